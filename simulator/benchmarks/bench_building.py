@@ -0,0 +1,135 @@
+"""
+Benchmark of the building update: time of a Building.update() of all rooms of a building, and of its vectorized step
+integrating the temperature, humidity and co2 with the exchanges between adjacent rooms, compared to the world update of a single room.
+The rooms are generated as in bench_sharding.py, each with a thermometer, a brightness sensor, a heater and a LED.
+The worlds of the quiet rooms are not updated (see Building.update()) and the publish policies of the thermometers are checked at once:
+with sensors not connected to the bus (the default), a typical tick (median) costs a few single room updates.
+With -c, the thermometers are connected to the bus and publish as in SVSHI mode, at every tick with the default publish policy.
+The mean includes the ticks at the boundaries of the outdoor light (dawn, sunrise, ...), shared by all rooms, that update every world.
+
+Run from the root of the simulator (simulator-knx/):
+    python3 simulator/benchmarks/bench_building.py
+    python3 simulator/benchmarks/bench_building.py -r 500 -w 20 -c
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+sys.path.append("./simulator")
+sys.path.append("./simulator/benchmarks")
+import system  # system before tools, that import system.tracing
+from bench_sharding import generate_config
+from devices import Sensor
+from world import Building
+from tools import configure_building_from_file, configure_system_from_file
+
+ROOMS = 500
+WIDTH = 20  # rooms per floor row, connected to their neighbours in the row and in the next row
+REPEAT = 200
+SINGLE_ROOM_CONFIG_PATH = "./config/sim_config_bedroom.json"
+
+
+def build_building(rooms: int, width: int, connect_sensors: bool = False) -> Building:
+    """
+    Create a building of generated rooms (see bench_sharding.generate_config()) on a grid of width rooms,
+    connected to their right and back neighbours, with their sensors connected to the bus if connect_sensors.
+    """
+    config = generate_config(rooms)
+    connections = []
+    for index in range(rooms):
+        if (index + 1) % width and index + 1 < rooms:
+            connections.append(
+                {
+                    "rooms": [f"room{index}", f"room{index + 1}"],
+                    "heat_exchange": 30,
+                    "air_exchange": 10,
+                }
+            )
+        if index + width < rooms:
+            connections.append(
+                {"rooms": [f"room{index}", f"room{index + width}"], "heat_exchange": 30}
+            )
+    config["world"]["connections"] = connections
+    with tempfile.TemporaryDirectory() as directory:
+        config_path = os.path.join(directory, f"building_{rooms}_rooms.json")
+        with open(config_path, "w") as file:
+            json.dump(config, file)
+        with contextlib.redirect_stdout(io.StringIO()):  # configuration prints
+            building, _ = configure_building_from_file(config_path, test_mode=True)
+    if connect_sensors:
+        for room in building.rooms:
+            for in_room_device in room.devices:
+                if isinstance(in_room_device.device, Sensor):
+                    in_room_device.device.connect_to(room.knxbus)
+        building.refresh()  # read the publish policies of the connected sensors
+    return building
+
+
+def timed(function, repeat: int) -> float:
+    """Return the mean time in ms of function calls"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def timed_ticks(function, repeat: int) -> Tuple[float, float]:
+    """Return the median and mean time in ms of function calls"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1e3)
+    return statistics.median(times), statistics.mean(times)
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "-r", "--rooms", type=int, default=ROOMS, help="Number of rooms"
+    )
+    parser.add_argument(
+        "-w", "--width", type=int, default=WIDTH, help="Number of rooms per row"
+    )
+    parser.add_argument(
+        "-c",
+        "--connect-sensors",
+        action="store_true",
+        help="Connect the sensors to the bus, the thermometers publish at every tick",
+    )
+    args = parser.parse_args(argv)
+    logging.disable(logging.CRITICAL)
+
+    building = build_building(args.rooms, args.width, args.connect_sensors)
+    building.update()  # first update
+    update, mean_update = timed_ticks(building.update, REPEAT)
+    step = timed(building.step, REPEAT)
+    exchanges = timed(building.exchanges, REPEAT)
+    with contextlib.redirect_stdout(io.StringIO()):
+        room, _ = configure_system_from_file(SINGLE_ROOM_CONFIG_PATH, test_mode=True)
+    room.update_world()  # first update
+    single_room = timed(room.update_world, REPEAT)
+    print(
+        f"{args.rooms} rooms with devices, {args.width} rooms per row, sensors {'connected' if args.connect_sensors else 'not connected'}"
+    )
+    print(
+        f"{'building update [ms]':>28} : {update:.3f} ({update / args.rooms * 1e3:.2f} us per room, {update / single_room:.1f}x a single room update)"
+    )
+    print(
+        f"{'mean building update [ms]':>28} : {mean_update:.3f} ({mean_update / single_room:.1f}x, with the outdoor light boundaries)"
+    )
+    print(f"{'building step [ms]':>28} : {step:.3f} (exchanges {exchanges:.3f})")
+    print(f"{'single room update [ms]':>28} : {single_room:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark of the KNX Bus delivery modes: throughput of the synchronous mode
+(delivery on the stack of the sender) against the queued mode (asyncio dispatcher).
+
+Run from the root of the simulator (simulator-knx/):
+    python3 simulator/benchmarks/bench_bus_queue.py
+"""
+
+import asyncio
+import logging
+import random
+import sys
+import time
+
+sys.path.append("./simulator")
+from system import KNXBus, GroupAddress, IndividualAddress, Telegram, BinaryPayload
+import devices as dev
+
+GA_COUNT = 1000
+TELEGRAMS = 100000
+BATCH_SIZES = [16, 256, 4096]
+
+
+def build_bus() -> KNXBus:
+    """Create a bus with GA_COUNT group addresses, each one with a LED attached to it."""
+    knxbus = KNXBus()
+    for raw in range(GA_COUNT):
+        led = dev.LED(
+            "led" + str(raw),
+            IndividualAddress(raw >> 12, (raw >> 8) & 0xF, raw & 0xFF),
+        )
+        knxbus.attach(led, GroupAddress.from_raw("3-levels", raw))
+    return knxbus
+
+
+def build_telegrams() -> list:
+    """Create TELEGRAMS telegrams to random group addresses of the bus."""
+    rng = random.Random(0)
+    source = IndividualAddress(0, 0, 0)
+    payloads = [BinaryPayload(True), BinaryPayload(False)]
+    return [
+        Telegram(
+            source,
+            GroupAddress.from_raw("3-levels", rng.randrange(GA_COUNT)),
+            payloads[i & 1],
+        )
+        for i in range(TELEGRAMS)
+    ]
+
+
+def bench_sync(telegrams: list) -> float:
+    """Return throughput in telegrams per second of the synchronous mode."""
+    knxbus = build_bus()
+    start = time.perf_counter()
+    for telegram in telegrams:
+        knxbus.transmit_telegram(telegram)
+    return len(telegrams) / (time.perf_counter() - start)
+
+
+async def bench_queued(telegrams: list, batch_size: int) -> float:
+    """Return throughput in telegrams per second of the queued mode, from first emission to last delivery."""
+    knxbus = build_bus()
+    knxbus.start_dispatcher(batch_size=batch_size)
+    start = time.perf_counter()
+    for telegram in telegrams:
+        knxbus.transmit_telegram(telegram)
+    await knxbus.flush()
+    elapsed = time.perf_counter() - start
+    await knxbus.stop_dispatcher()
+    return len(telegrams) / elapsed
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    telegrams = build_telegrams()
+    print(f"{'bus mode':>20} | {'throughput [telegrams/s]':>25}")
+    print(f"{'sync':>20} | {bench_sync(telegrams):>25.0f}")
+    for batch_size in BATCH_SIZES:
+        throughput = asyncio.run(bench_queued(telegrams, batch_size))
+        print(f"{'queued (batch ' + str(batch_size) + ')':>20} | {throughput:>25.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark of the KNX Bus routing table: latency of a telegram delivery
+with an increasing number of group addresses defined on the bus.
+
+Run from the root of the simulator (simulator-knx/):
+    python3 simulator/benchmarks/bench_bus_routing.py
+"""
+
+import logging
+import random
+import sys
+import time
+
+sys.path.append("./simulator")
+from system import KNXBus, GroupAddress, IndividualAddress, Telegram, BinaryPayload
+import devices as dev
+
+GA_COUNTS = [10, 100, 1000, 10000, 50000]
+DELIVERIES = 20000
+
+
+def raw_to_group_address(raw: int) -> GroupAddress:
+    """Create a '3-levels' group address from its raw 16-bit value."""
+    return GroupAddress("3-levels", raw >> 11, (raw >> 8) & 0x7, raw & 0xFF)
+
+
+def build_bus(ga_count: int) -> KNXBus:
+    """Create a bus with ga_count group addresses, each one with a LED attached to it."""
+    knxbus = KNXBus()
+    for raw in range(ga_count):
+        led = dev.LED(
+            "led" + str(raw),
+            IndividualAddress(raw >> 12, (raw >> 8) & 0xF, raw & 0xFF),
+        )
+        knxbus.attach(led, raw_to_group_address(raw))
+    return knxbus
+
+
+def bench_delivery(knxbus: KNXBus, ga_count: int) -> float:
+    """Return mean latency in microseconds of a telegram delivery to a random group address of the bus."""
+    rng = random.Random(0)
+    source = IndividualAddress(0, 0, 0)
+    payload = BinaryPayload(True)
+    telegrams = [
+        Telegram(source, raw_to_group_address(rng.randrange(ga_count)), payload)
+        for _ in range(DELIVERIES)
+    ]
+    start = time.perf_counter()
+    for telegram in telegrams:
+        knxbus.transmit_telegram(telegram)
+    return (time.perf_counter() - start) / DELIVERIES * 1e6
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    print(f"{'group addresses':>16} | {'delivery latency [us]':>22}")
+    for ga_count in GA_COUNTS:
+        knxbus = build_bus(ga_count)
+        latency = bench_delivery(knxbus, ga_count)
+        print(f"{ga_count:>16} | {latency:>22.2f}")
+
+
+if __name__ == "__main__":
+    main()
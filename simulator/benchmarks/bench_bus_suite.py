@@ -0,0 +1,236 @@
+"""
+Benchmark suite of the KNX Bus hot path on synthetic rooms: for N actuators, M group addresses and a fan-out
+(number of actuators assigned to each group address), it measures the delivery throughput of telegrams sent by
+Button.user_input() through KNXBus.transmit_telegram() to the actuators' update_state(),
+the cost of attach() and detach(), and the memory used per device.
+
+Results are written to a JSON file, that can be given as baseline to a later run to detect regressions.
+
+Run from the root of the simulator (simulator-knx/):
+    python3 simulator/benchmarks/bench_bus_suite.py -o bench.json
+    python3 simulator/benchmarks/bench_bus_suite.py -o bench_new.json -c bench.json
+    python3 simulator/benchmarks/bench_bus_suite.py -n 5000 -m 500 -f 10
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Tuple, Union
+
+sys.path.append("./simulator")
+from system import Room, IndividualAddress
+import devices as dev
+
+# Default scenarios (actuators, group addresses, fan-out)
+SCENARIOS = [(100, 10, 10), (1000, 100, 10), (1000, 1000, 1), (5000, 500, 50)]
+TELEGRAMS = 20000
+LINES = 4  # actuators are spread over LINES lines of area 1
+# Metrics compared to the baseline, with True if higher is better
+METRICS = {
+    "telegrams_per_s": True,
+    "deliveries_per_s": True,
+    "attach_us": False,
+    "detach_us": False,
+    "memory_per_device_B": False,
+}
+DEFAULT_TOLERANCE = 0.15
+
+
+def scenario_name(devices: int, group_addresses: int, fanout: int) -> str:
+    return f"n{devices}-m{group_addresses}-f{fanout}"
+
+
+def build_room() -> Room:
+    """Create an empty room without GUI nor SVSHI connection."""
+    return Room("benchroom", 20, 20, 3, 180, "3-levels", test_mode=True)
+
+
+def group_address_str(index: int) -> str:
+    """Return the '3-levels' group address string of the index-th group address of the synthetic room."""
+    return f"{1 + (index >> 11)}/{(index >> 8) & 0x7}/{index & 0xFF}"
+
+
+def build_devices(
+    room: Room, devices: int, group_addresses: int
+) -> Tuple[List[dev.Button], List[dev.LED]]:
+    """Add a Button per group address (line 0.0) and devices LEDs spread over LINES lines to the room."""
+    buttons = []
+    for index in range(group_addresses):
+        button = dev.Button(
+            f"button{index}", IndividualAddress(0, index >> 8, index & 0xFF)
+        )
+        room.add_device(button, 1, 1)
+        buttons.append(button)
+    leds = []
+    for index in range(devices):
+        line, number = index % LINES, index // LINES
+        led = dev.LED(
+            f"led{index}", IndividualAddress(1 + (number >> 8), line, number & 0xFF)
+        )
+        room.add_device(led, 1 + index % 18, 1 + (index // 18) % 18)
+        leds.append(led)
+    return buttons, leds
+
+
+def assignments(
+    devices: int, group_addresses: int, fanout: int
+) -> List[Tuple[int, int]]:
+    """Return the (LED index, group address index) pairs: each group address is assigned to fanout LEDs, round robin."""
+    return [
+        ((index * fanout + k) % devices, index)
+        for index in range(group_addresses)
+        for k in range(min(fanout, devices))
+    ]
+
+
+def run_scenario(
+    devices: int, group_addresses: int, fanout: int, telegrams: int = TELEGRAMS
+) -> Dict[str, Union[int, float]]:
+    """Run a scenario and return its metrics."""
+    tracemalloc.start()
+    room = build_room()
+    base_memory = tracemalloc.get_traced_memory()[0]
+    buttons, leds = build_devices(room, devices, group_addresses)
+    device_memory = tracemalloc.get_traced_memory()[0] - base_memory
+    tracemalloc.stop()
+
+    pairs = assignments(devices, group_addresses, fanout)
+    ga_strs = [group_address_str(index) for index in range(group_addresses)]
+    start = time.perf_counter()
+    for index, button in enumerate(buttons):
+        room.attach(button, ga_strs[index])
+    for led_index, ga_index in pairs:
+        room.attach(leds[led_index], ga_strs[ga_index])
+    attach_time = time.perf_counter() - start
+
+    rng = random.Random(0)
+    senders = [buttons[rng.randrange(group_addresses)] for _ in range(telegrams)]
+    start = time.perf_counter()
+    for button in senders:
+        button.user_input()
+    delivery_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for led_index, ga_index in pairs:
+        room.detach(leds[led_index], ga_strs[ga_index])
+    detach_time = time.perf_counter() - start
+
+    return {
+        "devices": devices,
+        "group_addresses": group_addresses,
+        "fanout": fanout,
+        "telegrams": telegrams,
+        "telegrams_per_s": round(telegrams / delivery_time, 1),
+        "deliveries_per_s": round(telegrams * min(fanout, devices) / delivery_time, 1),
+        "attach_us": round(attach_time / (len(pairs) + len(buttons)) * 1e6, 3),
+        "detach_us": round(detach_time / len(pairs) * 1e6, 3),
+        "memory_per_device_B": round(device_memory / (devices + group_addresses), 1),
+    }
+
+
+def compare(
+    results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float
+) -> List[str]:
+    """Return the list of regressions (metrics worse than baseline by more than tolerance) of the common scenarios."""
+    regressions = []
+    for name, metrics in results.items():
+        base_metrics = baseline.get(name)
+        if base_metrics is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            new, old = metrics.get(metric), base_metrics.get(metric)
+            if not new or not old:
+                continue
+            change = (new - old) / old
+            if (change < -tolerance) if higher_is_better else (change > tolerance):
+                regressions.append(
+                    f"{name} {metric}: {old} -> {new} ({change * 100:+.1f}%)"
+                )
+    return regressions
+
+
+def arguments_parser(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-n", "--devices", type=int, help="Number of actuators")
+    parser.add_argument(
+        "-m", "--group-addresses", type=int, help="Number of group addresses"
+    )
+    parser.add_argument(
+        "-f", "--fanout", type=int, help="Number of actuators per group address"
+    )
+    parser.add_argument(
+        "-t",
+        "--telegrams",
+        type=int,
+        default=TELEGRAMS,
+        help="Number of telegrams sent per scenario",
+    )
+    parser.add_argument("-o", "--output", help="JSON file to write the results to")
+    parser.add_argument(
+        "-c", "--compare", help="JSON file of a previous run to compare the results with"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Relative change tolerated before reporting a regression",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] = None) -> int:
+    """Run the scenarios, return 1 if regressions are found compared to the baseline, 0 otherwise."""
+    args = arguments_parser(argv)
+    logging.disable(logging.CRITICAL)
+    if args.devices or args.group_addresses or args.fanout:
+        scenarios = [
+            (args.devices or 1000, args.group_addresses or 100, args.fanout or 10)
+        ]
+    else:
+        scenarios = SCENARIOS
+
+    results = {}
+    print(
+        f"{'scenario':>18} | {'telegrams/s':>11} | {'deliveries/s':>12} | "
+        f"{'attach [us]':>11} | {'detach [us]':>11} | {'memory/device [B]':>17}"
+    )
+    for scenario in scenarios:
+        metrics = run_scenario(*scenario, telegrams=args.telegrams)
+        name = scenario_name(*scenario)
+        results[name] = metrics
+        print(
+            f"{name:>18} | {metrics['telegrams_per_s']:>11.0f} | "
+            f"{metrics['deliveries_per_s']:>12.0f} | {metrics['attach_us']:>11.2f} | "
+            f"{metrics['detach_us']:>11.2f} | {metrics['memory_per_device_B']:>17.0f}"
+        )
+
+    if args.output:
+        report = {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results,
+        }
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+        print(f"Results written to {args.output}")
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regression compared to {args.compare} (tolerance {args.tolerance * 100:.0f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
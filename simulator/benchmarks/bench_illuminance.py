@@ -0,0 +1,113 @@
+"""
+Benchmark of the brightness update: time to compute the illuminance of all brightness sensors of a room per tick,
+with the vectorized engine (cached geometry and one matrix-vector product) compared to the scalar per-pair loop
+equivalent to the previous implementation, and time to recompute the geometry after a device moved.
+
+Run from the root of the simulator (simulator-knx/):
+    python3 simulator/benchmarks/bench_illuminance.py
+    python3 simulator/benchmarks/bench_illuminance.py -l 1000 -s 200
+"""
+
+import argparse
+import logging
+import math
+import random
+import sys
+import time
+from typing import List
+
+sys.path.append("./simulator")
+from system import Room, IndividualAddress, Window
+import devices as dev
+from world import compute_distance, compute_distance_from_window
+
+LIGHTS = 1000
+SENSORS = 200
+REPEAT = 50
+
+
+def build_room(lights: int, sensors: int) -> Room:
+    """Create a room with lights LEDs (half turned on) on the ceiling, sensors brightness sensors and two windows."""
+    room = Room("benchroom", 20, 20, 3, 180, "3-levels", test_mode=True)
+    rng = random.Random(0)
+    for index in range(lights):
+        led = dev.LED(f"led{index}", IndividualAddress(1, index >> 8, index & 0xFF))
+        led.state = bool(index & 1)
+        room.add_device(led, rng.uniform(0, 20), rng.uniform(0, 20), 3)
+    for index in range(sensors):
+        sensor = dev.Brightness(
+            f"brightness{index}", IndividualAddress(2, index >> 8, index & 0xFF)
+        )
+        room.add_device(sensor, rng.uniform(0, 20), rng.uniform(0, 20), 1)
+    room.add_window(Window("window1", room, "north", 4, [3, 1.5]))
+    room.add_window(Window("window2", room, "west", 6, [2, 1.5]))
+    return room
+
+
+def scalar_brightness(room: Room, sensor) -> float:
+    """Brightness of a sensor computed source by source, as the previous AmbientLight implementation"""
+    brightness = 0
+    for source in room.devices:
+        if isinstance(source.device, dev.LightActuator) and source.device.state:
+            brightness += scalar_lux(source, compute_distance(source, sensor))
+    for window in room.windows:
+        brightness += scalar_lux(window, compute_distance_from_window(window, sensor))
+    return brightness
+
+
+def scalar_lux(source, distance: float) -> float:
+    if distance <= 0.01:
+        return source.device.effective_lumen()
+    solid_angle = 4 * math.pi * (math.sin(source.device.beam_angle / 4)) ** 2
+    return source.device.effective_lumen() / (solid_angle * distance**2)
+
+
+def timed(function, repeat: int) -> float:
+    """Return the mean time in ms of function calls"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "-l", "--lights", type=int, default=LIGHTS, help="Number of LEDs"
+    )
+    parser.add_argument(
+        "-s", "--sensors", type=int, default=SENSORS, help="Number of brightness sensors"
+    )
+    args = parser.parse_args(argv)
+    logging.disable(logging.CRITICAL)
+
+    room = build_room(args.lights, args.sensors)
+    engine = room.world.ambient_light._AmbientLight__illuminance
+    sensors = [
+        ir_device
+        for ir_device in room.devices
+        if isinstance(ir_device.device, dev.Brightness)
+    ]
+    engine.compute()  # geometry in cache
+    tick = timed(engine.compute, REPEAT)
+    lumens = timed(engine.lumens, REPEAT)
+    lumens_vector = engine.lumens()
+    matvec = timed(lambda: engine.geometry @ lumens_vector, REPEAT)
+
+    def recompute_geometry():
+        engine.invalidate()
+        engine.geometry
+
+    geometry = timed(recompute_geometry, 5)
+    scalar = timed(lambda: [scalar_brightness(room, s) for s in sensors], 1)
+    print(f"{args.lights} lights x {args.sensors} sensors")
+    print(
+        f"{'vectorized tick [ms]':>28} : {tick:.3f} "
+        f"(lumens vector {lumens:.3f}, matrix-vector product {matvec:.3f})"
+    )
+    print(f"{'geometry recompute [ms]':>28} : {geometry:.3f}")
+    print(f"{'scalar tick [ms]':>28} : {scalar:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Benchmark of the sharded simulation: room ticks per second of a generated building configuration
+simulated headless in 1, 2, 4, ... worker processes, with the telegrams bridged between the shards.
+
+Each generated room has a thermometer, a brightness sensor, a heater and a LED,
+the thermometer of each room sends its state to the heater of the next room, so that telegrams cross the shards.
+
+Run from the root of the simulator (simulator-knx/):
+    python3 simulator/benchmarks/bench_sharding.py
+    python3 simulator/benchmarks/bench_sharding.py -r 256 -s 1 2 4 8 16 -H 2 -e 10
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+from typing import Dict, List
+
+sys.path.append("./simulator")
+import system  # system before tools, that import system.tracing
+from tools.sharding import ShardedRunner, format_sharded_report
+
+ROOMS = 64
+SHARDS = [1, 2, 4, 8]
+HOURS = 1
+SIMULATED_DT = 60
+EPOCH_TICKS = 1
+ROOM_DEVICES = {  # class and location of each device of a room
+    "thermometer": ("Thermometer", [1, 1, 1]),
+    "brightness": ("Brightness", [2, 2, 1]),
+    "heater": ("Heater", [3, 0.5, 1]),
+    "led": ("LED", [2.5, 2, 3]),
+}
+
+
+def generate_config(rooms: int) -> Dict:
+    """Return a configuration of rooms rooms, the thermometer of each room is assigned with the heater of the next room."""
+    devices: Dict[str, Dict] = {}
+    rooms_config = {}
+    group_addresses = []
+    for room in range(rooms):
+        for offset, (prefix, (dev_class, _)) in enumerate(ROOM_DEVICES.items()):
+            index = len(ROOM_DEVICES) * room + offset + 1
+            area, line, device = index >> 12, (index >> 8) & 0xF, index & 0xFF
+            devices.setdefault(area, {}).setdefault(line, {})[f"{prefix}{room}"] = {
+                "class": dev_class,
+                "knx_location": f"{area}.{line}.{device}",
+            }
+        rooms_config[f"room{room + 1}"] = {
+            "name": f"room{room}",
+            "dimensions": [5, 4, 3],
+            "insulation": "average",
+            "windows": {
+                "window1": {"wall": "north", "size": [1, 1], "location_offset": 1}
+            },
+            "room_devices": {
+                f"{prefix}{room}": location
+                for prefix, (_, location) in ROOM_DEVICES.items()
+            },
+        }
+        group_addresses.append(
+            {
+                "address": f"{1 + (room >> 11)}/{(room >> 8) & 0x7}/{room & 0xFF}",
+                "group_devices": [f"thermometer{room}", f"heater{(room + 1) % rooms}"],
+            }
+        )
+    knx_config = {"number_of_areas": max(devices) + 1}
+    for area in range(max(devices) + 1):
+        lines = devices.get(area, {})
+        area_config = {"number_of_lines": max(lines, default=-1) + 1}
+        for line in range(area_config["number_of_lines"]):
+            area_config[f"line{line}"] = {"devices": lines.get(line, {})}
+        knx_config[f"area{area}"] = area_config
+    knx_config["group_address_style"] = "3-levels"
+    knx_config["group_addresses"] = group_addresses
+    return {
+        "knx": knx_config,
+        "world": {
+            "system_dt": 1,
+            "simulation_speed_factor": SIMULATED_DT,
+            "outside_temperature": 20.0,
+            "inside_temperature": 25.0,
+            "outside_relativehumidity": 35.0,
+            "inside_relativehumidity": 50.0,
+            "outside_co2": 300.0,
+            "inside_co2": 800.0,
+            "datetime": "2022/06/13/11/00",
+            "weather": "clear",
+            "number_of_rooms": rooms,
+            "rooms": rooms_config,
+        },
+    }
+
+
+def write_config(rooms: int, directory: str) -> str:
+    """Write a generated configuration of rooms rooms in directory, return its path"""
+    config_path = os.path.join(directory, f"building_{rooms}_rooms.json")
+    with open(config_path, "w") as file:
+        json.dump(generate_config(rooms), file)
+    return config_path
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "-r", "--rooms", type=int, default=ROOMS, help="Number of rooms"
+    )
+    parser.add_argument(
+        "-s", "--shards", type=int, nargs="+", default=SHARDS, help="Numbers of shards"
+    )
+    parser.add_argument(
+        "-H", "--hours", type=float, default=HOURS, help="Simulated hours"
+    )
+    parser.add_argument(
+        "-e",
+        "--epoch-ticks",
+        type=int,
+        default=EPOCH_TICKS,
+        help="Ticks between two synchronizations of the shards",
+    )
+    args = parser.parse_args(argv)
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as directory:
+        config_path = write_config(args.rooms, directory)
+        baseline = None
+        for shards in args.shards:
+            report = ShardedRunner(
+                config_path, shards, SIMULATED_DT, args.epoch_ticks
+            ).run(args.hours)
+            print(format_sharded_report(report))
+            if "errors" in report:
+                continue
+            baseline = baseline or report["room_ticks_per_s"]
+            print(
+                f"{'speedup':>28} : {report['room_ticks_per_s'] / baseline:.2f}x ({os.cpu_count()} cores)"
+            )
+
+
+if __name__ == "__main__":
+    main()
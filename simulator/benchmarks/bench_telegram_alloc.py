@@ -0,0 +1,90 @@
+"""
+Benchmark of the telegrams allocation: memory (tracemalloc) and time to create a burst of 100k telegrams,
+with the slotted Telegram/Payload classes and shared binary payloads, compared to dict-backed classes
+equivalent to the previous implementation.
+
+Run from the root of the simulator (simulator-knx/):
+    python3 simulator/benchmarks/bench_telegram_alloc.py
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+sys.path.append("./simulator")
+from system import GroupAddress, IndividualAddress
+from system.telegrams import Telegram, BinaryPayload, DimmerPayload, FloatPayload
+
+BURST = 100000
+
+
+class DictTelegram:
+    """Dict-backed telegram, as before the slotted implementation"""
+
+    def __init__(self, source_individual_addr, destination_group_addr, payload):
+        from system import IndividualAddress, GroupAddress
+
+        self.source: IndividualAddress = source_individual_addr
+        self.destination: GroupAddress = destination_group_addr
+        self.payload = payload
+
+
+class DictPayload:
+    """Dict-backed payload, as before the slotted implementation"""
+
+    def __init__(self, content) -> None:
+        self.content = None
+        self.content = content
+
+
+def burst_memory(make_telegram: Callable[[int], object]) -> Tuple[float, float]:
+    """Create BURST telegrams and keep them alive, return (bytes per telegram, peak MB)"""
+    gc.collect()
+    tracemalloc.start()
+    start_memory = tracemalloc.get_traced_memory()[0]
+    telegrams: List[object] = [make_telegram(i) for i in range(BURST)]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del telegrams
+    return (current - start_memory) / BURST, (peak - start_memory) / 1e6
+
+
+def burst_time(make_telegram: Callable[[int], object]) -> float:
+    """Return the creation time per telegram in us of a burst of BURST telegrams, without tracemalloc tracing"""
+    gc.collect()
+    start = time.perf_counter()
+    telegrams = [make_telegram(i) for i in range(BURST)]
+    elapsed = time.perf_counter() - start
+    del telegrams
+    return elapsed / BURST * 1e6
+
+
+def main() -> None:
+    source = IndividualAddress(1, 1, 1)
+    destination = GroupAddress("3-levels", 1, 1, 1)
+    scenarios = {
+        "dict binary": lambda i: DictTelegram(
+            source, destination, DictPayload(bool(i & 1))
+        ),
+        "slotted binary": lambda i: Telegram(
+            source, destination, BinaryPayload(bool(i & 1))
+        ),
+        "dict float": lambda i: DictTelegram(source, destination, DictPayload(i * 0.5)),
+        "slotted float": lambda i: Telegram(source, destination, FloatPayload(i * 0.5)),
+        "slotted dimmer": lambda i: Telegram(
+            source, destination, DimmerPayload(True, i % 101)
+        ),
+    }
+    print(
+        f"{'telegrams':>16} | {'bytes/telegram':>15} | {'peak [MB]':>10} | {'creation [us]':>14}"
+    )
+    for name, make_telegram in scenarios.items():
+        per_telegram, peak = burst_memory(make_telegram)
+        creation = burst_time(make_telegram)
+        print(f"{name:>16} | {per_telegram:>15.0f} | {peak:>10.2f} | {creation:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
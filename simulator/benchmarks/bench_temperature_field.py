@@ -0,0 +1,93 @@
+"""
+Benchmark of the temperature field: time of a world update of a room with a spatially resolved temperature (100x80 grid at 5cm),
+with a heater, an AC, two windows and thermometers, compared to the real-time budget of an update at a simulation speed factor.
+
+Run from the root of the simulator (simulator-knx/):
+    python3 simulator/benchmarks/bench_temperature_field.py
+    python3 simulator/benchmarks/bench_temperature_field.py -r 0.025 --three-dimensional
+"""
+
+import argparse
+import logging
+import sys
+import time
+from typing import List
+
+sys.path.append("./simulator")
+import system  # system before world and devices
+import devices as dev
+from world import TemperatureField
+
+RESOLUTION = 0.05
+SPEED_FACTOR = 180
+SYSTEM_DT = 1  # real seconds between two updates
+REPEAT = 500
+THERMOMETERS = [(1, 1, 1), (2.5, 2, 1.5), (4.5, 3.5, 1), (0.5, 3, 2)]
+
+
+def build_room(resolution: float, three_dimensional: bool) -> system.Room:
+    """Create a 5x4x3m room with a heater, an AC, two windows and thermometers, with a temperature field"""
+    room = system.Room(
+        "fieldroom",
+        5,
+        4,
+        3,
+        SPEED_FACTOR,
+        "3-levels",
+        insulation="average",
+        test_mode=True,
+    )
+    room.add_device(
+        dev.Heater("heater1", system.IndividualAddress(0, 0, 1), state=True),
+        0.5,
+        0.5,
+        1,
+    )
+    room.add_device(
+        dev.AC("ac1", system.IndividualAddress(0, 0, 2), state=True), 4.5, 3.5, 2.5
+    )
+    for index, location in enumerate(THERMOMETERS):
+        thermometer = dev.Thermometer(
+            f"thermometer{index}", system.IndividualAddress(0, 0, 10 + index)
+        )
+        room.add_device(thermometer, *location)
+    room.add_window(system.Window("window1", room, "north", 1, [1, 1]))
+    room.add_window(system.Window("window2", room, "east", 1.5, [1.5, 1]))
+    room.world.ambient_temperature.set_field(
+        TemperatureField(room, resolution, three_dimensional)
+    )
+    return room
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "-r",
+        "--resolution",
+        type=float,
+        default=RESOLUTION,
+        help="Size of the cells (m)",
+    )
+    parser.add_argument(
+        "--three-dimensional", action="store_true", help="Grid over the height too"
+    )
+    args = parser.parse_args(argv)
+    logging.disable(logging.CRITICAL)
+
+    room = build_room(args.resolution, args.three_dimensional)
+    field = room.world.ambient_temperature.field
+    room.update_world()  # first update
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        room.update_world()
+    update = (time.perf_counter() - start) / REPEAT
+    budget = SYSTEM_DT  # an update every system dt to follow the simulated time at the speed factor
+    print(f"grid {' x '.join(map(str, field.shape))}, {SPEED_FACTOR}x speed factor")
+    print(f"{'update [ms]':>28} : {update * 1e3:.3f}")
+    print(
+        f"{'real-time budget [ms]':>28} : {budget * 1e3:.0f} ({budget / update:.0f}x faster than real time)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,12 +6,15 @@ LED, Heater, AC, Switch and IPInterface.
 import logging
 import sys
 from abc import ABC
-from typing import Dict, Union, Tuple
+from typing import Callable, Dict, Union, Tuple
 
 from system.telegrams import Telegram, BinaryPayload, DimmerPayload, FloatPayload
 from system.system_tools import IndividualAddress
+from system.tracing import trace_point
 from .device_abstractions import Actuator
 
+TRACE_ACTUATOR_STATE = trace_point("device.actuator.state")
+
 
 class LightActuator(Actuator, ABC):
     """Abstract class to represent actuators acting on world's brightness"""
@@ -50,18 +53,31 @@ class LED(LightActuator):
 
         telegram : packet with new devices states
         """
-        if isinstance(telegram.payload, DimmerPayload):
-            self.state = telegram.payload.content
-            if self.state:
-                self.state_ratio = telegram.payload.state_ratio
+        self._handle(telegram)
 
-        elif isinstance(telegram.payload, BinaryPayload):
-            self.state = telegram.payload.content
+    def payload_handlers(self) -> Dict[type, Callable[[Telegram], None]]:
+        """Return the bound methods handling binary and dimmer payloads"""
+        return {
+            BinaryPayload: self.__update_binary_state,
+            DimmerPayload: self.__update_dimmer_state,
+        }
 
-        self.__str_state = "ON" if self.state else "OFF"
-        logging.info(
-            f"{self.name} has been turned {self.__str_state} by device '{telegram.source}'."
-        )
+    def __update_binary_state(self, telegram: Telegram) -> None:
+        self._update_binary_state(telegram)
+        if TRACE_ACTUATOR_STATE.enabled:
+            TRACE_ACTUATOR_STATE.emit(
+                device=self.name, state=self.state, source=str(telegram.source)
+            )
+
+    def __update_dimmer_state(self, telegram: Telegram) -> None:
+        self._update_dimmer_state(telegram)
+        if TRACE_ACTUATOR_STATE.enabled:
+            TRACE_ACTUATOR_STATE.emit(
+                device=self.name,
+                state=self.state,
+                state_ratio=self.state_ratio,
+                source=str(telegram.source),
+            )
 
     def effective_lumen(self) -> float:
         """Lumen quantity adjusted with the state ratio (% of source's max lumens)"""
@@ -103,6 +119,21 @@ class TemperatureActuator(Actuator, ABC):
         self.max_power = max_power
         self.state_ratio = 100  # in %
 
+    def update_state(self, telegram: Telegram) -> None:
+        """
+        Update the state and/or state_ratio of the temperature actuator (heater or AC)
+
+        telegram : packet with new devices states
+        """
+        self._handle(telegram)
+
+    def payload_handlers(self) -> Dict[type, Callable[[Telegram], None]]:
+        """Return the bound methods handling binary and dimmer payloads"""
+        return {
+            BinaryPayload: self._update_binary_state,
+            DimmerPayload: self._update_dimmer_state,
+        }
+
     def effective_power(self) -> float:
         """Power value adjusted with the state ratio (% of source's max power)"""
         return self.max_power * self.state_ratio / 100
@@ -147,19 +178,6 @@ class Heater(TemperatureActuator):
             sys.exit()
         super().__init__(name, individual_addr, state, update_rule, max_power)
 
-    def update_state(self, telegram: Telegram) -> None:
-        """
-        Update the state and/or state_ratio of the heater actuator
-
-        telegram : packet with new devices states
-        """
-        if isinstance(telegram.payload, BinaryPayload):
-            self.state = telegram.payload.content
-        if isinstance(telegram.payload, DimmerPayload):
-            self.state = telegram.payload.content
-            if self.state:
-                self.state_ratio = telegram.payload.state_ratio
-
 
 class AC(TemperatureActuator):
     """Concrete class to represent a cooling device"""
@@ -186,19 +204,6 @@ class AC(TemperatureActuator):
             sys.exit()
         super().__init__(name, individual_addr, state, update_rule, max_power)
 
-    def update_state(self, telegram: Telegram) -> None:
-        """
-        Update the state and/or state_ratio of the AC actuator
-
-        telegram : packet with new devices states
-        """
-        if isinstance(telegram.payload, BinaryPayload):
-            self.state = telegram.payload.content
-        if isinstance(telegram.payload, DimmerPayload):
-            self.state = telegram.payload.content
-            if self.state:
-                self.state_ratio = telegram.payload.state_ratio
-
 
 class Switch(Actuator):
     """Concrete class to represent a swicth indicator, can be linked to any real actuator device to indicate its state in GUI"""
@@ -216,12 +221,14 @@ class Switch(Actuator):
 
         telegram : packet with new devices states
         """
-        if isinstance(telegram.payload, BinaryPayload):
-            self.state = telegram.payload.content
-        if isinstance(telegram.payload, DimmerPayload):
-            self.state = telegram.payload.content
-            if self.state:
-                self.state_ratio = telegram.payload.state_ratio
+        self._handle(telegram)
+
+    def payload_handlers(self) -> Dict[type, Callable[[Telegram], None]]:
+        """Return the bound methods handling binary and dimmer payloads"""
+        return {
+            BinaryPayload: self._update_binary_state,
+            DimmerPayload: self._update_dimmer_state,
+        }
 
     def get_dev_info(
         self,
@@ -240,6 +247,8 @@ class IPInterface(Actuator):
 
     from svshi_interface.main import Interface
 
+    readable = False  # the interface only forwards telegrams to SVSHI
+
     def __init__(
         self,
         name: str,
@@ -257,16 +266,33 @@ class IPInterface(Actuator):
 
         telegram : packet with new devices states
         """
-        if isinstance(telegram.payload, BinaryPayload):
-            self.interface.add_to_sending_queue([telegram])
-        elif isinstance(telegram.payload, DimmerPayload):
-            # SVSHI does not support Dimmer payload for actuators, only binary (corresponds to svshi 'switch' type)
-            telegram.payload = BinaryPayload(telegram.payload.content)
-            self.interface.add_to_sending_queue([telegram])
-        elif isinstance(
-            telegram.payload, FloatPayload
-        ):  # Sensors values sent regularly on bus
-            self.interface.add_to_sending_queue([telegram])
+        self._handle(telegram)
+
+    def payload_handlers(self) -> Dict[type, Callable[[Telegram], None]]:
+        """
+        Return the bound methods forwarding binary, dimmer and float (sensors values sent regularly on bus) payloads to SVSHI,
+        and the GroupValueRead telegrams, that carry no payload.
+        """
+        return {
+            BinaryPayload: self.__forward,
+            DimmerPayload: self.__forward_dimmer,
+            FloatPayload: self.__forward,
+            type(None): self.__forward,
+        }
+
+    def __forward(self, telegram: Telegram) -> None:
+        self.interface.add_to_sending_queue([telegram])
+
+    def __forward_dimmer(self, telegram: Telegram) -> None:
+        # SVSHI does not support Dimmer payload for actuators, only binary (corresponds to svshi 'switch' type),
+        # a new telegram is sent as the received one is shared with the other subscribers
+        binary_telegram = Telegram(
+            telegram.source,
+            telegram.destination,
+            BinaryPayload(telegram.payload.content),
+            telegram.apci,
+        )
+        self.interface.add_to_sending_queue([binary_telegram])
 
     def get_dev_info(self) -> None:
         """IP Interface is not considered as a real device and has no specific attributes/characteristics, method implemented to respect the definition of abstract class Actuators"""
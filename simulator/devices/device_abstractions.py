@@ -8,11 +8,20 @@ import sys
 import traceback
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Callable, Dict, List, Tuple, Union
+
+from system.tracing import trace_point
+
+TRACE_CONNECT = trace_point("device.connect")
 
 
 class Device(ABC):
-    """Abstract root class to represent simulated KNX Devices"""
+    """
+    Abstract root class to represent simulated KNX Devices.
+    Readable devices answer the GroupValueRead telegrams for their group addresses when the bus has no value in cache.
+    """
+
+    readable = False
 
     from system.system_tools import IndividualAddress
     from system.telegrams import Payload
@@ -52,32 +61,38 @@ class Device(ABC):
         Construct a telegram with the given payload and send it on the bus.
         'knxbus' attribute is added to the device object with 'connect_to()' method,
         'connect_to()' method is called when added to the room with 'room.add_device()' method.
-        'knxbus.transmit_telegram()' sends telegrams to all devices assigned to the same group addresses.
+        'knxbus.transmit_batch()' sends the telegrams of all group addresses at once to the devices assigned to them.
         """
         from system import Telegram
 
-        for group_address in self.group_addresses:
-            telegram = Telegram(self.individual_addr, group_address, payload)
-            try:
-                assert hasattr(self, "knxbus")
-            except AssertionError:
-                logging.warning(
-                    f"The device '{self.name}' is not connected to the bus, and thus cannot send telegrams."
-                )
-            try:
-                self.knxbus.transmit_telegram(telegram)
-            except:
-                exc = sys.exc_info()[0]
-                trace = traceback.format_exc()
-                logging.warning(
-                    f"[Device.send_telegram()] - Transmission of the telegram from source '{telegram.source}' failed:{exc} with trace \n{trace}."
-                )
+        if not self.group_addresses:
+            return
+        if not hasattr(self, "knxbus"):
+            logging.warning(
+                f"The device '{self.name}' is not connected to the bus, and thus cannot send telegrams."
+            )
+            return
+        telegrams = [
+            Telegram(self.individual_addr, group_address, payload)
+            for group_address in self.group_addresses
+        ]
+        try:
+            self.knxbus.transmit_batch(telegrams)
+        except:
+            exc = sys.exc_info()[0]
+            trace = traceback.format_exc()
+            logging.warning(
+                f"[Device.send_telegram()] - Transmission of the telegrams from source '{self.individual_addr}' failed:{exc} with trace \n{trace}."
+            )
+
+    def read_value(self) -> Union[Payload, None]:
+        """Return the payload answering a GroupValueRead for the device's group addresses, None if not readable"""
+        return None
 
     def connect_to(self, knxbus: KNXBus) -> None:
         """Add the knxbus object to device's attributes to send telegrams by calling 'knxbus.transmit_telegram()' method"""
-        logging.info(
-            f"{self.name} can send telegrams on the KNX Bus, knxbus object is added to device's class attributes."
-        )
+        if TRACE_CONNECT.enabled:
+            TRACE_CONNECT.emit(device=self.name)
         self.knxbus = knxbus
 
     @abstractmethod
@@ -92,11 +107,20 @@ class FunctionalModule(Device, ABC):
     """
 
     from system.system_tools import IndividualAddress
+    from system.telegrams import BinaryPayload
+
+    readable = True
 
     def __init__(self, name: str, individual_addr: IndividualAddress) -> None:
         """Initialization of a Functional Module instance"""
         super().__init__(name, individual_addr)
 
+    def read_value(self) -> BinaryPayload:
+        """Return the payload of the functional module's state, answering a GroupValueRead"""
+        from system.telegrams import BinaryPayload
+
+        return BinaryPayload(self.state)
+
     @abstractmethod
     def user_input(self):
         """
@@ -107,18 +131,219 @@ class FunctionalModule(Device, ABC):
         """
 
 
+def first_true_update(predicate: Callable[[int], bool], start: int, stop: int) -> int:
+    """
+    Return the first update k in [start, stop) for which predicate(k) is True, stop if none,
+    for a predicate False then True on [start, stop) (searched by exponential steps then bisection).
+    """
+    if start >= stop or predicate(start):
+        return min(start, stop)
+    low, step = start, 1  # predicate(low) is False
+    while True:
+        high = min(low + step, stop)
+        if high == stop or predicate(high):
+            break
+        low, step = high, step * 2
+    while high - low > 1:
+        middle = (low + high) // 2
+        if predicate(middle):
+            high = middle
+        else:
+            low = middle
+    return high
+
+
+class PublishPolicy:
+    """
+    Class to represent the rules deciding if a sensor publishes its measured value on the bus at a world update.
+    The default policy publishes at every update.
+    """
+
+    CONFIG_KEYS = ("cov_threshold", "min_interval", "max_interval", "change_only")
+
+    def __init__(
+        self,
+        cov_threshold: float = 0,
+        min_interval: float = 0,
+        max_interval: float = None,
+        change_only: bool = False,
+    ) -> None:
+        """
+        Initialization of a publish policy, intervals are in simulated seconds.
+
+        cov_threshold : change of value, minimum absolute difference with the last published value to publish again (0 to ignore),
+        min_interval : minimum time between two published values,
+        max_interval : heartbeat, the value is published if nothing was published for max_interval, even if unchanged (None to disable),
+        change_only : publish only if the value differs from the last published value.
+        """
+        self.cov_threshold = cov_threshold
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.change_only = change_only
+        self.sent = 0
+        self.suppressed = 0
+        self.__last_value = None
+        self.__last_time = None
+
+    @classmethod
+    def from_config(cls, policy_config: Dict) -> "PublishPolicy":
+        """Create a publish policy from its dict representation in a JSON configuration file, default policy if incorrect."""
+        unknown_keys = [key for key in policy_config if key not in cls.CONFIG_KEYS]
+        if unknown_keys:
+            logging.warning(
+                f"The publish policy keys {unknown_keys} are not supported, expected keys in {list(cls.CONFIG_KEYS)}."
+            )
+        try:
+            cov_threshold = float(policy_config.get("cov_threshold", 0))
+            min_interval = float(policy_config.get("min_interval", 0))
+            max_interval = policy_config.get("max_interval", None)
+            if max_interval is not None:
+                max_interval = float(max_interval)
+            change_only = bool(policy_config.get("change_only", False))
+            assert cov_threshold >= 0 and min_interval >= 0
+            assert max_interval is None or max_interval >= min_interval
+        except (AssertionError, TypeError, ValueError):
+            logging.warning(
+                f"The publish policy {policy_config} is incorrect: thresholds and intervals should be positive numbers, and max_interval >= min_interval ==> default policy is used."
+            )
+            return cls()
+        return cls(cov_threshold, min_interval, max_interval, change_only)
+
+    def to_config(self) -> Dict[str, Union[float, bool]]:
+        """Return the dict representation of the policy for a JSON configuration file"""
+        return {
+            "cov_threshold": self.cov_threshold,
+            "min_interval": self.min_interval,
+            "max_interval": self.max_interval,
+            "change_only": self.change_only,
+        }
+
+    def publishes(self, value: Union[float, bool], time: float) -> bool:
+        """Return True if the value would be published at simulated time, without updating the counters."""
+        last_time = self.__last_time
+        if last_time is None:
+            return True
+        elapsed = time - last_time
+        if self.max_interval is not None and elapsed >= self.max_interval:  # heartbeat
+            return True
+        if elapsed < self.min_interval:
+            return False
+        delta = abs(value - self.__last_value)
+        return not ((self.change_only and delta == 0) or (delta < self.cov_threshold))
+
+    def allows(self, value: Union[float, bool], time: float) -> bool:
+        """
+        Return True if the value should be published at simulated time, and update the counters.
+
+        value : value measured by the sensor, time : current simulated time in seconds.
+        """
+        if not self.publishes(value, time):
+            self.suppressed += 1
+            return False
+        self.__last_value = value
+        self.__last_time = time
+        self.sent += 1
+        return True
+
+    def last_publication(self) -> Tuple[Union[float, None], Union[float, bool, None]]:
+        """Return the simulated time and the value of the last published value, (None, None) before the first one"""
+        return self.__last_time, self.__last_value
+
+    def next_publication(
+        self,
+        value_after: Callable[[int], Union[float, bool]],
+        time_after: Callable[[int], float],
+        horizon: int,
+    ) -> int:
+        """
+        Return the first of the next updates (1 to horizon) at which a value would be published, horizon if none before:
+        the first value, a heartbeat, or a value crossing the change of value threshold once min_interval elapsed.
+
+        value_after, time_after : functions returning the measured value and the simulated time after a number of updates,
+        the values should be monotonic until the horizon (e.g. indoor values tending toward outdoor values).
+        """
+        if self.__last_time is None:
+            return 1
+        heartbeat = horizon
+        if self.max_interval is not None:
+            heartbeat = first_true_update(
+                lambda k: time_after(k) - self.__last_time >= self.max_interval,
+                1,
+                horizon,
+            )
+        start = first_true_update(
+            lambda k: time_after(k) - self.__last_time >= self.min_interval,
+            1,
+            heartbeat,
+        )
+        change = first_true_update(
+            lambda k: self.publishes(value_after(k), time_after(k)), start, heartbeat
+        )
+        return min(heartbeat, change)
+
+    def get_info(self) -> Dict[str, Union[float, bool, int]]:
+        """Return the policy configuration and its counters, method called via CLI commmand 'getinfo'"""
+        policy_dict = self.to_config()
+        policy_dict.update({"sent": self.sent, "suppressed": self.suppressed})
+        return policy_dict
+
+
 class Sensor(Device, ABC):
     """
     Abstract class to represent Sensor devices (that read world states):
     Brightness, Thermometer, HumiditySoil, HumidityAir, CO2Sensor, AirSensor and PresenceSensor
+    Sensors publishing their state send it on the bus at the world updates, as allowed by their publish policy.
     """
 
     from system.system_tools import IndividualAddress
+    from system.telegrams import Payload
+
+    readable = True
+    publishes_state = True
 
     def __init__(self, name: str, individual_addr: IndividualAddress) -> None:
         """Initialization of a Sensor instance"""
         super().__init__(name, individual_addr)
         self.interface = None
+        self.publish_policy = PublishPolicy()
+
+    def _publishing(self) -> bool:
+        """Return True if the sensor sends its state on the bus at the world updates"""
+        return (
+            self.publishes_state
+            and len(self.group_addresses) > 0
+            and hasattr(self, "knxbus")
+        )
+
+    def _publish(self, payload: Payload) -> None:
+        """
+        Send payload on the bus if the publish policy of the sensor allows it,
+        only if the sensor is connected to the bus and assigned to a group address.
+        """
+        if self._publishing():
+            if self.publish_policy.allows(
+                payload.content, self.knxbus.simulation_time()
+            ):
+                self.send_telegram(payload)
+
+    def next_publication(
+        self,
+        value_after: Callable[[int], Union[float, bool]],
+        time_after: Callable[[int], float],
+        horizon: int,
+    ) -> int:
+        """
+        Return the first of the next world updates (1 to horizon) at which the sensor would send its state on the bus,
+        horizon if none before, from the functions predicting its measured value and the simulated time after a number of updates.
+        """
+        if not self._publishing():
+            return horizon
+        return self.publish_policy.next_publication(value_after, time_after, horizon)
+
+    def skip_publications(self, updates: int) -> None:
+        """Count the states that the publish policy suppressed during updates world updates skipped without publication"""
+        if self._publishing():
+            self.publish_policy.suppressed += updates
 
     @abstractmethod
     def send_state(self):
@@ -136,7 +361,11 @@ class Actuator(Device, ABC):
     """
 
     from system.system_tools import IndividualAddress
-    from system.telegrams import Telegram
+    from system.telegrams import Telegram, BinaryPayload
+
+    readable = True
+    # Handler function of each payload class received, per actuator class, resolved once (see payload_handler())
+    __handler_functions: Dict[type, Dict[type, Union[Callable, None]]] = {}
 
     def __init__(
         self, name: str, individual_addr: IndividualAddress, default_state: bool = False
@@ -145,14 +374,114 @@ class Actuator(Device, ABC):
         Initialization of a Actuator instance.
 
         state : True/False if device is respectively turned ON/OF
+        __watchers : functions called when the state or state_ratio of the actuator changes,
+        the state and state_ratio act on the world states and are properties notifying the watchers (see watch()).
         """
         super().__init__(name, individual_addr)
-        self.state = default_state
+        self.__watchers: List[Callable[[], None]] = []
+        self._state = default_state
+
+    @property
+    def state(self) -> bool:
+        return self._state
+
+    @state.setter
+    def state(self, state: bool) -> None:
+        if state != self._state:
+            self._state = state
+            for watcher in self.__watchers:
+                watcher()
+
+    @property
+    def state_ratio(self) -> float:
+        """State ratio of the actuators supporting it (% of the max power or lumens), AttributeError for the others"""
+        return self._state_ratio
+
+    @state_ratio.setter
+    def state_ratio(self, state_ratio: float) -> None:
+        if state_ratio != getattr(self, "_state_ratio", state_ratio):
+            self._state_ratio = state_ratio
+            for watcher in self.__watchers:
+                watcher()
+        else:
+            self._state_ratio = state_ratio
+
+    def watch(self, watcher: Callable[[], None]) -> None:
+        """
+        Call watcher when the state or state_ratio of the actuator changes,
+        used by the ambient states of the world to recompute their sensors only when needed.
+        """
+        self.__watchers.append(watcher)
 
     @abstractmethod
     def update_state(self, telegram: Telegram):
         """
         Update the state and/or state_ratio of device,
         Specific implementation for each actuator.
-        Method called by the KNXBus object when receiving a telegram for one of actuators' group addresses.
+        Method called with any telegram for one of actuators' group addresses, the KNXBus object calls directly the payload handlers.
+        """
+
+    def read_value(self) -> BinaryPayload:
+        """Return the payload of the actuator's state, answering a GroupValueRead"""
+        from system.telegrams import BinaryPayload
+
+        return BinaryPayload(self.state)
+
+    def payload_handlers(self) -> Dict[type, Callable[[Telegram], None]]:
+        """
+        Return the bound methods handling each payload class supported by the actuator,
+        used by the KNX Bus to compile the delivery plans of the group addresses.
+        If empty (default), all telegrams are handled by update_state().
         """
+        return {}
+
+    def __handler_function(self, payload_class: type) -> Union[Callable, None]:
+        """
+        Return the function handling a payload class, called with the actuator and the telegram,
+        resolved once per actuator class and payload class: the actuator does not keep references to its bound methods,
+        that would keep it alive in a reference cycle. The handlers that are not methods of the actuator are not cached.
+        """
+        functions = Actuator.__handler_functions.setdefault(type(self), {})
+        try:
+            return functions[payload_class]
+        except KeyError:
+            pass
+        handlers = self.payload_handlers()
+        handler = None if handlers else self.update_state
+        for cls in payload_class.__mro__:
+            if handler is not None:
+                break
+            handler = handlers.get(cls)
+        if handler is not None and getattr(handler, "__self__", None) is not self:
+            return lambda actuator, telegram: handler(telegram)
+        functions[payload_class] = None if handler is None else handler.__func__
+        return functions[payload_class]
+
+    def payload_handler(
+        self, payload_class: type
+    ) -> Union[Callable[[Telegram], None], None]:
+        """
+        Return the handler of the actuator for a payload class (or for its closest parent class),
+        None if the actuator ignores this payload class.
+        """
+        function = self.__handler_function(payload_class)
+        return None if function is None else function.__get__(self)
+
+    def _handle(self, telegram: Telegram) -> None:
+        """Call the handler of the actuator for the payload of telegram, if any, used by update_state()"""
+        try:
+            function = Actuator.__handler_functions[type(self)][type(telegram.payload)]
+        except KeyError:
+            function = self.__handler_function(type(telegram.payload))
+        if function is not None:
+            function(self, telegram)
+
+    def _update_binary_state(self, telegram: Telegram) -> None:
+        """Payload handler setting the state of the actuator"""
+        self.state = telegram.payload.content
+
+    def _update_dimmer_state(self, telegram: Telegram) -> None:
+        """Payload handler setting the state of the actuator, and its state_ratio if turned ON"""
+        self.state = telegram.payload.content
+        if self.state:
+            self.state_ratio = telegram.payload.state_ratio
@@ -9,6 +9,9 @@ from typing import Dict, Union, Tuple
 from .device_abstractions import FunctionalModule
 from system.telegrams import BinaryPayload, DimmerPayload
 from system.system_tools import IndividualAddress
+from system.tracing import trace_point
+
+TRACE_USER_INPUT = trace_point("device.user_input")
 
 
 class Button(FunctionalModule):
@@ -30,7 +33,8 @@ class Button(FunctionalModule):
         if state is not None:
             self.state = state
         self.__str_state = "ON" if self.state else "OFF"
-        logging.info(f"The {self.name} has been turned {self.__str_state}.")
+        if TRACE_USER_INPUT.enabled:
+            TRACE_USER_INPUT.emit(device=self.name, state=self.state)
         __binary_payload = BinaryPayload(binary_state=self.state)
         self.send_telegram(__binary_payload)
 
@@ -66,11 +70,10 @@ class Dimmer(FunctionalModule):
 
         if self.state:
             self.state_ratio = state_ratio
-            logging.info(
-                f"The {self.name} has been turned {self.__str_state} at {self.state_ratio}%."
+        if TRACE_USER_INPUT.enabled:
+            TRACE_USER_INPUT.emit(
+                device=self.name, state=self.state, state_ratio=self.state_ratio
             )
-        else:
-            logging.info(f"The {self.name} has been turned {self.__str_state}.")
 
         dimmer_payload = DimmerPayload(
             binary_state=self.state, state_ratio=self.state_ratio
@@ -82,6 +85,10 @@ class Dimmer(FunctionalModule):
                 f"The Dimmer payload was not correctly created, the telegram cannot be sent."
             )
 
+    def read_value(self) -> DimmerPayload:
+        """Return the payload of the dimmer's state and ratio, answering a GroupValueRead"""
+        return DimmerPayload(binary_state=self.state, state_ratio=self.state_ratio)
+
     def get_dev_info(
         self,
     ) -> Dict[str, Union[str, bool, float, Tuple[float, float, float]]]:
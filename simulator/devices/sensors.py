@@ -8,6 +8,7 @@ from typing import Dict, Union, Tuple
 
 from .device_abstractions import Sensor
 from system.system_tools import IndividualAddress
+from system.telegrams import BinaryPayload, FloatPayload
 
 
 class Brightness(Sensor):
@@ -32,16 +33,16 @@ class Brightness(Sensor):
             dev_specific_dict.update(self._dev_basic_dict)
         return dev_specific_dict
 
+    def read_value(self) -> FloatPayload:
+        """Return the payload of the sensor's measured value, sent on the bus or answering a GroupValueRead"""
+        return FloatPayload(self.brightness)
+
     def send_state(self) -> None:
         """
         Send sensor's measured value on the bus,
         only in svshi mode,
-        only if the sensor is assigned to a group address."""
-        from system import FloatPayload
-
-        if len(self.group_addresses) and hasattr(self, "knxbus"):
-            payload = FloatPayload(self.brightness)
-            self.send_telegram(payload)
+        only if the sensor is assigned to a group address and if its publish policy allows it."""
+        self._publish(self.read_value())
 
 
 class Thermometer(Sensor):
@@ -67,16 +68,16 @@ class Thermometer(Sensor):
             dev_specific_dict.update(self._dev_basic_dict)
         return dev_specific_dict
 
+    def read_value(self) -> FloatPayload:
+        """Return the payload of the sensor's measured value, sent on the bus or answering a GroupValueRead"""
+        return FloatPayload(self.temperature)
+
     def send_state(self) -> None:
         """
         Send sensor's measured value on the bus,
         only in svshi mode,
-        only if the sensor is assigned to a group address."""
-        from system import FloatPayload
-
-        if len(self.group_addresses) and hasattr(self, "knxbus"):
-            payload = FloatPayload(self.temperature)
-            self.send_telegram(payload)
+        only if the sensor is assigned to a group address and if its publish policy allows it."""
+        self._publish(self.read_value())
 
 
 class HumidityAir(Sensor):
@@ -101,16 +102,16 @@ class HumidityAir(Sensor):
             dev_specific_dict.update(self._dev_basic_dict)
         return dev_specific_dict
 
+    def read_value(self) -> FloatPayload:
+        """Return the payload of the sensor's measured value, sent on the bus or answering a GroupValueRead"""
+        return FloatPayload(self.humidity)
+
     def send_state(self) -> None:
         """
         Send sensor's measured value on the bus,
         only in svshi mode,
-        only if the sensor is assigned to a group address."""
-        from system import FloatPayload
-
-        if len(self.group_addresses) and hasattr(self, "knxbus"):
-            payload = FloatPayload(self.humidity)
-            self.send_telegram(payload)
+        only if the sensor is assigned to a group address and if its publish policy allows it."""
+        self._publish(self.read_value())
 
 
 class CO2Sensor(Sensor):
@@ -135,21 +136,24 @@ class CO2Sensor(Sensor):
             dev_specific_dict.update(self._dev_basic_dict)
         return dev_specific_dict
 
+    def read_value(self) -> FloatPayload:
+        """Return the payload of the sensor's measured value, sent on the bus or answering a GroupValueRead"""
+        return FloatPayload(self.co2)
+
     def send_state(self) -> None:
         """
         Send sensor's measured value on the bus,
         only in svshi mode,
-        only if the sensor is assigned to a group address."""
-        from system import FloatPayload
-
-        if len(self.group_addresses) and hasattr(self, "knxbus"):
-            payload = FloatPayload(self.co2)
-            self.send_telegram(payload)
+        only if the sensor is assigned to a group address and if its publish policy allows it."""
+        self._publish(self.read_value())
 
 
 class AirSensor(Sensor):
     """Concrete class to represent an Air Sensor: CO2, Humidity and/or Temperature"""
 
+    readable = False  # several values, see send_state()
+    publishes_state = False
+
     def __init__(
         self,
         name: str,
@@ -242,16 +246,16 @@ class HumiditySoil(Sensor):
             self.humiditysoil = value
             return 1
 
+    def read_value(self) -> FloatPayload:
+        """Return the payload of the sensor's measured value, sent on the bus or answering a GroupValueRead"""
+        return FloatPayload(self.humiditysoil)
+
     def send_state(self) -> None:
         """
         Send sensor's measured value on the bus,
         only in svshi mode,
-        only if the sensor is assigned to a group address."""
-        from system import FloatPayload
-
-        if len(self.group_addresses) and hasattr(self, "knxbus"):
-            payload = FloatPayload(self.humiditysoil)
-            self.send_telegram(payload)
+        only if the sensor is assigned to a group address and if its publish policy allows it."""
+        self._publish(self.read_value())
 
 
 class PresenceSensor(Sensor):
@@ -289,13 +293,13 @@ class PresenceSensor(Sensor):
             self.state = value
             return 1
 
+    def read_value(self) -> BinaryPayload:
+        """Return the payload of the sensor's measured value, sent on the bus or answering a GroupValueRead"""
+        return BinaryPayload(self.state)
+
     def send_state(self) -> None:
         """
         Send sensor's measured value on the bus,
         only in svshi mode,
-        only if the sensor is assigned to a group address."""
-        from system import FloatPayload
-
-        if len(self.group_addresses) and hasattr(self, "knxbus"):
-            payload = FloatPayload(self.humiditysoil)
-            self.send_telegram(payload)
+        only if the sensor is assigned to a group address and if its publish policy allows it."""
+        self._publish(self.read_value())
@@ -168,6 +168,15 @@ COLOR_FONT_ROOMDEVICE = BLACK_RGBA
 # Room colors
 COLOR_ROOM = GRAYX11_RGBA[:-1]  # [:-1] => shapes need only RGB, not alpha
 COLOR_ROOM_BORDER = BLACK_RGBA[:-1]
+# Illuminance heatmap colors, from dark (0 lux) to bright (HEATMAP_LUX_MAX and more), log scale
+COLORS_HEATMAP = [
+    (20, 30, 90),
+    (3, 97, 190),
+    (0, 170, 120),
+    (250, 210, 40),
+    (255, 90, 20),
+]
+HEATMAP_LUX_MAX = 2000
 # Simtime and Datetime box colors
 COLOR_BOX_SIMTIME = BLUETURQUOISE_RGBA[:-1]
 COLOR_BOX_SIMTIME_BORDER = BLUEGREY200_RGBA[:-1]
@@ -222,6 +231,7 @@ OPACITY_MIN = 55
 OPACITY_CLICKED = 150
 OPACITY_ROOM = 222
 OPACITY_ROOM_LABEL = 60
+OPACITY_HEATMAP = 110
 
 ## PNG paths
 # Main imgaes
@@ -10,12 +10,15 @@ import pyglet
 
 # Thrid-party libraries
 from time import time, sleep
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 import numpy as np
 
 # Application libraries
 import gui.gui_tools as gt
 import gui.gui_config as gc
+from system.tracing import trace_point
+
+TRACE_GUI_UPDATE = trace_point("gui.update")
 
 
 class GUIWindow(pyglet.window.Window):
@@ -103,6 +106,8 @@ class GUIWindow(pyglet.window.Window):
         self.__room_temperature_levels: List[pyglet.text.Label] = []
         self.__room_airquality_labels: List[pyglet.text.Label] = []
         self.__room_airsensor_levels: List[pyglet.text.Label] = []
+        # Last brightness, temperature, humidity and co2 levels displayed for each sensor
+        self.__displayed_levels: Tuple[Dict[str, float], ...] = ({}, {}, {}, {})
 
         # Initialize the Available devices widgets to draw them on the left side, that a user can drag them in the room
         self.__available_devices = gt.AvailableDevices(
@@ -931,52 +936,66 @@ class GUIWindow(pyglet.window.Window):
         humiditysoil_levels: List[Tuple[str, float]],
         presence_sensors_states: List[Tuple[str, bool]],
     ) -> None:
-        """Display (re-Initialisation) of the room sensors list with updated values"""
-        for room_brightness_level in self.__room_brightness_levels:
-            room_brightness_level.delete()
-        self.__room_brightness_levels = []
-        for room_temperature_level in self.__room_temperature_levels:
-            room_temperature_level.delete()
-        self.__room_temperature_levels = []
-        for room_sensor_level in self.__room_airsensor_levels:
-            room_sensor_level.delete()
-        self.__room_airsensor_levels = []
-        airsensor_dict = {}
+        """
+        Display (re-Initialisation) of the room sensors list with updated values,
+        the levels are given only for the sensors whose value changed, the others keep their displayed level.
+        """
+        for room_device in self.__room_devices:
+            if "thermometer" in room_device.label_name:
+                room_device.update_thermometer_sprite(rising_temp)
+        self.__room_widget.update_heatmap(self.room.world.ambient_light.lux_field())
+        if brightness_levels or temperature_levels or humidity_levels or co2_levels:
+            for displayed_levels, levels in zip(
+                self.__displayed_levels,
+                (brightness_levels, temperature_levels, humidity_levels, co2_levels),
+            ):
+                displayed_levels.update(levels)
+            brightness_levels, temperature_levels, humidity_levels, co2_levels = (
+                list(displayed_levels.items())
+                for displayed_levels in self.__displayed_levels
+            )
+            for room_brightness_level in self.__room_brightness_levels:
+                room_brightness_level.delete()
+            self.__room_brightness_levels = []
+            for room_temperature_level in self.__room_temperature_levels:
+                room_temperature_level.delete()
+            self.__room_temperature_levels = []
+            for room_sensor_level in self.__room_airsensor_levels:
+                room_sensor_level.delete()
+            self.__room_airsensor_levels = []
+            airsensor_dict = {}
 
-        for bright in brightness_levels:
-            bright_name, brightness = bright[0], round(bright[1], 1)
-            self.__display_brightness_level(bright_name, brightness)
-        for temp in temperature_levels:
-            temp_name, temperature = temp[0], round(temp[1], 2)
-            self.__display_temperature_level(temp_name, temperature)
-            for room_device in self.__room_devices:
-                if "thermometer" in room_device.label_name:
-                    room_device.update_thermometer_sprite(rising_temp)
-            if "air" in temp_name:
-                try:
-                    airsensor_dict[temp_name]["temperature"] = temperature
-                except KeyError:
-                    airsensor_dict[temp_name] = {}
-                    airsensor_dict[temp_name]["temperature"] = temperature
-        for hum in humidity_levels:
-            hum_name, humidity = hum[0], hum[1]
-            if "air" or "humidityair" in hum_name:
-                try:
-                    airsensor_dict[hum_name]["humidity"] = humidity
-                except KeyError:
-                    airsensor_dict[hum_name] = {}
-                    airsensor_dict[hum_name]["humidity"] = humidity
-        for co2 in co2_levels:
-            co2_name, co2 = co2[0], co2[1]
-            if "air" or "co2" in co2_name:
-                try:
-                    airsensor_dict[co2_name]["co2"] = co2
-                except KeyError:
-                    airsensor_dict[co2_name] = {}
-                    airsensor_dict[co2_name]["co2"] = co2
+            for bright in brightness_levels:
+                bright_name, brightness = bright[0], round(bright[1], 1)
+                self.__display_brightness_level(bright_name, brightness)
+            for temp in temperature_levels:
+                temp_name, temperature = temp[0], round(temp[1], 2)
+                self.__display_temperature_level(temp_name, temperature)
+                if "air" in temp_name:
+                    try:
+                        airsensor_dict[temp_name]["temperature"] = temperature
+                    except KeyError:
+                        airsensor_dict[temp_name] = {}
+                        airsensor_dict[temp_name]["temperature"] = temperature
+            for hum in humidity_levels:
+                hum_name, humidity = hum[0], hum[1]
+                if "air" or "humidityair" in hum_name:
+                    try:
+                        airsensor_dict[hum_name]["humidity"] = humidity
+                    except KeyError:
+                        airsensor_dict[hum_name] = {}
+                        airsensor_dict[hum_name]["humidity"] = humidity
+            for co2 in co2_levels:
+                co2_name, co2 = co2[0], co2[1]
+                if "air" or "co2" in co2_name:
+                    try:
+                        airsensor_dict[co2_name]["co2"] = co2
+                    except KeyError:
+                        airsensor_dict[co2_name] = {}
+                        airsensor_dict[co2_name]["co2"] = co2
 
-        if len(airsensor_dict) > 0:
-            self.__display_airsensors_levels(airsensor_dict)
+            if len(airsensor_dict) > 0:
+                self.__display_airsensors_levels(airsensor_dict)
 
         for humsoil in humiditysoil_levels:
             humsoil_name, humiditysoil = humsoil[0], humsoil[1]
@@ -1021,6 +1040,7 @@ class GUIWindow(pyglet.window.Window):
         ):  # Re-Initialisation of the room device labels list
             room_device_label.delete()
         self.__room_devices_labels = []
+        self.__displayed_levels = ({}, {}, {}, {})
         self.__button_pause.update_sprite(
             reload=True
         )  # Re-initialization of Pause button
@@ -1030,6 +1050,7 @@ class GUIWindow(pyglet.window.Window):
             config_path = self.__EMPTY_CONFIG_PATH
         else:
             config_path = self.__CONFIG_PATH
+        self.room.close()
         self.room, self.__SYSTEM_DT = configure_system_from_file(
             config_path,
             svshi_mode=self.__svshi_mode,
@@ -1399,4 +1420,5 @@ def update_gui_window(
     window.simtime_widget.simtime_value.text = f"{sim_time}"
     window.simtime_widget.date_value.text = f"{datetime_str}"
     window.daytimeweather_widget.update_out_state(weather, time_of_day, lux_out)
-    print(f"World state update at simulation time: {sim_time}", end="\r")
+    if TRACE_GUI_UPDATE.enabled:
+        TRACE_GUI_UPDATE.emit(simtime=sim_time, date_time=datetime_str)
@@ -7,6 +7,7 @@ import json
 from abc import abstractmethod
 from datetime import datetime
 
+import numpy as np
 import pyglet
 from pyglet.graphics import Batch, OrderedGroup
 from typing import List, Tuple
@@ -1132,6 +1133,47 @@ class RoomWidget(object):
         )
         self.__label.opacity = gc.OPACITY_ROOM_LABEL
         self.__sprite.opacity = gc.OPACITY_ROOM
+        # Illuminance heatmap, drawn over the room background image and under the devices
+        self.__heatmap_group = OrderedGroup(0, parent=group_mg)
+        self.__heatmap_sprite = None
+        self.__heatmap_field = None
+
+    def update_heatmap(self, lux_field) -> None:
+        """
+        Display the brightness of the room as a heatmap texture, one texel per node of the lux field, the texture is
+        rebuilt only when the field changes (None removes the heatmap).
+
+        lux_field : array of shape (nodes along x, nodes along y) of the brightness in lux, see AmbientLight.lux_field().
+        """
+        if lux_field is self.__heatmap_field:
+            return
+        self.__heatmap_field = lux_field
+        if self.__heatmap_sprite is not None:
+            self.__heatmap_sprite.delete()
+            self.__heatmap_sprite = None
+        if lux_field is None:
+            return
+        levels = np.clip(
+            np.log1p(lux_field.T) / np.log1p(gc.HEATMAP_LUX_MAX), 0, 1
+        )  # rows along y from the bottom, as pyglet images
+        stops = np.linspace(0, 1, len(gc.COLORS_HEATMAP))
+        rgba = np.empty(levels.shape + (4,), dtype=np.uint8)
+        for channel, values in enumerate(zip(*gc.COLORS_HEATMAP)):
+            rgba[..., channel] = np.interp(levels, stops, values)
+        rgba[..., 3] = 255
+        image = pyglet.image.ImageData(
+            levels.shape[1], levels.shape[0], "RGBA", rgba.tobytes()
+        )
+        self.__heatmap_sprite = pyglet.sprite.Sprite(
+            image,
+            self.origin_x,
+            self.origin_y,
+            batch=self.__batch,
+            group=self.__heatmap_group,
+        )
+        self.__heatmap_sprite.scale_x = self.width / image.width
+        self.__heatmap_sprite.scale_y = self.length / image.height
+        self.__heatmap_sprite.opacity = gc.OPACITY_HEATMAP
 
     def hit_test(self, x: float, y: float) -> bool:
         """Test if Room widget was hit by the mouse."""
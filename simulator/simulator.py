@@ -15,10 +15,12 @@ import pyglet
 from contextlib import suppress
 
 # Local application imports
-import gui
+from system.room import Room  # system before devices and tools, that import system.tracing
 import tools
 import tools.config_tools as ct
-from system.room import Room
+from tools.headless import format_report
+from tools.sharding import format_sharded_report
+from tools.montecarlo import format_montecarlo_report
 
 pp = pprint.PrettyPrinter(compact=True)
 
@@ -34,8 +36,36 @@ def launch_simulation(argv) -> None:
         CONFIG_PATH,
         SVSHI_MODE,
         TELEGRAM_LOGGING,
+        BUS_MODE,
+        HEADLESS_HOURS,
+        SIMULATED_DT,
+        EVENT_DRIVEN,
+        SHARDS,
+        MONTECARLO_SPEC,
     ) = tools.arguments_parser(argv)
 
+    # Sharded headless simulation of all the rooms, configured in the worker processes
+    if HEADLESS_HOURS is not None and SHARDS is not None:
+        print(
+            f"\n>>> The simulation is started in Sharded Headless Mode ({SHARDS} worker processes, no visual feedback) <<<"
+        )
+        report = tools.run_sharded(CONFIG_PATH, SHARDS, HEADLESS_HOURS, SIMULATED_DT)
+        print(format_sharded_report(report))
+        print("\nThe simulation program has been ended.")
+        sys.exit()
+
+    # Monte Carlo headless simulations of the room, configured in the worker processes
+    if HEADLESS_HOURS is not None and MONTECARLO_SPEC is not None:
+        print(
+            "\n>>> The simulation is started in Monte Carlo Headless Mode (process pool, no visual feedback) <<<"
+        )
+        report = tools.run_montecarlo(
+            CONFIG_PATH, MONTECARLO_SPEC, HEADLESS_HOURS, SIMULATED_DT
+        )
+        print(format_montecarlo_report(report))
+        print("\nThe simulation program has been ended.")
+        sys.exit()
+
     # System configuration from function configure_system()
     if CONFIG_MODE == ct.DEV_CONFIG:
         while True:
@@ -61,8 +91,28 @@ def launch_simulation(argv) -> None:
             CONFIG_PATH, svshi_mode=SVSHI_MODE, telegram_logging=TELEGRAM_LOGGING
         )
 
+    # Headless fast-forward, no interface with the user
+    if HEADLESS_HOURS is not None:
+        run_headless(
+            room1,
+            HEADLESS_HOURS,
+            SIMULATED_DT,
+            COMMAND_MODE,
+            SCRIPT_PATH,
+            BUS_MODE,
+            EVENT_DRIVEN,
+        )
+        room1.close()
+        sys.exit()
+
     # GUI interface with the user
     if INTERFACE_MODE == ct.GUI_MODE:
+        import gui  # imported here so that headless runs do not need a display
+
+        if BUS_MODE == ct.QUEUED_BUS_MODE:
+            logging.warning(
+                "The queued bus mode is only available in CLI interface mode, the KNX Bus stays in synchronous mode."
+            )
         window = gui.GUIWindow(
             CONFIG_PATH,
             ct.DEFAULT_CONFIG_PATH,
@@ -83,6 +133,8 @@ def launch_simulation(argv) -> None:
         except (KeyboardInterrupt, SystemExit):
             print("\nThe simulation program has been ended.")
             sys.exit()
+        finally:
+            window.room.close()  # the room of the last reload
         print("The GUI window has been closed and the simulation terminated.")
 
     # Terminal interface with the user (no visual feedback)
@@ -98,17 +150,45 @@ def launch_simulation(argv) -> None:
             print(
                 "\n>>> The simulation is started in Command Line Interface Mode (no visual feedback) <<<"
             )
-            loop.run_until_complete(async_main(loop, room1, COMMAND_MODE, SCRIPT_PATH))
+            loop.run_until_complete(
+                async_main(loop, room1, COMMAND_MODE, SCRIPT_PATH, BUS_MODE)
+            )
         except (KeyboardInterrupt, SystemExit):
             loop.run_until_complete(kill_tasks())
         finally:
             loop.run_until_complete(kill_tasks())
             loop.close()
+            room1.close()
             logging.info("Simulation Terminated.")
             print("\nThe simulation program has been ended.")
             sys.exit(1)
 
 
+def run_headless(
+    room: Room,
+    hours: float,
+    simulated_dt: float,
+    command_mode: str,
+    script_path: str,
+    bus_mode: str,
+    event_driven: bool,
+) -> None:
+    """Simulate the room headless for hours simulated hours, and/or run the script in script command mode, and print the run report."""
+    runner = tools.HeadlessRunner(room, simulated_dt, bus_mode, event_driven)
+    print(
+        "\n>>> The simulation is started in Headless Mode (fast-forward, no visual feedback) <<<"
+    )
+    if command_mode == ct.SCRIPT_MODE:
+        success, script_parser, report = runner.run_script(script_path, hours)
+        print(("Successful" if success else "Failed") + " script recap:")
+        pp.pprint(script_parser.stored_values)
+        pp.pprint(script_parser.assertions)
+    else:
+        report = runner.run(hours)
+    print(format_report(report))
+    print("\nThe simulation program has been ended.")
+
+
 async def user_input_loop(room: Room) -> None:
     """Asyncio loop to await user command from terminal"""
     while True:
@@ -159,12 +239,18 @@ async def kill_tasks() -> None:
         return None
 
 
-async def async_main(loop, room: Room, command_mode: str, script_path: str) -> None:
+async def async_main(
+    loop, room: Room, command_mode: str, script_path: str, bus_mode: str = ct.SYNC_BUS_MODE
+) -> None:
     """Manager function of asyncio tasks
 
     loop : asyncio get event loop
+    bus_mode : sync or queued delivery of telegrams on the KNX Bus
     """
     tasks = []
+    if bus_mode == ct.QUEUED_BUS_MODE:
+        print(">>>>>> The KNX Bus is set to QUEUED mode (asyncio dispatcher)")
+        room.knxbus.start_dispatcher(room.world.time.simulation_time)
     if command_mode == ct.CLI_COM_MODE:
         print(">>>>>> The Command mode is set to CLI (commands through terminal)")
         ui_task = loop.create_task(user_input_loop(room))
@@ -176,6 +262,7 @@ async def async_main(loop, room: Room, command_mode: str, script_path: str) -> N
         script_task = loop.create_task(simulator_script_loop(room, script_path))
         tasks.append(script_task)
     await asyncio.wait(tasks)
+    await room.knxbus.stop_dispatcher()
 
 
 if __name__ == "__main__":
@@ -20,10 +20,14 @@ from xknx.io.knxip_interface import *
 from xknx.io.request_response import *
 from xknx.knxip import TunnellingRequest
 
+from system.tracing import trace_point
+
 
 sys.path.append(".")
 sys.path.append("..")
 
+TRACE_SVSHI_RECEIVE = trace_point("svshi.receive")
+
 
 class Interface:
     def __init__(self, room, telegram_logging: bool, testing=False) -> None:
@@ -108,10 +112,8 @@ class Interface:
         return bytes(frame.to_knx())
 
     # RECEIVING TELEGRAMS
-    def __receiving_telegrams(
-        self, frame: KNXIPFrame, data: bytes, addr: Any, knxbus=None
-    ) -> None:
-        """Receives telegrams and forwards them to the system"""
+    def __receiving_telegrams(self, frame: KNXIPFrame, data: bytes, addr: Any):
+        """Receives a telegram and returns it as a simulator telegram to be forwarded to the system, None if not a telegram"""
 
         frame.from_knx(data)
 
@@ -122,7 +124,8 @@ class Interface:
             sim_telegram: sim_t.Telegram = self.__telegram_parser.from_knx_telegram(
                 telegram
             )
-            print("Received a telegram :\n", sim_telegram)
+            if TRACE_SVSHI_RECEIVE.enabled:
+                TRACE_SVSHI_RECEIVE.emit(telegram=str(sim_telegram), frame=str(telegram))
             if self.__telegram_logging:
                 with open(self.room.telegram_logging_file_path, "a+") as log_file:
                     if (
@@ -134,8 +137,8 @@ class Interface:
                     log_file.write(f"\nSVSHI -> Simulator: {telegram}")
 
             if sim_telegram is not None:
-                knxbus.transmit_telegram(sim_telegram)
                 self.__sock.sendto(self.__create_ack_data(frame), addr)
+            return sim_telegram
 
         elif isinstance(frame.body, ConnectionStateRequest):
             frame.init(KNXIPServiceType.CONNECTIONSTATE_RESPONSE)
@@ -201,11 +204,21 @@ class Interface:
                 rlist, _, _ = select.select([self.__sock, self.__rsock], [], [])
                 for ready_socket in rlist:
                     if ready_socket is self.__sock:
+                        # Ready socket is sock, we receive telegrams from SVSHI,
+                        # all telegrams already arrived are forwarded to the bus in a single batch
+                        sim_telegrams = []
                         data = self.__sock.recv(1024)
-                        # Ready socket is sock, we receive telegrams from SVSHI
+                        while data != b"\x11":
+                            sim_telegram = self.__receiving_telegrams(frame, data, addr)
+                            if sim_telegram is not None:
+                                sim_telegrams.append(sim_telegram)
+                            try:
+                                data = self.__sock.recv(1024, socket.MSG_DONTWAIT)
+                            except BlockingIOError:
+                                break
+                        self.room.knxbus.transmit_batch(sim_telegrams)
                         if data == b"\x11":
                             break
-                        self.__receiving_telegrams(frame, data, addr, self.room.knxbus)
                     else:
                         # Ready_socket is rsock, we need to send to SVSHI
                         signal = self.__rsock.recv(1)  # Dump the ready mark
@@ -6,7 +6,7 @@ import sys
 from typing import Dict, Final, Union
 
 from xknx.dpt.dpt import DPTArray, DPTBinary, DPTNumeric
-from xknx.telegram.apci import GroupValueWrite
+from xknx.telegram.apci import GroupValueRead, GroupValueResponse, GroupValueWrite
 from xknx.telegram.telegram import Telegram
 from xknx.telegram.address import GroupAddress, IndividualAddress, GroupAddressType
 from xknx.dpt.dpt_4byte_float import DPT4ByteFloat
@@ -45,6 +45,10 @@ class TelegramParser:
             "2-levels": self.__SHORT,
             "3-levels": self.__LONG,
         }
+        self.__xknx_to_sim_encoding: Final = {
+            xknx_encoding: sim_encoding
+            for sim_encoding, xknx_encoding in self.__sim_encoding_to_xknx.items()
+        }
 
     def from_knx_telegram(self, telegram: Telegram) -> Union[sim_t.Telegram, None]:
         """Creates a simulator telegram from a knx telegram if possible"""
@@ -52,28 +56,26 @@ class TelegramParser:
 
         payload = telegram.payload
 
-        ga_split = str(telegram.destination_address).split("/")
-
-        if telegram.destination_address.levels == self.__sim_encoding_to_xknx.get(
-            "free"
-        ):
-            address = GroupAddress("free", ga_split[0])
-        elif telegram.destination_address.levels == self.__sim_encoding_to_xknx.get(
-            "2-levels"
-        ):
-            address = GroupAddress("2-levels", ga_split[0], sub=ga_split[1])
-        else:
-            address = GroupAddress("3-levels", ga_split[0], ga_split[1], ga_split[2])
-
-        source = IndividualAddress(
-            telegram.source_address.area,
-            telegram.source_address.main,
-            telegram.source_address.line,
+        # Interned simulator addresses are directly retrieved from the raw KNX addresses
+        address = GroupAddress.from_raw(
+            self.__xknx_to_sim_encoding.get(
+                telegram.destination_address.levels, "3-levels"
+            ),
+            telegram.destination_address.raw,
         )
+        source = IndividualAddress.from_raw(telegram.source_address.raw)
         output = None
 
-        if isinstance(payload, GroupValueWrite):
-            # For the moment, similarly to SVSHI, we only support GroupValueWrtie as there is no reading involved
+        if isinstance(payload, GroupValueRead):
+            # Reads carry no value, they are answered by the bus with a GroupValueResponse
+            return sim_t.Telegram(source, address, None, sim_t.GROUP_VALUE_READ)
+
+        if isinstance(payload, (GroupValueWrite, GroupValueResponse)):
+            apci = (
+                sim_t.GROUP_VALUE_RESPONSE
+                if isinstance(payload, GroupValueResponse)
+                else sim_t.GROUP_VALUE_WRITE
+            )
             v = payload.value
 
             if v:
@@ -89,7 +91,7 @@ class TelegramParser:
                     payload = self.group_address_to_payload.get(
                         str(address), sim_t.BinaryPayload
                     )(binary_state=True if v.value == self.__TRUE else False)
-                    output = sim_t.Telegram(source, address, payload)
+                    output = sim_t.Telegram(source, address, payload, apci)
 
                 elif dpt == DPTArray:
 
@@ -99,17 +101,26 @@ class TelegramParser:
                     payload = self.group_address_to_payload.get(
                         str(address), sim_t.BinaryPayload
                     )(conv_v)
-                    output = sim_t.Telegram(source, address, payload)
+                    output = sim_t.Telegram(source, address, payload, apci)
         return output
 
     def from_simulator_telegram(
         self, telegram: sim_t.Telegram
     ) -> Union[Telegram, None]:
         """Creates a knx telegram from a simulator telegram, if possible"""
-        address = str(telegram.destination)
         payload = telegram.payload
 
         encoding = telegram.destination.encoding_style
+        ga = GroupAddress(
+            telegram.destination.raw,
+            levels=self.__sim_encoding_to_xknx.get(encoding),
+        )
+        if telegram.apci == sim_t.GROUP_VALUE_READ:
+            return Telegram(
+                source_address=IndividualAddress(telegram.source.raw),
+                destination_address=ga,
+                payload=GroupValueRead(),
+            )
 
         dpt = None
         value = None
@@ -132,15 +143,16 @@ class TelegramParser:
                 write_content = DPTBinary(value=binary_value)
             else:
                 write_content = DPTArray(value)
-            ga = GroupAddress(address)
-            ga.levels = self.__sim_encoding_to_xknx.get(encoding)
 
+            apci_class = (
+                GroupValueResponse
+                if telegram.apci == sim_t.GROUP_VALUE_RESPONSE
+                else GroupValueWrite
+            )
             newTelegram = Telegram(
-                source_address=IndividualAddress(
-                    f"{telegram.source.area}.{telegram.source.line}.{telegram.source.device}"
-                ),
+                source_address=IndividualAddress(telegram.source.raw),
                 destination_address=ga,
-                payload=GroupValueWrite(write_content),
+                payload=apci_class(write_content),
             )
             return newTelegram
         else:
@@ -5,5 +5,19 @@ system_tools gather also usefull classes for system cnfiguration: Location, Indi
 
 from .room import Room, InRoomDevice
 from .knxbus import KNXBus, GroupAddressBus
+from .topology import LineSegment, Coupler, GroupAddressFilter
+from .circuit_breaker import CircuitBreaker
+from .subscriptions import Subscription, TelegramLogger
+from .tracing import (
+    Tracer,
+    TracePoint,
+    ConsoleSink,
+    FileSink,
+    MemorySink,
+    TRACER,
+    trace_point,
+    enable_tracing,
+    disable_tracing,
+)
 from .telegrams import Telegram, Payload, BinaryPayload, FloatPayload
 from .system_tools import Location, IndividualAddress, GroupAddress, Window
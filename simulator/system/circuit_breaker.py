@@ -0,0 +1,175 @@
+"""
+Class definitions of the failure accounting of the KNX Bus subscribers:
+a circuit breaker quarantines the devices failing too often when receiving telegrams.
+"""
+
+import logging
+import traceback
+from typing import Dict, List, Union
+
+DEFAULT_MAX_FAILURES = 5
+DEFAULT_FAILURE_WINDOW = 10  # ticks
+DEFAULT_QUARANTINE_TICKS = 60
+
+
+class FaultRecord:
+    """Failure counters of a device receiving telegrams from the bus"""
+
+    __slots__ = (
+        "device",
+        "failures",
+        "window_failures",
+        "window_start",
+        "quarantines",
+        "released_at",
+        "first_traceback",
+        "last_error",
+    )
+
+    def __init__(self, device) -> None:
+        """
+        Initialization of the failure counters of a device.
+
+        failures : total number of failures, window_failures : number of failures since window_start tick,
+        quarantines : number of times the device was quarantined, released_at : tick of the end of the current quarantine (None if not quarantined),
+        first_traceback : full traceback of the first failure, last_error : short representation of the last exception.
+        """
+        self.device = device
+        self.failures = 0
+        self.window_failures = 0
+        self.window_start = 0
+        self.quarantines = 0
+        self.released_at: Union[int, None] = None
+        self.first_traceback: Union[str, None] = None
+        self.last_error: Union[str, None] = None
+
+    def get_info(self) -> Dict[str, Union[str, int, bool]]:
+        """Return the failure counters, method called via CLI commmand 'getinfo bus'"""
+        return {
+            "failures": self.failures,
+            "quarantined": self.released_at is not None,
+            "quarantines": self.quarantines,
+            "released at tick": self.released_at,
+            "last error": self.last_error,
+        }
+
+
+class CircuitBreaker:
+    """
+    Class to count the failures of the devices receiving telegrams from the bus.
+    A device failing max_failures times within failure_window ticks is quarantined for quarantine_ticks ticks:
+    the bus does not deliver it telegrams until it is released.
+    """
+
+    CONFIG_KEYS = ("max_failures", "failure_window", "quarantine_ticks")
+
+    def __init__(
+        self,
+        max_failures: int = DEFAULT_MAX_FAILURES,
+        failure_window: int = DEFAULT_FAILURE_WINDOW,
+        quarantine_ticks: int = DEFAULT_QUARANTINE_TICKS,
+    ) -> None:
+        """
+        Initialization of a circuit breaker, durations are in bus ticks (one tick per world update).
+
+        __records : failure counters of the devices that failed at least once, keyed by device id,
+        __next_release : earliest tick at which a quarantined device is released (None if no quarantine).
+        """
+        self.max_failures = max_failures
+        self.failure_window = failure_window
+        self.quarantine_ticks = quarantine_ticks
+        self.ticks = 0
+        self.__records: Dict[int, FaultRecord] = {}
+        self.__next_release: Union[int, None] = None
+
+    @classmethod
+    def from_config(cls, breaker_config: Dict) -> "CircuitBreaker":
+        """Create a circuit breaker from its dict representation in a JSON configuration file, default breaker if incorrect."""
+        unknown_keys = [key for key in breaker_config if key not in cls.CONFIG_KEYS]
+        if unknown_keys:
+            logging.warning(
+                f"The fault quarantine keys {unknown_keys} are not supported, expected keys in {list(cls.CONFIG_KEYS)}."
+            )
+        try:
+            max_failures = int(breaker_config.get("max_failures", DEFAULT_MAX_FAILURES))
+            failure_window = int(
+                breaker_config.get("failure_window", DEFAULT_FAILURE_WINDOW)
+            )
+            quarantine_ticks = int(
+                breaker_config.get("quarantine_ticks", DEFAULT_QUARANTINE_TICKS)
+            )
+            assert max_failures > 0 and failure_window > 0 and quarantine_ticks >= 0
+        except (AssertionError, TypeError, ValueError):
+            logging.warning(
+                f"The fault quarantine {breaker_config} is incorrect: max_failures and failure_window should be positive integers, quarantine_ticks a non-negative integer ==> default quarantine is used."
+            )
+            return cls()
+        return cls(max_failures, failure_window, quarantine_ticks)
+
+    def is_quarantined(self, device) -> bool:
+        record = self.__records.get(id(device))
+        return record is not None and record.released_at is not None
+
+    def record_failure(self, device, exception: BaseException) -> bool:
+        """
+        Count a failure of device, return True if the device is quarantined because of this failure.
+        The full traceback is only formatted for the first failure of the device.
+
+        exception : exception raised by the device, must be called from the except block.
+        """
+        record = self.__records.get(id(device))
+        if record is None:
+            record = self.__records[id(device)] = FaultRecord(device)
+            record.first_traceback = traceback.format_exc()
+            logging.warning(
+                f"[KNXBus] - The device {device.name} failed to receive a telegram, next failures are only counted: \n{record.first_traceback}"
+            )
+        record.failures += 1
+        record.last_error = f"{type(exception).__name__}: {exception}"
+        if self.ticks - record.window_start >= self.failure_window:
+            record.window_start = self.ticks
+            record.window_failures = 0
+        record.window_failures += 1
+        if record.window_failures < self.max_failures or record.released_at is not None:
+            return False
+        record.released_at = self.ticks + self.quarantine_ticks
+        record.quarantines += 1
+        record.window_failures = 0
+        if self.__next_release is None or record.released_at < self.__next_release:
+            self.__next_release = record.released_at
+        logging.warning(
+            f"[KNXBus] - The device {device.name} failed {self.max_failures} times in {self.failure_window} ticks and is quarantined for {self.quarantine_ticks} ticks."
+        )
+        return True
+
+    def tick(self, ticks: int = 1) -> List[object]:
+        """Advance the breaker clock of one tick (or more), return the devices released from quarantine."""
+        self.ticks += ticks
+        if self.__next_release is None or self.ticks < self.__next_release:
+            return []
+        released = []
+        next_release = None
+        for record in self.__records.values():
+            if record.released_at is None:
+                continue
+            if record.released_at <= self.ticks:
+                record.window_start = record.released_at
+                record.released_at = None
+                released.append(record.device)
+                logging.info(f"[KNXBus] - The device {record.device.name} is released from quarantine.")
+            elif next_release is None or record.released_at < next_release:
+                next_release = record.released_at
+        self.__next_release = next_release
+        return released
+
+    def get_info(self) -> Dict[str, Union[int, Dict]]:
+        """Return the breaker configuration and the failure counters of the devices, method called via CLI commmand 'getinfo bus'"""
+        return {
+            "max failures": self.max_failures,
+            "failure window": self.failure_window,
+            "quarantine ticks": self.quarantine_ticks,
+            "devices": {
+                record.device.name: record.get_info()
+                for record in self.__records.values()
+            },
+        }
@@ -3,31 +3,96 @@ Class definitions to implement the KNX Bus object representation and emulate the
 The GroupAddressBus class gather all devices assigned to a particular group address.
 """
 
+import asyncio
+import contextlib
+import heapq
+import itertools
 import logging
-import sys
-import traceback
-from typing import List, Dict, Union
+import threading
+from typing import Callable, List, Dict, Set, Tuple, Union
 
 from system.system_tools import GroupAddress
-from system.telegrams import Telegram
+from system.telegrams import (
+    Telegram,
+    Payload,
+    BinaryPayload,
+    DimmerPayload,
+    FloatPayload,
+    GROUP_VALUE_READ,
+    GROUP_VALUE_RESPONSE,
+)
+from system.telegram_history import TelegramHistory, DEFAULT_HISTORY_SIZE
+from system.topology import LineSegment, line_key, GroupAddressFilter
+from system.circuit_breaker import CircuitBreaker
+from system.subscriptions import Subscription, parse_group_address_pattern
+from system.tracing import trace_point
+
+TRACE_ATTACH = trace_point("bus.attach")
+TRACE_DETACH = trace_point("bus.detach")
+TRACE_READ_UNANSWERED = trace_point("bus.read.unanswered")
 
 
 class KNXBus:
     """
     Class to represent the KNX Bus.
     Manage the transmission of telegrams over the KNX Bus, between Devices.
+    Every telegram transmitted is recorded in the bus history (see TelegramHistory).
+    The bus is divided in line segments according to the individual addresses of the devices (area.line.device),
+    joined by line and area couplers (see topology module): a telegram only reaches the lines with devices assigned to its destination,
+    and only leaves its source line if the line coupler's filter table contains its destination.
+    Failures of the devices receiving telegrams are counted by a circuit breaker (see CircuitBreaker),
+    devices failing too often are quarantined: they are removed from the delivery plans until released.
+    Taps (IP interface, telegram logging, monitors) subscribe to all traffic or to a range of group addresses (see subscribe()),
+    they are matched with a bitmap of the subscribed group addresses instead of being attached to each group address.
+    The last GroupValueWrite or GroupValueResponse of each group address is cached, GroupValueRead telegrams are answered
+    from this cache, or by a readable device assigned to the group address if not in cache (see __serve_read()).
+    By default telegrams are delivered synchronously, on the stack of the sender.
+    In queued mode (see start_dispatcher()), telegrams are stored in a priority queue keyed by their simulated delivery time,
+    and delivered in batches by an asyncio dispatcher task.
     """
 
-    def __init__(self) -> None:  # , svshi_mode: bool
+    def __init__(
+        self, history_size: int = DEFAULT_HISTORY_SIZE
+    ) -> None:  # , svshi_mode: bool
         """
         Initialization of the KNX Bus object.
 
-        group_addresses : list of group addresses defined in the system
-        __ga_buses : list of GroupAddressBus objects, 
-        containing list of devices assigned to a particular group address"""
+        __ga_buses : routing table of GroupAddressBus objects, keyed by the raw 16-bit value of their group address,
+        containing list of devices assigned to a particular group address,
+        history : ring buffer of the last history_size telegrams transmitted on the bus,
+        __lines : line segments keyed by (area << 4 | line), __areas : main lines of the areas keyed by area,
+        backbone_load : number of telegrams transmitted between areas,
+        __quarantined : ids of the devices quarantined by the circuit breaker, shared with the GroupAddressBus objects,
+        __subscriptions : taps subscribed to the bus traffic, __tap_filter : union of the subscriptions' bitmaps,
+        __taps : cache of the subscriptions matching each raw group address, cleared when the subscriptions change,
+        __last_values : last GroupValueWrite/Response telegram of each raw group address, answering the GroupValueRead telegrams,
+        read_stats : number of reads answered from the cache, by a device, and unanswered"""
         self.name = "KNX Bus"
-        self.group_addresses = []
-        self.__ga_buses: List[GroupAddressBus] = []
+        self.__ga_buses: Dict[int, GroupAddressBus] = {}
+        self.history = TelegramHistory(history_size)
+        self.__lines: Dict[int, LineSegment] = {}
+        self.__areas: Dict[int, LineSegment] = {}
+        self.backbone_load = 0
+        self.__quarantined: Set[int] = set()
+        self.__breaker = CircuitBreaker()
+        self.__subscriptions: List[Subscription] = []
+        self.__tap_filter = GroupAddressFilter()
+        self.__taps: Dict[int, Tuple[Subscription, ...]] = {}
+        self.__last_values: Dict[int, Telegram] = {}
+        self.read_stats = {"cache": 0, "device": 0, "unanswered": 0}
+        self.__simulation_time: Callable[[], float] = lambda: 0
+        # Queued mode: heap of (delivery simulated time, sequence number, telegram)
+        self.__telegram_queue: List[Tuple[float, int, Telegram]] = []
+        self.__queue_counter = itertools.count()
+        self.__dispatcher_task: asyncio.Task = None
+        # Telegrams held back while a batch is open (see batch()), only those transmitted by the thread that opened it
+        self.__pending_batch: List[Telegram] = None
+        self.__batch_thread_id: int = None
+
+    @property
+    def group_addresses(self) -> List[GroupAddress]:
+        """List of group addresses defined in the system"""
+        return [ga_bus.group_address for ga_bus in self.__ga_buses.values()]
 
     def attach(
         self, device, group_address: GroupAddress
@@ -35,40 +100,46 @@ class KNXBus:
         """
         Assign a device to a group address, and connect it to the bus.
         The KNX Bus object can then call the correct devices' method 
-        when a telegram arrive with corresponding destination address:
-        (e.g. actuator.update_state() in transmit_telegram())
+        when a telegram arrive with corresponding destination address,
+        through the delivery plans of the GroupAddressBus compiled when attaching the device.
         If it is a new group address, creation of a GroupAddressBus object,
         if it is a new device on existing group address, addition of the device to the GroupAddressBus object.
 
         device : Device, not InRoomDevice
         """
         if group_address in device.group_addresses:
-            logging.info(
-                f"{device.name} is already connected to the KNX Bus through {group_address.name}."
-            )
-        else:
-            if group_address not in self.group_addresses:
-                logging.info(
-                    f"Creation of a ga_bus ({group_address.name}) for {device.name}."
+            if TRACE_ATTACH.enabled:
+                TRACE_ATTACH.emit(
+                    device=device.name, group_address=group_address.name, ga_bus="connected"
                 )
-                self.group_addresses.append(group_address)
-                ga_bus = GroupAddressBus(group_address)
+        else:
+            ga_bus = self.__ga_buses.get(group_address.raw)
+            if ga_bus is None:
+                if TRACE_ATTACH.enabled:
+                    TRACE_ATTACH.emit(
+                        device=device.name, group_address=group_address.name, ga_bus="created"
+                    )
+                ga_bus = GroupAddressBus(group_address, self.__quarantined)
                 ga_bus.add_device(device)
-                self.__ga_buses.append(ga_bus)
+                self.__ga_buses[group_address.raw] = ga_bus
             else:
-                for ga_bus in self.__ga_buses:
-                    if ga_bus.group_address == group_address:
-                        logging.info(
-                            f"{device.name} is added to the ga_bus ({group_address.name})."
-                        )
-                        ga_bus.add_device(device)
+                if TRACE_ATTACH.enabled:
+                    TRACE_ATTACH.emit(
+                        device=device.name, group_address=group_address.name, ga_bus="added"
+                    )
+                ga_bus.add_device(device)
+            # Update the filter tables of the couplers above the device
+            key = line_key(device.individual_addr) or 0
+            if self.__line_segment(key).coupler.add_group_address(group_address.raw):
+                self.__areas[key >> 4].coupler.add_group_address(group_address.raw)
 
     def detach(
         self, device, group_address: GroupAddress
     ) -> None:  # device : Device, not InRoomDevice
         """Remove devices from KNX Bus object, from GroupAddressBus objects, 
         and delete group adrress from device' group addresses list."""
-        if group_address not in self.group_addresses:
+        ga_bus = self.__ga_buses.get(group_address.raw)
+        if ga_bus is None:
             logging.warning(
                 f"The group address '{group_address.name}' is not linked to any device, thus device {device.name} cannot be detached from it"
             )
@@ -77,44 +148,503 @@ class KNXBus:
                 f"The group address '{group_address.name}' is not linked to {device.name}, that thus cannot be detached from it."
             )
         else:
-            for ga_bus in self.__ga_buses:
-                if ga_bus.group_address == group_address:
-                    if not ga_bus.detach_device(
-                        device
-                    ):  # return number of devices linked to this ga_bus after removal of device, if none, we delete the ga bus
-                        self.__ga_buses.remove(ga_bus)
-                        self.group_addresses.remove(group_address)
-                        logging.info(
-                            f"The ga_bus ({group_address.name}) is deleted as no devices are connected to it."
-                        )
-
-    def transmit_telegram(self, telegram: Telegram) -> None:
+            key = line_key(device.individual_addr) or 0
+            if self.__lines[key].coupler.remove_group_address(group_address.raw):
+                self.__areas[key >> 4].coupler.remove_group_address(group_address.raw)
+            if not ga_bus.detach_device(
+                device
+            ):  # return number of devices linked to this ga_bus after removal of device, if none, we delete the ga bus
+                del self.__ga_buses[group_address.raw]
+                if TRACE_DETACH.enabled:
+                    TRACE_DETACH.emit(
+                        device=device.name, group_address=group_address.name, ga_bus="deleted"
+                    )
+            elif TRACE_DETACH.enabled:
+                TRACE_DETACH.emit(
+                    device=device.name, group_address=group_address.name, ga_bus="removed"
+                )
+
+    @property
+    def subscriptions(self) -> List[Subscription]:
+        return list(self.__subscriptions)
+
+    def subscribe(
+        self, callback: Callable[[Telegram], None], pattern: str = "*", name: str = None
+    ) -> Union[Subscription, None]:
+        """
+        Subscribe a tap to the telegrams sent to the group addresses matching pattern,
+        the callback is called after the delivery to the actuators. Return the subscription, None if the pattern is incorrect.
+
+        pattern : '*' for all traffic, a raw range (e.g. '0-4095') or a group address with wildcards/ranges (e.g. '1/*/*', '2/0-3/*'),
+        name : name of the tap in 'getinfo bus', the callback's name by default.
+        """
+        filter_table = parse_group_address_pattern(pattern)
+        if filter_table is None:
+            logging.warning(
+                f"The subscription pattern '{pattern}' is incorrect, expected '*', a raw range 'n-m' or a group address with '*' or ranges 'n-m' as levels (e.g. '1/*/*')."
+            )
+            return None
+        if name is None:
+            name = getattr(callback, "__name__", type(callback).__name__)
+        subscription = Subscription(name, pattern, callback, filter_table)
+        self.__subscriptions.append(subscription)
+        self.__tap_filter.update(filter_table)
+        self.__taps = {}
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> bool:
+        """Remove a subscription from the bus, return False if it was not subscribed."""
+        try:
+            self.__subscriptions.remove(subscription)
+        except ValueError:
+            logging.warning(f"The tap {subscription.name} is not subscribed to the bus.")
+            return False
+        self.__tap_filter = GroupAddressFilter()
+        for other in self.__subscriptions:
+            self.__tap_filter.update(other.filter_table)
+        self.__taps = {}
+        return True
+
+    def __notify_taps(self, telegram: Telegram) -> None:
+        """Call the callbacks of the subscriptions matching the destination of telegram"""
+        raw = telegram.destination.raw
+        taps = self.__taps.get(raw)
+        if taps is None:
+            taps = self.__taps[raw] = tuple(
+                subscription
+                for subscription in self.__subscriptions
+                if raw in subscription.filter_table
+                and id(subscription) not in self.__quarantined
+            )
+        for subscription in taps:
+            subscription.received += 1
+            try:
+                subscription.callback(telegram)
+            except Exception as exc:
+                if self.__breaker.record_failure(subscription, exc):
+                    self.__update_quarantine(subscription, True)
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        """Circuit breaker counting the failures of the devices receiving telegrams"""
+        return self.__breaker
+
+    @breaker.setter
+    def breaker(self, breaker: CircuitBreaker) -> None:
+        """Replace the circuit breaker, the devices quarantined by the previous one are released"""
+        self.__breaker = breaker
+        if self.__quarantined:
+            self.__quarantined.clear()
+            self.__taps = {}
+            for ga_bus in self.__ga_buses.values():
+                ga_bus.compile_delivery_plans()
+
+    def __update_quarantine(self, device, quarantined: bool) -> None:
+        """Add or remove a device from the quarantined devices, and recompile the delivery plans it belongs to"""
+        if quarantined:
+            self.__quarantined.add(id(device))
+        else:
+            self.__quarantined.discard(id(device))
+        if isinstance(device, Subscription):
+            self.__taps = {}
+            return
+        for ga_bus in self.__ga_buses.values():
+            if device in ga_bus.actuators:
+                ga_bus.compile_delivery_plans()
+
+    def __line_segment(self, key: int) -> LineSegment:
+        """Return the line segment of key (area << 4 | line), created with its area main line if new."""
+        line = self.__lines.get(key)
+        if line is None:
+            area, line_number = key >> 4, key & 0xF
+            line = self.__lines[key] = LineSegment(
+                f"line {area}.{line_number}", "line coupler"
+            )
+            if area not in self.__areas:
+                self.__areas[area] = LineSegment(f"area {area}", "area coupler")
+        return line
+
+    def set_simulation_time(self, simulation_time: Callable[[], float]) -> None:
+        """
+        Set the clock of the bus, used to timestamp the telegrams in the history and to schedule them in queued mode.
+
+        simulation_time : function returning the current simulated time in seconds (e.g. Time.simulation_time).
+        """
+        # simulation_time() returns None if the World Time is not initialized
+        self.__simulation_time = lambda: simulation_time() or 0
+
+    def simulation_time(self) -> float:
+        """Return the current simulated time of the bus clock, in seconds"""
+        return self.__simulation_time()
+
+    def transmit_telegram(self, telegram: Telegram, delay: float = 0) -> None:
         """
         Transmit a telegram on the bus to other devicdes assigned to the destination address.
         Method called when Device.send_telegram() is called or when svshi interface receives a telegram from svshi.
+        In queued mode, the telegram is only scheduled for delivery and the method returns immediately.
+
+        delay : simulated seconds before delivery of the telegram, only considered in queued mode.
+        """
+        pending_batch = self.__pending_batch
+        if (
+            pending_batch is not None
+            and threading.get_ident() == self.__batch_thread_id
+        ):
+            pending_batch.append(telegram)
+        elif self.__dispatcher_task is None:
+            self.__deliver(telegram)
+        elif threading.get_ident() != self.__loop_thread_id:  # e.g. svshi receiving thread
+            delivery_time = self.__simulation_time() + delay
+            self.__loop.call_soon_threadsafe(self.__schedule, delivery_time, telegram)
+        else:
+            self.__schedule(self.__simulation_time() + delay, telegram)
+
+    def transmit_batch(self, telegrams: List[Telegram], delay: float = 0) -> None:
+        """
+        Transmit several telegrams on the bus at once, e.g. a device sending on all its group addresses,
+        or all the sensors broadcasting their state at a world update.
+        Telegrams are grouped by destination address, so that the GroupAddressBus of each destination is resolved once per batch,
+        telegrams to the same destination are delivered in the order of the batch.
+
+        delay : simulated seconds before delivery of the telegrams, only considered in queued mode.
+        """
+        if not telegrams:
+            return
+        pending_batch = self.__pending_batch
+        if (
+            pending_batch is not None
+            and threading.get_ident() == self.__batch_thread_id
+        ):
+            pending_batch.extend(telegrams)
+        elif self.__dispatcher_task is None:
+            destinations: Dict[int, List[Telegram]] = {}
+            for telegram in telegrams:
+                destinations.setdefault(telegram.destination.raw, []).append(telegram)
+            now = self.__simulation_time()
+            record = self.history.record
+            for raw, ga_telegrams in destinations.items():
+                ga_bus = self.__ga_buses.get(raw)
+                tapped = raw in self.__tap_filter
+                for telegram in ga_telegrams:
+                    record(telegram, now)
+                    self.__route(ga_bus, telegram, tapped)
+        elif threading.get_ident() != self.__loop_thread_id:  # e.g. svshi receiving thread
+            delivery_time = self.__simulation_time() + delay
+            self.__loop.call_soon_threadsafe(
+                self.__schedule_batch, delivery_time, telegrams
+            )
+        else:
+            self.__schedule_batch(self.__simulation_time() + delay, telegrams)
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Context manager holding back the telegrams transmitted inside it,
+        and transmitting them in a single transmit_batch() call when exiting.
+        Used by Room.update_world() to gather the sensors' broadcasts of a world update.
+        The telegrams of other threads (e.g. svshi receiving thread) are not held back, they are transmitted immediately.
+        """
+        if (
+            self.__pending_batch is not None
+        ):  # nested batch (the outer one transmits), or batch of another thread
+            yield
+            return
+        self.__batch_thread_id = threading.get_ident()
+        self.__pending_batch = []
+        try:
+            yield
+        finally:
+            telegrams, self.__pending_batch = self.__pending_batch, None
+            self.__batch_thread_id = None
+            self.transmit_batch(telegrams)
+
+    def __deliver(self, telegram: Telegram) -> None:
+        """
+        Deliver a telegram to the actuators assigned to its destination address.
+        The destination GroupAddressBus is found in O(1) with the raw value of the destination address.
+        """
+        self.history.record(telegram, self.__simulation_time())
+        raw = telegram.destination.raw
+        self.__route(self.__ga_buses.get(raw), telegram, raw in self.__tap_filter)
+
+    def __route(
+        self, ga_bus: Union["GroupAddressBus", None], telegram: Telegram, tapped: bool
+    ) -> None:
+        """
+        Route a telegram according to its service: writes are delivered to the actuators then to the taps,
+        responses only to the taps, reads are shown to the taps then answered by the bus.
+        Writes and responses update the last value of the group address.
+
+        tapped : True if a subscription matches the destination of the telegram.
         """
-        for ga_bus in self.__ga_buses:
-            if telegram.destination == ga_bus.group_address:
-                # Only actuators for now, but sensors and functional module could also receive telegrams to read state fro instance.
-                for actuator in ga_bus.actuators:
-                    try:
-                        actuator.update_state(telegram)
-                    except AttributeError:
-                        logging.warning(
-                            f"The actuator {actuator.name} or the telegram created is missing an Attribute."
-                        )
-                    except:
-                        exc = sys.exc_info()[0]
-                        trace = traceback.format_exc()
-                        logging.warning(
-                            f"[KNXBus.transmit_telegram()] - Transmission of the telegram from source '{telegram.source}' failed: {exc} with trace \n{trace}."
-                        )
+        apci = telegram.apci
+        if apci == GROUP_VALUE_READ:
+            if tapped:
+                self.__notify_taps(telegram)
+            self.__serve_read(ga_bus, telegram)
+            return
+        self.__last_values[telegram.destination.raw] = telegram
+        if apci != GROUP_VALUE_RESPONSE:
+            self.__execute_plan(ga_bus, telegram)
+        if tapped:
+            self.__notify_taps(telegram)
+
+    def __serve_read(
+        self, ga_bus: Union["GroupAddressBus", None], telegram: Telegram
+    ) -> None:
+        """
+        Answer a GroupValueRead with a GroupValueResponse transmitted on the bus,
+        with the last value written to the group address, or if not in cache, with the value of the first readable device assigned to it.
+        """
+        destination = telegram.destination
+        last_telegram = self.__last_values.get(destination.raw)
+        if last_telegram is not None:
+            self.read_stats["cache"] += 1
+            source, payload = last_telegram.source, last_telegram.payload
+        else:
+            source, payload = None, None
+            if ga_bus is not None:
+                for device in ga_bus.readable_devices():
+                    payload = device.read_value()
+                    if payload is not None:
+                        source = device.individual_addr
+                        break
+            if payload is None:
+                self.read_stats["unanswered"] += 1
+                if TRACE_READ_UNANSWERED.enabled:
+                    TRACE_READ_UNANSWERED.emit(
+                        source=str(telegram.source), group_address=destination.name
+                    )
+                return
+            self.read_stats["device"] += 1
+        self.transmit_telegram(
+            Telegram(source, destination, payload, GROUP_VALUE_RESPONSE)
+        )
+
+    def last_value(self, group_address: GroupAddress) -> Union[Payload, None]:
+        """Return the payload of the last GroupValueWrite/Response sent to group_address, None if nothing was sent"""
+        last_telegram = self.__last_values.get(group_address.raw)
+        return None if last_telegram is None else last_telegram.payload
+
+    def __execute_plan(
+        self, ga_bus: Union["GroupAddressBus", None], telegram: Telegram
+    ) -> None:
+        """
+        Call the payload handlers of the delivery plan of ga_bus for the payload class of the telegram, line by line:
+        the handlers of other lines than the source line are only called if the source line coupler forwards the telegram.
+        A failing actuator does not prevent the delivery to the others.
+        """
+        source_key = line_key(telegram.source)
+        source_line = self.__lines.get(source_key)
+        if source_line is None:  # source outside the topology (e.g. SVSHI), injected on the backbone
+            forward = True
+        else:
+            source_line.load += 1
+            forward = telegram.destination.raw in source_line.coupler.filter_table
+        if ga_bus is None:
+            return
+        payload_class = type(telegram.payload)
+        plan = ga_bus.delivery_plans.get(payload_class)
+        if plan is None:  # payload class not compiled in advance
+            plan = ga_bus.compile_delivery_plan(payload_class)
+        forwarded_keys = None
+        for key, handlers in plan:
+            if key != source_key:
+                if not forward:
+                    if forwarded_keys is None:
+                        source_line.coupler.blocked += 1
+                        forwarded_keys = []
+                    continue
+                if forwarded_keys is None:
+                    forwarded_keys = [key]
+                else:
+                    forwarded_keys.append(key)
+            # Only actuators for now, but sensors and functional module could also receive telegrams to read state fro instance.
+            for handler in handlers:
+                try:
+                    handler(telegram)
+                except Exception as exc:
+                    # Only counted, the traceback is formatted for the first failure of a device
+                    device = handler.__self__
+                    if self.__breaker.record_failure(device, exc):
+                        self.__update_quarantine(device, True)
+        if forwarded_keys:
+            self.__count_forwarding(source_key, source_line, forwarded_keys)
+
+    def __count_forwarding(
+        self, source_key: int, source_line: LineSegment, forwarded_keys: List[int]
+    ) -> None:
+        """Update the load and coupler counters of the segments crossed by a telegram forwarded from its source line to other lines"""
+        source_area = None
+        if source_line is not None:  # the telegram goes up to its area main line
+            source_line.coupler.forwarded += 1
+            source_area = source_key >> 4
+            self.__areas[source_area].load += 1
+        areas = set()
+        for key in forwarded_keys:
+            line = self.__lines[key]
+            line.load += 1
+            line.coupler.forwarded += 1
+            areas.add(key >> 4)
+        areas.discard(source_area)
+        if areas:  # the telegram goes through the backbone to other areas
+            self.backbone_load += 1
+            if source_area is not None:
+                self.__areas[source_area].coupler.forwarded += 1
+            for area in areas:
+                area_line = self.__areas[area]
+                area_line.load += 1
+                area_line.coupler.forwarded += 1
+
+    # Queued bus mode
+    def start_dispatcher(
+        self, simulation_time: Callable[[], float] = None, batch_size: int = 256
+    ) -> asyncio.Task:
+        """
+        Switch the bus to queued mode and start the dispatcher task, must be called from a running asyncio loop.
+
+        simulation_time : function returning the current simulated time in seconds, if not already set with set_simulation_time(),
+        batch_size : number of telegrams delivered before the dispatcher yields to other tasks.
+        """
+        if self.__dispatcher_task is not None:
+            logging.warning("The KNX Bus dispatcher is already started.")
+            return self.__dispatcher_task
+        self.__loop = asyncio.get_running_loop()
+        self.__loop_thread_id = threading.get_ident()
+        if simulation_time is not None:
+            self.set_simulation_time(simulation_time)
+        self.__batch_size = batch_size
+        self.__telegram_event = asyncio.Event()
+        self.__dispatcher_task = self.__loop.create_task(self.__dispatcher())
+        logging.info("The KNX Bus is in queued mode.")
+        return self.__dispatcher_task
+
+    async def stop_dispatcher(self) -> None:
+        """Deliver all telegrams still in queue, stop the dispatcher task and switch the bus back to synchronous mode."""
+        if self.__dispatcher_task is None:
+            return
+        self.__dispatcher_task.cancel()
+        try:
+            await self.__dispatcher_task
+        except asyncio.CancelledError:
+            pass
+        self.__dispatcher_task = None
+        while self.__telegram_queue:
+            _, _, telegram = heapq.heappop(self.__telegram_queue)
+            self.__deliver(telegram)
+
+    def __schedule(self, delivery_time: float, telegram: Telegram) -> None:
+        """Push a telegram in the priority queue and wake up the dispatcher"""
+        heapq.heappush(
+            self.__telegram_queue, (delivery_time, next(self.__queue_counter), telegram)
+        )
+        self.__telegram_event.set()
+
+    def __schedule_batch(self, delivery_time: float, telegrams: List[Telegram]) -> None:
+        """Push several telegrams in the priority queue and wake up the dispatcher once"""
+        queue = self.__telegram_queue
+        counter = self.__queue_counter
+        for telegram in telegrams:
+            heapq.heappush(queue, (delivery_time, next(counter), telegram))
+        self.__telegram_event.set()
+
+    def tick(self, ticks: int = 1) -> None:
+        """
+        Advance the circuit breaker clock of one tick (or more, for skipped world updates), releasing the devices whose quarantine is over,
+        and wake up the dispatcher when the simulated time advanced, to deliver the delayed telegrams now due.
+        """
+        for device in self.__breaker.tick(ticks):
+            self.__update_quarantine(device, False)
+        if self.__dispatcher_task is not None and self.__telegram_queue:
+            if threading.get_ident() != self.__loop_thread_id:
+                self.__loop.call_soon_threadsafe(self.__telegram_event.set)
+            else:
+                self.__telegram_event.set()
+
+    def quiescent(self) -> bool:
+        """
+        Return True if the bus needs no tick() until the next telegram: telegrams delivered synchronously and no device in quarantine,
+        used by the building of the room to defer its updates (see Building).
+        """
+        return self.__dispatcher_task is None and not self.__quarantined
+
+    def pending_telegrams(self) -> int:
+        """Return the number of telegrams waiting in queue for delivery."""
+        return len(self.__telegram_queue)
+
+    def next_delivery_time(self) -> Union[float, None]:
+        """Return the simulated time of the next telegram delivery in queued mode, None if no telegram is waiting."""
+        if self.__telegram_queue:
+            return self.__telegram_queue[0][0]
+        return None
+
+    async def flush(self) -> None:
+        """Wait until the dispatcher delivered all telegrams due at the current simulated time."""
+        while (
+            self.__dispatcher_task is not None
+            and self.__telegram_queue
+            and self.__telegram_queue[0][0] <= self.__simulation_time()
+        ):
+            await asyncio.sleep(0)
+
+    async def __dispatcher(self) -> None:
+        """
+        Asyncio task delivering the telegrams in order of delivery time (and of emission for same delivery time).
+        Telegrams are delivered in batches, the dispatcher yields to other tasks between two batches.
+        """
+        queue = self.__telegram_queue
+        while True:
+            await self.__telegram_event.wait()
+            self.__telegram_event.clear()
+            delivered = 0
+            now = self.__simulation_time()
+            while queue and queue[0][0] <= now:
+                _, _, telegram = heapq.heappop(queue)
+                self.__deliver(telegram)
+                delivered += 1
+                if delivered == self.__batch_size:
+                    delivered = 0
+                    await asyncio.sleep(0)
+                    now = self.__simulation_time()
+
+    def get_history_info(
+        self, group_address_style: str, n: int = 10, group_address: GroupAddress = None
+    ) -> Dict[str, Union[int, List[Dict[str, Union[str, float, bool]]]]]:
+        """
+        Return the last n telegrams of the bus history, method called via CLI commmand 'getinfo bus history'.
+
+        group_address_style : encoding style used to represent the destination group addresses,
+        group_address : only the telegrams sent to this group address if not None.
+        """
+        destination = None if group_address is None else group_address.raw
+        records = self.history.last(n, destination)
+        history_dict = {
+            "telegrams recorded": self.history.total,
+            "history size": self.history.capacity,
+        }
+        if group_address is not None:
+            history_dict["group address"] = group_address.name
+        history_dict["last telegrams"] = TelegramHistory.to_dicts(
+            records, group_address_style
+        )
+        return history_dict
+
+    def get_topology_info(self) -> Dict[str, Union[int, Dict]]:
+        """Return the load counters of the backbone, areas main lines and lines, with their couplers' counters"""
+        topology_dict = {"backbone": {"load": self.backbone_load}}
+        for area, area_line in sorted(self.__areas.items()):
+            area_dict = area_line.get_info()
+            for key, line in sorted(self.__lines.items()):
+                if key >> 4 == area:
+                    area_dict[line.name] = line.get_info()
+            topology_dict[area_line.name] = area_dict
+        return topology_dict
 
     def get_info(self) -> Dict[str, Union[str, Dict[str, Dict[str, List[str]]]]]:
         """Return information about the KNX Bus configuration, 
         and the devices assigned to each group address, method called via CLI commmand 'getinfo'"""
         bus_dict = {"name": self.name, "group_addresses": {}}
-        for ga_bus in self.__ga_buses:
+        for ga_bus in self.__ga_buses.values():
             str_ga = ga_bus.group_address.name
             ga_dict = {str_ga: {}}
             sensor_names = []
@@ -133,20 +663,73 @@ class KNXBus:
             if len(functional_module_names):
                 ga_dict[str_ga]["Functional Modules"] = functional_module_names
             bus_dict["group_addresses"].update(ga_dict)
+        bus_dict["topology"] = self.get_topology_info()
+        bus_dict["fault quarantine"] = self.__breaker.get_info()
+        bus_dict["group value reads"] = dict(self.read_stats)
+        bus_dict["subscriptions"] = {
+            subscription.name: subscription.get_info()
+            for subscription in self.__subscriptions
+        }
         return bus_dict
 
 
 class GroupAddressBus:
     """Class to gather devices assigned to a particular group address."""
 
-    def __init__(self, group_address: GroupAddress) -> None:
-        """Initialization of a group address bus object"""
+    def __init__(
+        self, group_address: GroupAddress, quarantined: Set[int] = None
+    ) -> None:
+        """
+        Initialization of a group address bus object.
+
+        quarantined : ids of the quarantined devices, excluded from the delivery plans.
+        """
         from devices import Actuator, Sensor, FunctionalModule
 
         self.group_address = group_address
         self.sensors: List[Sensor] = []
         self.actuators: List[Actuator] = []
         self.functional_modules: List[FunctionalModule] = []
+        self.quarantined = set() if quarantined is None else quarantined
+        # Bound payload handlers of the actuators for each payload class, grouped by line of the actuators,
+        # compiled when actuators are added or removed
+        self.delivery_plans: Dict[
+            type, List[Tuple[int, List[Callable[[Telegram], None]]]]
+        ] = {}
+
+    def compile_delivery_plan(
+        self, payload_class: type
+    ) -> List[Tuple[int, List[Callable[[Telegram], None]]]]:
+        """
+        Compile and store the list of the actuators' handlers to call when a telegram with a payload_class payload is received,
+        as a list of (line key, handlers of the actuators on this line).
+        """
+        line_handlers: Dict[int, List[Callable[[Telegram], None]]] = {}
+        for actuator in self.actuators:
+            if self.quarantined and id(actuator) in self.quarantined:
+                continue
+            handler = actuator.payload_handler(payload_class)
+            if handler is not None:
+                key = line_key(actuator.individual_addr) or 0
+                line_handlers.setdefault(key, []).append(handler)
+        plan = list(line_handlers.items())
+        self.delivery_plans[payload_class] = plan
+        return plan
+
+    def compile_delivery_plans(self) -> None:
+        """Recompile the delivery plans of the payload classes of the simulator, other classes are compiled when first received."""
+        self.delivery_plans = {}
+        for payload_class in (BinaryPayload, DimmerPayload, FloatPayload):
+            self.compile_delivery_plan(payload_class)
+
+    def readable_devices(self) -> List:
+        """Return the readable devices assigned to the group address: sensors, then functional modules, then actuators"""
+        return [
+            device
+            for devices in (self.sensors, self.functional_modules, self.actuators)
+            for device in devices
+            if device.readable
+        ]
 
     def add_device(self, device) -> None:  # device : Device, not InRoomDevice
         """Add a device to the corresponding list (actuators, sensors or functional modules), 
@@ -154,11 +737,9 @@ class GroupAddressBus:
         from devices import Actuator, Sensor, FunctionalModule
 
         device.group_addresses.append(self.group_address)
-        logging.info(
-            f"{device.name} can receive telegrams from the bus, {self.group_address.name} added to device's group addresses list."
-        )
         if isinstance(device, Actuator):
             self.actuators.append(device)
+            self.compile_delivery_plans()
         if isinstance(device, FunctionalModule):
             self.functional_modules.append(device)
         if isinstance(device, Sensor):
@@ -171,6 +752,7 @@ class GroupAddressBus:
         if isinstance(device, Actuator):
             try:
                 self.actuators.remove(device)
+                self.compile_delivery_plans()
             except ValueError:
                 logging.warning(
                     f"{device.name} is not stored in ga_bus {self.group_address.name}."
@@ -190,7 +772,4 @@ class GroupAddressBus:
                     f"{device.name} is not stored in ga_bus {self.group_address.name}."
                 )
         device.group_addresses.remove(self.group_address)
-        logging.info(
-            f"{self.group_address.name} removed from {device.name}'s group addresses."
-        )
         return len(self.sensors) + len(self.actuators) + len(self.functional_modules)
@@ -15,9 +15,14 @@ from devices import Device
 from system.system_tools import Location, Window
 from tools.check_tools import check_group_address, check_room_config
 from .knxbus import KNXBus
+from .subscriptions import TelegramLogger
+from .tracing import trace_point
 
 from svshi_interface.main import Interface
 
+TRACE_PAUSED = trace_point("room.paused")
+TRACE_RESUMED = trace_point("room.resumed")
+
 
 class InRoomDevice:
     """Wrapper class to represent a device located at a certain location in the room"""
@@ -64,6 +69,12 @@ class InRoomDevice:
         new_x = self.location.x if new_x is None else new_x
         new_loc = Location(self.room, new_x, new_y, new_z)
         self.location = new_loc
+        world = getattr(self.room, "world", None)
+        if (
+            world is not None
+        ):  # the cached light and temperature geometry depends on the devices' locations
+            world.ambient_light.invalidate_geometry()
+            world.ambient_temperature.invalidate_geometry()
 
     def get_irdev_info(
         self, attribute: str = None
@@ -94,6 +105,8 @@ class InRoomDevice:
         }
         device_dict = self.device.get_dev_info()
         ir_device_dict.update(device_dict)
+        if hasattr(self.device, "publish_policy"):  # Sensors
+            ir_device_dict["publish_policy"] = self.device.publish_policy.get_info()
         return ir_device_dict
 
 
@@ -167,6 +180,7 @@ class Room:
             co2_in,
         )  # date_time is simply a string keyword from config file at this point"
         self.knxbus = KNXBus()
+        self.knxbus.set_simulation_time(self.world.time.simulation_time)
         self.devices: List[InRoomDevice] = []
         self.windows: List[InRoomDevice] = []
         self.__system_dt = system_dt
@@ -181,6 +195,8 @@ class Room:
             self.telegram_logging_file_path = tel_logging_path + "/telegram_logs.txt"
         self.svshi_mode = svshi_mode
         self.telegram_logging = telegram_logging
+        # Tap writing the bus traffic to the log file, closed with close()
+        self.telegram_logger = None
         if self.svshi_mode:
             if (
                 interface is not None
@@ -196,10 +212,22 @@ class Room:
                 self.interface_device = IPInterface(
                     "ipinterface1", IndividualAddress(0, 0, 0), self.__interface
                 )
+        elif telegram_logging:  # in svshi mode, the interface logs the telegrams exchanged with SVSHI
+            self.telegram_logger = TelegramLogger(
+                self.telegram_logging_file_path,
+                lambda: self.world.time.simulation_time(),  # time shared in a building
+            )
+            self.knxbus.subscribe(self.telegram_logger, "*", "telegram logging")
 
     def __repr__(self):
         return f"Room {self.name}"
 
+    def close(self) -> None:
+        """Close the telegram logging file, called when the simulation is reloaded or ended"""
+        if self.telegram_logger is not None:
+            self.telegram_logger.close()
+            self.telegram_logger = None
+
     def add_device(
         self, device: Device, x: float, y: float, z: float = 1
     ) -> InRoomDevice:
@@ -273,6 +301,7 @@ class Room:
         if ga:
             self.knxbus.attach(device, ga)
             if self.svshi_mode:
+                # SVSHI receives the telegrams of the group addresses assigned in the room only
                 self.knxbus.attach(self.interface_device, ga)
             return True
         else:
@@ -291,34 +320,43 @@ class Room:
         else:
             return False
 
-    def update_world(self, interval: float = 1, gui_mode: bool = False) -> None:
+    def update_world(
+        self, interval: float = 1, gui_mode: bool = False, updates: int = 1
+    ) -> None:
         """
         Update the world states and sensors values by calling world.update()
 
         test_mode : Simply update sensors values.
         gui_mode : update graphical representation of teh room and devices.
+        updates : number of world updates to advance, the quiescent updates before the last one are skipped (see World.next_event()).
         """
         if self.simulation_status:
             if self.__paused_tick_counter > 0:
-                logging.info(
-                    f"Simulation was paused for {self.__paused_tick_counter * self.__system_dt} seconds."
-                )
+                if TRACE_RESUMED.enabled:
+                    TRACE_RESUMED.emit(
+                        room=self.name,
+                        paused_seconds=self.__paused_tick_counter * self.__system_dt,
+                    )
                 self.__paused_tick_counter = 0
-            # Update KNX devices' states and World's physical states
-            (
-                date_time,
-                weather,
-                time_of_day,
-                out_lux,
-                brightness_levels,
-                temperature_levels,
-                rising_temp,
-                humidity_levels,
-                co2_levels,
-                humiditysoil_levels,
-                presence_sensors_states,
-            ) = self.world.update(self.__first_update)
+            # Update KNX devices' states and World's physical states,
+            # the sensors' broadcasts of this update are transmitted on the bus in a single batch
+            with self.knxbus.batch():
+                (
+                    date_time,
+                    weather,
+                    time_of_day,
+                    out_lux,
+                    brightness_levels,
+                    temperature_levels,
+                    rising_temp,
+                    humidity_levels,
+                    co2_levels,
+                    humiditysoil_levels,
+                    presence_sensors_states,
+                ) = self.world.update(self.__first_update, updates)
             self.__first_update = False
+            # In queued mode, deliver the delayed telegrams now due
+            self.knxbus.tick(updates)
             if (
                 gui_mode and not self.__test_mode
             ):  # testing with pyglet blocked by gui during github CI
@@ -356,12 +394,12 @@ class Room:
                         f"Cannot update sensors value on GUI window: '{sys.exc_info()[0]}'."
                     )
         else:  # Simulation on pause
-            self.__paused_tick_counter += 1
-            print(
-                f" Simulation paused for {self.__paused_tick_counter * self.__system_dt} seconds"
-                + 30 * " ",
-                end="\r",
-            )
+            self.__paused_tick_counter += updates
+            if TRACE_PAUSED.enabled:
+                TRACE_PAUSED.emit(
+                    room=self.name,
+                    paused_seconds=self.__paused_tick_counter * self.__system_dt,
+                )
 
     def get_interface(self) -> Union[Interface, None]:
         """Return the interface used to set up svshi connection if in svshi mode. 
@@ -404,6 +442,31 @@ class Room:
         bus_dict.update(self.knxbus.get_info())
         return bus_dict
 
+    def get_bus_history_info(
+        self, n: int = 10, group_address: str = None
+    ) -> Union[Dict[str, Union[int, List[Dict[str, Union[str, float, bool]]]]], None]:
+        """Return the last n telegrams transmitted on the bus, only those sent to group_address if given,
+        method called via CLI commmand 'getinfo bus history'"""
+        ga = None
+        if group_address is not None:
+            ga = check_group_address(self.__group_address_style, group_address)
+            if not ga:
+                return None
+        return self.knxbus.get_history_info(self.__group_address_style, n, ga)
+
+    def count_bus_telegrams(
+        self, group_address: str = None, since: float = 0
+    ) -> Union[int, None]:
+        """Return the number of telegrams in the bus history since the simulated time since, only those sent to group_address if given,
+        method called via API commmand 'store bus'"""
+        destination = None
+        if group_address is not None:
+            ga = check_group_address(self.__group_address_style, group_address)
+            if not ga:
+                return None
+            destination = ga.raw
+        return self.knxbus.history.count_since(since, destination)
+
     def get_room_info(self) -> Dict[str, Union[str, List[str]]]:
         """Return information about the room, the insulation and dimensions, 
         and the room devices, method called via CLI commmand 'getinfo'"""
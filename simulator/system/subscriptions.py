@@ -0,0 +1,131 @@
+"""
+Class definitions of the subscriptions to the KNX Bus traffic, for taps (monitors, gateways, loggers)
+receiving all telegrams or the telegrams sent to a range of group addresses, without being attached to each group address.
+"""
+
+from typing import Callable, Dict, Union
+
+from system.telegrams import Telegram, GROUP_VALUE_WRITE
+from system.topology import GroupAddressFilter
+
+# Number of bits of each level of the raw group address, for the '3-levels' and '2-levels' patterns
+PATTERN_LEVEL_BITS = {3: (5, 3, 8), 2: (5, 11)}
+ALL_TRAFFIC_PATTERNS = ("*", "all")
+
+
+def parse_pattern_level(field: str, bits: int) -> Union[range, None]:
+    """Return the range of values of a pattern level ('*', 'n' or 'n-m'), None if incorrect."""
+    maximum = (1 << bits) - 1
+    if field == "*":
+        return range(0, maximum + 1)
+    try:
+        if "-" in field:
+            low, high = (int(bound) for bound in field.split("-"))
+        else:
+            low = high = int(field)
+    except ValueError:
+        return None
+    if not 0 <= low <= high <= maximum:
+        return None
+    return range(low, high + 1)
+
+
+def parse_group_address_pattern(pattern: str) -> Union[GroupAddressFilter, None]:
+    """
+    Return the bitmap of the group addresses matching a subscription pattern, None if the pattern is incorrect.
+
+    pattern : '*' or 'all' for all traffic, a raw range 'n-m' (e.g. '0-4095'),
+    or a group address whose levels are '*', numbers or ranges (e.g. '1/*/*', '2/0-3/*', '1/*').
+    """
+    ga_filter = GroupAddressFilter()
+    pattern = pattern.strip()
+    if pattern in ALL_TRAFFIC_PATTERNS:
+        ga_filter.add_range(0, 0xFFFF)
+        return ga_filter
+    fields = pattern.split("/")
+    if len(fields) == 1:  # raw range or single raw group address
+        levels_bits = (16,)
+    elif len(fields) in PATTERN_LEVEL_BITS:
+        levels_bits = PATTERN_LEVEL_BITS[len(fields)]
+    else:
+        return None
+    levels = [parse_pattern_level(field, bits) for field, bits in zip(fields, levels_bits)]
+    if None in levels:
+        return None
+    # Prefixes of the raw group address for all levels but the last, the last level is a contiguous range
+    prefixes = [0]
+    shift = 16
+    for level, bits in zip(levels[:-1], levels_bits[:-1]):
+        shift -= bits
+        prefixes = [prefix | (value << shift) for prefix in prefixes for value in level]
+    last_level = levels[-1]
+    for prefix in prefixes:
+        ga_filter.add_range(prefix | last_level.start, prefix | (last_level.stop - 1))
+    return ga_filter
+
+
+class Subscription:
+    """
+    Class to represent a tap subscribed to the bus traffic:
+    its callback is called with every telegram sent to a group address matching its pattern.
+    """
+
+    __slots__ = ("name", "pattern", "callback", "filter_table", "received")
+
+    def __init__(
+        self,
+        name: str,
+        pattern: str,
+        callback: Callable[[Telegram], None],
+        filter_table: GroupAddressFilter,
+    ) -> None:
+        """
+        Initialization of a subscription.
+
+        filter_table : bitmap of the group addresses matching the pattern,
+        received : number of telegrams received by the tap.
+        """
+        self.name = name
+        self.pattern = pattern
+        self.callback = callback
+        self.filter_table = filter_table
+        self.received = 0
+
+    def get_info(self) -> Dict[str, Union[str, int]]:
+        """Return the subscription's pattern and counter, method called via CLI commmand 'getinfo bus'"""
+        return {"pattern": self.pattern, "received": self.received}
+
+
+class TelegramLogger:
+    """Tap writing the telegrams transmitted on the bus to a log file (telegram logging mode)"""
+
+    def __init__(
+        self, file_path: str, simulation_time: Callable[[], float] = None
+    ) -> None:
+        """
+        Initialization of a telegram logger, the file is opened in append mode and line buffered.
+
+        simulation_time : function returning the current simulated time, written with each telegram.
+        """
+        self.file_path = file_path
+        self.__simulation_time = simulation_time
+        self.__log_file = open(file_path, "a+", buffering=1)
+        self.__log_file.write("\n========== Bus telegrams ==========")
+
+    def __call__(self, telegram: Telegram) -> None:
+        payload = telegram.payload
+        simtime = ""
+        if self.__simulation_time is not None:
+            simtime = f"[{self.__simulation_time() or 0:.2f}] "
+        if payload is None:  # GroupValueRead
+            content = telegram.apci
+        else:
+            content = f"{type(payload).__name__}({payload!r})"
+            if telegram.apci != GROUP_VALUE_WRITE:
+                content = f"{telegram.apci} {content}"
+        self.__log_file.write(
+            f"\n{simtime}{telegram.source} -> {telegram.destination}: {content}"
+        )
+
+    def close(self) -> None:
+        self.__log_file.close()
@@ -2,8 +2,9 @@
 Class definitions usefull to simulate the KNX system: Location, Individual and Group Address, and Windows (very similar to a device)
 """
 
+import logging
 import math
-from typing import Union, Tuple
+from typing import Dict, Union, Tuple
 
 import devices as dev
 
@@ -43,57 +44,210 @@ class Location:
 
 
 class IndividualAddress:
-    """Class to represent individual addresses (virtual location on the KNX Bus)"""
-
-    def __init__(
-        self, area: Union[str, int], line: Union[str, int], main: Union[str, int]
-    ) -> None:
+    """
+    Class to represent individual addresses (virtual location on the KNX Bus).
+    Individual addresses are immutable and interned: they store the raw KNX 16-bit encoding (4 bits area | 4 bits line | 8 bits device),
+    and the same address always returns the same instance.
+    """
+
+    __slots__ = ("raw", "_ia_str")
+    __interned: Dict[int, "IndividualAddress"] = {}
+
+    def __new__(
+        cls, area: Union[str, int], line: Union[str, int], main: Union[str, int]
+    ) -> "IndividualAddress":
+        if (
+            type(area) is int
+            and type(line) is int
+            and type(main) is int
+            and 0 <= area <= 15
+            and 0 <= line <= 15
+            and 0 <= main <= 255
+        ):  # Fast path, no need to check the address
+            return cls.from_raw((area << 12) | (line << 8) | main)
         from tools import check_individual_address
 
-        self.area, self.line, self.device = check_individual_address(area, line, main)
-        self.ia_str = ".".join([str(self.area), str(self.line), str(self.device)])
+        area, line, device = check_individual_address(area, line, main)
+        if area is None:  # Wrong address, not interned
+            return cls.from_raw(None)
+        return cls.from_raw((area << 12) | (line << 8) | device)
+
+    @classmethod
+    def from_raw(cls, raw: Union[int, None]) -> "IndividualAddress":
+        """Return the interned individual address corresponding to the raw 16-bit value, or a wrong address (not interned) if raw is None."""
+        if raw is None:
+            ia = object.__new__(cls)
+            object.__setattr__(ia, "raw", None)
+            object.__setattr__(ia, "_ia_str", "None.None.None")
+            return ia
+        ia = cls.__interned.get(raw)
+        if ia is None:
+            ia = object.__new__(cls)
+            object.__setattr__(ia, "raw", raw)
+            object.__setattr__(ia, "_ia_str", None)
+            ia = cls.__interned.setdefault(raw, ia)
+        return ia
+
+    @property
+    def area(self) -> Union[int, None]:
+        return None if self.raw is None else self.raw >> 12
+
+    @property
+    def line(self) -> Union[int, None]:
+        return None if self.raw is None else (self.raw >> 8) & 0xF
+
+    @property
+    def device(self) -> Union[int, None]:
+        return None if self.raw is None else self.raw & 0xFF
+
+    @property
+    def ia_str(self) -> str:
+        """String representation 'area.line.device', formatted once and cached."""
+        if self._ia_str is None:
+            object.__setattr__(
+                self, "_ia_str", f"{self.raw >> 12}.{(self.raw >> 8) & 0xF}.{self.raw & 0xFF}"
+            )
+        return self._ia_str
+
+    def __setattr__(self, name, value):
+        raise AttributeError("IndividualAddress objects are immutable.")
+
+    def __reduce__(self):
+        if self.raw is None:
+            return (IndividualAddress, (None, None, None))
+        return (IndividualAddress.from_raw, (self.raw,))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     def __eq__(self, other):
-        return (
-            self.area == other.area
-            and self.line == other.line
-            and self.device == self.device
-        )
+        if isinstance(other, IndividualAddress):
+            return self.raw == other.raw
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.raw)
 
     def __str__(self):
         return self.ia_str
 
-    def __repr__(self):
-        return f" Individual Address(area:{self.area}, line:{self.line}, device:{self.device})"
-
     def __repr__(self) -> str:
-        return f"{self.area}.{self.line}.{self.device}"
+        return self.ia_str
 
 
-class GroupAddress:
-    """Class to represent group addresses (devices gathered by functionality)"""
+GROUP_ADDRESS_STYLES = ("free", "2-levels", "3-levels")
 
-    def __init__(
-        self, encoding_style: str, main: int, middle: int = 0, sub: int = 0
-    ) -> None:
+
+class GroupAddress:
+    """
+    Class to represent group addresses (devices gathered by functionality).
+    Group addresses are immutable and interned: they store the raw KNX 16-bit encoding and their encoding style,
+    the same address always returns the same instance, and the string representation is formatted lazily.
+    """
+
+    __slots__ = ("encoding_style", "raw", "_name")
+    __interned: Dict[Tuple[str, int], "GroupAddress"] = {}
+
+    def __new__(
+        cls, encoding_style: str, main: int, middle: int = 0, sub: int = 0
+    ) -> "GroupAddress":
         """
-        Initialization of a group address object.
+        Return the group address object, created only the first time this address is used.
 
-        encoding_style should be 'free', '2-levels' or '3-levels'.
+        encoding_style should be 'free', '2-levels' or '3-levels',
+        raise a ValueError if a level is out of its bit width, as it would alias another address.
+        """
+        main, middle, sub = int(main), int(middle), int(sub)
+        if encoding_style == "3-levels":
+            # raw KNX encoding: 5 bits main | 3 bits middle | 8 bits sub
+            if not (0 <= main <= 31 and 0 <= middle <= 7 and 0 <= sub <= 255):
+                cls.__reject(
+                    f"'3-levels' group address {main}/{middle}/{sub} is out of bounds, should be in 0/0/0 -> 31/7/255."
+                )
+            raw = (main << 11) | (middle << 8) | sub
+        elif encoding_style == "2-levels":
+            # raw KNX encoding: 5 bits main | 11 bits sub
+            if not (0 <= main <= 31 and 0 <= sub <= 2047):
+                cls.__reject(
+                    f"'2-levels' group address {main}/{sub} is out of bounds, should be in 0/0 -> 31/2047."
+                )
+            raw = (main << 11) | sub
+        else:
+            raw = main
+        return cls.from_raw(encoding_style, raw)
+
+    @staticmethod
+    def __reject(message: str) -> None:
+        logging.warning(message)
+        raise ValueError(message)
+
+    @classmethod
+    def from_raw(cls, encoding_style: str, raw: int) -> "GroupAddress":
+        """
+        Return the interned group address corresponding to the raw 16-bit value and encoding style,
+        raise a ValueError if raw is not in 0..0xFFFF.
         """
-        self.encoding_style = encoding_style
+        key = (encoding_style, raw)
+        ga = cls.__interned.get(key)
+        if ga is None:
+            if not 0 <= raw <= 0xFFFF:
+                cls.__reject(
+                    f"Group address raw value {raw} is out of bounds, should be in 0 -> 65535."
+                )
+            ga = object.__new__(cls)
+            object.__setattr__(ga, "encoding_style", encoding_style)
+            object.__setattr__(ga, "raw", raw)
+            object.__setattr__(ga, "_name", None)
+            ga = cls.__interned.setdefault(key, ga)
+        return ga
+
+    @property
+    def main(self) -> int:
+        if self.encoding_style == "free":
+            return self.raw
+        return self.raw >> 11
+
+    @property
+    def middle(self) -> int:
+        if self.encoding_style == "3-levels":
+            return (self.raw >> 8) & 0x7
+        return 0
+
+    @property
+    def sub(self) -> int:
         if self.encoding_style == "3-levels":
-            self.main = main
-            self.middle = middle
-            self.sub = sub
-            self.name = "/".join((str(main), str(middle), str(sub)))
+            return self.raw & 0xFF
         elif self.encoding_style == "2-levels":
-            self.main = main
-            self.sub = sub
-            self.name = "/".join((str(main), str(sub)))
-        elif self.encoding_style == "free":
-            self.main = main
-            self.name = str(main)
+            return self.raw & 0x7FF
+        return 0
+
+    @property
+    def name(self) -> str:
+        """String representation in the group address encoding style, formatted once and cached."""
+        if self._name is None:
+            if self.encoding_style == "3-levels":
+                name = f"{self.raw >> 11}/{(self.raw >> 8) & 0x7}/{self.raw & 0xFF}"
+            elif self.encoding_style == "2-levels":
+                name = f"{self.raw >> 11}/{self.raw & 0x7FF}"
+            else:
+                name = str(self.raw)
+            object.__setattr__(self, "_name", name)
+        return self._name
+
+    def __setattr__(self, name, value):
+        raise AttributeError("GroupAddress objects are immutable.")
+
+    def __reduce__(self):
+        return (GroupAddress.from_raw, (self.encoding_style, self.raw))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     def __str__(self):
         return self.name
@@ -102,7 +256,13 @@ class GroupAddress:
         return self.name
 
     def __eq__(self, ga_to_compare):  # ga_to_compare : GroupAddress
-        return self.__str__() == str(ga_to_compare)
+        if isinstance(ga_to_compare, GroupAddress):
+            return self.raw == ga_to_compare.raw
+        return self.name == str(ga_to_compare)
+
+    def __hash__(self):
+        """Group addresses are hashed on their raw 16-bit value, to be used as keys of the bus routing table."""
+        return self.raw
 
 
 class Window:
@@ -155,8 +315,14 @@ class Window:
         """Compute max_lumen value based on out luminosity in lux and window's area."""
         self.max_lumen = out_lux * math.prod(self.size)
 
-    def effective_lumen(self) -> float:
-        """Lumen quantity adjusted with the state ratio (% of source's max lumens) represented by blinds (if implemented)"""
-        return 0.2 * self.max_lumen + 0.8 * self.max_lumen * (
+    def effective_lumen(self, out_lux: float = None) -> float:
+        """
+        Lumen quantity adjusted with the state ratio (% of source's max lumens) represented by blinds (if implemented),
+        for another outdoor luminosity out_lux than the current one if given.
+        """
+        max_lumen = (
+            self.max_lumen if out_lux is None else out_lux * math.prod(self.size)
+        )
+        return 0.2 * max_lumen + 0.8 * max_lumen * (
             self.state_ratio / 100
         )  # 20% of outdoor light will pass even with blinds closed
@@ -0,0 +1,234 @@
+"""
+Class definition of the telegram history of the KNX Bus:
+a fixed-size ring buffer of the last telegrams transmitted, stored in a NumPy structured array,
+with a secondary index per group address.
+"""
+
+import bisect
+import math
+from typing import Dict, List, Union
+
+import numpy as np
+
+from system.telegrams import (
+    Telegram,
+    BinaryPayload,
+    DimmerPayload,
+    FloatPayload,
+    GROUP_VALUE_WRITE,
+    GROUP_VALUE_READ,
+    GROUP_VALUE_RESPONSE,
+)
+
+# Fields of a telegram record: simulated time, raw source individual address (-1 if invalid),
+# raw destination group address, service code, payload type code, payload value and dimmer state ratio (NaN if none)
+TELEGRAM_RECORD_DTYPE = np.dtype(
+    [
+        ("time", np.float64),
+        ("source", np.int32),
+        ("destination", np.uint16),
+        ("apci", np.uint8),
+        ("payload_type", np.uint8),
+        ("value", np.float64),
+        ("ratio", np.float32),
+    ]
+)
+PAYLOAD_TYPE_CODES = {BinaryPayload: 1, DimmerPayload: 2, FloatPayload: 3}
+PAYLOAD_TYPE_NAMES = {
+    0: "Payload",
+    1: "BinaryPayload",
+    2: "DimmerPayload",
+    3: "FloatPayload",
+}
+APCI_CODES = {GROUP_VALUE_WRITE: 0, GROUP_VALUE_READ: 1, GROUP_VALUE_RESPONSE: 2}
+APCI_NAMES = {code: apci for apci, code in APCI_CODES.items()}
+DEFAULT_HISTORY_SIZE = 4096
+
+
+def telegram_record(telegram: Telegram, time: float) -> tuple:
+    """Return the fields of the record of a telegram transmitted at the simulated time, see TELEGRAM_RECORD_DTYPE"""
+    payload = telegram.payload
+    content = None if payload is None else payload.content
+    source = telegram.source.raw
+    return (
+        time,
+        -1 if source is None else source,
+        telegram.destination.raw,
+        APCI_CODES.get(telegram.apci, 0),
+        PAYLOAD_TYPE_CODES.get(type(payload), 0),
+        math.nan if content is None else float(content),
+        getattr(payload, "state_ratio", math.nan),
+    )
+
+
+def record_telegram(record, group_address_style: str) -> Telegram:
+    """
+    Return the telegram of a record (e.g. received from another process), inverse of telegram_record().
+
+    group_address_style : encoding style of the destination group address.
+    """
+    from system.system_tools import IndividualAddress, GroupAddress
+
+    _, source, destination, apci, payload_type, value, ratio = record
+    if payload_type == 1:
+        payload = BinaryPayload(bool(value))
+    elif payload_type == 2:
+        payload = DimmerPayload(bool(value), float(ratio))
+    elif payload_type == 3:
+        payload = FloatPayload(float(value))
+    else:
+        payload = None
+    return Telegram(
+        IndividualAddress.from_raw(None if source < 0 else int(source)),
+        GroupAddress.from_raw(group_address_style, int(destination)),
+        payload,
+        APCI_NAMES.get(int(apci), GROUP_VALUE_WRITE),
+    )
+
+
+class TelegramHistory:
+    """
+    Ring buffer of the last telegrams transmitted on the bus.
+    The memory used is fixed by the capacity, the oldest records are overwritten once the buffer is full.
+    Records are stored in chronological order (simulated time never decreases during a simulation),
+    so that counts since a time are found by binary search.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_HISTORY_SIZE) -> None:
+        """
+        Initialization of the telegram history.
+
+        capacity : maximum number of telegrams kept in the history,
+        __records : structured array of telegram records, __next_seq % capacity is the slot of the next record,
+        __ga_index : for each raw group address, sequence numbers and times of its records still in the buffer,
+        with the position of its oldest valid record (records are lazily removed from the index).
+        """
+        self.capacity = max(1, int(capacity))
+        self.__records = np.zeros(self.capacity, dtype=TELEGRAM_RECORD_DTYPE)
+        self.__next_seq = 0
+        self.__ga_index: Dict[int, List[Union[List[int], List[float], int]]] = {}
+
+    def __len__(self) -> int:
+        return min(self.__next_seq, self.capacity)
+
+    @property
+    def total(self) -> int:
+        """Number of telegrams recorded since the creation of the history, including overwritten ones"""
+        return self.__next_seq
+
+    def record(self, telegram: Telegram, time: float) -> None:
+        """
+        Store a telegram in the history, overwriting the oldest record if the buffer is full.
+
+        time : simulated time of the transmission, in seconds.
+        """
+        seq = self.__next_seq
+        slot = seq % self.capacity
+        records = self.__records
+        if seq >= self.capacity:  # the oldest record is overwritten, remove it from its group address index
+            self.__evict(int(records["destination"][slot]))
+        destination = telegram.destination.raw
+        records[slot] = telegram_record(telegram, time)
+        ga_entry = self.__ga_index.get(destination)
+        if ga_entry is None:
+            ga_entry = self.__ga_index[destination] = [[], [], 0]
+        ga_entry[0].append(seq)
+        ga_entry[1].append(time)
+        self.__next_seq = seq + 1
+
+    def __evict(self, destination: int) -> None:
+        """Remove the oldest record of a group address from the index, the index lists are compacted when half of them is obsolete."""
+        ga_entry = self.__ga_index[destination]
+        ga_entry[2] += 1
+        seqs, times, head = ga_entry
+        if head == len(seqs):
+            del self.__ga_index[destination]
+        elif head > len(seqs) // 2:
+            ga_entry[0], ga_entry[1], ga_entry[2] = seqs[head:], times[head:], 0
+
+    def last(self, n: int, destination: int = None) -> np.ndarray:
+        """
+        Return the last n records (or fewer if not available) in chronological order.
+
+        destination : raw group address to filter the records, all records if None.
+        """
+        if n <= 0:
+            return np.zeros(0, dtype=TELEGRAM_RECORD_DTYPE)
+        if destination is None:
+            count = min(n, len(self))
+            seqs = np.arange(self.__next_seq - count, self.__next_seq)
+        else:
+            ga_entry = self.__ga_index.get(destination)
+            if ga_entry is None:
+                return np.zeros(0, dtype=TELEGRAM_RECORD_DTYPE)
+            seqs_list, _, head = ga_entry
+            seqs = np.array(seqs_list[max(head, len(seqs_list) - n) :], dtype=np.int64)
+        return self.__records[seqs % self.capacity]
+
+    def count_since(self, time: float, destination: int = None) -> int:
+        """
+        Return the number of records in the history with a simulated time greater or equal than time, in O(log n).
+
+        destination : raw group address to filter the records, all records if None.
+        """
+        if destination is None:
+            times = self.__records["time"]
+            slot = self.__next_seq % self.capacity
+            if self.__next_seq < self.capacity:
+                return slot - int(np.searchsorted(times[:slot], time))
+            # The buffer is full: the records are chronological from slot to the end, then from 0 to slot
+            return (
+                self.capacity
+                - int(np.searchsorted(times[slot:], time))
+                - int(np.searchsorted(times[:slot], time))
+            )
+        ga_entry = self.__ga_index.get(destination)
+        if ga_entry is None:
+            return 0
+        _, times, head = ga_entry
+        return len(times) - bisect.bisect_left(times, time, head)
+
+    @staticmethod
+    def to_dicts(
+        records: np.ndarray, group_address_style: str
+    ) -> List[Dict[str, Union[str, float, bool]]]:
+        """
+        Return a readable representation of records, method called via CLI commmand 'getinfo bus history'.
+
+        group_address_style : encoding style used to represent the destination group addresses.
+        """
+        from system.system_tools import IndividualAddress, GroupAddress
+
+        records_list = []
+        for (
+            time,
+            source,
+            destination,
+            apci,
+            payload_type,
+            value,
+            ratio,
+        ) in records.tolist():
+            record_dict = {
+                "simtime": round(time, 2),
+                # wrong source addresses are recorded as -1
+                "source": IndividualAddress.from_raw(
+                    None if source < 0 else source
+                ).ia_str,
+                "destination": GroupAddress.from_raw(
+                    group_address_style, destination
+                ).name,
+                "payload": PAYLOAD_TYPE_NAMES.get(payload_type, "Payload"),
+            }
+            if apci:  # GroupValueWrite is implicit
+                record_dict["apci"] = APCI_NAMES[apci]
+                if apci == 1:  # a read carries no payload
+                    record_dict["payload"] = None
+            if payload_type in (1, 2):  # binary state
+                record_dict["value"] = bool(value)
+            elif not math.isnan(value):
+                record_dict["value"] = round(value, 2)
+            if not math.isnan(ratio):
+                record_dict["state_ratio"] = round(ratio, 2)
+            records_list.append(record_dict)
+        return records_list
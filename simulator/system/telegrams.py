@@ -5,23 +5,37 @@ Class definitions related to Telegrams and their Payload.
 import logging
 from abc import ABC
 
+# Application layer services (APCI) of group telegrams
+GROUP_VALUE_WRITE = "GroupValueWrite"
+GROUP_VALUE_READ = "GroupValueRead"  # no payload, answered with a GroupValueResponse
+GROUP_VALUE_RESPONSE = "GroupValueResponse"
+
 
 class Telegram:
     """Class to represent a KNX telegram and store its fields"""
 
-    def __init__(self, source_individual_addr, destination_group_addr, payload):
+    # Telegrams are created on every transmission, slots avoid a dict per instance
+    __slots__ = ("source", "destination", "payload", "apci")
+
+    def __init__(
+        self,
+        source_individual_addr: "IndividualAddress",
+        destination_group_addr: "GroupAddress",
+        payload: "Payload",
+        apci: str = GROUP_VALUE_WRITE,
+    ):
         """
         Initialization of a telegram object.
 
         source_individual_addr : IndividualAddress,
         destination_group_addr : GroupAddress,
-        payload : Payload.
+        payload : Payload, None for a GroupValueRead,
+        apci : service of the telegram, GROUP_VALUE_WRITE, GROUP_VALUE_READ or GROUP_VALUE_RESPONSE.
         """
-        from system import IndividualAddress, GroupAddress
-
-        self.source: IndividualAddress = source_individual_addr
-        self.destination: GroupAddress = destination_group_addr
-        self.payload: Payload = payload
+        self.source = source_individual_addr
+        self.destination = destination_group_addr
+        self.payload = payload
+        self.apci = apci
 
     def __str__(self):
         return f" --- -- Telegram -- ---\n-source: {self.source}  \n-destination: {self.destination}  \n-payload: {self.payload}\n --- -------------- --- "
@@ -30,6 +44,8 @@ class Telegram:
 class Payload(ABC):
     """Abstract class to represent the payload given as attribute to the Telegram object.s"""
 
+    __slots__ = ("content",)
+
     def __init__(self) -> None:
         """
         Initialization of a payload object.
@@ -43,11 +59,36 @@ class Payload(ABC):
 
 
 class BinaryPayload(Payload):
-    """Class to represent a binary payload (True/False)"""
+    """
+    Class to represent a binary payload (True/False).
+
+    BinaryPayload(True) and BinaryPayload(False) return the shared immutable payloads BinaryPayload.ON and BinaryPayload.OFF,
+    other contents (and subclasses) create new payloads.
+    """
+
+    __slots__ = ()
+    ON: "BinaryPayload" = None
+    OFF: "BinaryPayload" = None
+
+    def __new__(cls, binary_state: bool, *args, **kwargs) -> "BinaryPayload":
+        if cls is BinaryPayload:
+            if binary_state is True and BinaryPayload.ON is not None:
+                return BinaryPayload.ON
+            if binary_state is False and BinaryPayload.OFF is not None:
+                return BinaryPayload.OFF
+        return object.__new__(cls)
 
     def __init__(self, binary_state: bool) -> None:
-        super().__init__()
-        self.content: bool = binary_state
+        if self is not BinaryPayload.ON and self is not BinaryPayload.OFF:
+            self.content: bool = binary_state
+
+    def __setattr__(self, name, value):
+        if self is BinaryPayload.ON or self is BinaryPayload.OFF:
+            raise AttributeError("The shared BinaryPayload objects are immutable.")
+        object.__setattr__(self, name, value)
+
+    def __reduce__(self):
+        return (type(self), (self.content,))
 
     def __str__(self) -> str:
         return f" BinaryPayload: state={self.content}"
@@ -56,16 +97,23 @@ class BinaryPayload(Payload):
         return super().__repr__()
 
 
+BinaryPayload.ON = BinaryPayload(True)
+BinaryPayload.OFF = BinaryPayload(False)
+
+
 class DimmerPayload(BinaryPayload):
     """Class to represent a dimmer payload (True/False + value)"""
 
+    __slots__ = ("state_ratio",)
+    __setattr__ = object.__setattr__  # dimmer payloads are never shared
+
     def __init__(self, binary_state: bool, state_ratio: float) -> None:
         """
         Initialization of dimmer payload object.
 
         state_ratio is a percentage.
         """
-        super().__init__(binary_state)
+        self.content = binary_state
         try:
             assert state_ratio >= 0 and state_ratio <= 100
             self.state_ratio = state_ratio
@@ -74,6 +122,9 @@ class DimmerPayload(BinaryPayload):
                 f"The dimmer value {state_ratio} is not a percentage (0-100), the payload cannot be created."
             )
 
+    def __reduce__(self):
+        return (DimmerPayload, (self.content, self.state_ratio))
+
     def __str__(self) -> str:
         return f" DimmerPayload: state={self.content} | ratio={self.state_ratio}"
 
@@ -81,8 +132,9 @@ class DimmerPayload(BinaryPayload):
 class FloatPayload(Payload):
     """Class to represent the payload of a float (e.g. for Sensor values send on bus for svshi)."""
 
+    __slots__ = ()
+
     def __init__(self, value: float) -> None:
-        super().__init__()
         self.content: float = value
 
     def __repr__(self) -> str:
@@ -0,0 +1,121 @@
+"""
+Class definitions to represent the KNX topology behind the KNX Bus:
+line segments joined to their area main line by line couplers, and area main lines joined to the backbone by area couplers.
+Couplers only forward telegrams whose destination group address is in their filter table.
+"""
+
+from typing import Dict, Union
+
+
+def line_key(individual_addr) -> Union[int, None]:
+    """Return the key (area << 4 | line) of the line of an individual address, None if the address is invalid."""
+    raw = individual_addr.raw
+    return None if raw is None else raw >> 8
+
+
+class GroupAddressFilter:
+    """
+    Filter table of a coupler: bitmap of the 65536 raw group addresses (8 kB),
+    a set bit means that the telegrams sent to this group address pass the coupler.
+    """
+
+    __slots__ = ("__bits",)
+
+    def __init__(self) -> None:
+        self.__bits = bytearray(8192)
+
+    def __contains__(self, raw: int) -> bool:
+        return bool(self.__bits[raw >> 3] & (1 << (raw & 7)))
+
+    def __len__(self) -> int:
+        """Number of group addresses in the filter table"""
+        return bin(int.from_bytes(self.__bits, "little")).count("1")
+
+    def add(self, raw: int) -> None:
+        self.__bits[raw >> 3] |= 1 << (raw & 7)
+
+    def discard(self, raw: int) -> None:
+        self.__bits[raw >> 3] &= ~(1 << (raw & 7)) & 0xFF
+
+    def add_range(self, start: int, stop: int) -> None:
+        """Add the raw group addresses from start to stop (included), whole bytes are set at once."""
+        while start <= stop and start & 7:
+            self.add(start)
+            start += 1
+        while stop >= start and (stop + 1) & 7:
+            self.add(stop)
+            stop -= 1
+        if start < stop:
+            self.__bits[start >> 3 : (stop >> 3) + 1] = b"\xff" * (((stop - start) >> 3) + 1)
+
+    def update(self, other: "GroupAddressFilter") -> None:
+        """Add the group addresses of another filter table (bitwise or of the bitmaps)."""
+        union = int.from_bytes(self.__bits, "little") | int.from_bytes(
+            other.__bits, "little"
+        )
+        self.__bits[:] = union.to_bytes(len(self.__bits), "little")
+
+
+class Coupler:
+    """
+    Class to represent a line or area coupler,
+    its filter table contains the group addresses used by the devices below it.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Initialization of a coupler.
+
+        filter_table : bitmap of the group addresses passing the coupler,
+        forwarded/blocked : number of telegrams forwarded and blocked by the coupler,
+        __ga_counter : number of devices (or lines for an area coupler) below the coupler using each group address.
+        """
+        self.name = name
+        self.filter_table = GroupAddressFilter()
+        self.forwarded = 0
+        self.blocked = 0
+        self.__ga_counter: Dict[int, int] = {}
+
+    def add_group_address(self, raw: int) -> bool:
+        """Add a user of the group address below the coupler, return True if the group address is new in the filter table."""
+        count = self.__ga_counter.get(raw, 0)
+        self.__ga_counter[raw] = count + 1
+        if count == 0:
+            self.filter_table.add(raw)
+            return True
+        return False
+
+    def remove_group_address(self, raw: int) -> bool:
+        """Remove a user of the group address below the coupler, return True if the group address is removed from the filter table."""
+        count = self.__ga_counter.get(raw, 0) - 1
+        if count > 0:
+            self.__ga_counter[raw] = count
+            return False
+        self.__ga_counter.pop(raw, None)
+        self.filter_table.discard(raw)
+        return True
+
+    def get_info(self) -> Dict[str, Union[str, int]]:
+        """Return the coupler's counters, method called via CLI commmand 'getinfo bus'"""
+        return {
+            "filter table size": len(self.filter_table),
+            "forwarded": self.forwarded,
+            "blocked": self.blocked,
+        }
+
+
+class LineSegment:
+    """
+    Class to represent a bus segment: a line of an area, or the main line of an area,
+    with the coupler joining it to the upper level and a load counter of the telegrams transmitted on it.
+    """
+
+    def __init__(self, name: str, coupler_name: str) -> None:
+        """Initialization of a bus segment, load is the number of telegrams transmitted on it"""
+        self.name = name
+        self.coupler = Coupler(coupler_name)
+        self.load = 0
+
+    def get_info(self) -> Dict[str, Union[str, int, Dict[str, Union[str, int]]]]:
+        """Return the segment's load and its coupler's counters, method called via CLI commmand 'getinfo bus'"""
+        return {"load": self.load, self.coupler.name: self.coupler.get_info()}
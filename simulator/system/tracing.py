@@ -0,0 +1,184 @@
+"""
+Tracing facility for the diagnostics of the simulation hot paths (world updates, bus deliveries, devices' state changes).
+
+Each module creates its named trace points once, at import:
+    TRACE_ATTACH = trace_point("bus.attach")
+and guards each emission with the point's flag, so that a disabled trace point costs a single branch:
+    if TRACE_ATTACH.enabled:
+        TRACE_ATTACH.emit(device=device.name, group_address=group_address.name)
+The structured fields are only built when the point is enabled, and the events are written to the sinks (console, file, memory).
+"""
+
+import json
+import sys
+import time
+from collections import deque
+from fnmatch import fnmatchcase
+from typing import Callable, Deque, Dict, List, TextIO, Union
+
+
+class TraceEvent:
+    """Event emitted by an enabled trace point"""
+
+    __slots__ = ("name", "timestamp", "fields")
+
+    def __init__(self, name: str, timestamp: float, fields: Dict) -> None:
+        self.name = name
+        self.timestamp = timestamp
+        self.fields = fields
+
+    def to_dict(self) -> Dict:
+        return {"name": self.name, "timestamp": self.timestamp, **self.fields}
+
+    def __str__(self) -> str:
+        fields = " ".join(f"{key}={value}" for key, value in self.fields.items())
+        return f"[{self.timestamp:.6f}] {self.name} {fields}"
+
+
+class TracePoint:
+    """Named trace point, its events are only created and written to the sinks when enabled"""
+
+    __slots__ = ("name", "enabled", "tracer")
+
+    def __init__(self, name: str, tracer: "Tracer") -> None:
+        self.name = name
+        self.enabled = False
+        self.tracer = tracer
+
+    def emit(self, **fields) -> None:
+        """Write an event with fields to the tracer's sinks, to call only if enabled"""
+        self.tracer.write(TraceEvent(self.name, self.tracer.clock(), fields))
+
+
+class ConsoleSink:
+    """Sink printing the trace events to a stream (stderr by default)"""
+
+    def __init__(self, stream: TextIO = None) -> None:
+        self.stream = stream
+
+    def __call__(self, event: TraceEvent) -> None:
+        print(event, file=self.stream or sys.stderr)
+
+
+class FileSink:
+    """Sink writing the trace events to a file as JSON lines, the file is opened in append mode and line buffered"""
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+        self.__file = open(file_path, "a+", buffering=1)
+
+    def __call__(self, event: TraceEvent) -> None:
+        self.__file.write(json.dumps(event.to_dict(), default=str) + "\n")
+
+    def close(self) -> None:
+        self.__file.close()
+
+
+class MemorySink:
+    """Sink keeping the last trace events in memory (all events if capacity is None), e.g. for tests and post-mortem analysis"""
+
+    def __init__(self, capacity: int = None) -> None:
+        self.events: Deque[TraceEvent] = deque(maxlen=capacity)
+
+    def __call__(self, event: TraceEvent) -> None:
+        self.events.append(event)
+
+    def named(self, name: str) -> List[TraceEvent]:
+        """Return the events of the trace points matching name (fnmatch pattern, e.g. 'bus.*')"""
+        return [event for event in self.events if fnmatchcase(event.name, name)]
+
+    def clear(self) -> None:
+        self.events.clear()
+
+
+class Tracer:
+    """
+    Registry of the trace points and of the sinks receiving their events.
+    Trace points are enabled with fnmatch patterns on their names, also for the points created after enabling.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        """
+        Initialization of a tracer.
+
+        clock : function returning the timestamp of the events,
+        __patterns : enabled patterns of trace point names.
+        """
+        self.clock = clock
+        self.__points: Dict[str, TracePoint] = {}
+        self.__sinks: List[Callable[[TraceEvent], None]] = []
+        self.__patterns: List[str] = []
+
+    def point(self, name: str) -> TracePoint:
+        """Return the trace point name, created if new."""
+        trace_point = self.__points.get(name)
+        if trace_point is None:
+            trace_point = self.__points[name] = TracePoint(name, self)
+            trace_point.enabled = self.__matches(name)
+        return trace_point
+
+    @property
+    def points(self) -> Dict[str, TracePoint]:
+        return dict(self.__points)
+
+    @property
+    def sinks(self) -> List[Callable[[TraceEvent], None]]:
+        return list(self.__sinks)
+
+    def __matches(self, name: str) -> bool:
+        return any(fnmatchcase(name, pattern) for pattern in self.__patterns)
+
+    def enable(self, pattern: str = "*") -> None:
+        """Enable the trace points whose name match pattern (e.g. '*', 'bus.*', 'world.update')"""
+        self.__patterns.append(pattern)
+        for trace_point in self.__points.values():
+            trace_point.enabled = trace_point.enabled or fnmatchcase(
+                trace_point.name, pattern
+            )
+
+    def disable(self, pattern: str = "*") -> None:
+        """Disable the trace points whose name match pattern, '*' disables all trace points"""
+        self.__patterns = [p for p in self.__patterns if not fnmatchcase(p, pattern)]
+        for trace_point in self.__points.values():
+            if fnmatchcase(trace_point.name, pattern):
+                trace_point.enabled = False
+
+    def add_sink(self, sink: Callable[[TraceEvent], None]) -> None:
+        self.__sinks.append(sink)
+
+    def remove_sink(self, sink: Callable[[TraceEvent], None]) -> None:
+        """Remove sink from the tracer's sinks, and close it if it is a file sink"""
+        if sink in self.__sinks:
+            self.__sinks.remove(sink)
+        if isinstance(sink, FileSink):
+            sink.close()
+
+    def write(self, event: TraceEvent) -> None:
+        for sink in self.__sinks:
+            sink(event)
+
+
+# Tracer of the simulator, shared by all modules
+TRACER = Tracer()
+
+
+def trace_point(name: str) -> TracePoint:
+    """Return the trace point name of the simulator's tracer, to call once at module import"""
+    return TRACER.point(name)
+
+
+def enable_tracing(
+    pattern: str = "*", sink: Union[Callable[[TraceEvent], None], None] = None
+) -> None:
+    """Enable the simulator's trace points matching pattern, and add sink to the tracer's sinks if given."""
+    if sink is not None:
+        TRACER.add_sink(sink)
+    TRACER.enable(pattern)
+
+
+def disable_tracing(pattern: str = "*") -> None:
+    """Disable the simulator's trace points matching pattern, and remove the sinks if all trace points are disabled."""
+    TRACER.disable(pattern)
+    if pattern == "*":
+        for sink in TRACER.sinks:
+            TRACER.remove_sink(sink)
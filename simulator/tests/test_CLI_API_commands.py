@@ -234,6 +234,15 @@ def test_cli_commands(capfd):
         "getinfo bus dummy_option", room_conf
     )  # test if wrong option case handled
     assert ret == 0
+    # 'getinfo bus history'
+    ret = tools.user_command_parser("getinfo bus history", room_conf)
+    assert ret == 1
+    ret = tools.user_command_parser("getinfo bus history 5 1/1/1", room_conf)
+    assert ret == 1
+    ret = tools.user_command_parser(
+        "getinfo bus history 5 dummy_ga", room_conf
+    )  # test if wrong group address handled
+    assert ret == 0
 
     # 'getinfo dev'
     capfd.readouterr()  # empty buffer
@@ -558,6 +567,23 @@ async def test_api_commands(capfd):
         room_conf, "store switch1 state switch1_state1"
     )
     assert ret == 1
+    # 'store bus'
+    ret, _ = await parser_object.script_command_parser(
+        room_conf, "store bus all bus_count1"
+    )
+    assert ret == 1
+    ret, _ = await parser_object.script_command_parser(
+        room_conf, "store bus 1/1/1 bus_count2"
+    )
+    assert ret == 1
+    assert (
+        parser_object.stored_values["bus_count2"]
+        <= parser_object.stored_values["bus_count1"]
+    )
+    ret, _ = await parser_object.script_command_parser(
+        room_conf, "store bus dummy_ga bus_count3"
+    )
+    assert ret == None
     ret, _ = await parser_object.script_command_parser(
         room_conf, "store brightness1 brightness brightness1_bright1"
     )
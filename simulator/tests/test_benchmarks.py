@@ -0,0 +1,24 @@
+""" Test the bus benchmark suite on a small synthetic room"""
+
+import sys
+
+sys.path.append("..")
+from benchmarks.bench_bus_suite import run_scenario, compare, scenario_name
+
+
+def test_bus_suite_scenario():
+    metrics = run_scenario(20, 5, 4, telegrams=100)
+    assert metrics["devices"] == 20 and metrics["fanout"] == 4
+    assert abs(metrics["deliveries_per_s"] - metrics["telegrams_per_s"] * 4) < 1
+    assert metrics["attach_us"] > 0 and metrics["memory_per_device_B"] > 0
+
+    name = scenario_name(20, 5, 4)
+    assert name == "n20-m5-f4"
+    baseline = {name: dict(metrics)}
+    assert compare({name: metrics}, baseline, 0.15) == []
+    # Lower throughput and higher attach cost than the baseline are regressions
+    slower = dict(metrics, telegrams_per_s=metrics["telegrams_per_s"] / 2)
+    slower["attach_us"] = metrics["attach_us"] * 2
+    regressions = compare({name: slower}, baseline, 0.15)
+    assert len(regressions) == 2
+    assert regressions[0].startswith(name + " telegrams_per_s")
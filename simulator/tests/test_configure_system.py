@@ -4,6 +4,7 @@ import logging
 
 import system
 import devices as dev
+import world
 
 # Creation of the system base (devices + room)
 button1 = dev.Button("button1", system.IndividualAddress(0, 0, 20))
@@ -187,22 +188,16 @@ def test_correct_attachement_to_bus():
         room1.attach(devices[d], ga1_str)
         assert ga1 in room1.knxbus.group_addresses
         assert ga1 in devices[d].group_addresses
-        for ga_bus in room1.knxbus._KNXBus__ga_buses:
-            if ga_bus.group_address == ga1:
-                ga1_bus = ga_bus
+        ga1_bus = room1.knxbus._KNXBus__ga_buses.get(ga1.raw)
         if ga1_bus is None:
             assert False
-        ga_bus_index = room1.knxbus._KNXBus__ga_buses.index(ga1_bus)
-        assert ga1 == room1.knxbus._KNXBus__ga_buses[ga_bus_index].group_address
+        assert ga1 == ga1_bus.group_address
         if isinstance(devices[d], dev.Actuator):
-            assert devices[d] in room1.knxbus._KNXBus__ga_buses[ga_bus_index].actuators
+            assert devices[d] in ga1_bus.actuators
         if isinstance(devices[d], dev.FunctionalModule):
-            assert (
-                devices[d]
-                in room1.knxbus._KNXBus__ga_buses[ga_bus_index].functional_modules
-            )
+            assert devices[d] in ga1_bus.functional_modules
         if isinstance(devices[d], dev.Sensor):
-            assert devices[d] in room1.knxbus._KNXBus__ga_buses[ga_bus_index].sensors
+            assert devices[d] in ga1_bus.sensors
 
 
 ga2 = system.GroupAddress("3-levels", main=2, middle=2, sub=2)
@@ -223,33 +218,23 @@ def test_correct_detachement_from_bus():
         room1.add_device(devices[d], x, y, z)
         # We attach a second device
         room1.attach(devices[d], ga2_str)
-        for ga_bus in room1.knxbus._KNXBus__ga_buses:
-            if ga_bus.group_address == ga2:
-                ga2_bus = ga_bus
+        ga2_bus = room1.knxbus._KNXBus__ga_buses.get(ga2.raw)
         if ga2_bus is None:
             assert False
-        ga_bus_index = room1.knxbus._KNXBus__ga_buses.index(ga2_bus)
         # Test detachement (attachement is correct because of the previous test)
         room1.detach(devices[d], ga2_str)
         assert ga2 not in devices[d].group_addresses
         if isinstance(devices[d], dev.Actuator):
-            assert (
-                devices[d] not in room1.knxbus._KNXBus__ga_buses[ga_bus_index].actuators
-            )
+            assert devices[d] not in ga2_bus.actuators
         if isinstance(devices[d], dev.FunctionalModule):
-            assert (
-                devices[d]
-                not in room1.knxbus._KNXBus__ga_buses[ga_bus_index].functional_modules
-            )
+            assert devices[d] not in ga2_bus.functional_modules
         if isinstance(devices[d], dev.Sensor):
-            assert (
-                devices[d] not in room1.knxbus._KNXBus__ga_buses[ga_bus_index].sensors
-            )
+            assert devices[d] not in ga2_bus.sensors
     # Test removal of ga_bus if no device connected to it
     room1.detach(led22, ga2_str)
     assert ga2 not in led22.group_addresses
     assert ga2 not in room1.knxbus.group_addresses
-    assert ga2_bus not in room1.knxbus._KNXBus__ga_buses
+    assert ga2.raw not in room1.knxbus._KNXBus__ga_buses
 
 
 def test_correct_window_creation_addition():
@@ -420,6 +405,22 @@ def test_configure_system_from_file():
         )
         assert ir_device_room.location.pos == devices_loc_conf[index]
         index += 1
+    # Check publish policy of sensors
+    ir_brightness1_room = room_conf.devices[room_conf.devices.index(ir_brightness1_conf)]
+    assert ir_brightness1_room.device.publish_policy.to_config() == {
+        "cov_threshold": 50,
+        "min_interval": 60,
+        "max_interval": 3600,
+        "change_only": False,
+    }
+    ir_humiditysoil1_room = room_conf.devices[
+        room_conf.devices.index(ir_humiditysoil1_conf)
+    ]
+    assert ir_humiditysoil1_room.device.publish_policy.max_interval is None
+    # Check fault quarantine of the bus
+    assert room_conf.knxbus.breaker.max_failures == 3
+    assert room_conf.knxbus.breaker.failure_window == 5
+    assert room_conf.knxbus.breaker.quarantine_ticks == 30
 
     # Check window
     window1_config = {
@@ -440,6 +441,9 @@ def test_configure_system_from_file():
     assert window1_room.location_offset == window1_config["loc_offset"]
     assert window1_room.window_loc == window1_config["win_loc"]
     assert window1_room.size == window1_config["size"]
+    assert room_conf.world.ambient_light.site == world.Site(
+        46.516, 6.63282, "Europe/Zurich"
+    )
     assert (
         room_conf.world.ambient_light._AmbientLight__lux_out == 10752
     )  # clear day at 11, datetime="2022/06/13/11/00"
@@ -452,12 +456,15 @@ def test_configure_system_from_file():
         main, middle, sub = ga.split("/")
         ga_conf = system.GroupAddress("3-levels", main=main, middle=middle, sub=sub)
         assert ga_conf in room_conf.knxbus.group_addresses
-        for ga_bus in room_conf.knxbus._KNXBus__ga_buses:
+        for ga_bus in room_conf.knxbus._KNXBus__ga_buses.values():
             if ga_bus.group_address is ga_conf:
                 for device in group_addresses[ga]:
+                    # devices created by the config file are other instances with the same name
                     if isinstance(device, dev.Actuator):
-                        assert device in ga_bus.actuators
+                        assert device.name in [d.name for d in ga_bus.actuators]
                     if isinstance(device, dev.Sensor):
-                        assert device in ga_bus.sensors
+                        assert device.name in [d.name for d in ga_bus.sensors]
                     if isinstance(device, dev.FunctionalModule):
-                        assert device in ga_bus.functional_modules
+                        assert device.name in [
+                            d.name for d in ga_bus.functional_modules
+                        ]
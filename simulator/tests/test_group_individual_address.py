@@ -110,3 +110,59 @@ def test_incorrect_individual_address():
         area, line, device = ia_tuple[0], ia_tuple[1], ia_tuple[2]
         ia = system.IndividualAddress(area, line, device)
         assert ia.area is None and ia.line is None and ia.device is None
+
+
+# Test raw encoding and hashing of group addresses
+def test_group_address_raw_and_hash():
+    ga_3 = tools.check_group_address("3-levels", "1/1/1")
+    ga_2 = tools.check_group_address("2-levels", "1/257")
+    ga_free = tools.check_group_address("free", "2305")
+    assert ga_3.raw == ga_2.raw == ga_free.raw == 2305
+    assert tools.check_group_address("3-levels", "31/7/255").raw == 65535
+    assert tools.check_group_address("2-levels", "31/2047").raw == 65535
+    # Same raw value -> same routing table entry
+    routing_table = {ga_3: "ga_bus"}
+    assert routing_table[tools.check_group_address("3-levels", "1/1/1")] == "ga_bus"
+    assert tools.check_group_address("3-levels", "1/1/2") not in routing_table
+
+
+# Test interning and immutability of addresses
+def test_interned_immutable_addresses():
+    import pickle
+
+    ga = tools.check_group_address("3-levels", "23/6/217")
+    assert ga is system.GroupAddress("3-levels", 23, 6, 217)
+    assert ga is system.GroupAddress.from_raw("3-levels", ga.raw)
+    assert ga is pickle.loads(pickle.dumps(ga))
+    # Same raw value but different encoding style gives a different representation
+    ga_free = system.GroupAddress.from_raw("free", ga.raw)
+    assert ga_free is not ga and ga_free == ga
+    assert str(ga) == "23/6/217" and str(ga_free) == str(ga.raw)
+    with pytest.raises(AttributeError):
+        ga.main = 1
+    # Out-of-bounds levels are rejected instead of aliasing another address
+    for levels in ((1, 8, 0), (40, 0, 0), (1, 0, 256), (-1, 0, 0)):
+        with pytest.raises(ValueError):
+            system.GroupAddress("3-levels", *levels)
+    with pytest.raises(ValueError):
+        system.GroupAddress("2-levels", 1, sub=2048)
+    with pytest.raises(ValueError):
+        system.GroupAddress("free", 65536)
+    with pytest.raises(ValueError):
+        system.GroupAddress.from_raw("3-levels", 81920)
+    assert system.GroupAddress("3-levels", 1, 0, 0).raw == 2048
+
+    ia = system.IndividualAddress(2, 10, 250)
+    assert ia is system.IndividualAddress("2", "10", "250")
+    assert ia is system.IndividualAddress.from_raw((2 << 12) | (10 << 8) | 250)
+    assert ia is pickle.loads(pickle.dumps(ia))
+    assert ia.ia_str == str(ia) == "2.10.250"
+    assert {ia: 1}[system.IndividualAddress(2, 10, 250)] == 1
+    assert ia != system.IndividualAddress(2, 10, 251)
+    with pytest.raises(AttributeError):
+        ia.area = 1
+    # Wrong addresses are not interned, with or without their raw value
+    wrong = system.IndividualAddress.from_raw(None)
+    assert wrong.raw is None and wrong.ia_str == "None.None.None"
+    assert wrong is not system.IndividualAddress.from_raw(None)
+    assert system.IndividualAddress(0, 0, 300).ia_str == wrong.ia_str
@@ -0,0 +1,63 @@
+""" Test the Monte Carlo scenario runner on the bedroom configuration"""
+
+import system  # system before tools
+
+
+def test_montecarlo_runs_are_reproducible_per_seed():
+    from tools.montecarlo import MonteCarloRunner, sample_scenarios
+
+    distributions = {
+        "weather": ["clear", "overcast", "dark"],
+        "insulation": {"choice": ["good", "bad"], "weights": [1, 3]},
+        "datetime": {"uniform": ["2022/01/01/00/00", "2022/12/31/00/00"]},
+        "outside_temperature": {"normal": [10, 5]},
+        "unknown": [1, 2],
+    }
+    scenarios = sample_scenarios(distributions, 4, 7)
+    assert set(scenarios[0]) == {
+        "weather",
+        "insulation",
+        "datetime",
+        "outside_temperature",
+    }
+    # The scenario of a run depends only on the seed and its index
+    assert sample_scenarios(distributions, 2, 7) == scenarios[:2]
+    assert sample_scenarios(distributions, 4, 8) != scenarios
+
+    series = ["thermometer1.temperature", "brightness1.brightness", "heater1.state"]
+    reports = [
+        MonteCarloRunner(
+            "config/sim_config_bedroom.json",
+            distributions,
+            series,
+            4,
+            7,
+            processes,
+            60,
+            900,
+        ).run(1)
+        for processes in (1, 2)
+    ]
+    assert reports[0]["processes"] == 1 and reports[1]["processes"] == 2
+    assert reports[0]["scenarios"] == scenarios
+    assert reports[0]["series"] == reports[1]["series"]
+    assert reports[0]["statistics"] == reports[1]["statistics"]
+    assert reports[0]["times"] == [0, 0.25, 0.5, 0.75, 1]
+    temperature = reports[0]["series"]["thermometer1.temperature"]
+    assert len(temperature["p95"]) == 5
+    assert all(
+        low <= median <= high
+        for low, median, high in zip(
+            temperature["p5"], temperature["p50"], temperature["p95"]
+        )
+    )
+    statistics = reports[0]["statistics"]["brightness1.brightness"]
+    assert (
+        statistics["min"]["mean"]
+        <= statistics["mean"]["mean"]
+        <= statistics["max"]["mean"]
+    )
+    failed = MonteCarloRunner(
+        "config/sim_config_bedroom.json", {}, ["thermometer1.humidity"], 2, 0, 1
+    ).run(0.1)
+    assert len(failed["errors"]) == 2
@@ -0,0 +1,94 @@
+""" Test the sharded headless simulation of a generated building"""
+
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append("..")
+import system  # system before tools
+
+
+def test_sharded_run_is_independent_of_the_partition(tmp_path):
+    from benchmarks.bench_sharding import write_config
+    from tools.sharding import ShardedRunner, SharedRing, bridge_record_dtype, partition
+
+    assert partition([f"room{r}" for r in range(1, 6)], 2) == [
+        ["room1", "room2"],
+        ["room3", "room4", "room5"],
+    ]
+    assert len(partition(["room1"], 4)) == 1
+    # Ring buffer: records in order, an error instead of dropping records when full
+    ring = SharedRing(bridge_record_dtype(), 4)
+    try:
+        records = np.zeros(3, dtype=bridge_record_dtype())
+        records["room"] = [1, 2, 3]
+        assert ring.push(records) == 3
+        with pytest.raises(BufferError):
+            ring.push(records)
+        assert len(ring) == 3
+        assert list(ring.pop()["room"]) == [1, 2, 3] and len(ring) == 0
+        assert ring.push(records[:2]) == 2 and ring.push(records[2:]) == 1
+        assert list(ring.pop()["room"]) == [1, 2, 3]
+    finally:
+        ring.close()
+        ring.unlink()
+
+    config_path = write_config(6, str(tmp_path))
+    reports = [ShardedRunner(config_path, shards, 60).run(0.25) for shards in (1, 3)]
+    single, sharded = reports
+    assert single["ticks"] == sharded["ticks"] == 15
+    assert single["bridged"] == 0 and sharded["shards"] == 3
+    # The thermometers of 3 rooms send to the heater of a room in the next shard, at each of the 16 updates
+    assert sharded["bridged"] == 3 * 16
+    assert single["room_reports"] == sharded["room_reports"]
+    assert all(
+        room_report["simulated_time"] == 900
+        for room_report in sharded["room_reports"].values()
+    )
+    # Each bus records the telegrams of its thermometer and of the previous room's thermometer
+    assert {
+        room_report["telegrams"] for room_report in sharded["room_reports"].values()
+    } == {2 * 16}
+    # The bridged telegrams are recorded at the epoch boundary after their transmission, whatever the shard
+    for name, room_report in sharded["room_reports"].items():
+        assert room_report["history"] == single["room_reports"][name]["history"]
+        times = [time for time, _ in room_report["history"]]
+        assert times == sorted(times) and set(times) == {60.0 * t for t in range(16)}
+    # The telegrams of an epoch exceeding the ring buffers make the run fail instead of being dropped
+    failed = ShardedRunner(config_path, 3, 60, epoch_ticks=4, ring_capacity=2).run(0.25)
+    assert any("BufferError" in error for error in failed["errors"])
+
+
+def test_sharded_run_keeps_the_connected_rooms_in_a_shard(tmp_path):
+    import json
+    from benchmarks.bench_sharding import generate_config
+    from tools.config_tools import configure_rooms_from_file
+    from tools.sharding import ShardedRunner, shard_building
+
+    config = generate_config(4)
+    config["world"]["rooms"]["room1"]["insulation"] = "perfect"
+    config["world"]["rooms"]["room2"]["insulation"] = "bad"
+    # room1 and room2 would be in different shards without their connection
+    config["world"]["connections"] = [
+        {"rooms": rooms, "heat_exchange": 30}
+        for rooms in (["room0", "room1"], ["room1", "room2"])
+    ]
+    config_path = str(tmp_path / "building.json")
+    with open(config_path, "w") as file:
+        json.dump(config, file)
+    runners = [ShardedRunner(config_path, shards, 60) for shards in (1, 2)]
+    assert runners[1].partition == [["room1", "room2", "room3"], ["room4"]]
+    single, sharded = [runner.run(1)["room_reports"] for runner in runners]
+    # The perfectly insulated room cools down through its connections, in the same shard
+    assert single["room0"]["temperature"] < 25
+    assert single == sharded
+    # A connection between rooms of different shards cannot be integrated
+    rooms, _, _ = configure_rooms_from_file(
+        config_path, test_mode=True, room_keys=["room1", "room2"]
+    )
+    building = shard_building(rooms, config["world"]["connections"][:1])
+    assert building.rooms == rooms
+    with pytest.raises(ValueError, match="different shards"):
+        shard_building(rooms, config["world"]["connections"])
+    assert shard_building(rooms[:1], []) is None
@@ -100,3 +100,23 @@ def test_telegram_from_simulated_3():
     knx_t = parser.from_simulator_telegram(simulator_t)
 
     assert str(simulator_t) == str(parser.from_knx_telegram(knx_t))
+
+
+def test_telegram_read_response():
+    parser = TelegramParser({"1/1/1": FloatPayload})
+    ga1 = sim_addr.GroupAddress("3-levels", 1, 1, 1)
+    ia1 = sim_addr.IndividualAddress(0, 0, 1)
+
+    read_t = sim_t.Telegram(ia1, ga1, None, sim_t.GROUP_VALUE_READ)
+    knx_t = parser.from_simulator_telegram(read_t)
+    assert isinstance(knx_t.payload, GroupValueRead)
+    parsed_t = parser.from_knx_telegram(knx_t)
+    assert parsed_t.apci == sim_t.GROUP_VALUE_READ and parsed_t.payload is None
+    assert parsed_t.destination == ga1
+
+    response_t = sim_t.Telegram(ia1, ga1, FloatPayload(21.5), sim_t.GROUP_VALUE_RESPONSE)
+    knx_t = parser.from_simulator_telegram(response_t)
+    assert isinstance(knx_t.payload, GroupValueResponse)
+    parsed_t = parser.from_knx_telegram(knx_t)
+    assert parsed_t.apci == sim_t.GROUP_VALUE_RESPONSE
+    assert parsed_t.payload.content == 21.5
@@ -398,6 +398,46 @@ def test_update_state_actuator():
         Telegram(led1.individual_addr, ga, BinaryPayload(False))
     )
 
+    # The service of the telegrams is kept: a dimmer response is forwarded as a binary response, a read as a read
+    from system.telegrams import GROUP_VALUE_READ, GROUP_VALUE_RESPONSE
+
+    interface_device.update_state(
+        Telegram(
+            led1.individual_addr,
+            ga,
+            DimmerPayload(True, 50),
+            GROUP_VALUE_RESPONSE,
+        )
+    )
+    interface_device.update_state(
+        Telegram(led1.individual_addr, ga, None, GROUP_VALUE_READ)
+    )
+    element = parser.from_knx_telegram(
+        interface_device.interface._Interface__sending_queue.get()
+    )
+    assert element.apci == GROUP_VALUE_RESPONSE
+    assert isinstance(element.payload, BinaryPayload) and element.payload.content
+    element = parser.from_knx_telegram(
+        interface_device.interface._Interface__sending_queue.get()
+    )
+    assert element.apci == GROUP_VALUE_READ and element.payload is None
+    # The handlers are resolved once per actuator class and payload class, not at each telegram
+    import gc, weakref
+
+    interface_device.payload_handlers = None  # would fail if called again
+    interface_device.update_state(bin_telegram)
+    assert interface_device.payload_handler(FloatPayload).__func__ is (
+        interface_device.payload_handler(FloatPayload).__func__
+    )
+    # The actuator keeps no reference cycle through its handlers
+    reference = weakref.ref(led1)
+    gc.disable()
+    try:
+        del led1
+        assert reference() is None
+    finally:
+        gc.enable()
+
 
 def test_fails_on_wrong_update_value():
 
@@ -490,3 +530,678 @@ def test_sensors_send_telegrams():
     try_sending_state(humidity_air1)
     try_sending_state(humidity_soil1)
     try_sending_state(co2sensor1)
+
+
+def test_routing_only_to_destination_group_address():
+    button1 = dev.Button("button1", IndividualAddress(0, 0, 12))
+    led1 = dev.LED("led1", IndividualAddress(0, 0, 1))
+    led2 = dev.LED("led2", IndividualAddress(0, 0, 2))
+    room1 = Room(
+        "bedroom1",
+        20,
+        20,
+        3,
+        180,
+        "3-levels",
+        system_dt,
+        "good",
+        20.0,
+        50.0,
+        300,
+        test_mode=False,
+        svshi_mode=False,
+        telegram_logging=False,
+    )
+    room1.add_device(button1, 5, 5, 1)
+    room1.add_device(led1, 0, 0, 0)
+    room1.add_device(led2, 1, 0, 0)
+    # Many group addresses on the bus, only one shared by button1 and led1
+    for sub in range(200):
+        room1.attach(led2, "2/0/" + str(sub))
+    room1.attach(button1, "1/1/1")
+    room1.attach(led1, "1/1/1")
+
+    button1.user_input(True)
+    assert led1.state == True
+    assert led2.state == False
+
+    from system.telegrams import Telegram, BinaryPayload
+    from system import GroupAddress
+
+    # Telegram to a group address without any device is simply dropped
+    room1.knxbus.transmit_telegram(
+        Telegram(
+            button1.individual_addr,
+            GroupAddress("3-levels", 5, 5, 5),
+            BinaryPayload(False),
+        )
+    )
+    assert led1.state == True and led2.state == False
+
+
+@pytest.mark.asyncio
+async def test_queued_bus_scheduled_delivery():
+    from system.telegrams import Telegram, BinaryPayload
+    from system import GroupAddress
+
+    button1 = dev.Button("button1", IndividualAddress(0, 0, 12))
+    led1 = dev.LED("led1", IndividualAddress(0, 0, 1))
+    room1 = Room(
+        "bedroom1",
+        20,
+        20,
+        3,
+        180,
+        "3-levels",
+        system_dt,
+        "good",
+        20.0,
+        50.0,
+        300,
+        test_mode=False,
+        svshi_mode=False,
+        telegram_logging=False,
+    )
+    room1.add_device(button1, 5, 5, 1)
+    room1.add_device(led1, 0, 0, 0)
+    room1.attach(button1, "1/1/1")
+    room1.attach(led1, "1/1/1")
+    clock = [0]
+    room1.knxbus.start_dispatcher(lambda: clock[0])
+
+    # Telegrams are only queued by the sender, and delivered by the dispatcher
+    button1.user_input(True)
+    assert led1.state == False
+    assert room1.knxbus.pending_telegrams() == 1
+    await room1.knxbus.flush()
+    assert led1.state == True
+    # Telegrams due at the same time are delivered in emission order
+    ga = GroupAddress("3-levels", 1, 1, 1)
+    for value in [False, True, False]:
+        room1.knxbus.transmit_telegram(
+            Telegram(button1.individual_addr, ga, BinaryPayload(value))
+        )
+    await room1.knxbus.flush()
+    assert led1.state == False
+    # Delayed telegram is delivered once the simulated time reaches its delivery time
+    room1.knxbus.transmit_telegram(
+        Telegram(button1.individual_addr, ga, BinaryPayload(True)), delay=60
+    )
+    await room1.knxbus.flush()
+    assert led1.state == False
+    clock[0] = 60
+    room1.knxbus.tick()
+    await room1.knxbus.flush()
+    assert led1.state == True
+    assert room1.knxbus.pending_telegrams() == 0
+    # Stopping the dispatcher delivers the remaining telegrams and reverts to synchronous mode
+    room1.knxbus.transmit_telegram(
+        Telegram(button1.individual_addr, ga, BinaryPayload(False)), delay=3600
+    )
+    await room1.knxbus.stop_dispatcher()
+    assert led1.state == False
+    button1.user_input(True)
+    assert led1.state == True
+
+
+def test_transmit_batch():
+    from system.telegrams import Telegram, BinaryPayload
+    from system import GroupAddress
+
+    button1 = dev.Button("button1", IndividualAddress(0, 0, 12))
+    led1 = dev.LED("led1", IndividualAddress(0, 0, 1))
+    led2 = dev.LED("led2", IndividualAddress(0, 0, 2))
+    room1 = Room(
+        "bedroom1",
+        20,
+        20,
+        3,
+        180,
+        "3-levels",
+        system_dt,
+        "good",
+        20.0,
+        50.0,
+        300,
+        test_mode=False,
+        svshi_mode=False,
+        telegram_logging=False,
+    )
+    room1.add_device(button1, 5, 5, 1)
+    room1.add_device(led1, 0, 0, 0)
+    room1.add_device(led2, 1, 0, 0)
+    room1.attach(button1, "1/1/1")
+    room1.attach(button1, "1/1/2")
+    room1.attach(led1, "1/1/1")
+    room1.attach(led2, "1/1/2")
+    # A device sends one telegram per group address in a single batch
+    button1.user_input(True)
+    assert led1.state == True and led2.state == True
+
+    # Telegrams to the same destination are delivered in the order of the batch
+    ga1 = GroupAddress("3-levels", 1, 1, 1)
+    ga2 = GroupAddress("3-levels", 1, 1, 2)
+    room1.knxbus.transmit_batch(
+        [
+            Telegram(button1.individual_addr, ga1, BinaryPayload(False)),
+            Telegram(button1.individual_addr, ga2, BinaryPayload(False)),
+            Telegram(button1.individual_addr, ga1, BinaryPayload(True)),
+            Telegram(
+                button1.individual_addr,
+                GroupAddress("3-levels", 5, 5, 5),
+                BinaryPayload(False),
+            ),
+        ]
+    )
+    assert led1.state == True and led2.state == False
+
+    # Telegrams sent inside a batch are only delivered when the batch is closed
+    with room1.knxbus.batch():
+        button1.user_input(False)
+        assert led1.state == True
+        with room1.knxbus.batch():
+            room1.knxbus.transmit_telegram(
+                Telegram(button1.individual_addr, ga2, BinaryPayload(True))
+            )
+        assert led2.state == False
+    assert led1.state == False and led2.state == True
+
+    # Telegrams of another thread (e.g. svshi receiving thread) are not held back by an open batch
+    import threading
+
+    with room1.knxbus.batch():
+        sender = threading.Thread(
+            target=room1.knxbus.transmit_telegram,
+            args=(Telegram(button1.individual_addr, ga2, BinaryPayload(False)),),
+        )
+        sender.start()
+        sender.join()
+        assert led2.state == False
+
+
+def test_bus_history():
+    from system.telegrams import Telegram, BinaryPayload, FloatPayload
+    from system import GroupAddress, KNXBus
+
+    knxbus = KNXBus(history_size=8)
+    clock = [0]
+    knxbus.set_simulation_time(lambda: clock[0])
+    source = IndividualAddress(0, 0, 12)
+    ga1 = GroupAddress("3-levels", 1, 1, 1)
+    ga2 = GroupAddress("3-levels", 1, 1, 2)
+    records_size = knxbus.history._TelegramHistory__records.nbytes
+    for t in range(20):
+        clock[0] = t
+        if t % 4 == 0:
+            knxbus.transmit_telegram(Telegram(source, ga2, FloatPayload(t / 2)))
+        else:
+            knxbus.transmit_telegram(
+                Telegram(source, ga1, BinaryPayload(t % 2 == 1))
+            )
+    # Memory is fixed, only the last 8 telegrams (t=12..19) are kept
+    assert knxbus.history._TelegramHistory__records.nbytes == records_size
+    assert len(knxbus.history) == 8 and knxbus.history.total == 20
+    assert list(knxbus.history.last(100)["time"]) == list(range(12, 20))
+    # Per group address queries
+    assert list(knxbus.history.last(3, ga1.raw)["time"]) == [17, 18, 19]
+    assert list(knxbus.history.last(3, ga2.raw)["value"]) == [6.0, 8.0]
+    assert knxbus.history.count_since(15, ga1.raw) == 4
+    assert knxbus.history.count_since(15, ga2.raw) == 1
+    assert knxbus.history.count_since(15) == 5
+    assert knxbus.history.count_since(0) == 8
+    assert knxbus.history.count_since(0, GroupAddress("3-levels", 5, 5, 5).raw) == 0
+    history_dict = knxbus.get_history_info("3-levels", 2, ga2)
+    assert history_dict["last telegrams"] == [
+        {
+            "simtime": 12,
+            "source": "0.0.12",
+            "destination": "1/1/2",
+            "payload": "FloatPayload",
+            "value": 6.0,
+        },
+        {
+            "simtime": 16,
+            "source": "0.0.12",
+            "destination": "1/1/2",
+            "payload": "FloatPayload",
+            "value": 8.0,
+        },
+    ]
+
+
+def test_telegram_record_round_trip():
+    import numpy as np
+    from system.telegrams import Telegram, DimmerPayload
+    from system.telegram_history import (
+        TELEGRAM_RECORD_DTYPE,
+        telegram_record,
+        record_telegram,
+        TelegramHistory,
+    )
+    from system import GroupAddress
+
+    ga = GroupAddress("3-levels", 1, 1, 1)
+    invalid_source = IndividualAddress(0, 0, 300)  # wrong address, raw is None
+    assert invalid_source.raw is None
+    for source in (IndividualAddress(0, 0, 12), invalid_source):
+        telegram = Telegram(source, ga, DimmerPayload(True, 40))
+        records = np.array([telegram_record(telegram, 3.0)], TELEGRAM_RECORD_DTYPE)
+        received = record_telegram(records[0], "3-levels")
+        assert received.source.ia_str == source.ia_str
+        assert received.destination is ga
+        assert received.payload.content == True
+        assert received.payload.state_ratio == 40
+        assert TelegramHistory.to_dicts(records, "3-levels")[0]["source"] == (
+            source.ia_str
+        )
+    # The wrong addresses are not interned
+    assert IndividualAddress.from_raw(None) is not IndividualAddress.from_raw(None)
+
+
+def test_delivery_plans():
+    from system.telegrams import Telegram, BinaryPayload, FloatPayload
+    from system import GroupAddress, KNXBus
+
+    knxbus = KNXBus()
+    led1 = dev.LED("led1", IndividualAddress(0, 0, 1))
+    heater1 = dev.Heater("heater1", IndividualAddress(0, 0, 2), 400)
+    test_receive = TestingReceiveDevice(
+        "testingreceivedevice", IndividualAddress(0, 0, 30)
+    )
+    ga = GroupAddress("3-levels", 1, 1, 1)
+    knxbus.attach(led1, ga)
+    knxbus.attach(heater1, ga)
+    knxbus.attach(test_receive, ga)
+    ga_bus = knxbus._KNXBus__ga_buses[ga.raw]
+    # Plans are compiled at attach time, actuators without payload handlers receive all telegrams with update_state()
+    # All devices are on line 0.0
+    assert [key for key, _ in ga_bus.delivery_plans[BinaryPayload]] == [0]
+    assert len(ga_bus.delivery_plans[BinaryPayload][0][1]) == 3
+    assert ga_bus.delivery_plans[FloatPayload] == [(0, [test_receive.update_state])]
+
+    class CustomPayload(BinaryPayload):
+        pass
+
+    # Payload classes not compiled in advance use the handlers of their closest parent class
+    knxbus.transmit_telegram(Telegram(led1.individual_addr, ga, CustomPayload(True)))
+    assert led1.state == True and heater1.state == True and test_receive.state == True
+    assert len(ga_bus.delivery_plans[CustomPayload][0][1]) == 3
+    # Plans are recompiled when an actuator is detached
+    knxbus.detach(heater1, ga)
+    assert heater1 not in [
+        handler.__self__
+        for _, handlers in ga_bus.delivery_plans[BinaryPayload]
+        for handler in handlers
+    ]
+    assert CustomPayload not in ga_bus.delivery_plans
+    knxbus.transmit_telegram(Telegram(led1.individual_addr, ga, BinaryPayload(False)))
+    assert led1.state == False and heater1.state == True
+
+
+def test_telegram_slots_and_shared_payloads():
+    import copy
+    import pickle
+    from system.telegrams import Telegram, BinaryPayload, DimmerPayload, FloatPayload
+
+    # Binary on/off payloads are shared and immutable
+    assert BinaryPayload(True) is BinaryPayload.ON
+    assert BinaryPayload(binary_state=False) is BinaryPayload.OFF
+    with pytest.raises(AttributeError):
+        BinaryPayload.ON.content = False
+    assert pickle.loads(pickle.dumps(BinaryPayload.ON)) is BinaryPayload.ON
+    assert copy.deepcopy(BinaryPayload.OFF) is BinaryPayload.OFF
+    # Dimmer payloads are not shared
+    dimmer = DimmerPayload(True, 40)
+    assert dimmer is not DimmerPayload(True, 40)
+    assert pickle.loads(pickle.dumps(dimmer)).state_ratio == 40
+    # No instance dict
+    telegram = Telegram(led1.individual_addr, None, FloatPayload(2.5))
+    for obj in (telegram, telegram.payload, dimmer, BinaryPayload.ON):
+        assert not hasattr(obj, "__dict__")
+
+
+def test_bus_topology():
+    from system.telegrams import Telegram, BinaryPayload
+    from system import GroupAddress, KNXBus
+
+    knxbus = KNXBus()
+    switch1 = dev.Switch("switch1", IndividualAddress(1, 1, 1))
+    led1 = dev.LED("led1", IndividualAddress(1, 1, 2))  # same line as switch1
+    led2 = dev.LED("led2", IndividualAddress(1, 2, 1))  # same area, other line
+    led3 = dev.LED("led3", IndividualAddress(2, 1, 1))  # other area
+    led4 = dev.LED("led4", IndividualAddress(1, 2, 2))
+    ga1 = GroupAddress("3-levels", 1, 1, 1)
+    ga2 = GroupAddress("3-levels", 1, 1, 2)
+    for device in (switch1, led1, led2, led3):
+        knxbus.attach(device, ga1)
+    knxbus.attach(led4, ga2)
+    lines = knxbus._KNXBus__lines
+    areas = knxbus._KNXBus__areas
+    line_11, line_12, line_21 = lines[0x11], lines[0x12], lines[0x21]
+    # Filter tables are derived from the group addresses of the devices below the couplers
+    assert ga1.raw in line_11.coupler.filter_table
+    assert ga2.raw not in line_11.coupler.filter_table
+    assert ga2.raw in line_12.coupler.filter_table
+    assert len(line_12.coupler.filter_table) == 2
+    assert len(areas[1].coupler.filter_table) == 2
+    assert len(areas[2].coupler.filter_table) == 1
+
+    # ga1 telegram from line 1.1: local delivery, then forwarded to line 1.2 and through the backbone to area 2
+    knxbus.transmit_telegram(Telegram(switch1.individual_addr, ga1, BinaryPayload(True)))
+    assert led1.state == True and led2.state == True and led3.state == True
+    assert line_11.load == 1 and line_12.load == 1 and line_21.load == 1
+    assert line_11.coupler.forwarded == 1
+    assert areas[1].load == 1 and areas[2].load == 1
+    assert knxbus.backbone_load == 1 and areas[1].coupler.forwarded == 1
+
+    # ga2 telegram from line 1.1 is blocked by its line coupler: led4 on line 1.2 does not receive it
+    knxbus.transmit_telegram(Telegram(switch1.individual_addr, ga2, BinaryPayload(True)))
+    assert led4.state == False
+    assert line_11.load == 2 and line_12.load == 1
+    assert line_11.coupler.blocked == 1
+
+    # Telegrams from outside the topology (e.g. SVSHI) are injected on the backbone
+    knxbus.transmit_telegram(Telegram(IndividualAddress(0, 0, 0), ga2, BinaryPayload(True)))
+    assert led4.state == True and line_12.load == 2
+
+    # Detaching the last device of a line using a group address removes it from the filter tables
+    knxbus.detach(led3, ga1)
+    assert ga1.raw not in line_21.coupler.filter_table
+    assert ga1.raw not in areas[2].coupler.filter_table
+    assert "topology" in knxbus.get_info()
+    assert knxbus.get_topology_info()["area 1"]["line 1.2"]["load"] == 2
+
+
+def test_bus_fault_quarantine():
+    from system.telegrams import Telegram, BinaryPayload
+    from system import GroupAddress, KNXBus
+    from system.circuit_breaker import CircuitBreaker
+
+    class FaultyLED(dev.LED):
+        def payload_handlers(self):
+            return {}  # all telegrams are received with update_state()
+
+        def update_state(self, telegram):
+            self.received = getattr(self, "received", 0) + 1
+            raise ValueError("faulty led")
+
+    knxbus = KNXBus()
+    knxbus.breaker = CircuitBreaker(max_failures=3, failure_window=5, quarantine_ticks=2)
+    faulty = FaultyLED("faultyled10", IndividualAddress(0, 0, 10))
+    led2 = dev.LED("led2", IndividualAddress(0, 0, 2))
+    ga = GroupAddress("3-levels", 1, 1, 1)
+    knxbus.attach(faulty, ga)
+    knxbus.attach(led2, ga)
+    for state in (True, False, True, False):
+        knxbus.transmit_telegram(Telegram(led2.individual_addr, ga, BinaryPayload(state)))
+    # The 3rd failure quarantines the faulty device, other devices still receive telegrams
+    assert faulty.received == 3 and led2.state == False
+    assert knxbus.breaker.is_quarantined(faulty)
+    faulty_info = knxbus.get_info()["fault quarantine"]["devices"]["faultyled10"]
+    assert faulty_info["failures"] == 3 and faulty_info["quarantined"] == True
+    assert faulty_info["last error"] == "ValueError: faulty led"
+    # Released after quarantine_ticks ticks
+    knxbus.tick()
+    knxbus.transmit_telegram(Telegram(led2.individual_addr, ga, BinaryPayload(True)))
+    assert faulty.received == 3
+    knxbus.tick()
+    assert not knxbus.breaker.is_quarantined(faulty)
+    knxbus.transmit_telegram(Telegram(led2.individual_addr, ga, BinaryPayload(True)))
+    assert faulty.received == 4
+    assert knxbus.get_info()["fault quarantine"]["devices"]["faultyled10"]["quarantines"] == 1
+
+
+def test_bus_subscriptions(tmp_path, monkeypatch):
+    from system.telegrams import Telegram, BinaryPayload, FloatPayload
+    from system import GroupAddress, KNXBus, TelegramLogger
+    from system.subscriptions import parse_group_address_pattern
+
+    assert len(parse_group_address_pattern("*")) == 65536
+    assert len(parse_group_address_pattern("1/*/*")) == 2048
+    assert len(parse_group_address_pattern("2/0-3/*")) == 1024
+    assert len(parse_group_address_pattern("0-4095")) == 4096
+    assert parse_group_address_pattern("1/8/0") is None
+    assert parse_group_address_pattern("4096-1") is None
+
+    knxbus = KNXBus()
+    led1 = dev.LED("led1", IndividualAddress(0, 0, 1))
+    ga1 = GroupAddress("3-levels", 1, 1, 1)
+    ga2 = GroupAddress("3-levels", 2, 0, 5)  # no device assigned
+    knxbus.attach(led1, ga1)
+    all_traffic, main_1 = [], []
+    knxbus.subscribe(all_traffic.append, "*", "monitor")
+    main_1_subscription = knxbus.subscribe(main_1.append, "1/*/*", "gateway")
+    assert knxbus.subscribe(all_traffic.append, "1/*/x") is None
+    log_path = str(tmp_path / "telegram_logs.txt")
+    telegram_logger = TelegramLogger(log_path)
+    knxbus.subscribe(telegram_logger, "0-4095")  # main groups 0 and 1
+
+    telegram1 = Telegram(led1.individual_addr, ga1, BinaryPayload(True))
+    telegram2 = Telegram(led1.individual_addr, ga2, FloatPayload(2.5))
+    knxbus.transmit_telegram(telegram1)
+    knxbus.transmit_batch([telegram2, telegram1])
+    # Taps receive the telegrams matching their pattern, even without device assigned to the group address
+    assert led1.state == True
+    assert all_traffic == [telegram1, telegram2, telegram1]
+    assert main_1 == [telegram1, telegram1]
+    assert knxbus.get_info()["subscriptions"]["gateway"] == {
+        "pattern": "1/*/*",
+        "received": 2,
+    }
+    assert knxbus.unsubscribe(main_1_subscription)
+    assert not knxbus.unsubscribe(main_1_subscription)
+    knxbus.transmit_telegram(telegram1)
+    assert len(main_1) == 2 and len(all_traffic) == 4
+    telegram_logger.close()
+    with open(log_path) as log_file:
+        lines = log_file.read().strip().split("\n")
+    assert len(lines) == 4 and lines[1] == "0.0.1 -> 1/1/1: BinaryPayload(True)"
+
+    # The telegram logger of a room is closed with the room, e.g. when the simulation is reloaded
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "logs").mkdir()
+    room = Room(
+        "bedroom", 5, 4, 3, 60, "3-levels", test_mode=True, telegram_logging=True
+    )
+    room.knxbus.transmit_telegram(telegram1)
+    room.close()
+    assert room.telegram_logger is None
+    with open(room.telegram_logging_file_path) as log_file:
+        assert log_file.read().endswith("0.0.1 -> 1/1/1: BinaryPayload(True)")
+
+
+def test_group_value_read():
+    from system.telegrams import (
+        Telegram,
+        BinaryPayload,
+        FloatPayload,
+        GROUP_VALUE_READ,
+        GROUP_VALUE_RESPONSE,
+    )
+    from system import GroupAddress, KNXBus
+
+    knxbus = KNXBus()
+    therm1 = dev.Thermometer("thermometer1", IndividualAddress(0, 0, 7))
+    therm1.temperature = 21.5
+    led1 = dev.LED("led1", IndividualAddress(0, 0, 1))
+    button1 = dev.Button("button1", IndividualAddress(0, 0, 12))
+    ga_temp = GroupAddress("3-levels", 1, 1, 1)
+    ga_light = GroupAddress("3-levels", 1, 1, 2)
+    ga_none = GroupAddress("3-levels", 1, 1, 3)
+    knxbus.attach(therm1, ga_temp)
+    knxbus.attach(led1, ga_light)
+    knxbus.attach(button1, ga_light)
+    button1.connect_to(knxbus)
+    client = IndividualAddress(0, 0, 0)
+    monitor = []
+    knxbus.subscribe(monitor.append, "*", "monitor")
+
+    # Cache miss: the readable thermometer answers
+    knxbus.transmit_telegram(Telegram(client, ga_temp, None, GROUP_VALUE_READ))
+    assert [telegram.apci for telegram in monitor] == [
+        GROUP_VALUE_READ,
+        GROUP_VALUE_RESPONSE,
+    ]
+    response = monitor[1]
+    assert response.source == therm1.individual_addr
+    assert isinstance(response.payload, FloatPayload)
+    assert response.payload.content == 21.5
+    assert knxbus.last_value(ga_temp) is response.payload
+    # Cache hit: the value of the last write is returned, the response is not delivered to actuators
+    button1.user_input(state=True)
+    assert led1.state == True
+    led1.state = False
+    knxbus.transmit_telegram(Telegram(client, ga_light, None, GROUP_VALUE_READ))
+    assert monitor[-1].apci == GROUP_VALUE_RESPONSE
+    assert monitor[-1].payload is BinaryPayload.ON
+    assert monitor[-1].source == button1.individual_addr
+    assert led1.state == False
+    # No device assigned to the group address
+    knxbus.transmit_telegram(Telegram(client, ga_none, None, GROUP_VALUE_READ))
+    assert monitor[-1].apci == GROUP_VALUE_READ
+    assert knxbus.get_info()["group value reads"] == {
+        "cache": 1,
+        "device": 1,
+        "unanswered": 1,
+    }
+    history = knxbus.get_history_info("3-levels", n=2)["last telegrams"]
+    assert history[0]["apci"] == "GroupValueResponse" and history[0]["value"] == True
+    assert history[1]["apci"] == "GroupValueRead" and history[1]["payload"] is None
+
+
+def test_sensor_publish_policy():
+    therm1 = dev.Thermometer("thermometer1", IndividualAddress(0, 0, 7))
+    presence1 = dev.PresenceSensor("presencesensor1", IndividualAddress(0, 0, 8))
+    test_receive = TestingReceiveDevice(
+        "testingreceivedevice", IndividualAddress(0, 0, 30)
+    )
+    room1 = Room(
+        "bedroom1",
+        20,
+        20,
+        3,
+        180,
+        "3-levels",
+        system_dt,
+        "good",
+        20.0,
+        50.0,
+        300,
+        test_mode=False,
+        svshi_mode=False,
+        telegram_logging=False,
+    )
+    room1.add_device(therm1, 5, 5, 1)
+    room1.add_device(presence1, 6, 5, 1)
+    room1.add_device(test_receive, 5, 6, 1)
+    room1.attach(therm1, "1/1/1")
+    room1.attach(presence1, "1/1/2")
+    room1.attach(test_receive, "1/1/1")
+    # Sensors are only connected to the bus in svshi mode
+    therm1.connect_to(room1.knxbus)
+    presence1.connect_to(room1.knxbus)
+    clock = [0]
+    room1.knxbus.set_simulation_time(lambda: clock[0])
+
+    # Default policy publishes at every call
+    therm1.send_state()
+    therm1.send_state()
+    assert therm1.publish_policy.sent == 2 and therm1.publish_policy.suppressed == 0
+
+    therm1.publish_policy = dev.PublishPolicy.from_config(
+        {"cov_threshold": 0.5, "min_interval": 60, "max_interval": 600}
+    )
+    published = []
+    for t, temperature in [
+        (0, 20.0),  # first value always published
+        (30, 25.0),  # before min_interval
+        (60, 20.2),  # change below cov_threshold
+        (120, 21.0),  # change above cov_threshold
+        (720, 21.0),  # unchanged, but heartbeat after max_interval
+        (780, 21.0),  # unchanged
+    ]:
+        clock[0] = t
+        therm1.temperature = temperature
+        test_receive.state = False
+        therm1.send_state()
+        published.append(test_receive.state)
+    assert published == [True, False, False, True, True, False]
+    assert therm1.publish_policy.sent == 3 and therm1.publish_policy.suppressed == 3
+
+    # Change only policy on a binary sensor
+    presence1.publish_policy = dev.PublishPolicy(change_only=True)
+    for state in [False, False, True, True, False]:
+        presence1.state = state
+        presence1.send_state()
+    assert presence1.publish_policy.get_info()["sent"] == 3
+    assert presence1.publish_policy.get_info()["suppressed"] == 2
+    assert room1.knxbus.history.count_since(0, 0x0902) == 3  # 1/1/2
+
+    # Incorrect policy configuration falls back on the default policy
+    policy = dev.PublishPolicy.from_config({"min_interval": 60, "max_interval": 10})
+    assert policy.to_config() == dev.PublishPolicy().to_config()
+
+
+def test_trace_points(tmp_path):
+    import json
+    from system import (
+        GroupAddress,
+        KNXBus,
+        MemorySink,
+        FileSink,
+        TRACER,
+        trace_point,
+        enable_tracing,
+        disable_tracing,
+    )
+
+    knxbus = KNXBus()
+    led1 = dev.LED("led1", IndividualAddress(0, 0, 1))
+    button1 = dev.Button("button1", IndividualAddress(0, 0, 2))
+    button1.connect_to(knxbus)
+    ga1 = GroupAddress("3-levels", 1, 1, 1)
+    # Disabled trace points emit nothing
+    memory_sink = MemorySink()
+    TRACER.add_sink(memory_sink)
+    knxbus.attach(led1, ga1)
+    assert not TRACER.points["bus.attach"].enabled
+    assert len(memory_sink.events) == 0
+    TRACER.remove_sink(memory_sink)
+
+    file_path = str(tmp_path / "trace.jsonl")
+    file_sink = FileSink(file_path)
+    enable_tracing("bus.*", memory_sink)
+    enable_tracing("device.*", file_sink)
+    try:
+        knxbus.attach(button1, ga1)
+        button1.user_input()
+        knxbus.detach(button1, ga1)
+        attach_events = memory_sink.named("bus.attach")
+        assert [event.fields for event in attach_events] == [
+            {"device": "button1", "group_address": "1/1/1", "ga_bus": "added"}
+        ]
+        assert memory_sink.named("bus.detach")[0].fields["ga_bus"] == "removed"
+        states = memory_sink.named("device.actuator.state")
+        assert len(states) == 1
+        assert states[0].fields == {"device": "led1", "state": True, "source": "0.0.2"}
+        assert memory_sink.named("device.user_input")[0].fields["state"] == True
+        # Trace points created after enabling match the enabled patterns
+        assert trace_point("bus.test").enabled
+        assert not trace_point("test.point").enabled
+        disable_tracing("bus.*")
+        assert not TRACER.points["bus.attach"].enabled
+        assert TRACER.points["device.user_input"].enabled
+    finally:
+        disable_tracing()
+    assert TRACER.sinks == []
+    assert not any(point.enabled for point in TRACER.points.values())
+    with open(file_path) as trace_file:
+        events = [json.loads(line) for line in trace_file]
+    # Sinks receive the events of all enabled trace points
+    assert [event["name"] for event in events] == [
+        "bus.attach",
+        "device.user_input",
+        "device.actuator.state",
+        "bus.detach",
+    ]
+    assert events[2]["device"] == "led1" and "timestamp" in events[2]
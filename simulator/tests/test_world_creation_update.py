@@ -1,6 +1,9 @@
 """ test World creation, updates and state changes"""
 import pytest
 import logging
+import math
+import copy
+import json
 from datetime import timedelta, datetime
 
 import system
@@ -297,11 +300,12 @@ def test_world_configfile_creation_and_update():
     room_conf.update_world(
         interval=system_dt, gui_mode=False
     )  # second update change the value from one system_dt
-    new_temp_in = 24.0
-    new_hum_in = 52.51
+    # Exponential relaxation toward outdoor values during 3 simulated minutes, at the insulation rates per hour
+    new_temp_in = 24.95  # NOTE: 20 + 5 * exp(-0.2 * 0.05)
+    new_hum_in = 49.61
     new_co2_in = 793
-    new_p_sat_in = 2985.81505025  # NOTE: or temp = 24.0 and hum = 52.51
-    new_vapor_pressure_in = 1567.7352283984  # NOTE: for temp = 24.0 and hum = 52.51
+    new_p_sat_in = 3160.51344769  # NOTE: or temp = 24.95 and hum = 49.61
+    new_vapor_pressure_in = 1567.92772954  # NOTE: for temp = 24.95 and hum = 49.61
     new_simtime = "0:03:00"
     # Time
     updated_datetime = date_time + timedelta(seconds=system_dt * speed_factor)
@@ -311,10 +315,10 @@ def test_world_configfile_creation_and_update():
     assert round(system_brightness1.brightness, 1) == brightness
     # Temperature
     assert (
-        world_conf.ambient_temperature._AmbientTemperature__temperature_in
+        round(world_conf.ambient_temperature._AmbientTemperature__temperature_in, 2)
         == new_temp_in
     )
-    assert round(system_airsensor1.temperature, 1) == new_temp_in
+    assert round(system_airsensor1.temperature, 2) == new_temp_in
     # Humidity
     assert (
         round(world_conf.ambient_humidity._AmbientHumidity__humidity_in, 2)
@@ -325,7 +329,7 @@ def test_world_configfile_creation_and_update():
         == new_p_sat_in
     )
     assert (
-        world_conf.ambient_humidity._AmbientHumidity__vapor_pressure_in
+        round(world_conf.ambient_humidity._AmbientHumidity__vapor_pressure_in, 8)
         == new_vapor_pressure_in
     )
     assert round(system_airsensor1.humidity, 2) == new_hum_in
@@ -335,3 +339,622 @@ def test_world_configfile_creation_and_update():
     # Presence and humidity did not change
     assert system_presence1.state == presence
     assert system_humiditysoil1.humiditysoil == humiditysoil
+
+
+def test_vectorized_illuminance():
+    room = system.Room("illuminanceroom", 12.5, 10, 3, 180, "3-levels", test_mode=True)
+    leds = [
+        dev.LED(f"led{i}", system.IndividualAddress(0, 0, 10 + i)) for i in range(3)
+    ]
+    for led, loc in zip(leds, [(2, 2, 3), (6, 5, 3), (10, 8, 1)]):
+        room.add_device(led, *loc)
+    sensors = [
+        dev.Brightness(f"brightness{i}", system.IndividualAddress(0, 0, 20 + i))
+        for i in range(3)
+    ]
+    ir_sensors = [
+        room.add_device(sensor, *loc)
+        for sensor, loc in zip(sensors, [(1, 1, 1), (6, 5, 3), (11, 9, 1)])
+    ]
+    room.add_window(system.Window("window1", room, "north", 2, [2, 1.5]))
+    room.add_window(system.Window("window2", room, "west", 3, [1, 1]))
+    leds[0].state, leds[1].state = True, True
+    leds[1].state_ratio = 40
+
+    def scalar_lux(source, sensor, distance):
+        if distance <= 0.01:
+            return source.device.effective_lumen()
+        solid_angle = 4 * math.pi * (math.sin(source.device.beam_angle / 4)) ** 2
+        return source.device.effective_lumen() / (solid_angle * distance**2)
+
+    def scalar_brightness(sensor):
+        brightness = sum(
+            scalar_lux(source, sensor, world.compute_distance(source, sensor))
+            for source in room.devices
+            if isinstance(source.device, dev.LED) and source.device.state
+        )
+        brightness += sum(
+            scalar_lux(window, sensor, world.compute_distance_from_window(window, sensor))
+            for window in room.windows
+        )
+        return brightness
+
+    ambient_light = room.world.ambient_light
+    brightness_levels = ambient_light.update(room.world.time.date_time)[0]
+    assert [name for name, _ in brightness_levels] == [s.name for s in sensors]
+    for ir_sensor, (_, brightness) in zip(ir_sensors, brightness_levels):
+        assert brightness == pytest.approx(scalar_brightness(ir_sensor))
+        assert ir_sensor.device.brightness == brightness
+    # The geometry is cached, and recomputed when a device moves
+    geometry = ambient_light._AmbientLight__illuminance.geometry
+    assert ambient_light._AmbientLight__illuminance.geometry is geometry
+    ir_sensors[0].update_location(new_x=9, new_y=1, new_z=2)
+    assert ambient_light._AmbientLight__illuminance.geometry is not geometry
+    brightness_levels = ambient_light.update(room.world.time.date_time)[0]
+    assert brightness_levels[0][1] == pytest.approx(scalar_brightness(ir_sensors[0]))
+
+
+def test_illuminance_grid():
+    room = system.Room("gridroom", 12.5, 10, 3, 180, "3-levels", test_mode=True)
+    leds = [
+        dev.LED(f"led{i}", system.IndividualAddress(0, 0, 10 + i)) for i in range(2)
+    ]
+    for led, loc in zip(leds, [(2, 2, 3), (10, 8, 3)]):
+        room.add_device(led, *loc)
+    # Sensors on grid nodes (0.5m spacing) and between nodes
+    sensors = [
+        dev.Brightness(f"brightness{i}", system.IndividualAddress(0, 0, 20 + i))
+        for i in range(2)
+    ]
+    for sensor, loc in zip(sensors, [(3, 4, 1), (6.2, 5.1, 1.3)]):
+        room.add_device(sensor, *loc)
+    room.add_window(system.Window("window1", room, "north", 2, [2, 1.5]))
+    leds[0].state = True
+    ambient_light = room.world.ambient_light
+    exact = [level for _, level in ambient_light.update(room.world.time.date_time)[0]]
+    assert ambient_light.lux_field() is None
+
+    assert ambient_light.set_grid((room.width, room.length, room.height), -1) is None
+    assert ambient_light.set_grid((room.width, room.length, room.height), 0.5) == 1
+    engine = ambient_light._AmbientLight__illuminance
+    assert [len(axis) for axis in engine.grid_axes] == [26, 21, 7]
+    ambient_light.update(room.world.time.date_time)
+    levels = [sensor.brightness for sensor in sensors]
+    assert levels[0] == pytest.approx(exact[0])  # on a node
+    assert levels[1] == pytest.approx(exact[1], rel=0.05)  # interpolated
+    # The lux field is rebuilt only when the sources change
+    field = ambient_light.lux_field()
+    assert field.shape == (26, 21)
+    rebuilds = engine.rebuilds
+    ambient_light.update(room.world.time.date_time)
+    assert ambient_light.lux_field() is field and engine.rebuilds == rebuilds
+    leds[1].state = True
+    assert ambient_light.lux_field() is not field
+    assert engine.rebuilds == rebuilds + 1
+    assert ambient_light.lux_field()[20, 16] > field[20, 16]  # under led1
+    assert ambient_light.get_global_brightness(room) == pytest.approx(
+        ambient_light.lux_field().mean(), abs=0.01
+    )
+
+
+def test_dirty_ambients_report_only_changed_sensors():
+    room = system.Room(
+        "dirtyroom",
+        5,
+        4,
+        3,
+        60,
+        "3-levels",
+        insulation="perfect",
+        date_time="2022/06/13/01/00",
+        test_mode=True,
+    )
+    led = dev.LED("led1", system.IndividualAddress(0, 0, 1))
+    heater = dev.Heater("heater1", system.IndividualAddress(0, 0, 2))
+    brightness = dev.Brightness("brightness1", system.IndividualAddress(0, 0, 3))
+    thermometer = dev.Thermometer("thermometer1", system.IndividualAddress(0, 0, 4))
+    presence = dev.PresenceSensor("presencesensor1", system.IndividualAddress(0, 0, 5))
+    room.add_device(led, 2, 2, 3)
+    room.add_device(heater, 4, 1, 1)
+    ir_brightness = room.add_device(brightness, 1, 1, 1)
+    for sensor in (thermometer, presence):
+        room.add_device(sensor, 3, 3, 1)
+    world_conf = room.world
+
+    def changed(first_update=False):
+        levels = world_conf.update(first_update)
+        return [
+            name
+            for ambient_levels in levels[4:6] + levels[7:]
+            for name, _ in ambient_levels
+        ]
+
+    assert changed(first_update=True) == [
+        "brightness1",
+        "thermometer1",
+        "presencesensor1",
+    ]
+    # Night and perfect insulation without heating: nothing changes
+    assert changed() == [] and changed() == []
+    assert not world_conf.ambient_light._AmbientLight__dirty
+    assert not world_conf.ambient_temperature._AmbientTemperature__dirty
+    led.state = True
+    assert world_conf.ambient_light._AmbientLight__dirty
+    assert changed() == ["brightness1"]
+    assert world_conf.ambient_light.get_global_brightness() == round(
+        brightness.brightness, 2
+    )
+    ir_brightness.update_location(new_x=2, new_y=2)
+    assert changed() == ["brightness1"]
+    heater.state = True
+    assert changed() == ["thermometer1"] and changed() == ["thermometer1"]
+    world_conf.presence.add_entity("person")
+    assert presence.state
+    assert changed() == ["thermometer1", "presencesensor1"]
+    heater.state = False
+    assert changed() == []
+
+
+def test_temperature_field():
+    room = system.Room(
+        "fieldroom", 5, 4, 3, 180, "3-levels", insulation="average", test_mode=True
+    )
+    heater = dev.Heater("heater1", system.IndividualAddress(0, 0, 1), state=True)
+    near, far = [
+        dev.Thermometer(f"thermometer{i}", system.IndividualAddress(0, 0, 2 + i))
+        for i in range(2)
+    ]
+    room.add_device(heater, 0.5, 0.5, 1)
+    room.add_device(near, 1, 1, 1)
+    room.add_device(far, 4.5, 3.5, 1)
+    room.add_window(system.Window("window1", room, "north", 1, [1, 1]))
+    ambient_temperature = room.world.ambient_temperature
+    assert world.TemperatureField.from_config(room, {"resolution": -1}) is None
+    field = world.TemperatureField.from_config(room, {"resolution": 0.05})
+    assert field.shape == (100, 80)
+    ambient_temperature.set_field(field)
+    room.world.update(first_update=True)
+    mean = ambient_temperature._AmbientTemperature__temperature_in
+    assert near.temperature == far.temperature == mean
+    for _ in range(20):
+        room.world.update(first_update=False)
+    # The mean of the field stays the room's temperature, warmer near the heater
+    mean = ambient_temperature._AmbientTemperature__temperature_in
+    assert field.field(mean).mean() == pytest.approx(mean)
+    assert near.temperature > mean > far.temperature
+    # The exact integration in the cosine basis matches an explicit step of the stencil over a short duration
+    args = (mean, ambient_temperature.temperature_out, 0.2, [(room.devices[0], 1)])
+    forcing, coarse = world.TemperatureField(room, 0.25), world.TemperatureField(
+        room, 0.25
+    )
+    forcing.step(1e-9, *args)
+    coarse.step(1e-3, *args)
+    before = coarse.field(0)
+    coarse.step(1e-6, *args)
+    explicit = 1e-6 * (
+        20 * world.laplacian(before, coarse.spacings)
+        - 0.2 * before
+        + forcing.field(0) / 1e-9
+    )
+    scale = abs(explicit).max()
+    assert coarse.field(0) - before == pytest.approx(explicit, abs=1e-2 * scale)
+
+
+def test_outdoor_light_site_and_sun_events_cache():
+    start = datetime(2022, 3, 1)
+    timestamps = [start + timedelta(minutes=13 * i) for i in range(4000)]
+    world.sun_events.cache_clear()
+    for weather in ["clear", "overcast", "dark"]:
+        lux_array = world.outdoor_light_array(timestamps, weather)
+        assert list(lux_array) == pytest.approx(
+            [world.outdoor_light(t, weather)[0] for t in timestamps]
+        )
+    # Sun events are computed once per day
+    days = len({t.date() for t in timestamps})
+    assert world.sun_events.cache_info().misses == days
+    # Site in another time zone, sun events in local time
+    new_york = world.Site.from_config(
+        {"latitude": 40.71, "longitude": -74.0, "timezone": "America/New_York"}
+    )
+    assert new_york == world.Site(40.71, -74.0, "America/New_York")
+    dawn, sunrise, noon, sunset, dusk = world.sun_events(new_york, start.date())
+    assert 11 <= noon.hour <= 13 and noon.tzinfo is not None
+    assert world.outdoor_light(datetime(2022, 3, 1, 12), "clear", new_york) == (
+        10752,
+        "sun",
+    )
+    assert world.outdoor_light(datetime(2022, 3, 1, 23), "clear", new_york)[1] == "moon"
+    # Polar day and night, without sun events
+    tromso = world.Site(69.65, 18.96, "Europe/Oslo")
+    assert world.sun_events(tromso, datetime(2022, 6, 21).date()) is None
+    polar_times = [datetime(2022, 6, 21, 0, 30), datetime(2022, 12, 21, 0, 30)]
+    assert [world.outdoor_light(t, "clear", tromso)[1] for t in polar_times] == [
+        "sun",
+        "moon",
+    ]
+    assert list(world.outdoor_light_array(polar_times, "clear", tromso)) == [
+        10752,
+        0.108,
+    ]
+    # Incorrect site, default site is used
+    assert world.Site.from_config({"latitude": 95}) == world.DEFAULT_SITE
+    assert world.Site.from_config({"timezone": "Mars/Olympus"}) == world.DEFAULT_SITE
+
+
+def test_headless_fast_forward(tmp_path):
+    from tools.headless import HeadlessRunner, run_headless
+
+    config_path = "config/config_test_config.json"
+    room, _ = tools.configure_system_from_file(config_path, test_mode=True)
+    runner = HeadlessRunner(room, simulated_dt=60)
+    report = runner.run(hours=2)
+    assert report["ticks"] == 120 and report["simulated_dt"] == 60
+    assert report["simulated_time"] == 7200
+    assert room.world.time.simulation_time() == 7200
+    assert report["ticks_per_s"] > 0 and report["speedup"] > 1
+    # Script waits advance the simulated time, commands are executed at their simulated timestamps
+    script_path = tmp_path / "headless_script.txt"
+    script_path.write_text(
+        "store world simtime st0\n"
+        "wait 1 h\n"
+        "store world simtime st1\n"
+        "wait 90 m\n"
+        "store world simtime st2\n"
+        "end\n"
+    )
+    room, report = run_headless(
+        config_path, hours=3, simulated_dt=600, script_path=str(script_path)
+    )
+    assert report["script_success"] == 1
+    assert report["stored_values"]["st0"] == "0:00:00"
+    assert report["stored_values"]["st1"] == "1:00:00"
+    assert report["stored_values"]["st2"] == "2:30:00"
+    # Remaining simulated time after the script
+    assert report["ticks"] == 18 and report["simulated_time"] == 3 * 3600
+    # Queued bus, telegrams delivered at their simulated delivery time
+    room, report = run_headless(
+        config_path, hours=1, simulated_dt=60, bus_mode=tools.config_tools.QUEUED_BUS_MODE
+    )
+    assert report["ticks"] == 60
+
+
+def test_event_driven_headless_skips_quiescent_updates():
+    from tools.headless import HeadlessRunner
+
+    def build_room():
+        room = system.Room(
+            "bedroom",
+            12.5,
+            10,
+            3,
+            60,
+            "3-levels",
+            test_mode=True,
+            date_time="2022/06/13/05/00",
+        )
+        heater = dev.Heater("heater1", system.IndividualAddress(0, 0, 11), 400)
+        heater.state = True
+        room.add_device(heater, 1, 1, 1)
+        sensors = [
+            (
+                dev.Thermometer("thermometer1", system.IndividualAddress(0, 0, 12)),
+                (0.5, 60, 3600),
+            ),
+            (
+                dev.HumidityAir("humidityair1", system.IndividualAddress(0, 0, 13)),
+                (1, 0, 7200),
+            ),
+            (
+                dev.CO2Sensor("co2sensor1", system.IndividualAddress(0, 0, 14)),
+                (20, 0, None),
+            ),
+            (
+                dev.Brightness("brightness1", system.IndividualAddress(0, 0, 15)),
+                (50, 300, 14400),
+            ),
+            (
+                dev.HumiditySoil("humiditysoil1", system.IndividualAddress(0, 0, 16)),
+                (1.99, 0, None),
+            ),
+        ]
+        for index, (sensor, policy) in enumerate(sensors):
+            sensor.publish_policy = dev.PublishPolicy(*policy)
+            room.add_device(sensor, 3 + index, 3, 1)
+            room.attach(sensor, f"1/1/{index + 1}")
+            sensor.connect_to(room.knxbus)
+        sensors[4][0].humiditysoil = 60
+        room.add_window(system.Window("window1", room, "north", 4, [3, 1.5]))
+        return room
+
+    rooms, reports = [], []
+    for event_driven in (False, True):
+        room = build_room()
+        reports.append(HeadlessRunner(room, 60, event_driven=event_driven).run(48))
+        rooms.append(room)
+    tick_report, event_report = reports
+    assert tick_report["ticks"] == event_report["ticks"] == 48 * 60
+    assert tick_report["updates"] == 48 * 60
+    assert event_report["updates"] < tick_report["updates"] / 10
+    # Same telegrams, published at the same simulated times, with closed-form ambient values
+    tick_history = rooms[0].knxbus.history.last(4096)
+    event_history = rooms[1].knxbus.history.last(4096)
+    assert len(tick_history) == len(event_history) > 0
+    assert list(tick_history["time"]) == list(event_history["time"])
+    assert list(tick_history["destination"]) == list(event_history["destination"])
+    assert max(abs(tick_history["value"] - event_history["value"])) < 1e-6
+    # Same publish policies counters, the skipped updates are counted as suppressed
+    for tick_device, event_device in zip(rooms[0].devices, rooms[1].devices):
+        if isinstance(tick_device.device, dev.Sensor):
+            assert (
+                tick_device.device.publish_policy.get_info()
+                == event_device.device.publish_policy.get_info()
+            )
+    for ambient in ("temperature", "humidity", "co2"):
+        assert rooms[0].world.get_info(ambient, rooms[0], False) == rooms[
+            1
+        ].world.get_info(ambient, rooms[1], False)
+    # Outdoor light boundaries are interesting instants
+    date_time = datetime(2022, 6, 13, 12, 0)
+    boundary = world.next_outdoor_light_change(date_time)
+    dawn, sunrise, noon, sunset, dusk = world.sun_events(
+        world.DEFAULT_SITE, date_time.date()
+    )
+    assert boundary == (noon + (sunset - noon) / 2).replace(tzinfo=None)
+    assert world.next_outdoor_light_change(datetime(2022, 6, 13, 23, 0)) == datetime(
+        2022, 6, 14
+    )
+
+
+def test_exponential_relaxation_is_dt_consistent():
+    # Closed form: composing two steps gives the same value as a single step of the total duration
+    one_step = world.exponential_relaxation(20, 10, 0.3, 2, forcing=1.5)
+    two_steps = world.exponential_relaxation(
+        world.exponential_relaxation(20, 10, 0.3, 0.5, forcing=1.5),
+        10,
+        0.3,
+        1.5,
+        forcing=1.5,
+    )
+    assert abs(one_step - two_steps) < 1e-12
+    assert world.exponential_relaxation(20, 10, 0, 2, forcing=1.5) == 23
+    # Equilibrium at target + forcing / rate
+    assert abs(world.exponential_relaxation(20, 10, 0.3, 1000, 1.5) - 15) < 1e-9
+
+    from tools.headless import HeadlessRunner
+
+    def build_room():
+        room = system.Room(
+            "bedroom",
+            12.5,
+            10,
+            3,
+            60,
+            "3-levels",
+            insulation="bad",
+            test_mode=True,
+            date_time="2022/06/13/05/00",
+        )
+        heater = dev.Heater("heater1", system.IndividualAddress(0, 0, 11), 400)
+        heater.state = True
+        room.add_device(heater, 1, 1, 1)
+        ac = dev.AC("ac1", system.IndividualAddress(0, 0, 12), 400)
+        ac.state = True
+        ac.state_ratio = 50
+        room.add_device(ac, 12, 9, 1)
+        return room
+
+    # Same trajectory at hourly checkpoints, whatever the simulated dt
+    trajectories = []
+    for simulated_dt in (1, 60, 3600):
+        room = build_room()
+        runner = HeadlessRunner(room, simulated_dt)
+        trajectory = []
+        for _ in range(6):
+            runner.run(1)
+            trajectory.append(
+                (
+                    room.world.ambient_temperature._AmbientTemperature__temperature_in,
+                    room.world.ambient_humidity._AmbientHumidity__vapor_pressure_in,
+                    room.world.ambient_co2._AmbientCO2__co2_in,
+                )
+            )
+        trajectories.append(trajectory)
+    for trajectory in trajectories[1:]:
+        for values, reference in zip(trajectory, trajectories[0]):
+            for value, reference_value in zip(values, reference):
+                assert abs(value - reference_value) < 1e-6
+
+
+def test_building_vectorized_exchanges(tmp_path):
+    def build_room(name, insulation="good", temp_in=25.0, co2_in=800):
+        return system.Room(
+            name,
+            5,
+            4,
+            3,
+            60,
+            "3-levels",
+            insulation=insulation,
+            temp_in=temp_in,
+            co2_in=co2_in,
+            test_mode=True,
+            date_time="2022/06/13/05/00",
+        )
+
+    # A single room in a building evolves as a room alone
+    alone, in_building = build_room("bedroom"), build_room("bedroom")
+    for room in (alone, in_building):
+        heater = dev.Heater("heater1", system.IndividualAddress(0, 0, 11), 400)
+        heater.state = True
+        room.add_device(heater, 1, 1, 1)
+    building = world.Building([in_building])
+    assert in_building.world.building is building and alone.world.building is None
+    for _ in range(10):
+        alone.update_world()
+        building.update()
+    for ambient in ("temperature", "humidity", "co2"):
+        assert alone.world.get_info(
+            ambient, alone, False
+        ) == in_building.world.get_info(ambient, in_building, False)
+
+    # Two rooms with perfect insulation tend to their mean values, conserved by the exchanges
+    rooms = [
+        build_room("bedroom", "perfect", 30.0, 1200),
+        build_room("kitchen", "perfect", 20.0, 400),
+        build_room("attic", "perfect", 10.0, 500),
+    ]
+    building = world.Building(rooms, [("bedroom", "kitchen", 30, 30)])
+    assert not building.add_connection("bedroom", "garage", 30)
+    assert not building.add_connection("bedroom", "attic", -1)
+    for _ in range(24 * 60):
+        building.update()
+    info = building.get_info()
+    assert info["bedroom"]["temperature_in"] == info["kitchen"]["temperature_in"] == 25
+    assert info["bedroom"]["co2_in"] == info["kitchen"]["co2_in"] == 800
+    assert info["attic"] == {
+        "temperature_in": 10,
+        "vapor_pressure_in": round(building.values[1, 2], 2),
+        "co2_in": 500,
+    }
+    assert rooms[1].world.ambient_temperature.get_temperature() == 25
+    assert rooms[1].world.ambient_co2.get_co2() == 800
+
+    # Rooms of a configuration file, connected through the 'connections' of the world
+    with open("config/sim_config_bedroom.json", "r") as file:
+        config = json.load(file)
+    kitchen = copy.deepcopy(config["world"]["rooms"]["room1"])
+    kitchen["name"] = "kitchen"
+    config["world"]["rooms"]["room2"] = kitchen
+    config["world"]["number_of_rooms"] = 2
+    config["world"]["connections"] = [
+        {"rooms": ["bedroom1", "kitchen"], "heat_exchange": 30, "air_exchange": 10},
+        {"rooms": ["bedroom1"]},
+    ]
+    config_path = tmp_path / "building_config.json"
+    config_path.write_text(json.dumps(config))
+    building, _ = tools.configure_building_from_file(str(config_path), test_mode=True)
+    assert [room.name for room in building.rooms] == ["bedroom1", "kitchen"]
+    assert building.exchanges().shape == (3, 2)
+    building.update()
+    building.update()
+    bedroom, kitchen = building.rooms
+    assert (
+        bedroom.world.time.simulation_time() == kitchen.world.time.simulation_time() > 0
+    )
+    # Same configuration, same evolution
+    assert (
+        building.values[0, 0]
+        == building.values[0, 1]
+        != config["world"]["inside_temperature"]
+    )
+
+
+def test_building_reads_the_values_set_through_the_rooms():
+    bedroom, kitchen, attic = rooms = [
+        system.Room(
+            name, 5, 4, 3, 60, "3-levels", insulation=insulation, test_mode=True
+        )
+        for name, insulation in (
+            ("bedroom", "good"),
+            ("kitchen", "good"),
+            ("attic", "perfect"),
+        )
+    ]
+    building = world.Building(rooms)
+    building.update()
+    # Values set through the API of the rooms are integrated from the next update
+    bedroom.world.set_ambient_value("temperature_in", 30)
+    bedroom.world.set_ambient_value("co2_in", 1000)
+    kitchen.world.set_ambient_value("temperature_out", 35)
+    building.update()
+    assert 29.9 < bedroom.world.ambient_temperature.get_temperature() < 30
+    assert 990 < bedroom.world.ambient_co2.get_co2() < 1000
+    assert kitchen.world.ambient_temperature.get_temperature() > 25
+    # A heater added after the creation of the building heats its room
+    heater = dev.Heater("heater1", system.IndividualAddress(0, 0, 11), 400, state=True)
+    attic.add_device(heater, 1, 1, 1)
+    building.update()
+    assert attic.world.ambient_temperature.get_temperature() > 25
+
+
+def test_building_measures_the_sensors_and_defers_the_quiet_rooms():
+    def build_room(name):
+        room = system.Room(
+            name,
+            5,
+            4,
+            3,
+            60,
+            "3-levels",
+            insulation="good",
+            temp_in=25.0,
+            co2_in=800,
+            date_time="2022/06/13/01/00",
+            test_mode=True,
+        )
+        heater = dev.Heater("heater1", system.IndividualAddress(0, 0, 11), 400)
+        heater.state = True
+        room.add_device(heater, 1, 1, 1)
+        sensors = [
+            (
+                dev.Thermometer("thermometer1", system.IndividualAddress(0, 0, 12)),
+                (0.5, 60, 3600),
+            ),
+            (
+                dev.HumidityAir("humidityair1", system.IndividualAddress(0, 0, 13)),
+                (1, 0, 7200),
+            ),
+            (
+                dev.CO2Sensor("co2sensor1", system.IndividualAddress(0, 0, 14)),
+                (20, 0, None),
+            ),
+        ]
+        for index, (sensor, policy) in enumerate(sensors):
+            sensor.publish_policy = dev.PublishPolicy(*policy)
+            room.add_device(sensor, 3 + index, 3, 1)
+            room.attach(sensor, f"1/1/{index + 1}")
+            sensor.connect_to(room.knxbus)
+        return room
+
+    # The sensors measured by the building publish as the sensors of a room alone
+    alone, in_building = build_room("bedroom"), build_room("bedroom")
+    quiet = system.Room(
+        "attic", 5, 4, 3, 60, "3-levels", date_time="2022/06/13/01/00", test_mode=True
+    )
+    led = dev.LED("led1", system.IndividualAddress(0, 0, 1))
+    brightness = dev.Brightness("brightness1", system.IndividualAddress(0, 0, 3))
+    quiet.add_device(led, 2, 2, 3)
+    quiet.add_device(brightness, 1, 1, 1)
+    building = world.Building([in_building, quiet])
+    assert quiet.world.time is in_building.world.time
+    for tick in range(6 * 60):
+        if tick == 3 * 60:  # the forcing of the building follows the state of the heater
+            for room in (alone, in_building):
+                room.devices[0].device.state = False
+        alone.update_world()
+        building.update()
+    alone_history, building_history = [
+        room.knxbus.history.last(4096) for room in (alone, in_building)
+    ]
+    assert len(alone_history) == len(building_history) > 0
+    assert list(alone_history["time"]) == list(building_history["time"])
+    assert list(alone_history["destination"]) == list(building_history["destination"])
+    assert max(abs(alone_history["value"] - building_history["value"])) < 1e-6
+    for alone_device, building_device in zip(alone.devices, in_building.devices):
+        if isinstance(alone_device.device, dev.Sensor):
+            assert (
+                alone_device.device.publish_policy.get_info()
+                == building_device.device.publish_policy.get_info()
+            )
+    for ambient in ("temperature", "humidity", "co2"):
+        assert alone.world.get_info(ambient, alone, False) == in_building.world.get_info(
+            ambient, in_building, False
+        )
+    # The quiet room is only updated at its interesting instants, and at the next update after a change
+    tick = building._Building__tick
+    assert building._Building__last[1] < tick
+    assert brightness.brightness == 0
+    led.state = True
+    building.update()
+    assert building._Building__last[1] == tick + 1 and brightness.brightness > 0
+    assert quiet.world.time.simulation_time() == 6 * 60 * 60  # first update without time advance
@@ -3,6 +3,9 @@ Package tools that gather classes and function tools necessary for the good func
 parser: parse CLIarguments, CLI and API commands
 check: check functions to verify values when intializing or modifying classes or elements
 config: functions to configure the system at start or when the user reloads it.
+headless: fast-forward simulation without GUI nor scheduler.
+sharding: headless simulation of the rooms in several processes, with the telegrams bridged in shared memory.
+montecarlo: headless simulations of drawn scenarios in a process pool, with summary statistics of the sampled series.
 """
 
 from .parser_tools import (
@@ -21,4 +24,12 @@ from .check_tools import (
     check_weather_date,
     check_window,
 )
-from .config_tools import configure_system, configure_system_from_file, DEV_CLASSES
+from .config_tools import (
+    configure_system,
+    configure_system_from_file,
+    configure_building_from_file,
+    DEV_CLASSES,
+)
+from .headless import HeadlessRunner, run_headless
+from .sharding import ShardedRunner, run_sharded
+from .montecarlo import MonteCarloRunner, run_montecarlo
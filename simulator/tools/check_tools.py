@@ -60,7 +60,7 @@ def check_individual_address(
     if type(line) == str:
         try:
             assert line.isnumeric(), f"line='{line}' is not a number, "
-            area_check = int(line)
+            line_check = int(line)
         except AssertionError as assert_msg:
             ia_assert_msg += str(assert_msg)
     else:
@@ -78,7 +78,7 @@ def check_individual_address(
     if type(device) == str:
         try:
             assert device.isnumeric(), f"device number='{device}' is not a number, "
-            area_check = int(device)
+            device_check = int(device)
         except AssertionError as assert_msg:
             ia_assert_msg += str(assert_msg)
     else:
@@ -6,10 +6,11 @@ import json
 import logging
 import os
 import sys
-from typing import Tuple
+from typing import Collection, Tuple
 
 import devices as dev
 from system.system_tools import IndividualAddress, Window
+from system.circuit_breaker import CircuitBreaker
 from .check_tools import check_group_address, check_simulation_speed_factor
 
 
@@ -35,6 +36,9 @@ CLI_INT_MODE = "cli"
 ## User interface mode, this flag is only taken into account if INTERFACE_MODE = CLI_MODE, no CLI if GUI launched
 SCRIPT_MODE = "script"
 CLI_COM_MODE = "cli"
+## KNX bus mode, queued mode is only taken into account if INTERFACE_MODE = CLI_MODE
+SYNC_BUS_MODE = "sync"  # telegrams delivered on the stack of the sender
+QUEUED_BUS_MODE = "queued"  # telegrams delivered by an asyncio dispatcher task
 ## Configuration mode
 FILE_CONFIG = "file"  # configuration from json file
 DEFAULT_CONFIG = "default"  # configuration from default json file (~3devices)
@@ -123,8 +127,51 @@ def configure_system_from_file(
     svshi_mode: bool = False,
     telegram_logging: bool = False,
 ):
-    """System configuration from JSON configuration file parsing."""
+    """System configuration from JSON configuration file parsing, return the first room (see configure_building_from_file() for all rooms)."""
+    rooms, system_dt, _ = configure_rooms_from_file(
+        config_file_path, system_dt, test_mode, svshi_mode, telegram_logging
+    )
+    return rooms[0], system_dt
+
+
+def configure_building_from_file(
+    config_file_path: str,
+    system_dt: float = 1,
+    test_mode: bool = False,
+    svshi_mode: bool = False,
+    telegram_logging: bool = False,
+):
+    """
+    System configuration from JSON configuration file parsing, with all the rooms in a building
+    exchanging heat and air through the 'connections' of the world configuration.
+
+    return building, system_dt : Tuple[Building, float]
+    """
+    from world import Building
+
+    rooms, system_dt, world_config = configure_rooms_from_file(
+        config_file_path, system_dt, test_mode, svshi_mode, telegram_logging
+    )
+    return Building.from_config(rooms, world_config.get("connections", [])), system_dt
+
+
+def configure_rooms_from_file(
+    config_file_path: str,
+    system_dt: float = 1,
+    test_mode: bool = False,
+    svshi_mode: bool = False,
+    telegram_logging: bool = False,
+    room_keys: Collection[str] = None,
+):
+    """
+    Parse the JSON configuration file to create the rooms, their devices and group addresses.
+
+    room_keys : keys of the rooms to create (e.g. 'room1'), e.g. the rooms of a shard, all rooms if None.
+
+    return rooms, system_dt, world_config : Tuple[List[Room], float, Dict]
+    """
     from system import Room
+    from world import Site, TemperatureField
 
     global interface, interface_device
     with open(config_file_path, "r") as file:
@@ -180,6 +227,8 @@ def configure_system_from_file(
                 f"'{room_key}' not defined in config file, or wrong number of rooms."
             )
             continue
+        if room_keys is not None and room_key not in room_keys:
+            continue
         x, y, z = room_config["dimensions"]
         room_insulation = room_config["insulation"]
         # creation of a room of x*y*zm3
@@ -224,6 +273,26 @@ def configure_system_from_file(
         room_devices_config = room_config["room_devices"]
         # Store temporarily the room object with devices and their physical position
         rooms_builders.append([room, room_devices_config])
+    if any(key in world_config for key in Site.CONFIG_KEYS):
+        site = Site.from_config(world_config)
+        for room in rooms:
+            room.world.set_site(site)
+    if "illuminance_resolution" in world_config:
+        for room in rooms:
+            room.world.ambient_light.set_grid(
+                (room.width, room.length, room.height),
+                world_config["illuminance_resolution"],
+            )
+    if "temperature_field" in world_config:
+        for room in rooms:
+            room.world.ambient_temperature.set_field(
+                TemperatureField.from_config(room, world_config["temperature_field"])
+            )
+    if "fault_quarantine" in knx_config:
+        for room in rooms:
+            room.knxbus.breaker = CircuitBreaker.from_config(
+                knx_config["fault_quarantine"]
+            )
     # Parsing of devices to add in the room
     print(" ------- Room devices from configuration file -------")
     logging.info(" ------- Room devices from configuration file -------")
@@ -264,6 +333,14 @@ def configure_system_from_file(
                     )
                     continue
                 print(dev_key)
+                if not any(
+                    dev_key in rooms_config[key].get("room_devices", {})
+                    for key in rooms_config
+                ):
+                    logging.warning(
+                        f"{dev_key} is defined on KNX system but no physical location in the room was given ==> device is rejected."
+                    )
+                    continue
                 # room_builder = list of [room_object, room_devices_config] for all rooms of the system
                 for room_builder in rooms_builders:
                     if dev_key in room_builder[1].keys():
@@ -272,30 +349,37 @@ def configure_system_from_file(
                         dev_object = DEV_CLASSES[dev_class](
                             dev_key, IndividualAddress(_a, _l, _d)
                         )  # state False(OFF) by default
+                        if "publish_policy" in device_config:
+                            if isinstance(dev_object, dev.Sensor):
+                                dev_object.publish_policy = dev.PublishPolicy.from_config(
+                                    device_config["publish_policy"]
+                                )
+                            else:
+                                logging.warning(
+                                    f"{dev_key} is not a sensor, its publish policy is ignored."
+                                )
                         room_builder[0].add_device(
                             dev_object, dev_pos[0], dev_pos[1], dev_pos[2]
                         )
-                    else:
-                        logging.warning(
-                            f"{dev_key} is defined on KNX system but no physical location in the room was given ==> device is rejected."
-                        )
-                        continue
     # Parsing of group addresses to connect devices together
     logging.info(" ------- KNX System Configuration -------")
     ga_style = knx_config["group_address_style"]
     ga_builders = knx_config["group_addresses"]
     if len(ga_builders):
+        room_devices = {}  # devices of all rooms by name
+        for room in rooms:
+            for in_room_device in room.devices:
+                room_devices.setdefault(in_room_device.name, []).append(
+                    (room, in_room_device.device)
+                )
         for ga_builder in ga_builders:
             group_address = ga_builder["address"]
             group_devices = ga_builder["group_devices"]
             # Loop on devices connected to this ga
             for dev_name in group_devices:
-                for room in rooms:
-                    for in_room_device in room.devices:
-                        if in_room_device.name == dev_name:
-                            dev_object = in_room_device.device
-                            # Link the device to the ga (internal test to check Group Address format)
-                            room.attach(dev_object, group_address)
+                for room, dev_object in room_devices.get(dev_name, []):
+                    # Link the device to the ga (internal test to check Group Address format)
+                    room.attach(dev_object, group_address)
     else:
         logging.info("No group address is defined in config file.")
-    return rooms[0], system_dt  # only one room for now
+    return rooms, system_dt, world_config
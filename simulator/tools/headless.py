@@ -0,0 +1,189 @@
+"""
+Headless fast-forward simulation: the world is updated in a tight loop with a fixed simulated dt,
+without scheduler, sleep nor GUI, for a number of simulated hours and/or the duration of a script.
+Script 'wait' commands advance the simulated time instead of sleeping, and in queued bus mode the delayed telegrams
+are delivered after each update, at their simulated delivery time.
+
+In event-driven mode, the quiescent updates are skipped: the runner jumps to the next interesting instant
+(end of a script wait, telegram delivery, sensor publication or outdoor light boundary, see World.next_event()),
+and the ambient states are advanced in closed form across the gap.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from typing import Dict, Tuple, Union
+
+from .parser_tools import ScriptParser
+from .config_tools import configure_system_from_file, SYNC_BUS_MODE, QUEUED_BUS_MODE
+
+
+class HeadlessRunner:
+    """Class to run a room's simulation as fast as possible, decoupled from the wall-clock"""
+
+    def __init__(
+        self,
+        room,
+        simulated_dt: float = None,
+        bus_mode: str = SYNC_BUS_MODE,
+        event_driven: bool = False,
+    ) -> None:
+        """
+        Initialization of a headless runner, that should update the room from the start of its simulation.
+
+        room : Room
+        simulated_dt : simulated seconds between two world updates, system_dt * speed_factor of the configuration if None
+        bus_mode : sync or queued delivery of telegrams on the KNX Bus
+        event_driven : if True, skip the quiescent updates and jump to the next interesting instant
+
+        ticks : number of world updates simulated, updates : number of world updates computed (fewer than ticks in event-driven mode),
+        __target_time : simulated time the runner has advanced to,
+        the remainders of waits that are not a multiple of simulated_dt are carried over to the next advance.
+        """
+        self.room = room
+        if simulated_dt is not None:
+            room.world.set_simulated_dt(simulated_dt)
+        self.simulated_dt = room.world.time.simulated_dt
+        self.ticks = 0
+        self.updates = 0
+        self.wall_time = 0.0
+        self.__bus_mode = bus_mode
+        self.__event_driven = event_driven
+        self.__started = False
+        self.__target_time = room.world.time.simulation_time()
+
+    async def __update(self, ticks: int = 1) -> None:
+        self.room.update_world(updates=ticks)
+        if self.__bus_mode == QUEUED_BUS_MODE:
+            await self.room.knxbus.flush()
+
+    def __next_event(self, max_ticks: int) -> int:
+        """Return the number of ticks (1 to max_ticks) until the next telegram delivery or interesting instant of the world"""
+        delivery_time = self.room.knxbus.next_delivery_time()
+        if delivery_time is not None:
+            delay = delivery_time - self.room.world.time.simulation_time()
+            max_ticks = min(max_ticks, max(1, math.ceil(delay / self.simulated_dt)))
+        return self.room.world.next_event(max_ticks)
+
+    async def advance(self, seconds: float) -> int:
+        """Update the world until seconds simulated seconds elapsed (to the closest update), return the number of updates."""
+        start = time.perf_counter()
+        if not self.__started:  # first update, initial states without time advance
+            self.__started = True
+            await self.__update()
+        sim_time = self.room.world.time.simulation_time
+        self.__target_time += seconds
+        ticks = 0
+        while sim_time() + self.simulated_dt / 2 <= self.__target_time:
+            step = 1
+            if (
+                self.__event_driven
+            ):  # updates until the target time, as in tick-by-tick mode
+                remaining = int(
+                    (self.__target_time - sim_time()) / self.simulated_dt + 0.5
+                )
+                step = self.__next_event(remaining)
+            await self.__update(step)
+            ticks += step
+            self.updates += 1
+        self.ticks += ticks
+        self.wall_time += time.perf_counter() - start
+        return ticks
+
+    async def __start_bus(self) -> None:
+        if self.__bus_mode == QUEUED_BUS_MODE:
+            self.room.knxbus.start_dispatcher(self.room.world.time.simulation_time)
+
+    async def __run(self, hours: float) -> None:
+        await self.__start_bus()
+        await self.advance(hours * 3600)
+        await self.room.knxbus.stop_dispatcher()
+
+    async def __run_script(
+        self, script_path: str, hours: Union[float, None]
+    ) -> Tuple[int, ScriptParser]:
+        await self.__start_bus()
+        start_time = self.__target_time
+        script_parser = ScriptParser(wait=self.advance)
+        success = 1
+        with open(script_path, "r") as script_file:
+            for command in script_file.readlines():
+                ret, _ = await script_parser.script_command_parser(self.room, command)
+                if ret is None:
+                    logging.warning("The script has failed.")
+                    success = 0
+                    break
+                if ret == 0:  # 'end' command
+                    break
+        remaining = start_time + (hours or 0) * 3600 - self.__target_time
+        if success and remaining > 0:
+            await self.advance(remaining)
+        await self.room.knxbus.stop_dispatcher()
+        return success, script_parser
+
+    def run(self, hours: float) -> Dict[str, float]:
+        """Simulate hours simulated hours, return the run report."""
+        asyncio.run(self.__run(hours))
+        return self.report()
+
+    def run_script(
+        self, script_path: str, hours: float = None
+    ) -> Tuple[int, ScriptParser, Dict[str, float]]:
+        """
+        Run the commands of a script at their simulated timestamps, then simulate until hours simulated hours if given.
+        Return 1 if the script succeeded (0 otherwise), the script parser with the stored values and assertions, and the run report.
+        """
+        success, script_parser = asyncio.run(self.__run_script(script_path, hours))
+        return success, script_parser, self.report()
+
+    def report(self) -> Dict[str, float]:
+        """Return the number of ticks and computed updates, the simulated and wall-clock durations, the ticks per second and the speedup of the run"""
+        simulated_time = self.room.world.time.simulation_time()
+        return {
+            "ticks": self.ticks,
+            "updates": self.updates,
+            "simulated_dt": self.simulated_dt,
+            "simulated_time": simulated_time,
+            "wall_time": self.wall_time,
+            "ticks_per_s": self.ticks / self.wall_time if self.wall_time else 0.0,
+            "speedup": simulated_time / self.wall_time if self.wall_time else 0.0,
+        }
+
+
+def run_headless(
+    config_path: str,
+    hours: float = None,
+    simulated_dt: float = None,
+    script_path: str = None,
+    bus_mode: str = SYNC_BUS_MODE,
+    event_driven: bool = False,
+) -> Tuple[object, Dict[str, float]]:
+    """
+    Configure a system from a JSON configuration file and simulate it headless,
+    for hours simulated hours and/or the commands of a script.
+    Return the room and the run report, with the script success, stored values and assertions if a script is given.
+    """
+    room, _ = configure_system_from_file(config_path)
+    runner = HeadlessRunner(room, simulated_dt, bus_mode, event_driven)
+    if script_path is None:
+        return room, runner.run(hours or 0)
+    success, script_parser, report = runner.run_script(script_path, hours)
+    report.update(
+        {
+            "script_success": success,
+            "stored_values": script_parser.stored_values,
+            "assertions": script_parser.assertions,
+        }
+    )
+    return room, report
+
+
+def format_report(report: Dict[str, float]) -> str:
+    skipped = ""
+    if report["updates"] < report["ticks"]:
+        skipped = f" ({report['updates']} computed, quiescent updates skipped)"
+    return (
+        f"{report['ticks']} updates of {report['simulated_dt']:g} simulated seconds{skipped} in {report['wall_time']:.3f} s: "
+        f"{report['ticks_per_s']:.0f} ticks/s, {report['speedup']:.0f}x real time"
+    )
@@ -0,0 +1,349 @@
+"""
+Monte Carlo scenarios of a configuration file: independent headless simulations of the configured room,
+with the weather, insulation, start datetime and indoor/outdoor conditions drawn from parameter distributions,
+run in a pool of worker processes, and the sampled sensor and actuator time series aggregated in summary statistics.
+
+The scenarios are drawn in the parent process from a seed, each run from its own child seed (numpy SeedSequence),
+so that the scenario of a run depends only on the seed and its index, and the simulations are deterministic:
+the report is the same for a seed whatever the number of processes.
+
+The scenarios are described in a JSON specification file, e.g.
+    {
+        "runs": 64, "seed": 1, "sample_interval": 600,
+        "distributions": {
+            "weather": ["clear", "overcast", "dark"],
+            "insulation": {"choice": ["good", "average", "bad"], "weights": [0.2, 0.5, 0.3]},
+            "datetime": {"uniform": ["2022/01/01/00/00", "2022/12/31/00/00"]},
+            "outside_temperature": {"normal": [12, 6]},
+            "outside_relativehumidity": {"uniform": [30, 80]}
+        },
+        "series": ["thermometer1.temperature", "brightness1.brightness", "heater1.state"]
+    }
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Tuple, Union
+
+import numpy as np
+
+# Parameters of the world configuration that can be drawn, and of each room configuration
+WORLD_PARAMETERS = (
+    "weather",
+    "datetime",
+    "outside_temperature",
+    "inside_temperature",
+    "outside_relativehumidity",
+    "inside_relativehumidity",
+    "outside_co2",
+    "inside_co2",
+)
+ROOM_PARAMETERS = ("insulation",)
+DATETIME_FORMAT = "%Y/%m/%d/%H/%M"
+# Percentiles of the summary statistics across runs
+PERCENTILES = (5, 50, 95)
+
+
+def parse_distribution(
+    parameter: str, distribution
+) -> Union[Callable[[np.random.Generator], object], None]:
+    """
+    Return the function drawing a value of the parameter with a random generator, None if the distribution is invalid.
+
+    distribution : a constant, a list of values drawn uniformly, {"choice": values, "weights": weights},
+    {"uniform": [low, high]} or {"normal": [mean, standard deviation]},
+    the datetime bounds of a uniform distribution are 'yyyy/mm/dd/hh/mm' strings, the drawn datetime is rounded to the minute.
+    """
+    if parameter not in WORLD_PARAMETERS + ROOM_PARAMETERS:
+        logging.warning(
+            f"The parameter '{parameter}' cannot be drawn, it should be in {WORLD_PARAMETERS + ROOM_PARAMETERS} ==> it is ignored."
+        )
+        return None
+    if isinstance(distribution, list):
+        distribution = {"choice": distribution}
+    if not isinstance(distribution, dict):
+        return lambda rng: distribution
+    try:
+        (kind,) = set(distribution) & {"choice", "uniform", "normal"}
+        values = distribution[kind]
+        if kind == "choice":
+            probabilities = None
+            if "weights" in distribution:
+                probabilities = np.asarray(distribution["weights"], float)
+                probabilities = probabilities / probabilities.sum()
+            return lambda rng: values[rng.choice(len(values), p=probabilities)]
+        if kind == "uniform" and parameter == "datetime":
+            low, high = [datetime.strptime(value, DATETIME_FORMAT) for value in values]
+            minutes = (high - low) // timedelta(minutes=1)
+            return lambda rng: (
+                low + timedelta(minutes=int(rng.integers(0, minutes + 1)))
+            ).strftime(DATETIME_FORMAT)
+        if kind == "uniform":
+            low, high = map(float, values)
+            return lambda rng: float(rng.uniform(low, high))
+        if kind == "normal":
+            mean, deviation = map(float, values)
+            return lambda rng: float(rng.normal(mean, deviation))
+    except (KeyError, TypeError, ValueError):
+        pass
+    logging.warning(
+        f"The distribution {distribution} of '{parameter}' should be a constant, a list of values, "
+        "or a dict with 'choice' (and 'weights'), 'uniform' or 'normal' ==> it is ignored."
+    )
+    return None
+
+
+def sample_scenarios(distributions: Dict, runs: int, seed: int) -> List[Dict]:
+    """Return the parameters drawn for each run, from the child seed of the run (the scenario of a run does not depend on the number of runs)"""
+    samplers = {}
+    for parameter in sorted(distributions):
+        sampler = parse_distribution(parameter, distributions[parameter])
+        if sampler is not None:
+            samplers[parameter] = sampler
+    scenarios = []
+    for child_seed in np.random.SeedSequence(seed).spawn(runs):
+        rng = np.random.default_rng(child_seed)
+        scenarios.append(
+            {parameter: sampler(rng) for parameter, sampler in samplers.items()}
+        )
+    return scenarios
+
+
+def apply_scenario(config: Dict, scenario: Dict) -> Dict:
+    """Return a copy of the configuration with the parameters of the scenario, the room parameters are set for all rooms"""
+    config = json.loads(json.dumps(config))
+    world_config = config["world"]
+    for parameter, value in scenario.items():
+        if parameter in ROOM_PARAMETERS:
+            for room_config in world_config["rooms"].values():
+                room_config[parameter] = value
+        else:
+            world_config[parameter] = value
+    return config
+
+
+def _run_scenario(task: Tuple) -> Dict:
+    """Worker of the pool: configure the room of a scenario, simulate it headless and return its sampled time series"""
+    from tools.config_tools import configure_system_from_file
+    from tools.headless import HeadlessRunner
+
+    (
+        run,
+        config,
+        hours,
+        simulated_dt,
+        sample_interval,
+        series,
+        event_driven,
+    ) = task
+    config_file = tempfile.NamedTemporaryFile(
+        "w", suffix=".json", delete=False
+    )  # the configuration is parsed from a file
+    try:
+        with config_file:
+            json.dump(config, config_file)
+        with contextlib.redirect_stdout(io.StringIO()):  # configuration prints
+            room, _ = configure_system_from_file(config_file.name, test_mode=True)
+        devices = {
+            in_room_device.name: in_room_device.device
+            for in_room_device in room.devices
+        }
+        probes = []
+        for name in series:
+            device_name, attribute = name.split(".", 1)
+            if not hasattr(devices.get(device_name), attribute):
+                raise KeyError(f"no device attribute '{name}' in the room")
+            probes.append((devices[device_name], attribute))
+        runner = HeadlessRunner(room, simulated_dt, event_driven=event_driven)
+        sample_interval = sample_interval or runner.simulated_dt
+        samples = max(1, round(hours * 3600 / sample_interval))
+        values = np.zeros((len(probes), samples + 1))
+
+        async def simulate() -> None:
+            for sample in range(samples + 1):
+                await runner.advance(sample_interval if sample else 0)
+                for index, (device, attribute) in enumerate(probes):
+                    values[index, sample] = float(getattr(device, attribute))
+
+        asyncio.run(simulate())
+        return {
+            "run": run,
+            "values": values,
+            "ticks": runner.ticks,
+            "sample_interval": sample_interval,
+            "wall_time": runner.wall_time,
+        }
+    except (Exception, SystemExit) as exc:  # configuration errors exit
+        return {"run": run, "error": repr(exc)}
+    finally:
+        os.unlink(config_file.name)
+
+
+def summary_statistics(values: np.ndarray) -> Dict[str, List[float]]:
+    """Return the mean, standard deviation and percentiles across runs (first axis) of the values"""
+    percentiles = np.percentile(values, PERCENTILES, axis=0)
+    statistics = {
+        "mean": values.mean(axis=0).tolist(),
+        "std": values.std(axis=0).tolist(),
+    }
+    for percentile, percentile_values in zip(PERCENTILES, percentiles):
+        statistics[f"p{percentile}"] = percentile_values.tolist()
+    return statistics
+
+
+class MonteCarloRunner:
+    """Class to run independent headless simulations of a configuration file with drawn parameters in a process pool"""
+
+    def __init__(
+        self,
+        config_file_path: str,
+        distributions: Dict,
+        series: List[str],
+        runs: int,
+        seed: int = 0,
+        processes: int = None,
+        simulated_dt: float = None,
+        sample_interval: float = None,
+        event_driven: bool = False,
+    ) -> None:
+        """
+        Initialization of a Monte Carlo runner.
+
+        distributions : distribution of each drawn parameter, see parse_distribution(),
+        series : sampled device attributes, as 'device_name.attribute' (e.g. 'thermometer1.temperature', 'heater1.state'),
+        processes : number of worker processes, all cores if None, the runs are simulated in this process if 1,
+        simulated_dt : simulated seconds between two world updates, system_dt * speed_factor of the configuration if None,
+        sample_interval : simulated seconds between two samples of the series, simulated_dt if None,
+        event_driven : skip the quiescent updates between the samples (see HeadlessRunner).
+        """
+        with open(config_file_path, "r") as file:
+            self.config = json.load(file)
+        self.series = list(series)
+        self.runs = runs
+        self.seed = seed
+        self.processes = max(1, min(processes or os.cpu_count() or 1, runs))
+        self.simulated_dt = simulated_dt
+        self.sample_interval = sample_interval
+        self.event_driven = event_driven
+        self.scenarios = sample_scenarios(distributions, runs, seed)
+
+    @classmethod
+    def from_spec_file(
+        cls, config_file_path: str, spec_file_path: str, simulated_dt: float = None
+    ) -> "MonteCarloRunner":
+        """Create a runner from a JSON specification file of the runs, seed, distributions and series (see the module docstring)"""
+        with open(spec_file_path, "r") as file:
+            spec = json.load(file)
+        return cls(
+            config_file_path,
+            spec.get("distributions", {}),
+            spec.get("series", []),
+            spec.get("runs", 1),
+            spec.get("seed", 0),
+            spec.get("processes"),
+            simulated_dt,
+            spec.get("sample_interval"),
+            spec.get("event_driven", False),
+        )
+
+    def run(self, hours: float) -> Dict:
+        """Simulate each scenario for hours simulated hours, return the report with the summary statistics of the series."""
+        tasks = [
+            (
+                run,
+                apply_scenario(self.config, scenario),
+                hours,
+                self.simulated_dt,
+                self.sample_interval,
+                self.series,
+                self.event_driven,
+            )
+            for run, scenario in enumerate(self.scenarios)
+        ]
+        start = time.perf_counter()
+        if self.processes == 1:
+            results = [_run_scenario(task) for task in tasks]
+        else:
+            with multiprocessing.get_context().Pool(self.processes) as pool:
+                results = pool.map(_run_scenario, tasks, chunksize=1)
+        total_time = time.perf_counter() - start
+        errors = [
+            f"run {result['run']}: {result['error']}"
+            for result in results
+            if "error" in result
+        ]
+        if errors:
+            logging.error(f"The Monte Carlo simulation has failed: {errors}.")
+            return {"runs": self.runs, "seed": self.seed, "errors": errors}
+        values = np.stack(
+            [result["values"] for result in results]
+        )  # runs, series, samples
+        sample_interval = results[0]["sample_interval"]
+        return {
+            "runs": self.runs,
+            "seed": self.seed,
+            "processes": self.processes,
+            "ticks": results[0]["ticks"],
+            "total_time": total_time,
+            "runs_per_s": self.runs / total_time if total_time else 0.0,
+            "scenarios": self.scenarios,
+            "times": (np.arange(values.shape[2]) * sample_interval / 3600).tolist(),
+            "series": {
+                name: summary_statistics(values[:, index])
+                for index, name in enumerate(self.series)
+            },
+            "statistics": {
+                name: {
+                    "mean": summary_statistics(values[:, index].mean(axis=1)),
+                    "min": summary_statistics(values[:, index].min(axis=1)),
+                    "max": summary_statistics(values[:, index].max(axis=1)),
+                    "final": summary_statistics(values[:, index, -1]),
+                }
+                for index, name in enumerate(self.series)
+            },
+        }
+
+
+def run_montecarlo(
+    config_file_path: str,
+    spec_file_path: str,
+    hours: float,
+    simulated_dt: float = None,
+) -> Dict:
+    """
+    Simulate the scenarios of a specification file (see the module docstring) for hours simulated hours, return the run report,
+    written in the 'output' JSON file of the specification if given.
+    """
+    report = MonteCarloRunner.from_spec_file(
+        config_file_path, spec_file_path, simulated_dt
+    ).run(hours)
+    with open(spec_file_path, "r") as file:
+        output = json.load(file).get("output")
+    if output is not None:
+        with open(output, "w") as file:
+            json.dump(report, file, indent=1)
+    return report
+
+
+def format_montecarlo_report(report: Dict) -> str:
+    if "errors" in report:
+        return f"Monte Carlo simulation of {report['runs']} runs failed: {report['errors']}"
+    lines = [
+        f"{report['runs']} runs (seed {report['seed']}) x {report['ticks']} updates in {report['processes']} processes, "
+        f"{report['total_time']:.3f} s: {report['runs_per_s']:.1f} runs/s"
+    ]
+    for name, statistics in report["statistics"].items():
+        mean, final = statistics["mean"], statistics["final"]
+        lines.append(
+            f"{name:>28} : mean {mean['p50']:.2f} [{mean['p5']:.2f}, {mean['p95']:.2f}], "
+            f"final {final['p50']:.2f} [{final['p5']:.2f}, {final['p95']:.2f}] (median [p5, p95] across runs)"
+        )
+    return "\n".join(lines)
@@ -5,7 +5,7 @@ Module that define functions for parsing user commands, CLI arguments or API scr
 import logging
 import numbers
 import pprint
-from typing import Tuple, Union, Dict
+from typing import Awaitable, Callable, Tuple, Union, Dict
 
 import argparse
 import asyncio
@@ -20,12 +20,29 @@ COMMAND_HELP = (
     "- switch state: 'set [device_name] [ON/OFF] [value]'\n"
     "- read state: 'getvalue [device_name]'\n"
     "- system info: 'getinfo [device_name]' or 'getinfo world [ambient]'\n"
+    "- bus history: 'getinfo bus history [number] [group_address]'\n"
     "- exit: 'q' to quit the program\n"
     "- help: 'h' for help"
 )
 
 
-def arguments_parser(argv) -> Tuple[str, str, str, str, str, bool, bool]:
+def arguments_parser(
+    argv,
+) -> Tuple[
+    str,
+    str,
+    str,
+    str,
+    str,
+    bool,
+    bool,
+    str,
+    Union[float, None],
+    Union[float, None],
+    bool,
+    Union[int, None],
+    Union[str, None],
+]:
     """Function to parse CLI arguments given by the user when launching the program"""
     parser = argparse.ArgumentParser(
         description="Process Interface, Command, Config and Logging modes.",
@@ -121,6 +138,80 @@ def arguments_parser(argv) -> Tuple[str, str, str, str, str, bool, bool]:
             "Specifies that the telegrams sent and received should be logged in a file located in logs/ folder"
         ),
     )
+    # Bus mode argument definition
+    parser.add_argument(
+        "-b",
+        "--bus-mode",
+        action="store",
+        default="sync",
+        type=str.lower,
+        choices=["sync", "queued"],
+        help=(
+            "Provide KNX bus delivery mode (only if interface mode is CLI).\nExample '-b queued' or '--bus-mode=queued'\n-> default='sync'"
+        ),
+    )
+    # Headless mode arguments definition
+    parser.add_argument(
+        "-H",
+        "--headless",
+        action="store",
+        type=float,
+        metavar="HOURS",
+        help=(
+            "Run the simulation headless (no GUI, no scheduler) as fast as possible for HOURS simulated hours,\nand/or until the end of the script in script command mode.\nExample '-H 168' or '--headless=24 -c script'"
+        ),
+    )
+    parser.add_argument(
+        "--dt",
+        action="store",
+        type=float,
+        metavar="SECONDS",
+        help=(
+            "Simulated seconds between two world updates in headless mode.\n-> default=system_dt * simulation_speed_factor of the configuration"
+        ),
+    )
+    parser.add_argument(
+        "-E",
+        "--event-driven",
+        action="store_true",  # event_driven=True if option, False if no -E option
+        help=(
+            "In headless mode, skip the quiescent world updates and jump to the next interesting instant\n(script wait end, telegram delivery, sensor publication, sunrise/sunset)."
+        ),
+    )
+    parser.add_argument(
+        "--shards",
+        action="store",
+        type=int,
+        metavar="N",
+        help=(
+            "In headless mode, simulate all the rooms of the configuration file in N worker processes in lockstep,\nthe telegrams are bridged between the rooms of all shards (file configuration only, no script)."
+        ),
+    )
+    parser.add_argument(
+        "--montecarlo",
+        action="store",
+        metavar="SPEC",
+        help=(
+            "In headless mode, simulate the room of the configuration file in the scenarios drawn from the JSON specification SPEC,\nin a process pool, and print the summary statistics of the sampled series (file configuration only, no script)."
+        ),
+    )
+    # Tracing arguments definition
+    parser.add_argument(
+        "-T",
+        "--trace",
+        action="append",
+        metavar="PATTERN",
+        help=(
+            "Enable the trace points whose name match the pattern, can be repeated.\nExample '-T bus.*' or '--trace=world.update'\n-> trace points: bus.attach, bus.detach, bus.read.unanswered, device.actuator.state, device.user_input, device.connect,\nworld.update, world.brightness, world.temperature, world.humidity, world.co2, world.soil_moisture, room.paused, room.resumed, gui.update, svshi.receive"
+        ),
+    )
+    parser.add_argument(
+        "--trace-file",
+        action="store",
+        help=(
+            "Write the trace events to this file as JSON lines instead of the console (only with -T option)."
+        ),
+    )
 
     # Get the arguments from command line
     options = parser.parse_args()
@@ -132,6 +223,14 @@ def arguments_parser(argv) -> Tuple[str, str, str, str, str, bool, bool]:
     logging.basicConfig(
         level=options.log.upper(), format="%(asctime)s | [%(levelname)s] -- %(message)s"
     )  #%(name)s : username (e.g. root)
+    # Tracing arguments parser
+    if options.trace:
+        from system.tracing import enable_tracing, ConsoleSink, FileSink
+
+        sink = FileSink(options.trace_file) if options.trace_file else ConsoleSink()
+        for pattern in options.trace:
+            enable_tracing(pattern, sink)
+            sink = None  # sink added once
     # Interface mode argument parser
     INTERFACE_MODE = options.interface.lower()
     # Command mode argument parser
@@ -148,6 +247,14 @@ def arguments_parser(argv) -> Tuple[str, str, str, str, str, bool, bool]:
     SVSHI_MODE = options.svshi_mode
     # TELEGRAM_LOGGING mode argument parser
     TELEGRAM_LOGGING = options.telegram_logging
+    # Bus mode argument parser
+    BUS_MODE = options.bus_mode.lower()
+    # Headless mode arguments parser
+    HEADLESS_HOURS = options.headless
+    SIMULATED_DT = options.dt
+    EVENT_DRIVEN = options.event_driven
+    SHARDS = options.shards
+    MONTECARLO_SPEC = options.montecarlo
 
     return (
         INTERFACE_MODE,
@@ -157,6 +264,12 @@ def arguments_parser(argv) -> Tuple[str, str, str, str, str, bool, bool]:
         CONFIG_PATH,
         SVSHI_MODE,
         TELEGRAM_LOGGING,
+        BUS_MODE,
+        HEADLESS_HOURS,
+        SIMULATED_DT,
+        EVENT_DRIVEN,
+        SHARDS,
+        MONTECARLO_SPEC,
     )
 
 
@@ -296,9 +409,25 @@ def user_command_parser(command: str, room) -> Union[int, None]:  # room : Room
             return 1
         # Bus info asked by user
         elif "bus" in command_split[1]:
+            if len(command_split) > 2 and command_split[2] == "history":
+                # Optional arguments: number of telegrams and/or group address, in any order
+                n, group_address = 10, None
+                for option in command_split[3:]:
+                    if option.isdigit():
+                        n = int(option)
+                    else:
+                        group_address = option
+                history_dict = room.get_bus_history_info(n, group_address)
+                if history_dict is None:
+                    logging.warning(
+                        f"'getinfo bus history' command expect a number and/or a group address, but {command_split[3:]} was given."
+                    )
+                    return 0
+                pp.pprint(history_dict)
+                return 1
             if len(command_split) > 2:
                 logging.warning(
-                    f"'getinfo bus' command expect no arguments, but {command_split[2]} was given."
+                    f"'getinfo bus' command expect no arguments or 'history', but {command_split[2]} was given."
                 )
                 return 0
             bus_dict = room.get_bus_info()
@@ -365,13 +494,16 @@ def user_command_parser(command: str, room) -> Union[int, None]:  # room : Room
 class ScriptParser:
     """Class to handle the parsing of script API commands from a txt file."""
 
-    def __init__(self):
+    def __init__(self, wait: Callable[[float], Awaitable[None]] = None):
         """
         Initialization of a script parser object.
 
         stored_values : dict of variable stored during script
         assertions: dict of assertions that passed during script
+        wait : coroutine function advancing the simulation of a number of simulated seconds for the 'wait' command,
+        by default the parser sleeps while the scheduler updates the world.
         """
+        self.__wait = wait
         self.stored_values = {}
         self.assertions = {}
         self.assert_counter = 0
@@ -389,39 +521,41 @@ class ScriptParser:
         command_split = command.split(" ")
         # 'wait' command
         if command.startswith("wait"):
+            speed_factor = room.world.time.speed_factor
             if len(command_split) == 3:
+                try:
+                    wait_value = float(command_split[1])
+                except ValueError:
+                    logging.error(
+                        f"A number was excpected for the time to wait, but {command_split[1]} was given."
+                    )
+                    return None, self.assertions
                 if command_split[2] in [
                     "h",
                     "hour",
                     "hours",
                 ]:  # time to wait in simulated hours, not computer seconds
-                    speed_factor = room.world.time.speed_factor
-                    sleep_time = int(
-                        float(command_split[1]) * 3600 / speed_factor
-                    )  # time to wait in computer system seconds
+                    wait_seconds = wait_value * 3600
                 elif command_split[2] in [
                     "m",
                     "minute",
                     "minutes",
                 ]:  # time to wait in simulated minutes, not computer seconds
-                    speed_factor = room.world.time.speed_factor
-                    sleep_time = int(
-                        float(command_split[1]) / 60 * 3600 / speed_factor
-                    )  # time to wait in computer system seconds
+                    wait_seconds = wait_value / 60 * 3600
                 elif command_split[2] in [
                     "s",
                     "second",
                     "seconds",
                 ]:  # time to wait in simulated seconds, not computer seconds
-                    speed_factor = room.world.time.speed_factor
-                    sleep_time = int(
-                        float(command_split[1]) / 3600 * 3600 / speed_factor
-                    )  # time to wait in computer system seconds
+                    wait_seconds = wait_value / 3600 * 3600
                 else:
                     logging.error(
                         f"'wait' command expect 'h', 'm' or 's' as second argument, but {command_split[2]} was given."
                     )
                     return None, self.assertions
+                sleep_time = int(
+                    wait_seconds / speed_factor
+                )  # time to wait in computer system seconds
             elif len(command_split) == 2:
                 try:
                     sleep_time = int(command_split[1])
@@ -430,13 +564,17 @@ class ScriptParser:
                         f"A number was excpected for the time to wait, but {command_split[1]} was given."
                     )
                     return None, self.assertions
+                wait_seconds = sleep_time * speed_factor
             else:
                 logging.warning(
                     f"'wait' command expect 1 or 2 arguments, but {len(command_split)-1} was given."
                 )
                 return None, self.assertions
             logging.info(f"[SCRIPT] Wait for {sleep_time} sec")
-            await asyncio.sleep(sleep_time)
+            if self.__wait is not None:  # e.g. headless run, the simulated time is advanced without sleeping
+                await self.__wait(wait_seconds)
+            else:
+                await asyncio.sleep(sleep_time)
             return 1, self.assertions
         # 'store' command to keep one current system value in memory
         elif command.startswith("store"):
@@ -479,6 +617,19 @@ class ScriptParser:
                     f"[SCRIPT] The world {ambient} is stored in variable {var_name}={self.stored_values[var_name]}."
                 )
                 return 1, self.assertions
+            elif command_split[1] == "bus":  # store the number of telegrams in bus history
+                var_name = command_split[3]
+                group_address = None if command_split[2] == "all" else command_split[2]
+                self.stored_values[var_name] = room.count_bus_telegrams(group_address)
+                if self.stored_values[var_name] is None:
+                    logging.error(
+                        f"'store bus' command expect a group address or 'all', but {command_split[2]} was given."
+                    )
+                    return None, self.assertions
+                logging.info(
+                    f"[SCRIPT] The number of telegrams sent to {command_split[2]} is stored in variable {var_name}={self.stored_values[var_name]}."
+                )
+                return 1, self.assertions
             else:  # store a device attribute/method result
                 device_name = command_split[1]
                 var_name = command_split[3]
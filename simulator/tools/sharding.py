@@ -0,0 +1,596 @@
+"""
+Sharded headless simulation of the rooms of a configuration file, partitioned across worker processes.
+
+Each shard (worker process) creates only its rooms from the configuration file and updates them in its own loop.
+The shards advance in lockstep: after each epoch of ticks, they wait for each other at a single barrier,
+so that the simulated time of all rooms stays the same at each epoch boundary.
+
+The rooms of a sharded run form one KNX installation: the GroupValueWrite telegrams transmitted in a room
+are bridged to the other rooms with devices assigned to the same group address, whatever their shard.
+Telegrams are exchanged as fixed-size records (see TELEGRAM_RECORD_DTYPE) through shared-memory ring buffers,
+two per ordered pair of shards used in alternate epochs, and delivered at the next epoch boundary, in the same order whatever the partition.
+As a shard writes the rings of the other parity in the next epoch, it does not need to wait for the other shards
+to have read the telegrams of the epoch: a shard that reaches the next barrier has read them.
+The group addresses of each shard are published at start in a shared-memory bitmap, so that telegrams are only bridged where needed.
+The rooms linked by the 'connections' of the world configuration are kept in the same shard,
+where their exchanges are integrated in a Building, so that the physics does not depend on the partition.
+"""
+
+import contextlib
+import io
+import json
+import logging
+import math
+import multiprocessing
+import queue
+import time
+from multiprocessing import shared_memory
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Capacity of a ring buffer between two shards, in telegram records
+DEFAULT_RING_CAPACITY = 4096
+# Seconds waited at the epoch barrier before considering that a shard failed
+BARRIER_TIMEOUT = 120
+# Number of raw group addresses (16-bit)
+GROUP_ADDRESS_SPACE = 1 << 16
+
+
+def bridge_record_dtype() -> np.dtype:
+    """Return the dtype of the bridged telegram records: the telegram record (see TELEGRAM_RECORD_DTYPE) and the index of the room that sent it"""
+    from system.telegram_history import TELEGRAM_RECORD_DTYPE
+
+    return np.dtype(TELEGRAM_RECORD_DTYPE.descr + [("room", np.int32)])
+
+
+class SharedRing:
+    """
+    Single-producer single-consumer ring buffer of telegram records in shared memory.
+    The header holds the number of records written and read since the creation,
+    the producer writes the records before publishing the new write count, the consumer reads them before publishing the new read count.
+    """
+
+    HEADER_DTYPE = np.dtype([("written", np.int64), ("read", np.int64)])
+
+    def __init__(
+        self, dtype: np.dtype, capacity: int = DEFAULT_RING_CAPACITY, name: str = None
+    ) -> None:
+        """
+        Create a ring buffer of capacity records, or attach to the existing shared memory block name.
+
+        dtype : dtype of the records, e.g. bridge_record_dtype().
+        """
+        self.capacity = capacity
+        size = self.HEADER_DTYPE.itemsize + capacity * dtype.itemsize
+        self.__shm = shared_memory.SharedMemory(
+            name=name, create=name is None, size=size
+        )
+        self.name = self.__shm.name
+        self.__header = np.ndarray(1, self.HEADER_DTYPE, self.__shm.buf)
+        self.__records = np.ndarray(
+            capacity,
+            dtype,
+            self.__shm.buf,
+            offset=self.HEADER_DTYPE.itemsize,
+        )
+        if name is None:
+            self.__header[0] = (0, 0)
+
+    def __len__(self) -> int:
+        header = self.__header[0]
+        return int(header["written"] - header["read"])
+
+    def push(self, records: np.ndarray) -> int:
+        """
+        Write records at the end of the ring, return the number written.
+        Raise a BufferError without writing any record if they do not fit in the ring,
+        as dropping telegrams would make the results depend on the capacity.
+        """
+        written = int(self.__header[0]["written"])
+        count = len(records)
+        if count > self.capacity - len(self):
+            raise BufferError(
+                f"{count} telegram records do not fit in the ring buffer of capacity {self.capacity} ({len(self)} records not read), "
+                "increase the ring capacity or reduce the epoch ticks."
+            )
+        slots = (written + np.arange(count)) % self.capacity
+        self.__records[slots] = records
+        self.__header[0]["written"] = written + count
+        return count
+
+    def pop(self) -> np.ndarray:
+        """Read and remove all the records of the ring, in the order they were written."""
+        read, written = int(self.__header[0]["read"]), int(self.__header[0]["written"])
+        records = self.__records[np.arange(read, written) % self.capacity].copy()
+        self.__header[0]["read"] = written
+        return records
+
+    def close(self) -> None:
+        """Detach from the shared memory, the arrays must not be used anymore"""
+        self.__header = self.__records = None
+        self.__shm.close()
+
+    def unlink(self) -> None:
+        """Free the shared memory block, called once by its creator"""
+        self.__shm.unlink()
+
+
+def room_keys_from_file(config_file_path: str) -> List[str]:
+    """Return the keys of the rooms of a configuration file ('room1', 'room2', ...), in their order of creation"""
+    with open(config_file_path, "r") as file:
+        world_config = json.load(file)["world"]
+    return [
+        f"room{r}"
+        for r in range(1, world_config["number_of_rooms"] + 1)
+        if f"room{r}" in world_config["rooms"]
+    ]
+
+
+def connected_room_keys(config_file_path: str) -> List[List[str]]:
+    """Return the keys of the rooms linked by the 'connections' of a configuration file, grouped by connected component"""
+    with open(config_file_path, "r") as file:
+        world_config = json.load(file)["world"]
+    keys = {
+        room_config.get("name"): room_key
+        for room_key, room_config in world_config["rooms"].items()
+    }
+    components: Dict[str, List[str]] = {}  # component of each room key
+    for connection in world_config.get("connections", []):
+        try:
+            linked = [keys[name] for name in connection["rooms"]]
+        except (KeyError, TypeError):  # rejected with a warning by the building
+            continue
+        component = []
+        for key in linked:
+            for member in components.get(key, [key]):
+                if member not in component:
+                    component.append(member)
+        for key in component:
+            components[key] = component
+    return list(
+        {id(component): component for component in components.values()}.values()
+    )
+
+
+def partition(
+    room_keys: List[str], shards: int, connected: List[List[str]] = ()
+) -> List[List[str]]:
+    """
+    Split the room keys in at most shards blocks of (almost) the same size, contiguous in the order of the room keys.
+
+    connected : groups of room keys kept in the same block, placed at their first room key,
+    the room keys of each block are in their order in room_keys.
+    """
+    groups = {key: [key] for key in room_keys}
+    for component in connected:
+        component = [key for key in room_keys if key in component]
+        for key in component:
+            groups[key] = component
+    units = list({id(group): group for group in groups.values()}.values())
+    shards = max(1, min(shards, len(room_keys)))
+    bounds = [round(shard * len(room_keys) / shards) for shard in range(shards + 1)]
+    blocks: List[List[str]] = [[] for _ in range(shards)]
+    shard = count = 0
+    for unit in units:
+        blocks[shard] += unit
+        count += len(unit)
+        while shard < shards - 1 and count >= bounds[shard + 1]:
+            shard += 1
+    order = {key: index for index, key in enumerate(room_keys)}
+    return [sorted(block, key=order.get) for block in blocks if block]
+
+
+class ShardBridge:
+    """
+    Bridge of the telegrams between the rooms of a shard and the other rooms of the installation.
+    The telegrams transmitted in a room are collected by a tap on its bus, then at each epoch boundary
+    sent to the rooms of the shard and to the shards with devices assigned to their destination.
+    """
+
+    def __init__(
+        self,
+        rooms: List,
+        room_indexes: List[int],
+        shard: int,
+        outgoing: Dict[int, Tuple[SharedRing, SharedRing]],
+        incoming: Dict[int, Tuple[SharedRing, SharedRing]],
+        group_address_style: str,
+    ) -> None:
+        """
+        Initialization of the bridge of a shard.
+
+        rooms : rooms of the shard,
+        room_indexes : indexes of the rooms in the installation, their order in the configuration file,
+        outgoing, incoming : ring buffers to and from the other shards, by shard index, for the even and odd epochs,
+        shard_group_addresses : bitmap of the raw group addresses with devices assigned in each shard, set with publish_group_addresses(),
+        epoch : number of epochs received, its parity selects the ring buffers of the epoch,
+        __outbox : records of the telegrams transmitted in the rooms of the shard during the epoch, with the index of their room.
+        """
+        self.rooms = rooms
+        self.shard = shard
+        self.outgoing = outgoing
+        self.incoming = incoming
+        self.group_address_style = group_address_style
+        self.sent = self.received = 0
+        self.epoch = 0
+        self.shard_group_addresses = None
+        self.__record_dtype = bridge_record_dtype()
+        self.__outbox: List[tuple] = []
+        self.__local = np.zeros(0, dtype=self.__record_dtype)
+        self.__injecting = False
+        # Rooms of the shard with devices assigned to each raw group address
+        self.__ga_rooms: Dict[int, List[Tuple[int, object]]] = {}
+        for room, room_index in zip(rooms, room_indexes):
+            for group_address in room.knxbus.group_addresses:
+                self.__ga_rooms.setdefault(group_address.raw, []).append(
+                    (room_index, room)
+                )
+            room.knxbus.subscribe(
+                lambda telegram, room=room, room_index=room_index: self.__collect(
+                    room, room_index, telegram
+                ),
+                "*",
+                "shard bridge",
+            )
+
+    def publish_group_addresses(self, bitmap: np.ndarray) -> None:
+        """Mark the group addresses of the shard in the shared bitmap of shape (shards, GROUP_ADDRESS_SPACE)"""
+        bitmap[self.shard, list(self.__ga_rooms)] = True
+        self.shard_group_addresses = bitmap
+
+    def __collect(self, room, room_index: int, telegram) -> None:
+        from system.telegram_history import telegram_record
+        from system.telegrams import GROUP_VALUE_WRITE
+
+        if self.__injecting or telegram.apci != GROUP_VALUE_WRITE:
+            return
+        self.__outbox.append(
+            telegram_record(telegram, room.knxbus.simulation_time()) + (room_index,)
+        )
+
+    def send(self) -> None:
+        """Send the telegrams of the epoch to the shards with devices assigned to their destination"""
+        outbox = np.array(self.__outbox, dtype=self.__record_dtype)
+        self.__outbox = []
+        self.__local = outbox
+        if not len(outbox):
+            return
+        for shard, rings in self.outgoing.items():
+            ring = rings[self.epoch % 2]
+            records = outbox[self.shard_group_addresses[shard, outbox["destination"]]]
+            if len(records):
+                self.sent += ring.push(records)
+
+    def receive(self) -> None:
+        """
+        Deliver the telegrams of the epoch from all shards (including this one) to the other rooms with devices assigned to their destination,
+        ordered by room index and transmission order, so that the delivery order does not depend on the partition.
+        """
+        from system.telegram_history import TELEGRAM_RECORD_DTYPE, record_telegram
+
+        records = np.concatenate(
+            [self.__local]
+            + [rings[self.epoch % 2].pop() for rings in self.incoming.values()]
+        )
+        self.epoch += 1
+        if not len(records):
+            return
+        self.received += len(records) - len(self.__local)
+        records = records[np.argsort(records["room"], kind="stable")]
+        self.__injecting = True
+        try:
+            for destination, sender, record in zip(
+                records["destination"].tolist(),
+                records["room"].tolist(),
+                records[list(TELEGRAM_RECORD_DTYPE.names)].tolist(),
+            ):
+                targets = self.__ga_rooms.get(destination)
+                if targets is None:
+                    continue
+                telegram = record_telegram(record, self.group_address_style)
+                for room_index, room in targets:
+                    if room_index != sender:
+                        room.knxbus.transmit_telegram(telegram)
+        finally:
+            self.__injecting = False
+
+
+def shard_building(rooms: List, connections_config: List[Dict]):
+    """
+    Return the Building of the rooms of a shard with the 'connections' of the world configuration between them,
+    None if there is no such connection. Raise a ValueError if a connection links a room of the shard to a room of another shard,
+    as their exchanges could not be integrated.
+    """
+    from world import Building
+
+    names = {room.name for room in rooms}
+    shard_connections = []
+    for connection in connections_config:
+        try:
+            connected = set(connection["rooms"]) & names
+        except (KeyError, TypeError):  # rejected with a warning by the building
+            connected = names
+        if len(connected) >= 2:
+            shard_connections.append(connection)
+        elif connected:
+            raise ValueError(
+                f"The connection {connection} is between rooms of different shards, the exchanges between rooms are only integrated in a shard."
+            )
+    if not shard_connections:
+        return None
+    return Building.from_config(rooms, shard_connections)
+
+
+def _run_shard(
+    config_file_path: str,
+    shard: int,
+    room_keys: List[str],
+    room_indexes: Dict[str, int],
+    ring_names: Dict[Tuple[int, int, int], str],
+    ring_capacity: int,
+    bitmap_name: str,
+    shards: int,
+    barrier,
+    results,
+    epochs: int,
+    epoch_ticks: int,
+    simulated_dt: float,
+    connect_sensors: bool,
+) -> None:
+    """Worker process of a shard: create its rooms, update them for the epochs in lockstep with the other shards, and put its report in results."""
+    from tools.config_tools import configure_rooms_from_file
+    from devices import Sensor
+
+    rings = {
+        key: SharedRing(bridge_record_dtype(), ring_capacity, name)
+        for key, name in ring_names.items()
+    }
+    bitmap_shm = shared_memory.SharedMemory(name=bitmap_name)
+    bridge = None
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):  # configuration prints
+            rooms, _, _ = configure_rooms_from_file(
+                config_file_path, test_mode=True, room_keys=room_keys
+            )
+        with open(config_file_path, "r") as file:
+            config = json.load(file)
+        group_address_style = config["knx"]["group_address_style"]
+        for room in rooms:
+            if simulated_dt is not None:
+                room.world.set_simulated_dt(simulated_dt)
+            if connect_sensors:
+                for in_room_device in room.devices:
+                    if isinstance(in_room_device.device, Sensor):
+                        in_room_device.device.connect_to(room.knxbus)
+        # after connecting the sensors, the building reads their publish policies
+        building = shard_building(rooms, config["world"].get("connections", []))
+        bridge = ShardBridge(
+            rooms,
+            [room_indexes[room_key] for room_key in room_keys],
+            shard,
+            {
+                dst: (rings[src, dst, 0], rings[src, dst, 1])
+                for src, dst, parity in rings
+                if src == shard and parity == 0
+            },
+            {
+                src: (rings[src, dst, 0], rings[src, dst, 1])
+                for src, dst, parity in rings
+                if dst == shard and parity == 0
+            },
+            group_address_style,
+        )
+        bridge.publish_group_addresses(
+            np.ndarray((shards, GROUP_ADDRESS_SPACE), np.bool_, bitmap_shm.buf)
+        )
+        barrier.wait(BARRIER_TIMEOUT)  # all group addresses published
+        update_rooms = (
+            building.update
+            if building is not None
+            else lambda: [room.update_world() for room in rooms]
+        )
+        update_rooms()  # first update, initial states without time advance
+        start = time.perf_counter()
+        for _ in range(epochs):
+            for _ in range(epoch_ticks):
+                update_rooms()
+            bridge.send()
+            barrier.wait(BARRIER_TIMEOUT)  # lockstep: all telegrams of the epoch sent
+            # the telegrams of the next epoch are sent in the rings of the other parity,
+            # those of this epoch are received by all shards before any of them passes the next barrier
+            bridge.receive()
+        wall_time = time.perf_counter() - start
+        results.put(
+            {
+                "shard": shard,
+                "rooms": {
+                    room.name: {
+                        "simulated_time": room.world.time.simulation_time(),
+                        "telegrams": room.knxbus.history.total,
+                        "history": room.knxbus.history.last(
+                            room.knxbus.history.total
+                        )[["time", "destination"]].tolist(),
+                        "temperature": room.world.ambient_temperature.get_temperature(),
+                    }
+                    for room in rooms
+                },
+                "sent": bridge.sent,
+                "received": bridge.received,
+                "wall_time": wall_time,
+            }
+        )
+    except Exception as exc:
+        barrier.abort()
+        results.put({"shard": shard, "error": repr(exc)})
+    finally:
+        if bridge is not None:
+            bridge.shard_group_addresses = None  # release the shared memory buffer
+        bitmap_shm.close()
+        for ring in rings.values():
+            ring.close()
+
+
+class ShardedRunner:
+    """Class to run the rooms of a configuration file headless, partitioned across worker processes in lockstep"""
+
+    def __init__(
+        self,
+        config_file_path: str,
+        shards: int,
+        simulated_dt: float = None,
+        epoch_ticks: int = 1,
+        ring_capacity: int = DEFAULT_RING_CAPACITY,
+        connect_sensors: bool = True,
+    ) -> None:
+        """
+        Initialization of a sharded runner.
+
+        shards : number of worker processes, at most the number of rooms,
+        simulated_dt : simulated seconds between two world updates, system_dt * speed_factor of the configuration if None,
+        epoch_ticks : ticks between two synchronizations of the shards, the bridged telegrams are delivered at the end of each epoch,
+        ring_capacity : telegram records per ring buffer between two shards, the run fails if the telegrams of an epoch exceed it,
+        connect_sensors : if True, the sensors send their state on the bus (as in SVSHI mode), and thus to the other rooms.
+        """
+        self.config_file_path = config_file_path
+        self.room_keys = room_keys_from_file(config_file_path)
+        self.partition = partition(
+            self.room_keys, shards, connected_room_keys(config_file_path)
+        )
+        self.simulated_dt = simulated_dt
+        self.epoch_ticks = max(1, int(epoch_ticks))
+        self.ring_capacity = ring_capacity
+        self.connect_sensors = connect_sensors
+
+    @staticmethod
+    def __collect_reports(workers: List, results) -> List[Dict]:
+        """Return the reports of the shards, or an error for the shards whose process ended without report"""
+        reports = {}
+        exited = (
+            set()
+        )  # shards whose process had exited at the last timeout, their report may still be in the queue
+        while len(reports) < len(workers):
+            try:
+                report = results.get(timeout=1)
+                reports[report["shard"]] = report
+            except queue.Empty:
+                for shard, worker in enumerate(workers):
+                    if shard in reports or worker.is_alive():
+                        continue
+                    if shard in exited:
+                        reports[shard] = {
+                            "shard": shard,
+                            "error": f"process exited with code {worker.exitcode}",
+                        }
+                    exited.add(shard)
+        return list(reports.values())
+
+    def run(self, hours: float) -> Dict:
+        """Simulate hours simulated hours (rounded to whole epochs), return the run report."""
+        shards = len(self.partition)
+        simulated_dt = self.simulated_dt
+        if simulated_dt is None:
+            with open(self.config_file_path, "r") as file:
+                world_config = json.load(file)["world"]
+            simulated_dt = (
+                world_config["system_dt"] * world_config["simulation_speed_factor"]
+            )
+        epochs = math.ceil(round(hours * 3600 / simulated_dt, 6) / self.epoch_ticks)
+        rings = {
+            (src, dst, parity): SharedRing(bridge_record_dtype(), self.ring_capacity)
+            for src in range(shards)
+            for dst in range(shards)
+            for parity in (0, 1)
+            if src != dst
+        }
+        bitmap = shared_memory.SharedMemory(
+            create=True, size=shards * GROUP_ADDRESS_SPACE
+        )
+        bitmap.buf[: shards * GROUP_ADDRESS_SPACE] = bytes(shards * GROUP_ADDRESS_SPACE)
+        context = multiprocessing.get_context()
+        barrier = context.Barrier(shards)
+        results = context.Queue()
+        room_indexes = {key: index for index, key in enumerate(self.room_keys)}
+        start = time.perf_counter()
+        workers = [
+            context.Process(
+                target=_run_shard,
+                args=(
+                    self.config_file_path,
+                    shard,
+                    room_keys,
+                    room_indexes,
+                    {key: ring.name for key, ring in rings.items()},
+                    self.ring_capacity,
+                    bitmap.name,
+                    shards,
+                    barrier,
+                    results,
+                    epochs,
+                    self.epoch_ticks,
+                    self.simulated_dt,
+                    self.connect_sensors,
+                ),
+                daemon=True,
+            )
+            for shard, room_keys in enumerate(self.partition)
+        ]
+        try:
+            for worker in workers:
+                worker.start()
+            reports = self.__collect_reports(workers, results)
+            for worker in workers:
+                worker.join()
+        finally:
+            for ring in rings.values():
+                ring.close()
+                ring.unlink()
+            bitmap.close()
+            bitmap.unlink()
+        total_time = time.perf_counter() - start
+        reports.sort(key=lambda report: report["shard"])
+        errors = [report["error"] for report in reports if "error" in report]
+        if errors:
+            logging.error(f"The sharded simulation has failed: {errors}.")
+            return {"shards": shards, "errors": errors}
+        ticks = epochs * self.epoch_ticks
+        wall_time = max(report["wall_time"] for report in reports)
+        return {
+            "shards": shards,
+            "rooms": len(self.room_keys),
+            "ticks": ticks,
+            "simulated_dt": simulated_dt,
+            "simulated_time": ticks * simulated_dt,
+            "wall_time": wall_time,
+            "total_time": total_time,
+            "room_ticks_per_s": (
+                ticks * len(self.room_keys) / wall_time if wall_time else 0.0
+            ),
+            "bridged": sum(report["sent"] for report in reports),
+            "room_reports": {
+                name: room_report
+                for report in reports
+                for name, room_report in report["rooms"].items()
+            },
+        }
+
+
+def run_sharded(
+    config_file_path: str,
+    shards: int,
+    hours: float,
+    simulated_dt: float = None,
+    epoch_ticks: int = 1,
+) -> Dict:
+    """Simulate the rooms of a configuration file headless for hours simulated hours, partitioned in shards worker processes, return the run report."""
+    return ShardedRunner(config_file_path, shards, simulated_dt, epoch_ticks).run(hours)
+
+
+def format_sharded_report(report: Dict) -> str:
+    if "errors" in report:
+        return f"Sharded simulation failed in {report['shards']} shards: {report['errors']}"
+    return (
+        f"{report['rooms']} rooms x {report['ticks']} updates of {report['simulated_dt']:g} simulated seconds "
+        f"in {report['shards']} shards, {report['wall_time']:.3f} s: {report['room_ticks_per_s']:.0f} room ticks/s, "
+        f"{report['bridged']} telegrams bridged between shards"
+    )
@@ -3,10 +3,18 @@ Package world to model and update physical world states, such as Temperature, Hu
 """
 
 from .world import Time, AmbientTemperature, AmbientLight, World
+from .building import Building
+from .temperature_field import TemperatureField, laplacian
 from .world_tools import (
     outdoor_light,
+    outdoor_light_array,
+    next_outdoor_light_change,
+    sun_events,
+    Site,
+    DEFAULT_SITE,
     compute_distance,
     compute_distance_from_window,
+    exponential_relaxation,
     INSULATION_TO_TEMPERATURE_FACTOR,
     INSULATION_TO_HUMIDITY_FACTOR,
     INSULATION_TO_CO2_FACTOR,
@@ -0,0 +1,502 @@
+"""
+Building-level world of several rooms: the indoor temperature, vapor pressure and co2 of all rooms are stored in arrays,
+and updated in one vectorized step per tick, with the exchanges of heat and air between adjacent rooms.
+The temperature, humidity and co2 sensors are measured on these arrays, the other ambients (light, soil moisture, presence)
+are updated room by room, only at the interesting instants of each room (see Building.update()).
+
+Each room relaxes toward the outdoor values at its insulation rate (see exponential_relaxation()),
+and toward its neighbours' values at the exchange rates of its connections:
+    dx_i/dt = k_i (x_out - x_i) + sum_j (g_ij / v_i) (x_j - x_i) + f_i
+with g_ij the volume exchanged per hour between the rooms i and j (m^3/h) and v_i the volume of room i.
+The connections are stored as a sparse adjacency (arrays of edges), the exchanges are computed with a weighted bincount.
+"""
+
+import functools
+import itertools
+import logging
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+# Bounds of the indoor temperature (arbitrary), as AmbientTemperature
+TEMPERATURE_MIN, TEMPERATURE_MAX = 5.0, 35.0
+# Maximum number of updates a quiet room is left without world update (horizon of World.next_event())
+MAX_DEFERRED_UPDATES = 3600
+
+
+def saturation_vapor_pressure(temperatures: np.ndarray) -> np.ndarray:
+    """Return the saturation vapor pressures of water at the temperatures (> 0 °C), as AmbientHumidity.compute_saturation_vapor_pressure_water()"""
+    return np.round(
+        np.exp(34.494 - 4924.99 / (temperatures + 237.1))
+        / (temperatures + 105) ** 1.57,
+        8,
+    )
+
+
+class Building:
+    """
+    Class to represent a building of rooms exchanging heat and air through their connections (walls, doors),
+    the temperature, humidity and co2 of all rooms are integrated together, the other ambients (light, soil moisture, presence) stay per room.
+    The rooms share the time of the building, a paused room only stops updating its world and sensors.
+    """
+
+    # Ambient states integrated by the building, in the order of the relaxation() of the rooms' ambients
+    AMBIENTS = ("ambient_temperature", "ambient_humidity", "ambient_co2")
+
+    def __init__(self, rooms: List, connections: List[Tuple] = ()) -> None:
+        """
+        Initialization of a building, the rooms' worlds are attached to the building that integrates their temperature, humidity and co2.
+
+        rooms : list of Room objects, with the same simulated dt,
+        connections : list of (room_a, room_b, heat_exchange, air_exchange) tuples, see add_connection().
+
+        values, targets, rates, forcing : arrays of shape (3, number of rooms) of the indoor and outdoor values,
+        relaxation rates per hour and forcing per hour of the temperature, vapor pressure and co2 of the rooms,
+        __edges : sparse adjacency, origin and neighbour room indexes of each connection (in both directions),
+        __heat_exchange, __air_exchange : volume exchanged per hour of each edge,
+        __stale : indexes of the rooms whose ambient values were set or sources added through the rooms' API, read again before the next step,
+        __sources_changed : indexes of the rooms whose heating or cooling sources changed state, their forcing is read again before the next step,
+        __synced : rooms whose ambients hold the values of the arrays, the others are written when read through the rooms' API (see __pull()),
+        __tick : updates of the building since the first one, __last, __due : tick of the last and of the next world update of each room.
+        """
+        self.rooms = list(rooms)
+        self.time = self.rooms[0].world.time
+        self.__indexes = {room.name: index for index, room in enumerate(self.rooms)}
+        if len(self.__indexes) < len(self.rooms):
+            logging.warning(
+                "Several rooms of the building have the same name, connections refer to the last one."
+            )
+        self.volumes = np.array(
+            [room.width * room.length * room.height for room in self.rooms], float
+        )
+        self.__edges = np.zeros((2, 0), dtype=np.intp)
+        self.__heat_exchange = np.zeros(0)
+        self.__air_exchange = np.zeros(0)
+        self.__first_update = True
+        self.__stale: Set[int] = set()
+        self.__sources_changed: Set[int] = set()
+        self.__synced = np.ones(len(self.rooms), dtype=bool)
+        self.__tick = 0
+        self.__last = np.zeros(len(self.rooms), dtype=np.int64)
+        self.__due = np.zeros(len(self.rooms), dtype=np.int64)
+        self.__update_exchange_rates()
+        for index, room in enumerate(self.rooms):
+            room.world.building = self
+            room.world.time = self.time
+            room.knxbus.set_simulation_time(self.time.simulation_time)
+            for ambient in self.AMBIENTS:
+                getattr(room.world, ambient).watch(
+                    functools.partial(self.__set_stale, index)
+                )
+                getattr(room.world, ambient).attach(
+                    functools.partial(self.__pull, index)
+                )
+            room.world.ambient_temperature.watch_sources(
+                functools.partial(self.__sources_changed.add, index)
+            )
+            for ambient in (
+                room.world.ambient_light,
+                room.world.soil_moisture,
+                room.world.presence,
+            ):
+                ambient.watch(functools.partial(self.__wake, index))
+        for connection in connections:
+            self.add_connection(*connection)
+        self.refresh()
+
+    @classmethod
+    def from_config(cls, rooms: List, connections_config: List[Dict]) -> "Building":
+        """
+        Create a building from the 'connections' of the world configuration, e.g.
+        [{"rooms": ["bedroom", "kitchen"], "heat_exchange": 30, "air_exchange": 10}]
+        """
+        connections = []
+        for connection in connections_config:
+            try:
+                room_a, room_b = connection["rooms"]
+                connections.append(
+                    (
+                        room_a,
+                        room_b,
+                        float(connection.get("heat_exchange", 0)),
+                        float(connection.get("air_exchange", 0)),
+                    )
+                )
+            except (KeyError, TypeError, ValueError):
+                logging.warning(
+                    f"The connection {connection} should define two 'rooms' and their 'heat_exchange' and 'air_exchange' in m3/h ==> connection is rejected."
+                )
+        return cls(rooms, connections)
+
+    def add_connection(
+        self,
+        room_a: str,
+        room_b: str,
+        heat_exchange: float,
+        air_exchange: float = 0,
+    ) -> bool:
+        """
+        Connect two rooms of the building, return False if a room is unknown.
+
+        room_a, room_b : names of the rooms,
+        heat_exchange : heat exchanged through the wall, as an equivalent volume of air exchanged per hour (m^3/h),
+        air_exchange : volume of air exchanged per hour (m^3/h), e.g. through a door, exchanges humidity and co2.
+        """
+        try:
+            a, b = self.__indexes[room_a], self.__indexes[room_b]
+        except KeyError:
+            logging.warning(
+                f"The connection between '{room_a}' and '{room_b}' refers to a room not in the building ==> connection is rejected."
+            )
+            return False
+        if heat_exchange < 0 or air_exchange < 0:
+            logging.warning(
+                f"The exchanges between '{room_a}' and '{room_b}' should be >= 0 ==> connection is rejected."
+            )
+            return False
+        self.__edges = np.hstack([self.__edges, [[a, b], [b, a]]])
+        self.__heat_exchange = np.append(self.__heat_exchange, [heat_exchange] * 2)
+        self.__air_exchange = np.append(self.__air_exchange, [air_exchange] * 2)
+        self.__update_exchange_rates()
+        self.__duration = None
+        return True
+
+    def __update_exchange_rates(self) -> None:
+        """
+        Compute the exchange rates per hour of each edge, relative to the volume of the origin room,
+        and the bins of the edges' origins for the three ambients in a single bincount.
+        """
+        origins = self.__edges[0]
+        volumes = self.volumes[origins]
+        self.__edge_rates = np.array(
+            [
+                self.__heat_exchange / volumes,
+                self.__air_exchange / volumes,
+                self.__air_exchange / volumes,
+            ]
+        )
+        self.__bins = (
+            origins + len(self.rooms) * np.arange(len(self.AMBIENTS))[:, None]
+        ).ravel()
+        self.__exchange_rates = np.bincount(
+            self.__bins,
+            self.__edge_rates.ravel(),
+            minlength=len(self.AMBIENTS) * len(self.rooms),
+        ).reshape(len(self.AMBIENTS), len(self.rooms))
+
+    def __set_stale(self, index: int) -> None:
+        """Read again the values and sensors of a room before the next step, and update its world at the next update"""
+        self.__stale.add(index)
+        self.__due[index] = 0
+
+    def __wake(self, index: int) -> None:
+        """Update the world of a room at the next update, called when one of its ambients becomes dirty"""
+        self.__due[index] = 0
+
+    def __pull(self, index: int) -> None:
+        """Write the values of the arrays in the ambients of a room, before they are read or set through the room's API"""
+        if not self.__synced[index]:
+            self.__synced[index] = True
+            temperature, vapor_pressure, co2 = self.values[:, index].tolist()
+            world = self.rooms[index].world
+            world.ambient_temperature.set_indoor(temperature)
+            # the humidity is measured at the temperature of the sensors, rounded as AmbientTemperature.get_temperature()
+            world.ambient_humidity.set_indoor(vapor_pressure, round(temperature, 2))
+            world.ambient_co2.set_indoor(co2)
+
+    def __update_sensor_tables(self) -> None:
+        """
+        List the temperature, humidity and co2 sensors of the rooms measured by the building (see World.measured_by_building()),
+        in the order of the rooms, with the thresholds and last publication of the publish policies of the sensors sending their state,
+        so that the publications of all sensors are checked at once (see __measure()).
+        """
+        from devices import PublishPolicy
+
+        measured_indexes = [
+            index
+            for index, room in enumerate(self.rooms)
+            if room.world.measured_by_building()
+            and any(getattr(room.world, ambient).sensors() for ambient in self.AMBIENTS)
+        ]
+        self.__measured_indexes = np.array(measured_indexes, dtype=np.intp)
+        # (device, attribute, row of the measures, column of the room in the measures, room index) of each sensor
+        self.__sensors = [
+            (sensor.device, attribute, row, column, index)
+            for column, index in enumerate(measured_indexes)
+            for row, (ambient, attribute) in enumerate(
+                zip(self.AMBIENTS, ("temperature", "humidity", "co2"))
+            )
+            for sensor in getattr(self.rooms[index].world, ambient).sensors()
+        ]
+        self.__sensor_rows = np.array(
+            [row for _, _, row, _, _ in self.__sensors], dtype=np.intp
+        )
+        self.__sensor_columns = np.array(
+            [column for _, _, _, column, _ in self.__sensors], dtype=np.intp
+        )
+        policies = [
+            device.publish_policy if device._publishing() else None
+            for device, *_ in self.__sensors
+        ]
+        self.__publishing = np.array(
+            [policy is not None for policy in policies], bool
+        )
+        policies = [policy or PublishPolicy() for policy in policies]
+        self.__policies = policies
+        self.__cov_thresholds = np.array(
+            [policy.cov_threshold for policy in policies], float
+        )
+        self.__min_intervals = np.array(
+            [policy.min_interval for policy in policies], float
+        )
+        self.__max_intervals = np.array(
+            [
+                np.inf if policy.max_interval is None else policy.max_interval
+                for policy in policies
+            ],
+            float,
+        )
+        self.__change_only = np.array(
+            [policy.change_only for policy in policies], bool
+        )
+        self.__last_times = np.full(len(policies), np.nan)
+        self.__last_values = np.full(len(policies), np.nan)
+        for position in range(len(policies)):
+            self.__read_last_publication(position)
+
+    def __read_last_publication(self, position: int) -> None:
+        """Read the time and value of the last publication of a sensor of the tables, NaN if none"""
+        last_time, last_value = self.__policies[position].last_publication()
+        if last_time is not None:
+            self.__last_times[position] = last_time
+            self.__last_values[position] = last_value
+
+    def refresh(self) -> None:
+        """
+        Read the indoor and outdoor values, insulation rates and forcing of the rooms' ambients, and the publish policies of the sensors,
+        to call after setting ambient values or adding heaters and ACs directly in the rooms,
+        or after connecting their sensors to the bus or changing their publish policies.
+        """
+        for index in range(len(self.rooms)):
+            self.__pull(index)
+        terms = np.array(
+            [
+                [getattr(room.world, ambient).relaxation() for room in self.rooms]
+                for ambient in self.AMBIENTS
+            ],
+            float,
+        ).reshape(len(self.AMBIENTS), len(self.rooms), 4)
+        self.values, self.targets, self.rates, self.forcing = terms.transpose(
+            2, 0, 1
+        ).copy()
+        self.__sources_changed.clear()
+        self.__update_sensor_tables()
+        self.__stale.clear()
+        self.__duration = None
+
+    def __refresh_stale(self) -> None:
+        """Read again the values, insulation rates, forcing and sensors of the rooms set through the rooms' API since the last step"""
+        for index in self.__stale:
+            self.__pull(index)
+            world = self.rooms[index].world
+            for row, ambient in enumerate(self.AMBIENTS):
+                (
+                    self.values[row, index],
+                    self.targets[row, index],
+                    self.rates[row, index],
+                    self.forcing[row, index],
+                ) = getattr(world, ambient).relaxation()
+        self.__update_sensor_tables()
+        self.__stale.clear()
+        self.__duration = None
+
+    def exchanges(self) -> np.ndarray:
+        """
+        Return the inflow per hour of each room from its neighbours, sum_j (g_ij / v_i) x_j,
+        for the temperature, vapor pressure and co2 (array of shape (3, number of rooms)).
+        """
+        neighbours = self.__edges[1]
+        return np.bincount(
+            self.__bins,
+            (self.__edge_rates * np.take(self.values, neighbours, axis=1)).ravel(),
+            minlength=self.values.size,
+        ).reshape(self.values.shape)
+
+    def __relaxation_rates(self, duration: float) -> None:
+        """Compute the total relaxation rates (insulation and exchanges) and their decay over duration hours, cached while unchanged"""
+        rates = self.rates + self.__exchange_rates
+        self.__relaxing = rates > 0
+        self.__isolated = not self.__relaxing.all()
+        self.__total_rates = np.where(self.__relaxing, rates, 1)
+        self.__decay = np.exp(-self.__total_rates * duration)
+        self.__outdoor_inflow = self.rates * self.targets
+        self.__duration = duration
+
+    def step(self, updates: int = 1) -> None:
+        """
+        Integrate the temperature, vapor pressure and co2 of all rooms over a number of updates, in one vectorized step.
+        Each room relaxes exactly (see exponential_relaxation()) toward the mean of the outdoor and neighbours' values weighted by the rates,
+        with the neighbours' values of the start of the step: exact for isolated rooms, stable for any simulated dt.
+        Rooms with neither insulation losses nor connections evolve linearly with their forcing.
+        The values set and sources added through the rooms' API since the last step are read first,
+        and the forcing of the rooms whose heating or cooling sources changed state.
+        """
+        if self.__stale:
+            self.__refresh_stale()
+        for index in self.__sources_changed:
+            self.forcing[0, index] = self.rooms[
+                index
+            ].world.ambient_temperature.relaxation()[3]
+        self.__sources_changed.clear()
+        duration = updates * self.time.update_rule_ratio
+        if duration != self.__duration:
+            self.__relaxation_rates(duration)
+        equilibrium = (
+            self.__outdoor_inflow + self.exchanges() + self.forcing
+        ) / self.__total_rates
+        values = equilibrium + (self.values - equilibrium) * self.__decay
+        if self.__isolated:
+            values = np.where(
+                self.__relaxing, values, self.values + self.forcing * duration
+            )
+        self.values = values
+        np.clip(values[0], TEMPERATURE_MIN, TEMPERATURE_MAX, out=values[0])
+        self.__synced[:] = False
+
+    def __allowed(self, values: np.ndarray, time: float) -> np.ndarray:
+        """Return the mask of the sensors of the tables whose publish policy allows to publish their values at simulated time, as PublishPolicy.publishes()"""
+        elapsed = time - self.__last_times
+        delta = np.abs(values - self.__last_values)
+        changed = ~(
+            (self.__change_only & (delta == 0)) | (delta < self.__cov_thresholds)
+        )
+        return self.__publishing & (
+            np.isnan(self.__last_times)
+            | (elapsed >= self.__max_intervals)  # heartbeat
+            | ((elapsed >= self.__min_intervals) & changed)
+        )
+
+    def __measure(self, updates: int) -> None:
+        """
+        Set the temperature, humidity and co2 measured by the sensors of the rooms from the arrays, as the rooms' ambients,
+        and send their state on the bus, the states of the updates skipped before the last one are suppressed.
+        The publish policies of all sensors are checked at once on the arrays, only the sensors allowed to publish send their state,
+        the publications of the others are counted as suppressed.
+        """
+        if not self.__sensors:
+            return
+        temperatures = self.values[0, self.__measured_indexes]
+        humidities = np.round(
+            100
+            * self.values[1, self.__measured_indexes]
+            / saturation_vapor_pressure(np.round(temperatures, 2)),
+            2,
+        )
+        co2_levels = self.values[2, self.__measured_indexes].astype(int)
+        measures = (temperatures.tolist(), humidities.tolist(), co2_levels.tolist())
+        sensors = self.__sensors
+        active = np.array(
+            [
+                self.rooms[index].simulation_status
+                for index in self.__measured_indexes.tolist()
+            ],
+            bool,
+        )[self.__sensor_columns]
+        if not active.all():
+            sensors = list(itertools.compress(sensors, active.tolist()))
+        for device, attribute, row, column, _ in sensors:
+            setattr(device, attribute, measures[row][column])
+        values = np.array([temperatures, humidities, co2_levels], float)[
+            self.__sensor_rows, self.__sensor_columns
+        ]
+        allowed = self.__allowed(values, self.time.simulation_time()) & active
+        suppressed = self.__publishing & active & ~allowed
+        for position in np.flatnonzero(suppressed).tolist():
+            self.__policies[position].suppressed += updates
+        for index, positions in itertools.groupby(
+            np.flatnonzero(allowed).tolist(),
+            lambda position: self.__sensors[position][4],
+        ):
+            with self.rooms[index].knxbus.batch():
+                for position in positions:
+                    device = self.__sensors[position][0]
+                    if updates > 1:
+                        device.skip_publications(updates - 1)
+                    device.send_state()
+                    self.__read_last_publication(position)
+
+    def __update_world(
+        self, index: int, interval: float, gui_mode: bool, updates: int
+    ) -> None:
+        """
+        Update the world of a room with Room.update_world() for the updates since its last one,
+        and plan its next update at the next interesting instant of its world (see World.next_event()).
+        The room is updated at each update in GUI mode, when paused (to count the paused time),
+        with a temperature field, or when its bus needs to tick (see KNXBus.quiescent()).
+        """
+        room = self.rooms[index]
+        self.__pull(index)
+        self.__due[index] = self.__tick + MAX_DEFERRED_UPDATES
+        room.update_world(interval, gui_mode, updates)
+        self.__last[index] = self.__tick
+        if gui_mode or not room.simulation_status or not room.knxbus.quiescent():
+            horizon = 1
+        else:
+            horizon = room.world.next_event(MAX_DEFERRED_UPDATES)
+        # an ambient becoming dirty during the update wakes the room at the next update
+        self.__due[index] = min(self.__due[index], self.__tick + horizon)
+
+    def update(
+        self, interval: float = 1, gui_mode: bool = False, updates: int = 1
+    ) -> None:
+        """
+        Update the building: advance the time, integrate the temperature, humidity and co2 of all rooms (see step()),
+        and update the worlds of the rooms at an interesting instant (see World.next_event()),
+        or whose light, soil moisture or presence changed since their last update (e.g. a LED turned on by a telegram).
+        The other rooms are left without world update, the updates are skipped in closed form at their next update,
+        the values of their ambients are written when read through the rooms' API.
+        The temperature, humidity and co2 sensors of the rooms without temperature field are measured on the arrays,
+        and send their state at each update (see World.measured_by_building()).
+        The device values set directly on a room left without update (e.g. the soil moisture of a sensor)
+        are taken into account at its next world update, see synchronize() to read the values of all rooms.
+        """
+        if self.__stale:
+            self.__refresh_stale()
+        if self.__first_update:
+            self.__first_update = False
+            for index in range(len(self.rooms)):
+                self.__update_world(index, interval, gui_mode, updates)
+        else:
+            self.time.update_datetime(updates)
+            self.__tick += updates
+            self.step(updates)
+            for index in np.flatnonzero(self.__due <= self.__tick).tolist():
+                self.__update_world(
+                    index, interval, gui_mode, self.__tick - int(self.__last[index])
+                )
+        self.__measure(updates)
+
+    def synchronize(self) -> None:
+        """
+        Bring the worlds of the rooms left without update up to the current time,
+        and write the values of the arrays in the ambients of all rooms, e.g. before reading the rooms' sensors at the end of a run.
+        """
+        if self.__first_update:
+            return
+        for index in np.flatnonzero(self.__last < self.__tick).tolist():
+            self.__update_world(index, 1, False, self.__tick - int(self.__last[index]))
+        for index in range(len(self.rooms)):
+            self.__pull(index)
+
+    def get_info(self) -> Dict[str, Dict[str, float]]:
+        """Return the indoor temperature, vapor pressure and co2 of each room"""
+        return {
+            room.name: {
+                "temperature_in": round(temperature, 2),
+                "vapor_pressure_in": round(vapor_pressure, 2),
+                "co2_in": round(co2, 2),
+            }
+            for room, temperature, vapor_pressure, co2 in zip(
+                self.rooms, *self.values.tolist()
+            )
+        }
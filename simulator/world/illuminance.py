@@ -0,0 +1,281 @@
+"""
+Vectorized computation of the illuminance measured by the brightness sensors of a room.
+The geometry (distances and solid angles between light sources, windows and sensors) is cached in a matrix,
+recomputed only when a source, window or sensor is added or moved.
+Optionally, the illuminance is computed on a grid of points over the room (lux field), the sensors then measure
+the trilinear interpolation of the grid values around them.
+"""
+
+import itertools
+import math
+from typing import List, Tuple
+
+import numpy as np
+
+# Distance under which a sensor receives all the light emitted by a source (same place)
+SAME_PLACE_DISTANCE = 0.01
+# Walls along the x axis, the other walls ('west', 'east') are along the y axis
+X_AXIS_WALLS = ("north", "south")
+# Height of the horizontal plane of the lux field displayed and averaged for the room, standard working plane height (m)
+WORKING_PLANE_HEIGHT = 0.8
+# Offsets of the 8 corners of a grid cell, along x, y and z
+CELL_CORNERS = np.array(list(itertools.product((0, 1), repeat=3)))
+
+
+def solid_angle(beam_angle: float) -> float:
+    """
+    Solid angle of the beam cone of a light source, https://en.wikipedia.org/wiki/Solid_angle
+
+    beam_angle : as used by the light sources of the simulator (e.g. 180 for a LED bulb).
+    """
+    return 4 * math.pi * (math.sin(beam_angle / 4)) ** 2
+
+
+def window_nearest_points(windows, sensor_positions: np.ndarray) -> np.ndarray:
+    """
+    Return the nearest points of each window to each sensor (projection of the sensor on the window plane, bounded by the window size),
+    as an array of shape (number of sensors, number of windows, 3).
+
+    windows : list of InRoomDevice of Window devices,
+    sensor_positions : array of shape (number of sensors, 3).
+    """
+    window_points = np.array([window.device.window_loc for window in windows], float)
+    x_axis = np.array([window.device.wall in X_AXIS_WALLS for window in windows])
+    low = np.array(
+        [
+            window.location.x if window.device.wall in X_AXIS_WALLS else window.location.y
+            for window in windows
+        ],
+        float,
+    )
+    high = low + np.array([window.device.size[0] for window in windows], float)
+    axis = np.where(x_axis, 0, 1)  # coordinate of the window plane along the wall
+    nearest = np.broadcast_to(
+        window_points, (len(sensor_positions), len(windows), 3)
+    ).copy()
+    sensor_along_wall = sensor_positions[:, axis]  # shape (sensors, windows)
+    nearest[:, np.arange(len(windows)), axis] = np.clip(sensor_along_wall, low, high)
+    return nearest
+
+
+def illuminance_factors(distances: np.ndarray, solid_angles: np.ndarray) -> np.ndarray:
+    """
+    Return the fraction of the lumens of each source received on 1m^2 by each sensor,
+    1 if the sensor and the source are at the same place.
+
+    distances : array of shape (sensors, sources), solid_angles : array of shape (sources,).
+    """
+    same_place = distances <= SAME_PLACE_DISTANCE
+    with np.errstate(divide="ignore"):
+        factors = 1 / (solid_angles * np.where(same_place, 1, distances) ** 2)
+    return np.where(same_place, 1, factors)
+
+
+def grid_axes(
+    dimensions: Tuple[float, float, float], resolution: float
+) -> List[np.ndarray]:
+    """
+    Return the coordinates of the grid nodes along x, y and z, evenly spaced from 0 to the room size,
+    with a spacing of at most resolution meters (at least 2 nodes per axis).
+
+    dimensions : width, length and height of the room (m).
+    """
+    return [
+        np.linspace(0, size, max(2, math.ceil(size / resolution - 1e-9) + 1))
+        for size in dimensions
+    ]
+
+
+def interpolation_weights(
+    axes: List[np.ndarray], positions: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the flat indexes of the 8 grid nodes around each position and their trilinear interpolation weights,
+    as arrays of shape (number of positions, 8), the positions outside of the grid are clipped to its border.
+
+    axes : grid nodes coordinates along x, y and z (see grid_axes()), positions : array of shape (number of positions, 3).
+    """
+    lows, fractions = [], []
+    for dimension, (axis, coordinates) in enumerate(zip(axes, positions.T)):
+        scaled = np.clip(coordinates / (axis[1] - axis[0]), 0, len(axis) - 1)
+        low = np.minimum(scaled.astype(np.intp), len(axis) - 2)
+        fraction = (scaled - low)[:, None]
+        corners = CELL_CORNERS[:, dimension]
+        lows.append(low[:, None] + corners)
+        fractions.append(np.where(corners, fraction, 1 - fraction))
+    indexes = np.ravel_multi_index(tuple(lows), tuple(len(axis) for axis in axes))
+    return indexes, np.prod(fractions, axis=0)
+
+
+class IlluminanceEngine:
+    """
+    Class computing the illuminance (lux) of all the brightness sensors with a single matrix-vector product:
+    lux = geometry @ lumens, with geometry[sensor, source] the fraction of lumens of the source received by the sensor on 1m^2,
+    for the light sources then the windows.
+    With a grid (see set_grid()), the geometry of the sensors is interpolated from the geometry of the grid nodes,
+    the lux field of the grid is rebuilt only when the lumens of the sources change (state, dimming or outdoor luminosity).
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialization of the illuminance engine.
+
+        __sources, __windows, __sensors : InRoomDevice objects of the light sources, windows and brightness sensors,
+        __geometry : cached geometry matrix, None when it needs to be recomputed,
+        __grid_axes : coordinates of the grid nodes along x, y and z, None without grid,
+        __grid_geometry : cached geometry matrix of the grid nodes, of shape (nodes, sources + windows),
+        __grid_lux, __grid_lumens : cached lux field of the grid and the lumens of the sources it was computed with,
+        rebuilds : number of computations of the lux field.
+        """
+        self.__sources = []
+        self.__windows = []
+        self.__sensors = []
+        self.__geometry: np.ndarray = None
+        self.__grid_axes: List[np.ndarray] = None
+        self.__grid_geometry: np.ndarray = None
+        self.__grid_lux: np.ndarray = None
+        self.__grid_lumens: np.ndarray = None
+        self.__fields = {}
+        self.rebuilds = 0
+
+    def add_source(self, source) -> None:
+        self.__sources.append(source)
+        self.invalidate()
+
+    def add_window(self, window) -> None:
+        self.__windows.append(window)
+        self.invalidate()
+
+    def add_sensor(self, sensor) -> None:
+        self.__sensors.append(sensor)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Discard the cached geometry and lux field, called when a source, window or sensor is added or moved."""
+        self.__geometry = None
+        self.__grid_geometry = None
+        self.__grid_lux = None
+
+    def set_grid(
+        self, dimensions: Tuple[float, float, float], resolution: float = None
+    ) -> None:
+        """
+        Compute the illuminance on a grid of nodes spaced by at most resolution meters over the room, None to remove the grid.
+
+        dimensions : width, length and height of the room (m).
+        """
+        self.__grid_axes = (
+            None if resolution is None else grid_axes(dimensions, resolution)
+        )
+        self.invalidate()
+
+    @property
+    def grid_axes(self) -> List[np.ndarray]:
+        """Coordinates of the grid nodes along x, y and z, None without grid"""
+        return self.__grid_axes
+
+    @property
+    def geometry(self) -> np.ndarray:
+        """Geometry matrix of shape (sensors, sources + windows), computed if not in cache."""
+        if self.__geometry is None:
+            self.__geometry = self.__compute_geometry()
+        return self.__geometry
+
+    def __compute_geometry(self) -> np.ndarray:
+        sensor_positions = np.array(
+            [sensor.location.pos for sensor in self.__sensors], float
+        ).reshape(-1, 3)
+        if self.__grid_axes is None:
+            return self.__factors(sensor_positions)
+        indexes, weights = interpolation_weights(self.__grid_axes, sensor_positions)
+        return np.einsum("pc,pcs->ps", weights, self.grid_geometry[indexes])
+
+    @property
+    def grid_geometry(self) -> np.ndarray:
+        """Geometry matrix of the grid nodes (flattened in x, y, z order), computed if not in cache."""
+        if self.__grid_geometry is None:
+            nodes = np.stack(
+                np.meshgrid(*self.__grid_axes, indexing="ij"), axis=-1
+            ).reshape(-1, 3)
+            self.__grid_geometry = self.__factors(nodes)
+        return self.__grid_geometry
+
+    def __factors(self, positions: np.ndarray) -> np.ndarray:
+        """Return the fraction of lumens of each light source and window received on 1m^2 at each position, of shape (positions, sources + windows)"""
+        geometry = np.zeros((len(positions), len(self.__sources) + len(self.__windows)))
+        if self.__sources:
+            source_positions = np.array(
+                [source.location.pos for source in self.__sources], float
+            )
+            distances = np.linalg.norm(
+                positions[:, None, :] - source_positions[None, :, :], axis=2
+            )
+            solid_angles = np.array(
+                [solid_angle(source.device.beam_angle) for source in self.__sources]
+            )
+            geometry[:, : len(self.__sources)] = illuminance_factors(
+                distances, solid_angles
+            )
+        if self.__windows:
+            nearest = window_nearest_points(self.__windows, positions)
+            distances = np.linalg.norm(nearest - positions[:, None, :], axis=2)
+            solid_angles = np.array(
+                [solid_angle(window.device.beam_angle) for window in self.__windows]
+            )
+            geometry[:, len(self.__sources) :] = illuminance_factors(
+                distances, solid_angles
+            )
+        return geometry
+
+    def lumens(self, out_lux: float = None) -> np.ndarray:
+        """
+        Return the effective lumens of the light sources (0 if turned off) followed by the windows',
+        for another outdoor luminosity out_lux than the current one if given.
+        """
+        source_lumens = [
+            source.device.effective_lumen() if source.device.state else 0.0
+            for source in self.__sources
+        ]
+        window_lumens = [
+            window.device.effective_lumen(out_lux) for window in self.__windows
+        ]
+        return np.array(source_lumens + window_lumens, float)
+
+    def compute(self, out_lux: float = None) -> np.ndarray:
+        """Return the illuminance in lux measured by each sensor, in the order they were added (for the outdoor luminosity out_lux if given)"""
+        return self.geometry @ self.lumens(out_lux)
+
+    def grid(self, out_lux: float = None) -> np.ndarray:
+        """
+        Return the lux field of the grid, of shape (nodes along x, y, z), None without grid.
+        The field is cached and rebuilt only when the lumens of the light sources or windows change.
+        """
+        if self.__grid_axes is None:
+            return None
+        lumens = self.lumens(out_lux)
+        if self.__grid_lux is None or not np.array_equal(lumens, self.__grid_lumens):
+            self.__grid_lux = (self.grid_geometry @ lumens).reshape(
+                tuple(len(axis) for axis in self.__grid_axes)
+            )
+            self.__grid_lumens = lumens
+            self.__fields = {}
+            self.rebuilds += 1
+        return self.__grid_lux
+
+    def field(self, height: float = WORKING_PLANE_HEIGHT) -> np.ndarray:
+        """
+        Return the lux field on the horizontal plane at height, of shape (nodes along x, y), None without grid,
+        linearly interpolated between the grid layers, the same array is returned while the field is unchanged.
+        """
+        grid = self.grid()
+        if grid is None:
+            return None
+        if height not in self.__fields:
+            heights = self.__grid_axes[2]
+            scaled = np.clip(height / (heights[1] - heights[0]), 0, len(heights) - 1)
+            low = min(int(scaled), len(heights) - 2)
+            fraction = scaled - low
+            self.__fields[height] = (1 - fraction) * grid[:, :, low] + fraction * grid[
+                :, :, low + 1
+            ]
+        return self.__fields[height]
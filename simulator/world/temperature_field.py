@@ -0,0 +1,244 @@
+"""
+Spatially resolved indoor temperature: finite-difference diffusion grid over a room (2D floor plan or 3D),
+with the heaters, ACs and windows as located sources and sinks, sampled by the temperature sensors at their location.
+
+The room's mean temperature is still integrated by AmbientTemperature (or the Building), the field holds the deviation from the mean:
+    dphi/dt = D lap(phi) - k phi + sum_i r_i (s_i - 1) + k (t_out - t_mean) (w - 1)
+with lap() the 5-point (7-point in 3D) stencil with zero-flux walls, D the air mixing diffusivity, k the insulation rate,
+r_i the forcing of the source i (°C/h) spread with the shape s_i around it (mean 1),
+and w the distribution of the insulation losses (mean 1), concentrated at the windows.
+All terms have a zero mean, so the mean of the field stays the room's mean temperature.
+
+The stencil is diagonal in the cosine basis (DCT-II) of the grid, the deviation is stored in this basis
+and integrated exactly over each update (see exponential_relaxation()), stable for any grid resolution and simulated dt.
+"""
+
+import logging
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .illuminance import X_AXIS_WALLS
+
+# Effective diffusivity of the indoor air mixed by convection (m^2/h), arbitrary
+AIR_MIXING_DIFFUSIVITY = 20.0
+# Radius of the spread of the heat of a source or of the losses of a window around it (m)
+SOURCE_RADIUS = 0.3
+# Share of the insulation losses through the windows, the rest is lost uniformly
+WINDOW_LOSS_SHARE = 0.5
+
+
+def laplacian(values: np.ndarray, spacings: Tuple[float, ...]) -> np.ndarray:
+    """
+    Return the finite-difference laplacian of the values of a grid of cells (5-point stencil in 2D, 7-point in 3D),
+    with zero-flux boundaries (the values are mirrored beyond the walls).
+
+    spacings : size of the cells along each axis (m).
+    """
+    padded = np.pad(values, 1, mode="edge")
+    center = tuple(slice(1, -1) for _ in values.shape)
+    result = np.zeros_like(values, dtype=float)
+    for axis, spacing in enumerate(spacings):
+        before = center[:axis] + (slice(None, -2),) + center[axis + 1 :]
+        after = center[:axis] + (slice(2, None),) + center[axis + 1 :]
+        result += (padded[before] + padded[after] - 2 * values) / spacing**2
+    return result
+
+
+def cosine_basis(cells: int, size: float, positions: np.ndarray = None) -> np.ndarray:
+    """
+    Return the orthonormal cosine basis (DCT-II) of cells cells along an axis of size meters, of shape (modes, cells),
+    or evaluated at positions (m) along the axis, of shape (modes, positions).
+    """
+    if positions is None:
+        positions = (np.arange(cells) + 0.5) * size / cells
+    modes = np.arange(cells)[:, None]
+    scale = np.where(modes == 0, np.sqrt(1 / cells), np.sqrt(2 / cells))
+    return scale * np.cos(np.pi * modes * np.asarray(positions, float)[None, :] / size)
+
+
+def stencil_eigenvalues(cells: int, spacing: float) -> np.ndarray:
+    """Return the eigenvalues of the 1D stencil with zero-flux boundaries, for the modes of cosine_basis()"""
+    return -(2 - 2 * np.cos(np.pi * np.arange(cells) / cells)) / spacing**2
+
+
+class TemperatureField:
+    """
+    Class to represent the deviation of the temperature from the room's mean temperature on a grid of cells over the room,
+    see the module docstring for the model.
+    """
+
+    def __init__(
+        self,
+        room,
+        resolution: float,
+        three_dimensional: bool = False,
+        diffusivity: float = AIR_MIXING_DIFFUSIVITY,
+    ) -> None:
+        """
+        Initialization of a temperature field over a room.
+
+        room : Room, its windows are the located sinks of the field,
+        resolution : size of the cells (m), e.g. 0.05 for a 100x80 grid over a 5x4m room,
+        three_dimensional : grid over the height of the room too, else the field is a floor plan,
+        diffusivity : mixing diffusivity of the air (m^2/h).
+
+        __modes : deviation in the cosine basis, of the grid shape,
+        __shapes : cached sources' shapes in the cosine basis by source name, __losses : losses distribution in the cosine basis,
+        __samples : cached sensors and their basis functions, None when the geometry needs to be recomputed.
+        """
+        self.__room = room
+        sizes = (room.width, room.length, room.height)[: 3 if three_dimensional else 2]
+        self.shape = tuple(max(1, round(size / resolution)) for size in sizes)
+        self.sizes = sizes
+        self.spacings = tuple(size / cells for size, cells in zip(sizes, self.shape))
+        self.diffusivity = diffusivity
+        self.__bases = [
+            cosine_basis(cells, size) for cells, size in zip(self.shape, sizes)
+        ]
+        eigenvalues = [
+            stencil_eigenvalues(cells, spacing)
+            for cells, spacing in zip(self.shape, self.spacings)
+        ]
+        self.__stencil = sum(np.ix_(*eigenvalues))  # eigenvalues of the laplacian
+        self.__modes = np.zeros(self.shape)
+        self.__decay_key = None
+        self.invalidate()
+
+    @classmethod
+    def from_config(cls, room, field_config: Dict) -> "TemperatureField":
+        """
+        Create a temperature field from the 'temperature_field' of the world configuration, e.g.
+        {"resolution": 0.05, "three_dimensional": false, "diffusivity": 20}, return None if invalid.
+        """
+        try:
+            resolution = float(field_config["resolution"])
+            diffusivity = float(field_config.get("diffusivity", AIR_MIXING_DIFFUSIVITY))
+            three_dimensional = bool(field_config.get("three_dimensional", False))
+        except (KeyError, TypeError, ValueError):
+            logging.warning(
+                f"The temperature field {field_config} should define a 'resolution' in m, and optionally the 'diffusivity' in m2/h and 'three_dimensional' ==> the temperature stays homogeneous."
+            )
+            return None
+        if resolution <= 0 or diffusivity < 0:
+            logging.warning(
+                f"The temperature field resolution should be > 0 and its diffusivity >= 0, but {resolution} and {diffusivity} were given ==> the temperature stays homogeneous."
+            )
+            return None
+        return cls(room, resolution, three_dimensional, diffusivity)
+
+    def invalidate(self) -> None:
+        """Discard the cached geometry of the sources, windows and sensors, called when a device moves in the room"""
+        self.__shapes: Dict[str, np.ndarray] = {}
+        self.__samples: Tuple[List, np.ndarray] = None
+        self.__losses = None
+
+    def __transform(self, values: np.ndarray) -> np.ndarray:
+        """Return the values of the cells in the cosine basis"""
+        for axis, basis in enumerate(self.__bases):
+            values = np.moveaxis(np.tensordot(basis, values, axes=(1, axis)), 0, axis)
+        return values
+
+    def __spread(self, points: List[Tuple[float, ...]]) -> np.ndarray:
+        """Return the sum of the gaussian spreads around points, of mean 1 over the cells, minus 1, in the cosine basis"""
+        centers = np.meshgrid(
+            *[
+                (np.arange(cells) + 0.5) * spacing
+                for cells, spacing in zip(self.shape, self.spacings)
+            ],
+            indexing="ij",
+        )
+        radius = max(SOURCE_RADIUS, max(self.spacings))
+        spread = np.zeros(self.shape)
+        for point in points:
+            distances = sum(
+                (center - coordinate) ** 2 for center, coordinate in zip(centers, point)
+            )
+            spread += np.exp(-distances / (2 * radius**2))
+        return self.__transform(spread / spread.mean() - 1)
+
+    def __source_shape(self, source) -> np.ndarray:
+        """Return the shape of a source (InRoomDevice) minus 1, in the cosine basis, cached until invalidate()"""
+        if source.name not in self.__shapes:
+            self.__shapes[source.name] = self.__spread([source.location.pos])
+        return self.__shapes[source.name]
+
+    def __window_losses(self) -> np.ndarray:
+        """Return the distribution of the insulation losses minus 1, concentrated at the windows, in the cosine basis"""
+        if self.__losses is None:
+            centers = []
+            for window in self.__room.windows:
+                x, y, z = window.location.pos
+                half_width = window.device.size[0] / 2
+                if window.device.wall in X_AXIS_WALLS:
+                    centers.append((x + half_width, y, z))
+                else:
+                    centers.append((x, y + half_width, z))
+            self.__losses = (
+                WINDOW_LOSS_SHARE * self.__spread(centers)
+                if centers
+                else np.zeros(self.shape)
+            )
+        return self.__losses
+
+    def __decay(
+        self, duration: float, insulation_rate: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the decay of the modes over duration hours and the integral of the decay, cached while unchanged"""
+        if self.__decay_key != (duration, insulation_rate):
+            rates = self.diffusivity * self.__stencil - insulation_rate
+            self.__decay_factors = np.exp(rates * duration)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                self.__integrals = np.where(
+                    rates == 0, duration, (self.__decay_factors - 1) / rates
+                )
+            self.__decay_key = (duration, insulation_rate)
+        return self.__decay_factors, self.__integrals
+
+    def step(
+        self,
+        duration: float,
+        temperature_in: float,
+        temperature_out: float,
+        insulation_rate: float,
+        sources: List[Tuple[object, float]],
+    ) -> None:
+        """
+        Integrate the deviation over duration hours, with the sources and losses of the start of the step.
+
+        temperature_in, temperature_out : mean indoor and outdoor temperatures at the start of the step,
+        insulation_rate : relaxation rate per hour of the room toward the outdoor temperature,
+        sources : InRoomDevice of the sources turned on, with their forcing in °C per hour.
+        """
+        forcing = (
+            insulation_rate
+            * (temperature_out - temperature_in)
+            * self.__window_losses()
+        )
+        for source, rule in sources:
+            forcing = forcing + rule * self.__source_shape(source)
+        decay, integral = self.__decay(duration, insulation_rate)
+        self.__modes = self.__modes * decay + forcing * integral
+
+    def sample(self, sensors: List) -> np.ndarray:
+        """Return the deviation from the mean temperature at the location of the sensors (InRoomDevice)"""
+        if self.__samples is None or self.__samples[0] != sensors:
+            positions = np.array(
+                [sensor.location.pos for sensor in sensors], float
+            ).reshape(-1, 3)
+            bases = [
+                cosine_basis(cells, size, positions[:, axis])
+                for axis, (cells, size) in enumerate(zip(self.shape, self.sizes))
+            ]
+            basis = bases[0][:, None, :] * bases[1][None, :, :]
+            if len(bases) == 3:
+                basis = basis[:, :, None, :] * bases[2][None, None, :, :]
+            self.__samples = (list(sensors), basis.reshape(-1, len(sensors)))
+        return self.__modes.ravel() @ self.__samples[1]
+
+    def field(self, temperature_in: float) -> np.ndarray:
+        """Return the temperature of the cells, for the mean indoor temperature, of the grid shape"""
+        values = self.__modes
+        for axis, basis in enumerate(self.__bases):
+            values = np.moveaxis(np.tensordot(basis.T, values, axes=(1, axis)), 0, axis)
+        return temperature_in + values
@@ -7,22 +7,55 @@ import time
 import math
 import logging
 from datetime import timedelta, datetime
-from typing import List, Union, Tuple, Dict
+from functools import lru_cache
+from typing import Callable, List, Union, Tuple, Dict
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from numpy import float32, mean, sign
+from numpy import float32, mean, ndarray, sign
 
 import tools
+from system.tracing import trace_point
+from .illuminance import IlluminanceEngine, WORKING_PLANE_HEIGHT
 from .world_tools import (
     outdoor_light,
-    compute_distance,
-    compute_distance_from_window,
+    next_outdoor_light_change,
+    sun_events,
+    exponential_relaxation,
+    Site,
+    DEFAULT_SITE,
     INSULATION_TO_TEMPERATURE_FACTOR,
     INSULATION_TO_HUMIDITY_FACTOR,
     INSULATION_TO_CO2_FACTOR,
     SOIL_MOISTURE_MIN,
 )
 
+TRACE_WORLD_UPDATE = trace_point("world.update")
+TRACE_BRIGHTNESS = trace_point("world.brightness")
+TRACE_TEMPERATURE = trace_point("world.temperature")
+TRACE_HUMIDITY = trace_point("world.humidity")
+TRACE_CO2 = trace_point("world.co2")
+TRACE_SOIL_MOISTURE = trace_point("world.soil_moisture")
+# Margin before a boundary of the outdoor light, to check if the outdoor lux is constant until the boundary
+LIGHT_BOUNDARY_MARGIN = timedelta(seconds=1)
+
+
+def changed_levels(
+    levels: List[Tuple[str, Union[float, bool]]],
+    reported: Dict[str, Union[float, bool]],
+) -> List[Tuple[str, Union[float, bool]]]:
+    """
+    Return the levels (sensor name, value) that differ from the last values reported for the sensors, and record them as reported.
+
+    reported : last value reported for each sensor name, updated in place.
+    """
+    changed = [
+        (name, value)
+        for name, value in levels
+        if name not in reported or reported[name] != value
+    ]
+    reported.update(changed)
+    return changed
+
 
 class Time:
     """
@@ -49,8 +82,24 @@ class Time:
         self.__datetime_init = date_time
         self.date_time = date_time
         self.__simtim_tick_counter = 0
+        self.__elapsed_offset = 0  # simulated seconds elapsed before the last speed factor change
         self.update_rule_ratio = (self.__system_dt * self.speed_factor) / 3600
 
+    @property
+    def simulated_dt(self) -> float:
+        """Simulated seconds between two world updates"""
+        return self.__system_dt * self.speed_factor
+
+    def set_simulated_dt(self, simulated_dt: float) -> None:
+        """
+        Change the simulated time between two world updates (e.g. for a headless run with a fixed simulated dt),
+        without changing the simulation time elapsed so far.
+        """
+        self.__elapsed_offset = self.simulation_time()
+        self.__simtim_tick_counter = 0
+        self.speed_factor = simulated_dt / self.__system_dt
+        self.update_rule_ratio = simulated_dt / 3600
+
     # Scheduler management, if not in GUI mode
     def scheduler_init(self) -> AsyncIOScheduler:
         """Initialize the asyncio scheduler."""
@@ -84,7 +133,9 @@ class Time:
         At each update that occur every system_dt, the tick_counter is increased by system_dt,
         and the simulated time is computed by multiplying with the speed_factor (simulated seconds corresponding to one update = system_dt)."""
         try:
-            elapsed_time = (self.__simtim_tick_counter) * self.speed_factor
+            elapsed_time = (
+                self.__elapsed_offset + self.__simtim_tick_counter * self.speed_factor
+            )
             if str_mode:
                 str_elapsed_time = str(timedelta(seconds=round(elapsed_time, 2)))
                 return str_elapsed_time
@@ -94,36 +145,70 @@ class Time:
             logging.warning("The Simulation time is not initialized.")
             return None
 
-    def update_datetime(self) -> datetime:
-        """Increment simtime with system_dt=interval between two tick/updates"""
-        self.__simtim_tick_counter += self.__system_dt
+    def update_datetime(self, updates: int = 1) -> datetime:
+        """Increment simtime with system_dt=interval between two tick/updates, for a number of updates"""
+        self.__simtim_tick_counter += self.__system_dt * updates
         self.date_time = self.__datetime_init + timedelta(
             seconds=self.simulation_time(str_mode=False)
         )
         return self.date_time
 
+    def time_after(self, updates: int) -> float:
+        """Return the simulation time after a number of updates"""
+        return (
+            self.__elapsed_offset
+            + (self.__simtim_tick_counter + self.__system_dt * updates)
+            * self.speed_factor
+        )
+
+    def date_time_after(self, updates: int) -> datetime:
+        """Return the simulation date and time after a number of updates"""
+        return self.__datetime_init + timedelta(seconds=self.time_after(updates))
+
+    def updates_until(self, date_time: datetime) -> int:
+        """Return the number of updates (at least 1) until the simulation date and time reaches date_time"""
+        seconds = (date_time - self.date_time).total_seconds()
+        return max(1, math.ceil(seconds / self.simulated_dt))
+
 
 class AmbientLight:
-    """Class to represent Light/Brightness in a simulation, Brightness is location-dependant in the room."""
+    """
+    Class to represent Light/Brightness in a simulation, Brightness is location-dependant in the room.
+    The sensors' brightness is recomputed only when the ambient is dirty: a light source changed state, a device moved,
+    or the outdoor lux changed (the outdoor lux is constant between some boundaries of the day, see next_outdoor_light_change()).
+    """
 
-    def __init__(self, date_time: datetime, weather: str) -> None:
+    def __init__(
+        self, date_time: datetime, weather: str, site: Site = DEFAULT_SITE
+    ) -> None:
         """
         Initialization of an ambient light object, brightness in luc=lumen/m^2.
 
         weather : can be 'slear', 'overcast' or 'dark'
-        datetime : datetime.datetime object to represent simulation date and time"""
+        datetime : datetime.datetime object to represent simulation date and time
+        site : geographical site (latitude, longitude, timezone) of the room for the sun events"""
         from system.room import InRoomDevice
         from system.system_tools import Window
 
         self.__light_sources: List[InRoomDevice] = []
         self.__light_sensors: List[InRoomDevice] = []
         self.__windows: List[Window] = []
+        self.__illuminance = IlluminanceEngine()
         # values fo global brightness, utilization and light loss factor:
         # https://www.fuzionlighting.com.au/technical/room-index, considering light on 3m ceiling
         self.__utilization_factor = 0.52
         self.__light_loss_factor = 0.8
         self.__weather = weather
-        self.__lux_out, self.__time_of_day = outdoor_light(date_time, weather)
+        self.__site = site
+        self.__lux_out, self.__time_of_day = outdoor_light(date_time, weather, site)
+        # dirty : the sensors' brightness should be recomputed at the next update,
+        # constant_until : datetime until which the outdoor lux is constant, None to recompute it at each update,
+        # reported : last brightness reported for each sensor
+        self.__dirty = True
+        self.__constant_until: datetime = None
+        self.__reported: Dict[str, float] = {}
+        # Functions called when the ambient becomes dirty between two updates (see watch())
+        self.__watchers: List[Callable[[], None]] = []
 
     def add_source(self, lightsource) -> None:
         """
@@ -139,8 +224,12 @@ class AmbientLight:
             self.__windows.append(lightsource)
             # Compute window max_lumen from out_lux and window area
             lightsource.device.max_lumen_from_out_lux(self.__lux_out)
+            self.__illuminance.add_window(lightsource)
         elif isinstance(lightsource.device, LightActuator):
             self.__light_sources.append(lightsource)
+            self.__illuminance.add_source(lightsource)
+            lightsource.device.watch(self.mark_dirty)
+        self.mark_dirty()
 
     def add_sensor(self, lightsensor) -> None:
         """
@@ -149,86 +238,143 @@ class AmbientLight:
         lightsensor: InRoomDevice
         """
         self.__light_sensors.append(lightsensor)
-
-    def __lux_from_lightsource(self, source, distance: float) -> float:
+        self.__illuminance.add_sensor(lightsensor)
+        self.mark_dirty()
+
+    def invalidate_geometry(self) -> None:
+        """Discard the cached sensors/sources geometry, called when a light source, window or sensor moves in the room."""
+        self.__illuminance.invalidate()
+        self.mark_dirty()
+
+    def watch(self, watcher: Callable[[], None]) -> None:
+        """Call watcher when the ambient becomes dirty between two updates, used by the building of the room to update it (see Building)"""
+        self.__watchers.append(watcher)
+
+    def mark_dirty(self) -> None:
+        """Recompute the sensors' brightness at the next update, called when a light source changes state"""
+        self.__dirty = True
+        for watcher in self.__watchers:
+            watcher()
+
+    def set_grid(
+        self, dimensions: Tuple[float, float, float], resolution: float = None
+    ) -> Union[None, int]:
         """
-        Compute resulting lux at a certain distance of a light source emitting lumens.
-        lux = lumen/square meter
-        With the beam angle of source, we compute the total sphere surface reached by lumens 
-        at a certain distance from source,
-        We then take the fraction corresponding to 1 square meter: 
-        (effective_lumen * lumen_ratio) / lux_area = lux/m^2 at a certain distance.
+        Compute the brightness on a grid over the room (lux field), the sensors then measure the interpolation of the grid,
+        None as resolution removes the grid.
 
-        source: InRoomDevice
+        dimensions : width, length and height of the room (m),
+        resolution : maximal spacing between the grid nodes (m).
         """
-        if (
-            distance <= 0.01
-        ):  # source and sensor at same place, sensor gets all the light emitted
-            return source.device.effective_lumen()
-        lux_area = 1  # 1 m^2
-        # Total surface of sphere reached by light around lightsource
-        # https://en.wikipedia.org/wiki/Solid_angle
-        solid_angle = 4 * math.pi * (math.sin(source.device.beam_angle / 4)) ** 2
-        total_beam_cone_surface = solid_angle * distance**2
-        # Fraction of lumen reaching a 1m^2 area at a specific distance from source
-        lumen_ratio = lux_area / total_beam_cone_surface
-        # Lumen reaching the 1m^2 area at distance from source
-        effective_lumen = (
-            source.device.effective_lumen() * lumen_ratio
-        )  # result in lumen [lm]
-        return effective_lumen / lux_area  # result in [lm/m^2]
+        if resolution is not None and not resolution > 0:
+            logging.warning(
+                f"The illuminance grid resolution should be > 0 meters, but {resolution} was given."
+            )
+            return None
+        self.__illuminance.set_grid(dimensions, resolution)
+        self.mark_dirty()
+        return 1
 
-    def __compute_sensor_brightness(self, brightness_sensor) -> float:
+    def lux_field(self, height: float = WORKING_PLANE_HEIGHT) -> Union[ndarray, None]:
         """
-        Compute brightness measured by a certain sensor.
-
-        brightness_sensor: InRoomDevice
+        Return the brightness (lux) on the horizontal plane at height of the room, as an array of shape (nodes along x, nodes along y),
+        None if no grid is set, the field is rebuilt only when a light source or the outdoor brightness changes.
         """
-        from system import Window
-
-        brightness = 0
-        for source in self.__light_sources:
-            if source.device.state:
-                # Compute distance between sensor and source
-                distance = compute_distance(source, brightness_sensor)
-                print(
-                    f"distance {distance} between source {source.name} and sensor {brightness_sensor.name} "
-                )
-                # Compute the partial brightness (illuminance in lux=[lm/m^2])
-                partial_illuminance = self.__lux_from_lightsource(source, distance)
-                # We can linearly add lux values
-                brightness += partial_illuminance
+        return self.__illuminance.field(height)
 
-        for window in self.__windows:
-            distance = compute_distance_from_window(window, brightness_sensor)
-            partial_illuminance = self.__lux_from_lightsource(window, distance)
-            brightness += partial_illuminance
-        return brightness
+    def __compute_sensors_brightness(self) -> List[float]:
+        """
+        Compute brightness measured by all sensors, in the order of the light sensors list.
+        The lux are summed linearly over the light sources turned on and the windows, with a single matrix-vector product
+        of the cached geometry (fraction of lumens reaching 1m^2 at the sensor) and of the effective lumens of the sources.
+        """
+        return self.__illuminance.compute().tolist()
 
     def update(
         self, date_time: datetime, first_update: bool = False
     ) -> Tuple[List[Tuple[str, float]], str, datetime, float]:
         """
         Update all brightness sensors of the world (the room), called at each World.update()
+        The sensors' brightness is recomputed only if the ambient is dirty, the sensors send their state at each update.
 
         first_update : if start of simulation, no update when first called to display initial values on gui window.
 
-        Return new brightness levels and weather/time info for GUI updates.
+        Return the brightness levels changed since the last update and weather/time info for GUI updates.
         """
-        if not first_update:
-            logging.info("Brightness update...")
-
-            self.__lux_out, self.__time_of_day = outdoor_light(
-                date_time, self.__weather
+        if not first_update and (
+            self.__constant_until is None or date_time >= self.__constant_until
+        ):
+            self.__update_outdoor_light(date_time)
+        brightness_levels = []
+        if self.__dirty:
+            for sensor, brightness in zip(
+                self.__light_sensors, self.__compute_sensors_brightness()
+            ):  # update light sensors values
+                sensor.device.brightness = brightness
+            brightness_levels = changed_levels(
+                [
+                    (sensor.device.name, sensor.device.brightness)
+                    for sensor in self.__light_sensors
+                ],
+                self.__reported,
+            )
+            self.__dirty = False
+        for sensor in self.__light_sensors:
+            sensor.device.send_state()
+        if TRACE_BRIGHTNESS.enabled:
+            TRACE_BRIGHTNESS.emit(
+                lux_out=self.__lux_out,
+                time_of_day=self.__time_of_day,
+                levels=brightness_levels,
             )
+        return brightness_levels, self.__weather, self.__time_of_day, self.__lux_out
+
+    def __update_outdoor_light(self, date_time: datetime) -> None:
+        """
+        Compute the outdoor lux and time of day at date_time, the ambient is dirty if the outdoor lux changed.
+        If unchanged since the last update and at the end of the current piece of the outdoor light, it is constant until the next boundary.
+        """
+        lux_out, self.__time_of_day = outdoor_light(
+            date_time, self.__weather, self.__site
+        )
+        self.__constant_until = None
+        if lux_out != self.__lux_out:
+            self.__lux_out = lux_out
             for window in self.__windows:  # update max_lumen
                 window.device.max_lumen_from_out_lux(self.__lux_out)
-        brightness_levels = []
-        for sensor in self.__light_sensors:  # update light sensors values
-            sensor.device.brightness = self.__compute_sensor_brightness(sensor)
-            brightness_levels.append((sensor.device.name, sensor.device.brightness))
+            self.__dirty = True
+        elif sun_events(self.__site, date_time.date()) is not None:  # not polar
+            boundary = next_outdoor_light_change(date_time, self.__site)
+            lux_end, _ = outdoor_light(
+                boundary - LIGHT_BOUNDARY_MARGIN, self.__weather, self.__site
+            )
+            if lux_end == lux_out:
+                self.__constant_until = boundary
+
+    def predict(self, date_time: datetime) -> List[float]:
+        """Return the brightness that the sensors would measure at date_time, with the current light sources' states"""
+        lux_out, _ = outdoor_light(date_time, self.__weather, self.__site)
+        return self.__illuminance.compute(lux_out).tolist()
+
+    def sensor_predictions(
+        self, date_time_after: Callable[[int], datetime]
+    ) -> List[Tuple[object, Callable[[int], float]]]:
+        """Return the brightness sensors with the function predicting their measured value after a number of updates"""
+        brightness_after = lru_cache(maxsize=None)(
+            lambda updates: self.predict(date_time_after(updates))
+        )
+        return [
+            (
+                sensor.device,
+                lambda updates, index=index: brightness_after(updates)[index],
+            )
+            for index, sensor in enumerate(self.__light_sensors)
+        ]
 
-        return brightness_levels, self.__weather, self.__time_of_day, self.__lux_out
+    def skip(self, updates: int) -> None:
+        """Skip updates without publication of the sensors, the brightness is computed at the next update"""
+        for sensor in self.__light_sensors:
+            sensor.device.skip_publications(updates)
 
     # API, CLI functions
     def set_weather(self, date_time: datetime, value: str) -> Union[None, int]:
@@ -246,14 +392,37 @@ class AmbientLight:
         else:
             self.__weather = value
             self.__lux_out, self.__time_of_day = outdoor_light(
-                date_time, self.__weather
+                date_time, self.__weather, self.__site
             )
             for window in self.__windows:  # update max_lumen
                 window.device.max_lumen_from_out_lux(self.__lux_out)
-            for sensor in self.__light_sensors:  # update light sensors values
-                sensor.device.brightness = self.__compute_sensor_brightness(sensor)
+            for sensor, brightness in zip(
+                self.__light_sensors, self.__compute_sensors_brightness()
+            ):  # update light sensors values
+                sensor.device.brightness = brightness
+            self.__constant_until = None
+            self.mark_dirty()
             return 1
 
+    @property
+    def site(self) -> Site:
+        return self.__site
+
+    def set_site(self, date_time: datetime, site: Site) -> None:
+        """Set the geographical site of the room, then updates the light emitted by Windows, and light measured by sensors."""
+        self.__site = site
+        self.__lux_out, self.__time_of_day = outdoor_light(
+            date_time, self.__weather, self.__site
+        )
+        for window in self.__windows:  # update max_lumen
+            window.device.max_lumen_from_out_lux(self.__lux_out)
+        for sensor, brightness in zip(
+            self.__light_sensors, self.__compute_sensors_brightness()
+        ):  # update light sensors values
+            sensor.device.brightness = brightness
+        self.__constant_until = None
+        self.mark_dirty()
+
     def __compute_global_brightness(self, room) -> float:
         """
         Compute global room brightness considering the light received on room's ground from all light sources.
@@ -281,9 +450,10 @@ class AmbientLight:
         """
         Return global brightness.
         call __compute_global_brightness if room info are provided through the room argument.
-            -> compute global brightness with detailed formula using light sources.
+            -> compute global brightness with detailed formula using light sources,
+            or average the lux field on the working plane if a grid is set (see set_grid()).
         simply average sensors values if no room is provided
-            -> average sensors values from light_sensors list
+            -> average sensors values from light_sensors list, recomputed only if the ambient is dirty
 
         room : Room
         """
@@ -294,12 +464,15 @@ class AmbientLight:
             else:
                 return self.__lux_out
         if room is None:  # Average of all sensors' brightness
-            brightness_levels = []
-            for sensor in self.__light_sensors:
-                brightness_levels.append(
-                    self.__compute_sensor_brightness(sensor)
-                )  # We recompute to have the latest value
+            if self.__dirty:  # We recompute to have the latest value
+                brightness_levels = self.__compute_sensors_brightness()
+            else:
+                brightness_levels = [
+                    sensor.device.brightness for sensor in self.__light_sensors
+                ]
             bright = mean(brightness_levels) if len(brightness_levels) else 0
+        elif self.__illuminance.grid_axes is not None:  # Average of the lux field
+            bright = float(self.lux_field().mean())
         else:  # Use detailed formula to compute global brightness
             bright = self.__compute_global_brightness(room)
 
@@ -334,6 +507,17 @@ class AmbientTemperature:
         self.__temp_sensors = []
         self.__max_power_heater = 0
         self.__max_power_ac = 0
+        # dirty : the temperature can change at the next update, it is settled when an update leaves it unchanged
+        # until a source changes state or a value is set, reported : last temperature reported for each sensor
+        self.__dirty = True
+        self.__reported: Dict[str, float] = {}
+        # Functions called when a value is set or a source is added (see watch()), when a source changes state (see watch_sources()),
+        # function called before the indoor temperature is read or set, when integrated by a building (see attach())
+        self.__watchers: List[Callable[[], None]] = []
+        self.__source_watchers: List[Callable[[], None]] = []
+        self.__pull: Callable[[], None] = None
+        # Optional spatially resolved temperature around the mean temperature, see set_field()
+        self.field = None
 
     def __repr__(self):
         return f"{self.__temperature_in} °C"
@@ -350,9 +534,14 @@ class AmbientTemperature:
         from devices import Heater, AC
 
         self.__temp_sources.append(tempsource)
+        self.__dirty = True
+        for watcher in self.__watchers:
+            watcher()
         if isinstance(tempsource.device, Heater):
+            tempsource.device.watch(self.mark_dirty)
             self.__max_power_heater += tempsource.device.max_power
         elif isinstance(tempsource.device, AC):
+            tempsource.device.watch(self.mark_dirty)
             self.__max_power_ac += tempsource.device.max_power
         else:
             logging.warning(
@@ -366,64 +555,194 @@ class AmbientTemperature:
         tempsensor: InRoomDevice
         """
         self.__temp_sensors.append(tempsensor)
+        self.__dirty = True
+        for watcher in self.__watchers:
+            watcher()
+
+    def set_update_rule_ratio(self, update_rule_ratio: float) -> None:
+        """Set the fraction of a simulated hour between two world updates, when the simulated dt changes"""
+        self.__update_rule_ratio = update_rule_ratio
+        self.__dirty = True
+
+    def watch(self, watcher: Callable[[], None]) -> None:
+        """Call watcher when the temperatures are set or a source, a sensor or a field is added, used by the building of the room to read them again (see Building)"""
+        self.__watchers.append(watcher)
+
+    def watch_sources(self, watcher: Callable[[], None]) -> None:
+        """Call watcher when a heating or cooling source changes state, used by the building of the room to read the sources' forcing again (see Building)"""
+        self.__source_watchers.append(watcher)
+
+    def attach(self, pull: Callable[[], None]) -> None:
+        """Call pull before the indoor temperature is read or set through the API, used by the building of the room to write it (see Building)"""
+        self.__pull = pull
+
+    def sensors(self) -> List:
+        """Return the temperature sensors (InRoomDevice), measured by the building of the room (see Building)"""
+        return self.__temp_sensors
+
+    def mark_dirty(self) -> None:
+        """Integrate the temperature at the next update, called when a heating or cooling source changes state"""
+        self.__dirty = True
+        for watcher in self.__source_watchers:
+            watcher()
+
+    def set_field(self, field) -> None:
+        """
+        Set the temperature field (TemperatureField) over the room, the sensors then measure the temperature at their location,
+        the field is integrated at each update around the mean indoor temperature.
+        """
+        self.field = field
+        self.__dirty = True
+        for watcher in self.__watchers:
+            watcher()
+
+    def invalidate_geometry(self) -> None:
+        """Discard the cached geometry of the temperature field, called when a device moves in the room"""
+        if self.field is not None:
+            self.field.invalidate()
+            self.__dirty = True
+
+    def __source_rules(self) -> List[Tuple[object, float]]:
+        """
+        Return the heating and cooling sources turned on (InRoomDevice) with the degrees per hour they bring (<0 for ACs),
+        the update rule of each source is its effective power relative to the total max power of the sources.
+        """
+        from devices import Heater, AC
+
+        rules = []
+        if self.__temp_sources:
+            self.total_max_power = self.__max_power_heater + self.__max_power_ac
+            for source in self.__temp_sources:
+                if source.device.state:
+                    if isinstance(source.device, Heater):
+                        source.device.update_rule = (
+                            source.device.effective_power() / self.total_max_power
+                        )
+                    if isinstance(source.device, AC):
+                        source.device.update_rule = (
+                            -source.device.effective_power() / self.total_max_power
+                        )
+                    rules.append((source, source.device.update_rule))
+        return rules
+
+    def __sources_forcing(self) -> float:
+        """Return the degrees per hour gained (lost if <0) with the heating and cooling sources turned on"""
+        return sum(
+            rule for _, rule in self.__source_rules()
+        )  # The ac update rule is <0
+
+    def predict(self, updates: int) -> float:
+        """
+        Return the indoor temperature after a number of updates with the current sources' states:
+        exponential relaxation toward the outdoor temperature at the insulation rate, with the sources' forcing,
+        bounded to 5 <= t <= 35 °C (arbitrary).
+        """
+        temperature = exponential_relaxation(
+            self.__temperature_in,
+            self.temperature_out,
+            INSULATION_TO_TEMPERATURE_FACTOR[self.__room_insulation],
+            updates * self.__update_rule_ratio,
+            self.__sources_forcing(),
+        )
+        return max(5.0, min(35.0, temperature))
+
+    def sensor_predictions(self) -> List[Tuple[object, Callable[[int], float]]]:
+        """Return the temperature sensors with the function predicting their measured value after a number of updates"""
+        return [(sensor.device, self.predict) for sensor in self.__temp_sensors]
+
+    def relaxation(self) -> Tuple[float, float, float, float]:
+        """Return the indoor and outdoor temperatures, the insulation rate per hour and the sources' forcing in °C per hour, to integrate the temperature with other rooms (see Building)"""
+        return (
+            self.__temperature_in,
+            self.temperature_out,
+            INSULATION_TO_TEMPERATURE_FACTOR[self.__room_insulation],
+            self.__sources_forcing(),
+        )
+
+    def set_indoor(self, temperature: float) -> None:
+        """Set the indoor temperature integrated by the building, measured by the sensors at the next update"""
+        if temperature != self.__temperature_in:
+            self.__temperature_in = temperature
+            self.__dirty = True
+
+    def skip(self, updates: int, integrate: bool = True) -> None:
+        """
+        Advance the indoor temperature of a number of updates in closed form, without publication of the sensors.
+
+        integrate : False if the temperature is integrated by the building of the room.
+        """
+        if self.field is not None:
+            self.field.step(
+                updates * self.__update_rule_ratio,
+                self.__temperature_in,
+                self.temperature_out,
+                INSULATION_TO_TEMPERATURE_FACTOR[self.__room_insulation],
+                self.__source_rules(),
+            )
+        if integrate and self.__dirty:
+            self.__temperature_in = self.predict(updates)
+        for sensor in self.__temp_sensors:
+            sensor.device.skip_publications(updates)
 
     def update(
-        self, first_update: bool = False
+        self, first_update: bool = False, integrate: bool = True
     ) -> Tuple[List[Tuple[str, float]], bool]:
         """
         Update all temperature sensors of the world (the room), called at each World.update().
         Use the devices' update rule taking into consideration the effective power of each heating device.
         If no temperature sources, indoor temperature tends to outdoor temperature progressively.
+        The temperature is integrated exactly over the update interval (see predict()), whatever the simulated dt,
+        only if the ambient is dirty, the sensors send their state at each update.
+        With a temperature field, the field is integrated too and the sensors measure the temperature at their location.
 
         first_update : if start of simulation, no update when first called to display initial values on gui window.
+        integrate : False if the temperature is integrated by the building of the room, with the exchanges between rooms.
 
-        Return new temperature levels and a rising temp flag for GUI updates.
+        Return the temperature levels changed since the last update and a rising temp flag for GUI updates.
         """
-        from devices import Heater, AC
-
         previous_temp = self.__temperature_in
-        max_temp = 35.0  # arbitrary
-        min_temp = 5.0  # arbitrary
-        if not first_update:
-            logging.info("Temperature update...")
-            if not self.__temp_sources:
-                self.__temperature_in += (
-                    self.temperature_out - self.__temperature_in
-                ) * INSULATION_TO_TEMPERATURE_FACTOR[self.__room_insulation]
-            else:
-                self.total_max_power = self.__max_power_heater + self.__max_power_ac
-                for source in self.__temp_sources:  # sources of heat or 'cool'
-                    # Temperature update with sources influence
-                    if source.device.state:
-                        if isinstance(source.device, Heater):
-                            source.device.update_rule = (
-                                source.device.effective_power() / self.total_max_power
-                            )
-                            self.__temperature_in += (
-                                source.device.update_rule * self.__update_rule_ratio
-                            )
-                        if isinstance(source.device, AC):
-                            source.device.update_rule = (
-                                -source.device.effective_power() / self.total_max_power
-                            )
-                            self.__temperature_in += (
-                                source.device.update_rule * self.__update_rule_ratio
-                            )  # The ac update rule is <0
-                # Temperature update with outdoor temperature and room insulation influence
-                self.__temperature_in += (
-                    self.temperature_out - self.__temperature_in
-                ) * INSULATION_TO_TEMPERATURE_FACTOR[self.__room_insulation]
-            self.__temperature_in = max(
-                min_temp, min(max_temp, self.__temperature_in)
-            )  # temperature should be (min_temp <= t <= max_temp)
         temperature_levels = []
-        for sensor in self.__temp_sensors:  # InRoomDevice objects
-            sensor.device.temperature = self.__temperature_in
+        if self.__dirty:
+            if not first_update and integrate:
+                self.__temperature_in = self.predict(1)
+            self.__dirty = (
+                first_update
+                or self.field is not None
+                or (integrate and self.__temperature_in != previous_temp)
+            )
+            if self.field is None:
+                for sensor in self.__temp_sensors:  # InRoomDevice objects
+                    sensor.device.temperature = self.__temperature_in
+            else:
+                if not first_update:
+                    self.field.step(
+                        self.__update_rule_ratio,
+                        previous_temp,
+                        self.temperature_out,
+                        INSULATION_TO_TEMPERATURE_FACTOR[self.__room_insulation],
+                        self.__source_rules(),
+                    )
+                deviations = self.field.sample(self.__temp_sensors).tolist()
+                for sensor, deviation in zip(self.__temp_sensors, deviations):
+                    sensor.device.temperature = max(
+                        5.0, min(35.0, self.__temperature_in + deviation)
+                    )
+            temperature_levels = changed_levels(
+                [
+                    (sensor.name, sensor.device.temperature)
+                    for sensor in self.__temp_sensors
+                ],
+                self.__reported,
+            )
+        for sensor in self.__temp_sensors:
             sensor.device.send_state()
-            temperature_levels.append((sensor.name, sensor.device.temperature))
         rising_temp = self.__temperature_in > previous_temp
         if round(self.__temperature_in, 2) == round(previous_temp, 2):
             rising_temp = None
+        if TRACE_TEMPERATURE.enabled:
+            TRACE_TEMPERATURE.emit(
+                temperature_in=self.__temperature_in, rising=rising_temp
+            )
         return temperature_levels, rising_temp
 
     # CLI, API methods
@@ -434,6 +753,8 @@ class AmbientTemperature:
 
         location should be 'in' or 'out'.
         """
+        if self.__pull is not None:
+            self.__pull()
         if location == "in":
             self.__temperature_in = float(value)
             for sensor in self.__temp_sensors:
@@ -445,10 +766,15 @@ class AmbientTemperature:
                 f"The location should be 'in' or 'out' when setting temperature, but {location} was given."
             )
             return 0
+        self.__dirty = True
+        for watcher in self.__watchers:
+            watcher()
         return 1
 
     def get_temperature(self, str_mode: bool = False) -> Union[str, float]:
         """Return the current temperature value, called with CLI 'getinfo' command."""
+        if self.__pull is not None:
+            self.__pull()
         if str_mode:
             temp = str(round(self.__temperature_in, 2)) + " °C"
         else:
@@ -487,6 +813,14 @@ class AmbientHumidity:
         self.__room_insulation = room_insulation
         self.__update_rule_ratio = update_rule_ratio
         self.__humidity_sensors: List = []
+        # dirty : the vapor pressure can change at the next update, it is settled when an update leaves it unchanged,
+        # the humidity is also recomputed when the temperature changes, reported : last humidity reported for each sensor
+        self.__dirty = True
+        self.__reported: Dict[str, float] = {}
+        # Functions called when a value is set or a sensor is added (see watch()),
+        # function called before the humidity is read or set, when integrated by a building (see attach())
+        self.__watchers: List[Callable[[], None]] = []
+        self.__pull: Callable[[], None] = None
 
         self.__saturation_vapour_pressure_out = (
             self.compute_saturation_vapor_pressure_water(self.__temperature_out)
@@ -501,6 +835,18 @@ class AmbientHumidity:
             self.__saturation_vapour_pressure_out * self.humidity_out / 100, 8
         )
 
+    def watch(self, watcher: Callable[[], None]) -> None:
+        """Call watcher when the humidity levels are set or a sensor is added, used by the building of the room to read them again (see Building)"""
+        self.__watchers.append(watcher)
+
+    def attach(self, pull: Callable[[], None]) -> None:
+        """Call pull before the humidity is read or set through the API, used by the building of the room to write it (see Building)"""
+        self.__pull = pull
+
+    def sensors(self) -> List:
+        """Return the humidity sensors (InRoomDevice), measured by the building of the room (see Building)"""
+        return self.__humidity_sensors
+
     def add_sensor(self, humiditysoil) -> None:
         """
         Add humidity sensor to the sensors list : HumidityAir and AirSensor.
@@ -508,6 +854,9 @@ class AmbientHumidity:
         humiditysoil: InRoomDevice
         """
         self.__humidity_sensors.append(humiditysoil)
+        self.__dirty = True
+        for watcher in self.__watchers:
+            watcher()
 
     def compute_saturation_vapor_pressure_water(
         self, temperature: float
@@ -529,8 +878,87 @@ class AmbientHumidity:
             )
             return None
 
+    def set_update_rule_ratio(self, update_rule_ratio: float) -> None:
+        """Set the fraction of a simulated hour between two world updates, when the simulated dt changes"""
+        self.__update_rule_ratio = update_rule_ratio
+        self.__dirty = True
+
+    def __vapor_pressure_after(self, updates: int) -> float:
+        """Return the indoor vapor pressure after a number of updates, relaxing toward the outdoor vapor pressure at the insulation rate"""
+        return exponential_relaxation(
+            self.__vapor_pressure_in,
+            self.__vapor_pressure_out,
+            INSULATION_TO_HUMIDITY_FACTOR[self.__room_insulation],
+            updates * self.__update_rule_ratio,
+        )
+
+    def predict(self, updates: int, temperature: float) -> float:
+        """Return the humidity measured by the sensors after a number of updates, reaching the indoor temperature"""
+        return round(
+            100
+            * self.__vapor_pressure_after(updates)
+            / self.compute_saturation_vapor_pressure_water(temperature),
+            2,
+        )
+
+    def sensor_predictions(
+        self, temperature_after: Callable[[int], float]
+    ) -> List[Tuple[object, Callable[[int], float]]]:
+        """Return the humidity sensors with the function predicting their measured value after a number of updates"""
+        return [
+            (
+                sensor.device,
+                lambda updates: self.predict(updates, temperature_after(updates)),
+            )
+            for sensor in self.__humidity_sensors
+        ]
+
+    def relaxation(self) -> Tuple[float, float, float, float]:
+        """Return the indoor and outdoor vapor pressures, the insulation rate per hour and no forcing, to integrate the humidity with other rooms (see Building)"""
+        return (
+            self.__vapor_pressure_in,
+            self.__vapor_pressure_out,
+            INSULATION_TO_HUMIDITY_FACTOR[self.__room_insulation],
+            0,
+        )
+
+    def set_indoor(self, vapor_pressure: float, temperature: float = None) -> None:
+        """
+        Set the indoor vapor pressure integrated by the building, the humidity is computed at the next update,
+        or immediately if the indoor temperature is given.
+        """
+        if vapor_pressure != self.__vapor_pressure_in:
+            self.__vapor_pressure_in = vapor_pressure
+            self.__dirty = True
+        if temperature is not None:
+            self.__saturation_vapour_pressure_in = (
+                self.compute_saturation_vapor_pressure_water(temperature)
+            )
+            self.__temperature_in = temperature
+            self.__humidity_in = (
+                100 * self.__vapor_pressure_in / self.__saturation_vapour_pressure_in
+            )
+
+    def skip(self, updates: int, temperature: float, integrate: bool = True) -> None:
+        """
+        Advance the indoor humidity of a number of updates in closed form, reaching the indoor temperature, without publication of the sensors.
+
+        integrate : False if the vapor pressure is integrated by the building of the room.
+        """
+        self.__saturation_vapour_pressure_in = (
+            self.compute_saturation_vapor_pressure_water(temperature)
+        )
+        self.__temperature_in = temperature
+        if integrate:
+            self.__vapor_pressure_in = self.__vapor_pressure_after(updates)
+        self.__humidity_in = (
+            100 * self.__vapor_pressure_in / self.__saturation_vapour_pressure_in
+        )
+        for sensor in self.__humidity_sensors:
+            sensor.device.skip_publications(updates)
+
     def update(
-        self, temperature: float, first_update: bool = False
+        self, temperature: float, first_update: bool = False, integrate: bool = True
     ) -> List[Tuple[str, float]]:
         """
         Update all humidity sensors of the world (the room), called at each World.update().
@@ -539,32 +967,46 @@ class AmbientHumidity:
         we use it to update the vapor pressur of water in the room,
         we then compute the saturation vapor pressure at current temperature,
         and finally we can compute the relative humidity by taking the percentage ratio between the two.
+        The humidity is recomputed only if the ambient is dirty or the temperature changed, the sensors send their state at each update.
 
         first_update : if start of simulation, no update when first called to display initial values on gui window.
+        integrate : False if the vapor pressure is integrated by the building of the room, with the exchanges between rooms.
 
-        Return humidity levels for GUI updates.
+        Return the humidity levels changed since the last update for GUI updates.
         """
-        if not first_update:
-            logging.info("Humidity update...")
-            # We recompute sat vapor pressure from new temperature
-            self.__saturation_vapour_pressure_in = (
-                self.compute_saturation_vapor_pressure_water(temperature)
-            )
-            self.__temperature_in = temperature
-            # Apply humidity factor from outside temp and room's insulation
-            self.__vapor_pressure_in += (
-                (self.__vapor_pressure_out - self.__vapor_pressure_in)
-                * INSULATION_TO_HUMIDITY_FACTOR[self.__room_insulation]
-                * self.__update_rule_ratio
+        humidity_levels = []
+        if self.__dirty or temperature != self.__temperature_in:
+            previous_vapor_pressure = self.__vapor_pressure_in
+            if not first_update:
+                # We recompute sat vapor pressure from new temperature
+                self.__saturation_vapour_pressure_in = (
+                    self.compute_saturation_vapor_pressure_water(temperature)
+                )
+                self.__temperature_in = temperature
+                # Apply humidity factor from outside temp and room's insulation
+                if integrate:
+                    self.__vapor_pressure_in = self.__vapor_pressure_after(1)
+                self.__humidity_in = (
+                    100
+                    * self.__vapor_pressure_in
+                    / self.__saturation_vapour_pressure_in
+                )
+            self.__dirty = first_update or (
+                integrate and self.__vapor_pressure_in != previous_vapor_pressure
             )
-            self.__humidity_in = (
-                100 * self.__vapor_pressure_in / self.__saturation_vapour_pressure_in
+            for sensor in self.__humidity_sensors:
+                sensor.device.humidity = round(self.__humidity_in, 2)
+            humidity_levels = changed_levels(
+                [
+                    (sensor.device.name, sensor.device.humidity)
+                    for sensor in self.__humidity_sensors
+                ],
+                self.__reported,
             )
-
-        humidity_levels = []
         for sensor in self.__humidity_sensors:
-            sensor.device.humidity = round(self.__humidity_in, 2)
-            humidity_levels.append((sensor.device.name, sensor.device.humidity))
+            sensor.device.send_state()
+        if TRACE_HUMIDITY.enabled:
+            TRACE_HUMIDITY.emit(humidity_in=self.__humidity_in)
         return humidity_levels
 
     # API, CLI methods
@@ -575,6 +1017,8 @@ class AmbientHumidity:
 
         location should be 'in' or 'out'.
         """
+        if self.__pull is not None:
+            self.__pull()
         if location == "in":
             self.__humidity_in = float(value)
             self.__saturation_vapour_pressure_in = (
@@ -601,10 +1045,15 @@ class AmbientHumidity:
                 f"The location should be 'in' or 'out' when setting humidity, but {location} was given."
             )
             return 0
+        self.__dirty = True
+        for watcher in self.__watchers:
+            watcher()
         return 1
 
     def get_humidity(self, str_mode: bool = False) -> Union[str, float]:
         """Return the current humidity value, called with CLI 'getinfo' command."""
+        if self.__pull is not None:
+            self.__pull()
         if str_mode:
             hum = str(round(self.__humidity_in, 2)) + " %"
         else:
@@ -643,6 +1092,26 @@ class AmbientCO2:
         self.__room_insulation = room_insulation
         self.__co2_sensors: List = []
         self.__update_rule_ratio = update_rule_ratio
+        # dirty : the co2 level can change at the next update, it is settled when an update leaves it unchanged,
+        # reported : last co2 level reported for each sensor
+        self.__dirty = True
+        self.__reported: Dict[str, int] = {}
+        # Functions called when a value is set or a sensor is added (see watch()),
+        # function called before the co2 level is read or set, when integrated by a building (see attach())
+        self.__watchers: List[Callable[[], None]] = []
+        self.__pull: Callable[[], None] = None
+
+    def watch(self, watcher: Callable[[], None]) -> None:
+        """Call watcher when the co2 levels are set or a sensor is added, used by the building of the room to read them again (see Building)"""
+        self.__watchers.append(watcher)
+
+    def attach(self, pull: Callable[[], None]) -> None:
+        """Call pull before the co2 level is read or set through the API, used by the building of the room to write it (see Building)"""
+        self.__pull = pull
+
+    def sensors(self) -> List:
+        """Return the co2 sensors (InRoomDevice), measured by the building of the room (see Building)"""
+        return self.__co2_sensors
 
     def add_sensor(self, co2sensor) -> None:
         """
@@ -651,28 +1120,90 @@ class AmbientCO2:
         co2sensor: InRoomDevice
         """
         self.__co2_sensors.append(co2sensor)
+        self.__dirty = True
+        for watcher in self.__watchers:
+            watcher()
 
-    def update(self, first_update: bool = False) -> List[Tuple[str, float]]:
+    def set_update_rule_ratio(self, update_rule_ratio: float) -> None:
+        """Set the fraction of a simulated hour between two world updates, when the simulated dt changes"""
+        self.__update_rule_ratio = update_rule_ratio
+        self.__dirty = True
+
+    def __co2_after(self, updates: int) -> float:
+        """Return the indoor co2 level after a number of updates, relaxing toward the outdoor co2 level at the insulation rate"""
+        return exponential_relaxation(
+            self.__co2_in,
+            self.co2_out,
+            INSULATION_TO_CO2_FACTOR[self.__room_insulation],
+            updates * self.__update_rule_ratio,
+        )
+
+    def predict(self, updates: int) -> int:
+        """Return the co2 level measured by the sensors after a number of updates"""
+        return int(self.__co2_after(updates))
+
+    def sensor_predictions(self) -> List[Tuple[object, Callable[[int], int]]]:
+        """Return the co2 sensors with the function predicting their measured value after a number of updates"""
+        return [(sensor.device, self.predict) for sensor in self.__co2_sensors]
+
+    def relaxation(self) -> Tuple[float, float, float, float]:
+        """Return the indoor and outdoor co2 levels, the insulation rate per hour and no forcing, to integrate the co2 with other rooms (see Building)"""
+        return (
+            self.__co2_in,
+            self.co2_out,
+            INSULATION_TO_CO2_FACTOR[self.__room_insulation],
+            0,
+        )
+
+    def set_indoor(self, co2: float) -> None:
+        """Set the indoor co2 level integrated by the building, measured by the sensors at the next update"""
+        if co2 != self.__co2_in:
+            self.__co2_in = co2
+            self.__dirty = True
+
+    def skip(self, updates: int, integrate: bool = True) -> None:
+        """
+        Advance the indoor co2 level of a number of updates in closed form, without publication of the sensors.
+
+        integrate : False if the co2 level is integrated by the building of the room.
+        """
+        if integrate and self.__dirty:
+            self.__co2_in = self.__co2_after(updates)
+        for sensor in self.__co2_sensors:
+            sensor.device.skip_publications(updates)
+
+    def update(
+        self, first_update: bool = False, integrate: bool = True
+    ) -> List[Tuple[str, float]]:
         """
         Update all co2 sensors of the world (the room), called at each World.update().
         Arbitrarly update co2 values with room insulation, update_rule_ratio and a specific arbitrary factor.
-        Indoor co2 tends toward outdoor co2.
+        Indoor co2 tends toward outdoor co2, only if the ambient is dirty, the sensors send their state at each update.
 
         first_update : if start of simulation, no update when first called to display initial values on gui window.
+        integrate : False if the co2 level is integrated by the building of the room, with the exchanges between rooms.
 
-        Return co2 levels for GUI updates.
+        Return the co2 levels changed since the last update for GUI updates.
         """
-        if not first_update:
-            logging.info("CO2 update...")
-            self.__co2_in += (
-                (self.co2_out - self.__co2_in)
-                * INSULATION_TO_CO2_FACTOR[self.__room_insulation]
-                * self.__update_rule_ratio
-            )
         co2_levels = []
+        if self.__dirty:
+            previous_co2 = self.__co2_in
+            if not first_update and integrate:
+                self.__co2_in = self.__co2_after(1)
+            self.__dirty = first_update or (integrate and self.__co2_in != previous_co2)
+            for sensor in self.__co2_sensors:
+                sensor.device.co2 = int(self.__co2_in)
+            co2_levels = changed_levels(
+                [
+                    (sensor.device.name, sensor.device.co2)
+                    for sensor in self.__co2_sensors
+                ],
+                self.__reported,
+            )
         for sensor in self.__co2_sensors:
-            sensor.device.co2 = int(self.__co2_in)
-            co2_levels.append((sensor.device.name, sensor.device.co2))
+            sensor.device.send_state()
+        if TRACE_CO2.enabled:
+            TRACE_CO2.emit(co2_in=self.__co2_in)
         return co2_levels
 
     # API, CLI
@@ -683,6 +1214,8 @@ class AmbientCO2:
 
         location should be 'in' or 'out'.
         """
+        if self.__pull is not None:
+            self.__pull()
         if location == "in":
             self.__co2_in = float(value)
             for sensor in self.__co2_sensors:
@@ -694,10 +1227,15 @@ class AmbientCO2:
                 f"The location should be 'in' or 'out' when setting CO2, but {location} was given."
             )
             return 0
+        self.__dirty = True
+        for watcher in self.__watchers:
+            watcher()
         return 1
 
     def get_co2(self, str_mode: bool = False) -> Union[str, float]:
         """Return the current co2 value, called with CLI 'getinfo' command."""
+        if self.__pull is not None:
+            self.__pull()
         if str_mode:
             co2 = str(round(self.__co2_in, 2)) + " ppm"
         else:
@@ -721,6 +1259,15 @@ class SoilMoisture:
         self.__update_rule_down = (
             -0.5
         )  # -0.5% of soil moisture per hour, limited to SOIL_MOISTURE_MIN
+        self.__reported: Dict[str, float] = (
+            {}
+        )  # last soil moisture reported for each sensor
+        # Functions called when a sensor is added (see watch())
+        self.__watchers: List[Callable[[], None]] = []
+
+    def watch(self, watcher: Callable[[], None]) -> None:
+        """Call watcher when a sensor is added, used by the building of the room to update it (see Building)"""
+        self.__watchers.append(watcher)
 
     def add_sensor(self, humiditysoilsensor) -> None:
         """
@@ -729,19 +1276,49 @@ class SoilMoisture:
         humiditysoilsensor: InRoomDevice
         """
         self.__humiditysoil_sensors.append(humiditysoilsensor)
+        for watcher in self.__watchers:
+            watcher()
+
+    def set_update_rule_ratio(self, update_rule_ratio: float) -> None:
+        """Set the fraction of a simulated hour between two world updates, when the simulated dt changes"""
+        self.__update_rule_ratio = update_rule_ratio
+
+    def predict(self, updates: int, sensor) -> float:
+        """Return the soil moisture measured by sensor (InRoomDevice) after a number of updates"""
+        if sensor.device.humiditysoil > SOIL_MOISTURE_MIN:
+            moisture_delta = self.__update_rule_down * self.__update_rule_ratio
+            return max(
+                SOIL_MOISTURE_MIN, sensor.device.humiditysoil + updates * moisture_delta
+            )
+        return SOIL_MOISTURE_MIN
+
+    def sensor_predictions(self) -> List[Tuple[object, Callable[[int], float]]]:
+        """Return the soil moisture sensors with the function predicting their measured value after a number of updates"""
+        return [
+            (
+                sensor.device,
+                lambda updates, sensor=sensor: self.predict(updates, sensor),
+            )
+            for sensor in self.__humiditysoil_sensors
+        ]
+
+    def skip(self, updates: int) -> None:
+        """Advance the soil moisture of a number of updates, without publication of the sensors"""
+        for sensor in self.__humiditysoil_sensors:
+            sensor.device.humiditysoil = self.predict(updates, sensor)
+            sensor.device.skip_publications(updates)
 
     def update(self, first_update: bool = False) -> List[Tuple[str, float]]:
         """
         Update all soil moisture sensors of the world (the room), called at each World.update().
+        The soil moisture of each sensor decreases until SOIL_MOISTURE_MIN, it can be set by the user at any time on the sensor.
 
         first_update : if start of simulation, no update when first called to display initial values on gui window.
 
-        Return soil moisture levels for GUI updates.
+        Return the soil moisture levels changed since the last update for GUI updates.
         """
-        moisture_levels = []
         for sensor in self.__humiditysoil_sensors:
             if not first_update:
-                logging.info("Soil Moisture update...")
                 if sensor.device.humiditysoil > SOIL_MOISTURE_MIN:
                     moisture_delta = self.__update_rule_down * self.__update_rule_ratio
                     if (
@@ -750,11 +1327,18 @@ class SoilMoisture:
                         sensor.device.humiditysoil = SOIL_MOISTURE_MIN
                     else:
                         sensor.device.humiditysoil += moisture_delta
-                else:
+                elif sensor.device.humiditysoil != SOIL_MOISTURE_MIN:
                     sensor.device.humiditysoil = SOIL_MOISTURE_MIN
-            moisture_levels.append(
+            sensor.device.send_state()
+        moisture_levels = changed_levels(
+            [
                 (sensor.device.name, round(sensor.device.humiditysoil, 2))
-            )
+                for sensor in self.__humiditysoil_sensors
+            ],
+            self.__reported,
+        )
+        if TRACE_SOIL_MOISTURE.enabled:
+            TRACE_SOIL_MOISTURE.emit(levels=moisture_levels)
         return moisture_levels
 
 
@@ -771,12 +1355,28 @@ class Presence:
         self.presence = False
         self.entities = []  # person detectable by presence sensor
         self.__presence_sensors = []
+        # dirty : the presence changed since the last update, reported : last presence reported for each sensor
+        self.__dirty = True
+        self.__reported: Dict[str, bool] = {}
+        # Functions called when the presence changes or a sensor is added (see watch())
+        self.__watchers: List[Callable[[], None]] = []
+
+    def watch(self, watcher: Callable[[], None]) -> None:
+        """Call watcher when the presence changes or a sensor is added, used by the building of the room to update it (see Building)"""
+        self.__watchers.append(watcher)
+
+    def mark_dirty(self) -> None:
+        """Report the presence to the GUI at the next update, called when the presence changes or a sensor is added"""
+        self.__dirty = True
+        for watcher in self.__watchers:
+            watcher()
 
     def add_entity(self, entity: str) -> None:
         """Add an entity (person) in the room, and update presence values."""
         self.entities.append(entity)
         self.presence = True
-        self.update()
+        self.mark_dirty()
+        self.__publish()
 
     def add_sensor(self, presencesensor) -> None:
         """
@@ -785,22 +1385,53 @@ class Presence:
         presencesensor: InRoomDevice
         """
         self.__presence_sensors.append(presencesensor)
+        self.mark_dirty()
 
     def remove_entity(self, entity: str) -> None:
         """Remove an entity (person) from the room, and update presence value accordingly."""
         if entity in self.entities:
             self.entities.remove(entity)
             self.presence = True if len(self.entities) else False
-            self.update()
+            self.mark_dirty()
+            self.__publish()
         else:
             logging.warning(f"The entity {entity} is not present in the simulation.")
 
-    def update(self) -> List[Tuple[str, float]]:
-        """Update all presence sensors of the world (the room), called at each World.update()"""
-        presence_sensors_states = []
+    def sensor_predictions(self) -> List[Tuple[object, Callable[[int], bool]]]:
+        """Return the presence sensors with the function predicting their measured value after a number of updates"""
+        return [
+            (sensor.device, lambda updates: self.presence)
+            for sensor in self.__presence_sensors
+        ]
+
+    def skip(self, updates: int) -> None:
+        """Skip updates without publication of the sensors, the presence only changes with API commands"""
+        for sensor in self.__presence_sensors:
+            sensor.device.skip_publications(updates)
+
+    def __publish(self) -> None:
+        """Set the presence measured by the sensors, and send their state on the bus"""
         for sensor in self.__presence_sensors:
             sensor.device.state = self.presence
-            presence_sensors_states.append((sensor.device.name, sensor.device.state))
+            sensor.device.send_state()
+
+    def update(self) -> List[Tuple[str, float]]:
+        """
+        Update all presence sensors of the world (the room), called at each World.update()
+
+        Return the presence sensors' states changed since the last update for GUI updates.
+        """
+        presence_sensors_states = []
+        if self.__dirty:
+            presence_sensors_states = changed_levels(
+                [
+                    (sensor.device.name, self.presence)
+                    for sensor in self.__presence_sensors
+                ],
+                self.__reported,
+            )
+            self.__dirty = False
+        self.__publish()
         return presence_sensors_states
 
     # API method
@@ -824,6 +1455,7 @@ class Presence:
             self.presence = value_bool
             for sensor in self.__presence_sensors:
                 sensor.device.state = self.presence
+            self.mark_dirty()
             return 1
 
 
@@ -894,10 +1526,17 @@ class World:
         self.soil_moisture = SoilMoisture(self.time.update_rule_ratio)
         # Presence
         self.presence = Presence()
+        # Building integrating the temperature, humidity and co2 of this world with the other rooms, None if the room is alone
+        self.building = None
 
-    def update(
-        self, first_update: bool
-    ) -> Tuple[
+    def measured_by_building(self) -> bool:
+        """
+        Return True if the temperature, humidity and co2 sensors are measured by the building of the room (see Building),
+        i.e. the room is in a building and has no temperature field, the ambients are then not updated with the world.
+        """
+        return self.building is not None and self.ambient_temperature.field is None
+
+    def update(self, first_update: bool, updates: int = 1) -> Tuple[
         datetime,
         str,
         datetime,
@@ -911,13 +1550,19 @@ class World:
         List[Tuple[str, bool]],
     ]:
         """
-        World states update, call all ambient states updates methods.
+        World states update, call all ambient states updates methods,
+        each ambient recomputes its sensors only if it is dirty (see the ambients' update()).
+
+        updates : number of updates to advance, the updates before the last one are skipped in closed form without publication of the sensors,
+        only if no interesting instant occurs before the last one (see next_event()).
+        In a building, the time is advanced by the building, and the temperature, humidity and co2 are not updated
+        if they are measured by the building (see measured_by_building()).
 
-        Return world info and states, and ambient levels for GUI updates."""
+        Return world info and states, and the ambient levels changed since the last update for GUI updates.
+        """
+        measured = self.measured_by_building()
+        temperature_levels, rising_temp, humidity_levels, co2_levels = [], None, [], []
         if first_update:
-            logging.info(
-                f"Initial simulation state at {self.time.simulation_time(str_mode=True)}."
-            )
             date_time = self.time.date_time
             (
                 brightness_levels,
@@ -925,34 +1570,48 @@ class World:
                 time_of_day,
                 out_lux,
             ) = self.ambient_light.update(date_time, first_update=first_update)
-            temperature_levels, rising_temp = self.ambient_temperature.update(
-                first_update=first_update
-            )
-            humidity_levels = self.ambient_humidity.update(
-                self.ambient_temperature.get_temperature(str_mode=False),
-                first_update=first_update,
-            )
-            co2_levels = self.ambient_co2.update(first_update=first_update)
+            if not measured:
+                temperature_levels, rising_temp = self.ambient_temperature.update(
+                    first_update=first_update
+                )
+                humidity_levels = self.ambient_humidity.update(
+                    self.ambient_temperature.get_temperature(str_mode=False),
+                    first_update=first_update,
+                )
+                co2_levels = self.ambient_co2.update(first_update=first_update)
             humiditysoil_levels = self.soil_moisture.update(first_update=first_update)
             presence_sensors_states = self.presence.update()
         else:
-            date_time = self.time.update_datetime()
-            logging.info(
-                f"Simulation update at {self.time.simulation_time(str_mode=True)}."
-            )
+            integrate = self.building is None
+            if updates > 1:
+                self.__skip(updates - 1)
+            if integrate:
+                date_time = self.time.update_datetime()
+            else:
+                date_time = self.time.date_time
             (
                 brightness_levels,
                 weather,
                 time_of_day,
                 out_lux,
             ) = self.ambient_light.update(date_time)
-            temperature_levels, rising_temp = self.ambient_temperature.update()
-            humidity_levels = self.ambient_humidity.update(
-                self.ambient_temperature.get_temperature(str_mode=False)
-            )
-            co2_levels = self.ambient_co2.update()
+            if not measured:
+                temperature_levels, rising_temp = self.ambient_temperature.update(
+                    integrate=integrate
+                )
+                humidity_levels = self.ambient_humidity.update(
+                    self.ambient_temperature.get_temperature(str_mode=False),
+                    integrate=integrate,
+                )
+                co2_levels = self.ambient_co2.update(integrate=integrate)
             humiditysoil_levels = self.soil_moisture.update()
             presence_sensors_states = self.presence.update()
+        if TRACE_WORLD_UPDATE.enabled:
+            TRACE_WORLD_UPDATE.emit(
+                simtime=self.time.simulation_time(),
+                date_time=date_time.isoformat(),
+                first_update=first_update,
+            )
         return (
             date_time,
             weather,
@@ -967,6 +1626,78 @@ class World:
             presence_sensors_states,
         )
 
+    def __skip(self, updates: int) -> None:
+        """
+        Advance the time and the ambient states of a number of quiescent updates in closed form, without publication of the sensors,
+        in a building the time is advanced by the building (see update()).
+        """
+        integrate = self.building is None
+        if integrate:
+            self.time.update_datetime(updates)
+        self.ambient_light.skip(updates)
+        if not self.measured_by_building():
+            self.ambient_temperature.skip(updates, integrate)
+            self.ambient_humidity.skip(
+                updates,
+                self.ambient_temperature.get_temperature(str_mode=False),
+                integrate,
+            )
+            self.ambient_co2.skip(updates, integrate)
+        self.soil_moisture.skip(updates)
+        self.presence.skip(updates)
+
+    def next_event(self, max_updates: int) -> int:
+        """
+        Return the number of updates (1 to max_updates) until the next interesting instant of the world, the previous updates are quiescent and can be skipped:
+        a boundary of the outdoor light (dawn, sunrise, sunset, dusk, ...),
+        or a sensor sending its state on the bus (change of value threshold crossed, heartbeat, or each update with the default publish policy).
+        The ambient states are predicted in closed form with the current states of the devices,
+        except the temperature field (see AmbientTemperature.set_field()) that is integrated at each update.
+        The sensors measured by the building of the room are not considered (see measured_by_building()).
+        """
+        if self.ambient_temperature.field is not None:
+            return 1
+        light_change = next_outdoor_light_change(
+            self.time.date_time, self.ambient_light.site
+        )
+        horizon = max(1, min(max_updates, self.time.updates_until(light_change)))
+
+        def temperature_after(updates: int) -> float:
+            return round(self.ambient_temperature.predict(updates), 2)
+
+        predictions = self.ambient_light.sensor_predictions(self.time.date_time_after)
+        if not self.measured_by_building():
+            predictions += (
+                self.ambient_temperature.sensor_predictions()
+                + self.ambient_humidity.sensor_predictions(temperature_after)
+                + self.ambient_co2.sensor_predictions()
+            )
+        predictions += (
+            self.soil_moisture.sensor_predictions() + self.presence.sensor_predictions()
+        )
+        for sensor, value_after in predictions:
+            if horizon == 1:
+                break
+            horizon = sensor.next_publication(
+                value_after, self.time.time_after, horizon
+            )
+        return horizon
+
+    def set_site(self, site: Site) -> None:
+        """Set the geographical site of the world, used to compute the outdoor brightness from the sun events."""
+        self.ambient_light.set_site(self.time.date_time, site)
+
+    def set_simulated_dt(self, simulated_dt: float) -> None:
+        """Set the simulated time between two world updates, and the corresponding update rule ratio of the ambients."""
+        self.time.set_simulated_dt(simulated_dt)
+        for ambient in (
+            self.ambient_temperature,
+            self.ambient_humidity,
+            self.ambient_co2,
+            self.soil_moisture,
+        ):
+            ambient.set_update_rule_ratio(self.time.update_rule_ratio)
+
     # API, CLI methods
     def set_ambient_value(
         self, ambient: str, value: Union[str, float]
@@ -3,14 +3,19 @@ Module that gather usefull functions and definitions for physical world states m
 """
 
 import math
-from datetime import datetime, timezone
-from typing import Tuple
+import logging
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from functools import lru_cache
+from typing import Dict, NamedTuple, Tuple, Union
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from astral import LocationInfo
-from astral.sun import sun
+import numpy as np
+from astral import Observer
+from astral.sun import sun, elevation
 
 
 SOIL_MOISTURE_MIN = 10
+# The insulation factors are the rates (per hour) of the exponential relaxation of the indoor values toward the outdoor values
 # Influence of outdoor temp
 INSULATION_TO_TEMPERATURE_FACTOR = {
     "perfect": 0,
@@ -48,91 +53,209 @@ DATE_WEATHER_TO_LUX = {
 }
 
 
-def outdoor_light(date_time: datetime, weather: str) -> Tuple[float, datetime]:
-    """Return outdoor lux value from weather conditions and time of day in a certain location (e.g. Lausanne)"""
-    city = LocationInfo("Lausanne", "Switzerland", "Europe", 46.516, 6.63282)
-    date = date_time.date()
-    date_time = date_time.replace(tzinfo=timezone.utc)
-    sun_time = sun(city.observer, date=date)
-    dawn_datetime, sunrise_datetime, noon_datetime, sunset_datetime, dusk_datetime = (
-        sun_time["dawn"],
-        sun_time["sunrise"],
-        sun_time["noon"],
-        sun_time["sunset"],
-        sun_time["dusk"],
+SUN_EVENTS_CACHE_SIZE = 1024  # (site, date) pairs, more than 2 years of a single site
+TWILIGHT_ELEVATION = -6  # degrees, civil twilight (astral default for dawn/dusk)
+
+
+class Site(NamedTuple):
+    """Geographical site of the simulated building, for the sun events computation"""
+
+    latitude: float
+    longitude: float
+    timezone: str = "UTC"  # time zone of the simulation date and time
+
+    CONFIG_KEYS = ("latitude", "longitude", "timezone")
+
+    @classmethod
+    def from_config(cls, world_config: Dict) -> "Site":
+        """Create a site from the 'world' section of a JSON configuration file, default site (Lausanne) for missing or incorrect values."""
+        try:
+            latitude = float(world_config.get("latitude", DEFAULT_SITE.latitude))
+            longitude = float(world_config.get("longitude", DEFAULT_SITE.longitude))
+            timezone_name = str(world_config.get("timezone", DEFAULT_SITE.timezone))
+            assert -90 <= latitude <= 90 and -180 <= longitude <= 180
+            site = cls(latitude, longitude, timezone_name)
+            site.time_zone()
+        except (AssertionError, TypeError, ValueError, ZoneInfoNotFoundError):
+            logging.warning(
+                f"The site {({key: world_config.get(key) for key in cls.CONFIG_KEYS})} is incorrect: latitude should be in [-90, 90], longitude in [-180, 180] and timezone a IANA time zone (e.g. 'Europe/Zurich') ==> default site is used."
+            )
+            return DEFAULT_SITE
+        return site
+
+    def time_zone(self) -> tzinfo:
+        if self.timezone == "UTC":
+            return timezone.utc
+        return ZoneInfo(self.timezone)
+
+
+DEFAULT_SITE = Site(46.516, 6.63282)  # Lausanne, dates in UTC
+
+
+@lru_cache(maxsize=SUN_EVENTS_CACHE_SIZE)
+def sun_events(site: Site, day: date) -> Union[Tuple[datetime, ...], None]:
+    """
+    Return the (dawn, sunrise, noon, sunset, dusk) datetimes of a date at a site, in the site time zone,
+    None if the sun does not rise, set or reach the twilight elevation this day (polar day/night).
+    Results are cached per (site, date) with LRU eviction, as they are the same for all the updates of a day.
+    """
+    observer = Observer(site.latitude, site.longitude)
+    try:
+        sun_time = sun(observer, date=day, tzinfo=site.time_zone())
+    except ValueError:
+        return None
+    return tuple(sun_time[event] for event in ("dawn", "sunrise", "noon", "sunset", "dusk"))
+
+
+def weather_lux(weather: str) -> Tuple[float, float, float, float]:
+    """Return the (night, twilight, sunrise/sunset, day) lux levels of a weather ('clear', 'overcast' or 'dark')"""
+    return (
+        DATE_WEATHER_TO_LUX[f"{weather}_night"],
+        DATE_WEATHER_TO_LUX.get(
+            f"{weather}_twilight", DATE_WEATHER_TO_LUX["overcast_twilight"]
+        ),
+        DATE_WEATHER_TO_LUX[f"{weather}_sunrise_sunset"],
+        DATE_WEATHER_TO_LUX[f"{weather}_day"],
     )
+
+
+def polar_outdoor_light(
+    date_time: datetime, weather: str, site: Site
+) -> Tuple[float, str]:
+    """Return outdoor lux value and time of day from the sun elevation, for days without sun events at the site"""
+    night, twilight, sunrise_sunset, day = weather_lux(weather)
+    sun_elevation = elevation(Observer(site.latitude, site.longitude), date_time)
+    if sun_elevation > 0:
+        return max(day, sunrise_sunset), "sun"
+    if sun_elevation > TWILIGHT_ELEVATION:
+        return sunrise_sunset - twilight, "sunrise"
+    return night, "moon"
+
+
+def outdoor_light(
+    date_time: datetime, weather: str, site: Site = DEFAULT_SITE
+) -> Tuple[float, str]:
+    """Return outdoor lux value from weather conditions and time of day at a site (Lausanne by default), and time of day for GUI symbol"""
+    date_time = date_time.replace(tzinfo=site.time_zone())
+    events = sun_events(site, date_time.date())
+    if events is None:
+        return polar_outdoor_light(date_time, weather, site)
+    dawn_datetime, sunrise_datetime, noon_datetime, sunset_datetime, dusk_datetime = events
+    night, twilight, sunrise_sunset, day = weather_lux(weather)
     # Night
     if date_time < dawn_datetime or dusk_datetime < date_time:
         time_of_day = "moon"  # for gui time of day symbol
-        if weather == "clear":
-            lux_out = DATE_WEATHER_TO_LUX["clear_night"]
-        elif weather == "overcast":
-            lux_out = DATE_WEATHER_TO_LUX["overcast_night"]
-        elif weather == "dark":
-            lux_out = DATE_WEATHER_TO_LUX["dark_night"]
+        lux_out = night
     # Day
     elif sunrise_datetime < date_time and date_time < sunset_datetime:
         time_of_day = "sun"  # for gui time of day symbol
-        if (
-            date_time < noon_datetime
-        ):  # ratio of how close we are to ;id_morning/mid_afternoon, 1 if mid_morning < date_time < mid_afternoon
-            mid_morning_offset = (noon_datetime - sunrise_datetime) / 2
-            mid_morning_datetime = sunrise_datetime + mid_morning_offset
-            ratio = min(
-                (date_time - sunrise_datetime)
-                / (mid_morning_datetime - sunrise_datetime),
-                1,
-            )
-        elif noon_datetime < date_time:
-            mid_afternoon_offset = (sunset_datetime - noon_datetime) / 2
-            mid_afternoon_datetime = sunset_datetime - mid_afternoon_offset
-            ratio = min(
-                (sunset_datetime - date_time)
-                / (sunset_datetime - mid_afternoon_datetime),
-                1,
-            )
-        if weather == "clear":
-            lux_out = max(
-                ratio * DATE_WEATHER_TO_LUX["clear_day"],
-                DATE_WEATHER_TO_LUX["clear_sunrise_sunset"],
-            )
-        elif weather == "overcast":
-            lux_out = max(
-                ratio * DATE_WEATHER_TO_LUX["overcast_day"],
-                DATE_WEATHER_TO_LUX["overcast_sunrise_sunset"],
-            )
-        elif weather == "dark":
-            lux_out = max(
-                ratio * DATE_WEATHER_TO_LUX["dark_day"],
-                DATE_WEATHER_TO_LUX["dark_sunrise_sunset"],
-            )
+        # ratio of how close we are to mid_morning/mid_afternoon, 1 if mid_morning < date_time < mid_afternoon
+        if date_time < noon_datetime:
+            ratio = (date_time - sunrise_datetime) / ((noon_datetime - sunrise_datetime) / 2)
+        else:
+            ratio = (sunset_datetime - date_time) / ((sunset_datetime - noon_datetime) / 2)
+        lux_out = max(min(ratio, 1) * day, sunrise_sunset)
     # Twilight
     else:  # ratio of how close we are to sunrise/sunset with regards to twilight
-        if dawn_datetime < date_time and date_time < sunrise_datetime:
+        if date_time <= sunrise_datetime:
             time_of_day = "sunrise"  # for gui time of day symbol
             ratio = (date_time - dawn_datetime) / (sunrise_datetime - dawn_datetime)
-        elif sunset_datetime < date_time and date_time < dusk_datetime:
+        else:
             time_of_day = "sunset"  # for gui time of day symbol
             ratio = (dusk_datetime - date_time) / (dusk_datetime - sunset_datetime)
-
-        if weather == "clear":
-            lux_out = ratio * (
-                DATE_WEATHER_TO_LUX["clear_sunrise_sunset"]
-                - DATE_WEATHER_TO_LUX["clear_twilight"]
-            )
-        elif weather == "overcast":
-            lux_out = ratio * (
-                DATE_WEATHER_TO_LUX["overcast_sunrise_sunset"]
-                - DATE_WEATHER_TO_LUX["overcast_twilight"]
-            )
-        elif weather == "dark":
-            lux_out = ratio * (
-                DATE_WEATHER_TO_LUX["dark_sunrise_sunset"]
-                - DATE_WEATHER_TO_LUX["overcast_twilight"]
-            )
+        lux_out = ratio * (sunrise_sunset - twilight)
     return lux_out, time_of_day
 
 
+def next_outdoor_light_change(
+    date_time: datetime, site: Site = DEFAULT_SITE
+) -> datetime:
+    """
+    Return the next boundary after date_time of the pieces of outdoor_light() at a site:
+    dawn, sunrise, mid-morning, noon, mid-afternoon, sunset, dusk or midnight (naive datetimes in the site time zone).
+    Between two boundaries, the outdoor lux is constant or monotonic.
+    """
+    midnight = datetime.combine(date_time.date() + timedelta(days=1), time())
+    events = sun_events(site, date_time.date())
+    if events is None:  # polar day/night
+        return midnight
+    dawn, sunrise, noon, sunset, dusk = [event.replace(tzinfo=None) for event in events]
+    boundaries = (
+        dawn,
+        sunrise,
+        sunrise + (noon - sunrise) / 2,
+        noon,
+        noon + (sunset - noon) / 2,
+        sunset,
+        dusk,
+    )
+    return next((boundary for boundary in boundaries if boundary > date_time), midnight)
+
+
+def outdoor_light_array(
+    timestamps, weather: str, site: Site = DEFAULT_SITE
+) -> np.ndarray:
+    """
+    Vectorized outdoor_light: return the outdoor lux values for an array of timestamps.
+    Sun events are computed once per distinct date (and cached), the lux levels are then selected with array operations.
+
+    timestamps : sequence of datetime.datetime or numpy datetime64 array, naive dates and times in the site time zone.
+    """
+    times = np.asarray(timestamps, dtype="datetime64[us]")
+    days, day_indexes = np.unique(times.astype("datetime64[D]"), return_inverse=True)
+    events = np.zeros((len(days), 5), dtype="datetime64[us]")
+    polar_days = np.zeros(len(days), dtype=bool)
+    for index, day_date in enumerate(days.tolist()):  # datetime.date objects
+        day_events = sun_events(site, day_date)
+        if day_events is None:
+            polar_days[index] = True
+        else:
+            events[index] = [event.replace(tzinfo=None) for event in day_events]
+    # Naive local times as microseconds since epoch, for the timestamps and their day's events
+    events = events[day_indexes].astype(np.int64).astype(float)
+    t = times.astype(np.int64).astype(float)
+    dawn, sunrise, noon, sunset, dusk = events.T
+    night, twilight, sunrise_sunset, day = weather_lux(weather)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        day_ratio = np.where(
+            t < noon,
+            (t - sunrise) / ((noon - sunrise) / 2),
+            (sunset - t) / ((sunset - noon) / 2),
+        )
+        twilight_ratio = np.where(
+            t <= sunrise,
+            (t - dawn) / (sunrise - dawn),
+            (dusk - t) / (dusk - sunset),
+        )
+    lux_out = np.select(
+        [(t < dawn) | (dusk < t), (sunrise < t) & (t < sunset)],
+        [
+            night,
+            np.maximum(np.minimum(day_ratio, 1) * day, sunrise_sunset),
+        ],
+        twilight_ratio * (sunrise_sunset - twilight),
+    )
+    for index in np.flatnonzero(polar_days[day_indexes]):
+        lux_out[index] = outdoor_light(times[index].item(), weather, site)[0]
+    return lux_out
+
+
+def exponential_relaxation(
+    value: float, target: float, rate: float, duration: float, forcing: float = 0
+) -> float:
+    """
+    Return value after duration hours of d(value)/dt = rate * (target - value) + forcing, in closed form:
+    exponential relaxation toward target (e.g. outdoor temperature) with a constant forcing (e.g. heaters' and ACs' degrees per hour),
+    exact for any duration, so that successive updates give the same values for any simulated dt.
+
+    rate : per hour (e.g. insulation factor), 0 for a linear evolution with the forcing only.
+    """
+    if rate == 0:
+        return value + forcing * duration
+    equilibrium = target + forcing / rate
+    return equilibrium + (value - equilibrium) * math.exp(-rate * duration)
+
+
 def compute_distance(source, sensor) -> float:
     """
     Computes euclidian distance between a sensor and a source (or simply two room devices).